@@ -0,0 +1,80 @@
+"""Measures the time and memory it takes to build answers
+from the rows of SARepo's Core listing query
+
+The rows are made up, so no database is involved. Every answer carries
+its support user with the role and its question with the regular user,
+the same related entities are repeated over the rows as in real data.
+
+Usage:
+    python -m benchmarks.entities [answers]
+"""
+from datetime import datetime
+from uuid import uuid4
+from bot.db.repositories.sa_row_mappers import ANSWERS_ROWS
+import gc
+import sys
+import time
+import tracemalloc
+
+
+DEFAULT_ANSWERS = 100_000
+
+# How many answers share the same support user and the same question
+ANSWERS_PER_SUPPORT_USER = 1000
+ANSWERS_PER_QUESTION = 2
+
+
+def make_rows(answers: int) -> list[tuple]:
+    date = datetime(2023, 1, 1)
+
+    role = (1, "Role", "", True, False, date)
+
+    support_users = [
+        (uuid4(), f"Support {i}", i, date, False, True, None) + role
+        for i in range(answers // ANSWERS_PER_SUPPORT_USER + 1)
+    ]
+
+    questions = [
+        (uuid4(), f"Question {i}", i, date, uuid4(), 1000 + i, date)
+        for i in range(answers // ANSWERS_PER_QUESTION + 1)
+    ]
+
+    return [
+        (uuid4(), "Answer", i, None, date)
+        + support_users[i // ANSWERS_PER_SUPPORT_USER]
+        + questions[i // ANSWERS_PER_QUESTION]
+        for i in range(answers)
+    ]
+
+
+def build(rows: list[tuple]) -> list:
+    as_entity = ANSWERS_ROWS.make_as_entity()
+
+    return [as_entity(row) for row in rows]  # type: ignore
+
+
+def main(answers: int) -> None:
+    rows = make_rows(answers)
+
+    start = time.perf_counter()
+    build(rows)
+    elapsed = time.perf_counter() - start
+
+    # Memory is measured by a separate run, since tracing slows it down
+    gc.collect()
+    tracemalloc.start()
+
+    entities = build(rows)
+
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"answers built:   {len(entities)}")
+    print(f"time:            {elapsed:.3f} s")
+    print(f"per answer:      {elapsed / answers * 1_000_000:.2f} us")
+    print(f"memory:          {memory / 1024 / 1024:.1f} MiB")
+    print(f"per answer:      {memory / answers:.0f} bytes")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ANSWERS)
@@ -0,0 +1,143 @@
+"""Measures the CPU time per entity of the bulk listings of SARepo,
+the way the data export reads them
+
+Usage:
+    python -m benchmarks.repo_listings [questions]
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+from bot.db.models.sa_models import ModelBase
+from bot.db.repositories.repository import LoaderProfile
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.entities.role import Role, RolePermissions
+from bot.entities.support_user import SupportUser
+from bot.utils import AttachmentType
+import asyncio
+import sys
+import time
+
+
+DEFAULT_QUESTIONS = 5000
+
+PAGE_SIZE = 500
+
+
+async def seed(repo: SARepo, questions: int) -> None:
+    date = datetime(2023, 1, 1)
+
+    role = await Role.add_role("Role", RolePermissions(True, False), repo)
+
+    support_user = await SupportUser.add_support_user(1, "Jake", repo, role)
+
+    regular_users = [
+        {"id": uuid4(), "tg_bot_user_id": 100 + i, "join_date": date}
+        for i in range(questions // 10)
+    ]
+
+    questions_rows = [
+        {
+            "id": uuid4(),
+            "regular_user_id": regular_users[i % len(regular_users)]["id"],
+            "message": f"Question {i}",
+            "tg_message_id": i,
+            "date": date + timedelta(seconds=i),
+        }
+        for i in range(questions)
+    ]
+
+    answers_rows = [
+        {
+            "id": uuid4(),
+            "support_user_id": support_user.id,
+            "question_id": question["id"],
+            "message": "Answer",
+            "tg_message_id": questions + i,
+            "is_useful": None,
+            "date": question["date"],
+        }
+        for i, question in enumerate(questions_rows)
+    ]
+
+    await repo.bulk_add_regular_users(regular_users)
+    await repo.bulk_add_questions(questions_rows)
+    await repo.bulk_add_answers(answers_rows)
+    await repo.bulk_add_questions_attachments(
+        {
+            "id": uuid4(),
+            "question_id": question["id"],
+            "tg_file_id": "file",
+            "attachment_type": AttachmentType.IMAGE,
+            "caption": None,
+            "date": question["date"],
+        }
+        for question in questions_rows
+    )
+
+
+async def main(questions: int) -> None:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=StaticPool
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    repo = SARepo(
+        SARepoConfig(
+            connection_povider=async_sessionmaker(
+                engine, expire_on_commit=False, class_=AsyncSession
+            )
+        )
+    )
+
+    await seed(repo, questions)
+
+    listings = {
+        "regular_users": lambda cursor: repo.get_regular_users_page(
+            cursor, PAGE_SIZE, loader_profile=LoaderProfile.IDENTITY
+        ),
+        "questions": lambda cursor: repo.get_questions_page(
+            cursor, PAGE_SIZE, loader_profile=LoaderProfile.IDENTITY
+        ),
+        "answers": lambda cursor: repo.get_answers_page(
+            cursor, PAGE_SIZE, loader_profile=LoaderProfile.IDENTITY
+        ),
+        "questions_attachments": (
+            lambda cursor: repo.get_questions_attachments_page(
+                cursor, PAGE_SIZE
+            )
+        ),
+    }
+
+    for name, get_page in listings.items():
+        start = time.thread_time()
+
+        entities = 0
+        cursor = None
+
+        while True:
+            page = await get_page(cursor)
+
+            entities += len(page.items)
+            cursor = page.next_cursor
+
+            if cursor is None:
+                break
+
+        per_entity = (time.thread_time() - start) / entities * 1_000_000
+
+        print(f"{name:<25} {entities:6} entities {per_entity:8.1f} us/entity")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_QUESTIONS)
+    )
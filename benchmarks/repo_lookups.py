@@ -0,0 +1,135 @@
+"""Measures the CPU time per call of the hot lookups of SARepo
+
+Runs every lookup against an in-memory SQLite database and counts only
+the CPU time of the event loop's thread, so the numbers are the Python
+overhead of the repo and SQLAlchemy without the driver's thread.
+
+Usage:
+    python -m benchmarks.repo_lookups [calls]
+"""
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+from typing import Any, Awaitable, Callable
+from bot.db.models.sa_models import ModelBase
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.db.repositories.ttl_cache import TTLCache
+from bot.entities.regular_user import RegularUser
+from bot.entities.support_user import SupportUser
+import asyncio
+import sys
+import time
+
+
+DEFAULT_CALLS = 500
+
+
+async def seed(repo: SARepo) -> dict[str, Any]:
+    support_user = await SupportUser.add_support_user(1, "Jake", repo)
+
+    for i in range(10):
+        regular_user = await RegularUser.add_regular_user(100 + i, repo)
+
+        for j in range(3):
+            question = await regular_user.ask_question(
+                f"Question {j}", 1000 + i * 10 + j, repo
+            )
+
+            await support_user.bind_question(question, repo)
+
+            answer = await support_user.answer_current_question(
+                f"Answer {j}", 2000 + i * 10 + j, repo
+            )
+
+            await support_user.unbind_question(repo)
+
+    return {
+        "regular_user": regular_user,
+        "question": question,
+        "answer": answer,
+    }
+
+
+def get_lookups(
+    repo: SARepo, data: dict[str, Any]
+) -> dict[str, Callable[[], Awaitable[Any]]]:
+    regular_user = data["regular_user"]
+    question = data["question"]
+    answer = data["answer"]
+
+    return {
+        "resolve_identity": lambda: repo.resolve_identity(
+            regular_user.tg_bot_user_id
+        ),
+        "get_support_user_by_tg_bot_user_id": (
+            lambda: repo.get_support_user_by_tg_bot_user_id(1)
+        ),
+        "get_regular_user_by_tg_bot_user_id": (
+            lambda: repo.get_regular_user_by_tg_bot_user_id(
+                regular_user.tg_bot_user_id
+            )
+        ),
+        "get_question_by_id": lambda: repo.get_question_by_id(question.id),
+        "get_question_by_tg_message_id": (
+            lambda: repo.get_question_by_tg_message_id(question.tg_message_id)
+        ),
+        "get_regular_user_last_asked_question": (
+            lambda: repo.get_regular_user_last_asked_question(regular_user.id)
+        ),
+        "get_answer_by_tg_message_id": (
+            lambda: repo.get_answer_by_tg_message_id(answer.tg_message_id)
+        ),
+        "get_question_last_answer": (
+            lambda: repo.get_question_last_answer(question.id)
+        ),
+        "count_regular_users_questions": (
+            lambda: repo.count_regular_users_questions(regular_user.id)
+        ),
+        "count_question_answers": (
+            lambda: repo.count_question_answers(question.id)
+        ),
+    }
+
+
+async def main(calls: int) -> None:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=StaticPool
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    # The identities expire at once, so they are always queried
+    repo_config = SARepoConfig(
+        connection_povider=async_sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        ),
+        identity_cache=TTLCache(1, 0),
+    )
+
+    data = await seed(SARepo(repo_config))
+
+    repo = SARepo(repo_config)
+
+    for name, lookup in get_lookups(repo, data).items():
+        # Warms up the compiled cache
+        for _ in range(10):
+            await lookup()
+
+        start = time.thread_time()
+
+        for _ in range(calls):
+            await lookup()
+
+        per_call = (time.thread_time() - start) / calls * 1_000_000
+
+        print(f"{name:<40} {per_call:8.1f} us/call")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CALLS))
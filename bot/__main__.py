@@ -1,3 +1,3 @@
-from bot.bot import app
+from bot.cli import main
 
-app.run_polling()
+main()
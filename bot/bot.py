@@ -83,6 +83,12 @@ app.add_handler(
     CommandHandler("globalstats", handlers.handle_global_statistics)
 )
 
+app.add_handler(CommandHandler("poolstats", handlers.handle_pools_statistics))
+
+app.add_handler(CommandHandler("querystats", handlers.handle_query_statistics))
+
+app.add_handler(CommandHandler("export", handlers.handle_export))
+
 
 app.add_handler(
     CallbackQueryHandler(
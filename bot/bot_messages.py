@@ -1,3 +1,4 @@
+from __future__ import annotations
 from telegram import (
     Update,
     ReplyKeyboardMarkup,
@@ -6,6 +7,9 @@ from telegram import (
 )
 from bot.utils import AttachmentType
 from bot.entities.attachment import Attachment
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import BinaryIO, Iterator
 import abc
 
 
@@ -13,11 +17,78 @@ class MessageToSend(abc.ABC):
     chat_id: int | None
     reply_to: int | None
 
-    @abc.abstractmethod
     async def send(self, update: Update) -> None:
+        """Sends the message, unless an update is handled inside of
+        a unit of work. Then it's put into the outbox of the update,
+        so it's sent once the unit of work is commited.
+        """
+        outbox = _current_outbox.get()
+
+        if outbox is not None:
+            outbox.messages.append((self, update))
+
+            return
+
+        await self.send_now(update)
+
+    @abc.abstractmethod
+    async def send_now(self, update: Update) -> None:
         raise NotImplementedError
 
 
+class Outbox:
+    """Messages sent while an update is handled inside of a unit of work
+
+    They are sent after the unit of work is commited, so the users
+    aren't told about the changes that can still be rolled back, and
+    the connection of the unit of work isn't held while they are sent.
+    If the unit of work is rolled back, they are never sent.
+    """
+
+    messages: list[tuple[MessageToSend, Update]]
+
+    def __init__(self):
+        self.messages = []
+
+    @contextmanager
+    def collect(self) -> Iterator[Outbox]:
+        """Puts the messages sent inside of the block into the outbox"""
+        token = _current_outbox.set(self)
+
+        try:
+            yield self
+
+        finally:
+            _current_outbox.reset(token)
+
+    async def send(self) -> None:
+        """Sends the collected messages in their order
+
+        A message that fails to be sent doesn't stop the rest,
+        the first error is raised once all of them are tried,
+        e.g. the support user still learns the answer is saved
+        when the regular user has blocked the bot.
+        """
+        messages, self.messages = self.messages, []
+
+        error: Exception | None = None
+
+        for message, update in messages:
+            try:
+                await message.send_now(update)
+
+            except Exception as e:
+                error = error or e
+
+        if error:
+            raise error
+
+
+_current_outbox: ContextVar[Outbox | None] = ContextVar(
+    "current_outbox", default=None
+)
+
+
 class TextToSend(MessageToSend):
     def __init__(
         self,
@@ -36,7 +107,7 @@ class TextToSend(MessageToSend):
         self.reply_to = reply_to
         self.parse_mode = parse_mode
 
-    async def send(self, update: Update):
+    async def send_now(self, update: Update):
         messages = self.messages
 
         if len(messages) > 1:
@@ -68,6 +139,15 @@ class TextToSend(MessageToSend):
             )
 
 
+class CallbackQueryAnswerToSend(MessageToSend):
+    """Answer to the callback query of the update,
+    which stops the loading animation of the pressed button
+    """
+
+    async def send_now(self, update: Update):
+        await update.callback_query.answer()  # type: ignore
+
+
 class FileToSend(MessageToSend, abc.ABC):
     file_id: str
 
@@ -85,7 +165,7 @@ class ImageToSend(FileToSend):
         self.chat_id = chat_id
         self.reply_to = reply_to
 
-    async def send(self, update: Update):
+    async def send_now(self, update: Update):
         await update.get_bot().send_photo(
             self.chat_id or update.effective_chat.id,  # type: ignore
             photo=self.file_id,
@@ -107,7 +187,7 @@ class VideoToSend(FileToSend):
         self.chat_id = chat_id
         self.reply_to = reply_to
 
-    async def send(self, update: Update):
+    async def send_now(self, update: Update):
         await update.get_bot().send_video(
             self.chat_id or update.effective_chat.id,  # type: ignore
             video=self.file_id,
@@ -129,7 +209,7 @@ class AudioToSend(FileToSend):
         self.chat_id = chat_id
         self.reply_to = reply_to
 
-    async def send(self, update: Update):
+    async def send_now(self, update: Update):
         await update.get_bot().send_audio(
             self.chat_id or update.effective_chat.id,  # type: ignore
             audio=self.file_id,
@@ -151,7 +231,7 @@ class DocumentToSend(FileToSend):
         self.reply_to = reply_to
         self.caption = caption
 
-    async def send(self, update: Update):
+    async def send_now(self, update: Update):
         await update.get_bot().send_document(
             self.chat_id or update.effective_chat.id,  # type: ignore
             document=self.file_id,
@@ -159,6 +239,37 @@ class DocumentToSend(FileToSend):
         )
 
 
+class GeneratedDocumentToSend(MessageToSend):
+    """Uploads a document generated by the bot, e.g. a data export
+
+    The file is closed once it's sent.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        filename: str,
+        chat_id: int | None = None,
+        reply_to: int | None = None,
+        caption: str | None = None,
+    ):
+        self.file = file
+        self.filename = filename
+        self.chat_id = chat_id
+        self.reply_to = reply_to
+        self.caption = caption
+
+    async def send_now(self, update: Update):
+        with self.file:
+            await update.get_bot().send_document(
+                self.chat_id or update.effective_chat.id,  # type: ignore
+                document=self.file,
+                filename=self.filename,
+                caption=self.caption,  # type: ignore
+                reply_to_message_id=self.reply_to,  # type: ignore
+            )
+
+
 class VoiceToSend(FileToSend):
     def __init__(
         self,
@@ -170,7 +281,7 @@ class VoiceToSend(FileToSend):
         self.chat_id = chat_id
         self.reply_to = reply_to
 
-    async def send(self, update: Update):
+    async def send_now(self, update: Update):
         await update.get_bot().send_voice(
             self.chat_id or update.effective_chat.id,  # type: ignore
             voice=self.file_id,
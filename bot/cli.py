@@ -0,0 +1,335 @@
+from bot.db.repositories.get_repo import get_repo
+from bot.db.repositories.repository import (
+    ARCHIVE_BATCH_SIZE,
+    BULK_INSERT_BATCH_SIZE,
+    DELETE_BATCH_SIZE,
+)
+from bot.services.data_export import (
+    ExportDataset,
+    ExportFormat,
+    get_export_file_name,
+    write_export,
+)
+from bot.services.data_import import (
+    IMPORT_ORDER,
+    IMPORT_TRANSACTION_SIZE,
+    find_import_file,
+    import_rows,
+    open_import_file,
+)
+from bot.services.retention import (
+    RetentionAction,
+    apply_retention_policy,
+    erase_regular_user,
+)
+from bot.settings import REPO_TYPE
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import asyncio
+
+
+# Closed questions older than it are archived by default
+ARCHIVE_AFTER_DAYS = 90
+
+# Questions older than it are deleted or anonymized by default
+RETAIN_DAYS = 365
+
+
+async def rebuild_statistics() -> None:
+    await get_repo(REPO_TYPE).rebuild_statistics()
+
+
+async def archive(older_than_days: int, batch_size: int) -> None:
+    archived_questions = await get_repo(REPO_TYPE).archive_questions(
+        datetime.now() - timedelta(days=older_than_days), batch_size
+    )
+
+    print(f"Archived {archived_questions} questions")
+
+
+async def retention(
+    action: RetentionAction, older_than_days: int, batch_size: int
+) -> None:
+    processed_questions = await apply_retention_policy(
+        get_repo(REPO_TYPE),
+        action,
+        datetime.now() - timedelta(days=older_than_days),
+        batch_size,
+        lambda processed: print(f"Processed {processed} questions"),
+    )
+
+    print(f"Applied {action.value} to {processed_questions} questions")
+
+
+async def erase_user(tg_bot_user_id: int, batch_size: int) -> None:
+    erased_questions = await erase_regular_user(
+        get_repo(REPO_TYPE),
+        tg_bot_user_id,
+        batch_size,
+        lambda erased: print(f"Erased {erased} questions"),
+    )
+
+    if erased_questions is None:
+        raise SystemExit(f"No regular user with telegram id {tg_bot_user_id}")
+
+    print(
+        f"Erased the regular user {tg_bot_user_id} "
+        + f"with {erased_questions} questions"
+    )
+
+
+async def export(
+    datasets: list[ExportDataset],
+    export_format: ExportFormat,
+    output_dir: Path,
+) -> None:
+    repo = get_repo(REPO_TYPE)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for dataset in datasets:
+        path = output_dir / get_export_file_name(dataset, export_format)
+
+        with open(path, "wb") as file:
+            exported_rows = await write_export(
+                repo, dataset, export_format, file
+            )
+
+        print(f"Exported {exported_rows} rows of {dataset.value} to {path}")
+
+
+async def import_data(
+    datasets: list[ExportDataset] | None,
+    input_dir: Path,
+    batch_size: int,
+    transaction_size: int,
+) -> None:
+    repo = get_repo(REPO_TYPE)
+
+    for dataset in IMPORT_ORDER:
+        if datasets is not None and dataset not in datasets:
+            continue
+
+        path = find_import_file(input_dir, dataset)
+
+        if not path:
+            # Only the datasets passed explicitly are required
+            if datasets is not None:
+                raise SystemExit(f"No file to import {dataset.value} from")
+
+            continue
+
+        with open_import_file(path) as lines:
+            imported_rows = await import_rows(
+                repo, dataset, lines, batch_size, transaction_size
+            )
+
+        print(f"Imported {imported_rows} rows of {dataset.value} from {path}")
+
+    # The bulk inserts drop the counters, so they are recounted
+    # right away instead of on the first statistics request
+    await repo.rebuild_statistics()
+
+
+def run_bot() -> None:
+    # The bot is imported here, since it requires the bot token,
+    # which isn't needed for the maintenance commands
+    from bot.bot import app
+
+    app.run_polling()
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot",
+        description="Runs the bot if no command is passed.",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser(
+        "rebuild-statistics",
+        help="recounts the statistics counters from scratch",
+    )
+
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help="moves the old closed questions with their answers "
+        + "and attachments into the archive tables",
+    )
+    archive_parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=ARCHIVE_AFTER_DAYS,
+        help="questions asked this many days ago or earlier are archived, "
+        + f"{ARCHIVE_AFTER_DAYS} by default",
+    )
+    archive_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ARCHIVE_BATCH_SIZE,
+        help="questions moved in a single transaction, "
+        + f"{ARCHIVE_BATCH_SIZE} by default",
+    )
+
+    retention_parser = subparsers.add_parser(
+        "retention",
+        help="deletes or anonymizes the old questions with their answers "
+        + "and attachments",
+    )
+    retention_parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=RETAIN_DAYS,
+        help="questions asked this many days ago or earlier are processed, "
+        + f"{RETAIN_DAYS} by default",
+    )
+    retention_parser.add_argument(
+        "--action",
+        type=RetentionAction,
+        default=RetentionAction.DELETE,
+        choices=list(RetentionAction),
+        metavar="{"
+        + ",".join(action.value for action in RetentionAction)
+        + "}",
+        help="what is done with the questions, delete by default",
+    )
+    retention_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DELETE_BATCH_SIZE,
+        help="questions processed in a single transaction, "
+        + f"{DELETE_BATCH_SIZE} by default",
+    )
+
+    erase_user_parser = subparsers.add_parser(
+        "erase-user",
+        help="deletes the regular user with all their questions, "
+        + "answers to them and attachments",
+    )
+    erase_user_parser.add_argument(
+        "tg_bot_user_id",
+        type=int,
+        help="telegram id of the regular user",
+    )
+    erase_user_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DELETE_BATCH_SIZE,
+        help="questions deleted in a single transaction, "
+        + f"{DELETE_BATCH_SIZE} by default",
+    )
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="exports the data into gzip compressed JSONL or CSV files",
+    )
+    export_parser.add_argument(
+        "datasets",
+        nargs="*",
+        type=ExportDataset,
+        default=list(ExportDataset),
+        metavar="dataset",
+        help="datasets to export, all of them by default: "
+        + ", ".join(dataset.value for dataset in ExportDataset),
+    )
+    export_parser.add_argument(
+        "--format",
+        type=ExportFormat,
+        default=ExportFormat.JSONL,
+        choices=list(ExportFormat),
+        metavar="{"
+        + ",".join(export_format.value for export_format in ExportFormat)
+        + "}",
+        help="format of the exported rows, jsonl by default",
+    )
+    export_parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("."),
+        help="directory to write the files to, the current one by default",
+    )
+
+    import_parser = subparsers.add_parser(
+        "import",
+        help="imports the data from JSONL files in the format of the export",
+    )
+    import_parser.add_argument(
+        "datasets",
+        nargs="*",
+        type=ExportDataset,
+        metavar="dataset",
+        help="datasets to import, all the found ones by default",
+    )
+    import_parser.add_argument(
+        "--input-dir",
+        type=Path,
+        default=Path("."),
+        help="directory with <dataset>.jsonl(.gz) files, "
+        + "the current one by default",
+    )
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BULK_INSERT_BATCH_SIZE,
+        help="rows inserted by a single statement, "
+        + f"{BULK_INSERT_BATCH_SIZE} by default",
+    )
+    import_parser.add_argument(
+        "--transaction-size",
+        type=int,
+        default=IMPORT_TRANSACTION_SIZE,
+        help="rows inserted in a single transaction, "
+        + f"{IMPORT_TRANSACTION_SIZE} by default",
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    match parsed_args.command:
+        case "rebuild-statistics":
+            asyncio.run(rebuild_statistics())
+
+        case "archive":
+            asyncio.run(
+                archive(
+                    parsed_args.older_than_days,
+                    parsed_args.batch_size,
+                )
+            )
+
+        case "retention":
+            asyncio.run(
+                retention(
+                    parsed_args.action,
+                    parsed_args.older_than_days,
+                    parsed_args.batch_size,
+                )
+            )
+
+        case "erase-user":
+            asyncio.run(
+                erase_user(parsed_args.tg_bot_user_id, parsed_args.batch_size)
+            )
+
+        case "export":
+            asyncio.run(
+                export(
+                    parsed_args.datasets,
+                    parsed_args.format,
+                    parsed_args.output_dir,
+                )
+            )
+
+        case "import":
+            asyncio.run(
+                import_data(
+                    parsed_args.datasets or None,
+                    parsed_args.input_dir,
+                    parsed_args.batch_size,
+                    parsed_args.transaction_size,
+                )
+            )
+
+        case _:
+            run_bot()
@@ -1,4 +1,8 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import (
+    create_async_engine,
+    AsyncEngine,
+    AsyncSession,
+)
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import Engine
 from sqlalchemy import event
@@ -7,7 +11,14 @@ from dotenv import load_dotenv
 
 import os
 
+from bot.db.repositories.group_commit import GroupCommitter
 from bot.db.repositories.sa_repository import SARepoConfig
+from bot.db.pool_metrics import (
+    MeteredAsyncAdaptedQueuePool,
+    PoolStatus,
+    get_pool_status,
+)
+from bot.db.query_metrics import QueryMetrics, instrument_engine
 
 
 load_dotenv()
@@ -20,6 +31,39 @@ DEBUG = os.getenv("BOT_TOKEN") or False
 
 DB_PROVIDER = os.getenv("DB_PROVIDER") or "sqlite"
 
+# Options of the engines' connection pools, every DB provider
+# has its own defaults for the ones that aren't set
+DB_POOL_SIZE = os.getenv("DB_POOL_SIZE")
+
+DB_POOL_MAX_OVERFLOW = os.getenv("DB_POOL_MAX_OVERFLOW")
+
+DB_POOL_TIMEOUT = os.getenv("DB_POOL_TIMEOUT")
+
+DB_POOL_RECYCLE = os.getenv("DB_POOL_RECYCLE")
+
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING")
+
+# Queries that take this many milliseconds or longer are logged
+SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD") or 100)
+
+# If enabled, the inserts of questions, answers and their attachments
+# that arrive within GROUP_COMMIT_MAX_DELAY milliseconds of each other
+# are commited together, at most GROUP_COMMIT_MAX_BATCH_SIZE at once
+GROUP_COMMIT = (os.getenv("GROUP_COMMIT") or "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+GROUP_COMMIT_MAX_DELAY = float(os.getenv("GROUP_COMMIT_MAX_DELAY") or 5)
+
+GROUP_COMMIT_MAX_BATCH_SIZE = int(
+    os.getenv("GROUP_COMMIT_MAX_BATCH_SIZE") or 100
+)
+
+# Options passed to the DB driver when it connects
+connect_args: dict = {}
+
 match DB_PROVIDER:
     case "postgres":
         POSTGRES_DRIVER_NAME = os.getenv("POSTGRES_DRIVER_NAME") or "asyncpg"
@@ -34,6 +78,25 @@ match DB_PROVIDER:
 
         POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD") or "postgres"
 
+        # Size of asyncpg's prepared statements cache of every connection,
+        # should be 0 if PgBouncer is used in the transaction mode
+        POSTGRES_STATEMENT_CACHE_SIZE = os.getenv(
+            "POSTGRES_STATEMENT_CACHE_SIZE"
+        )
+
+        if POSTGRES_STATEMENT_CACHE_SIZE and POSTGRES_DRIVER_NAME == "asyncpg":
+            connect_args["statement_cache_size"] = int(
+                POSTGRES_STATEMENT_CACHE_SIZE
+            )
+
+        pool_defaults = {
+            "pool_size": 10,
+            "max_overflow": 10,
+            "pool_timeout": 30,
+            "pool_recycle": -1,
+            "pool_pre_ping": False,
+        }
+
         if not POSTGRES_PASSWORD:
             raise EnvironmentError(
                 "POSTGRES_PASSWORD required if you are using PostgreSQL"
@@ -59,6 +122,16 @@ match DB_PROVIDER:
 
         MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
 
+        # MySQL closes the connections that are idle for wait_timeout
+        # (8 hours by default), so they are recycled long before that
+        pool_defaults = {
+            "pool_size": 10,
+            "max_overflow": 10,
+            "pool_timeout": 30,
+            "pool_recycle": 3600,
+            "pool_pre_ping": True,
+        }
+
         if not MYSQL_PASSWORD:
             raise EnvironmentError(
                 "MYSQL_PASSWORD required if you are using MySQL"
@@ -92,20 +165,177 @@ match DB_PROVIDER:
         # URL for your database
         DB_URL = f"sqlite+{SQLITE_DRIVER_NAME}:///" + SQLITE_DB_FILE_PATH
 
+        # SQLite has one writer at a time and no network,
+        # so a few connections are enough
+        pool_defaults = {
+            "pool_size": 5,
+            "max_overflow": 5,
+            "pool_timeout": 30,
+            "pool_recycle": -1,
+            "pool_pre_ping": False,
+        }
+
+        # Pragmas set for every connection, see
+        # https://www.sqlite.org/pragma.html for their values.
+        # In the WAL mode the readers don't block the writer and
+        # the writer doesn't block the readers, and with
+        # synchronous=NORMAL commits don't wait for fsync.
+        SQLITE_PRAGMAS = {
+            "foreign_keys": "ON",
+            "journal_mode": os.getenv("SQLITE_JOURNAL_MODE") or "WAL",
+            "synchronous": os.getenv("SQLITE_SYNCHRONOUS") or "NORMAL",
+            "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT") or "5000",
+            "mmap_size": os.getenv("SQLITE_MMAP_SIZE") or "268435456",
+            "cache_size": os.getenv("SQLITE_CACHE_SIZE") or "-65536",
+            "temp_store": os.getenv("SQLITE_TEMP_STORE") or "MEMORY",
+        }
+
+        # If enabled, the writes go through the only connection of the
+        # primary engine, so the writers wait for their turn in the pool
+        # instead of failing with "database is locked". The reads go to
+        # their own pool of read-only connections to the same file,
+        # so the connection of the writes is only taken from the first
+        # write of an update to its commit.
+        SQLITE_SINGLE_WRITER = (
+            os.getenv("SQLITE_SINGLE_WRITER") or "true"
+        ).lower() in ("1", "true", "yes")
+
+
+# Comma separated URLs of the read replicas of the database,
+# the read-only queries are sent to them instead of DB_URL
+DB_READ_URLS = [
+    url.strip()
+    for url in (os.getenv("DB_READ_URLS") or "").split(",")
+    if url.strip()
+]
+
+is_sqlite_single_writer = DB_PROVIDER == "sqlite" and SQLITE_SINGLE_WRITER
+
+
+pool_options = {
+    "pool_size": int(DB_POOL_SIZE or pool_defaults["pool_size"]),
+    "max_overflow": int(DB_POOL_MAX_OVERFLOW or pool_defaults["max_overflow"]),
+    "pool_timeout": float(DB_POOL_TIMEOUT or pool_defaults["pool_timeout"]),
+    "pool_recycle": int(DB_POOL_RECYCLE or pool_defaults["pool_recycle"]),
+    "pool_pre_ping": (
+        DB_POOL_PRE_PING.lower() in ("1", "true", "yes")
+        if DB_POOL_PRE_PING
+        else pool_defaults["pool_pre_ping"]
+    ),
+}
+
+
+def create_engine(url: str, **options) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        connect_args=connect_args,
+        **(pool_options | options),
+    )
+
+
+engine = (
+    create_engine(DB_URL, pool_size=1, max_overflow=0)
+    if is_sqlite_single_writer
+    else create_engine(DB_URL)
+)
+
+read_engines = [create_engine(url) for url in DB_READ_URLS]
+
+# The read-only connections to the file of the single writer
+primary_read_engine = (
+    create_engine(DB_URL) if is_sqlite_single_writer else None
+)
+
+query_metrics = QueryMetrics(SLOW_QUERY_THRESHOLD / 1000)
+
+for instrumented_engine in (engine, *read_engines):
+    instrument_engine(instrumented_engine, query_metrics)
 
-engine = create_async_engine(DB_URL, echo=False)
+if primary_read_engine:
+    instrument_engine(primary_read_engine, query_metrics)
 
 
 async_session = sessionmaker(  # type: ignore
     engine, expire_on_commit=False, class_=AsyncSession  # type: ignore
 )
 
-sa_repo_config = SARepoConfig(connection_povider=async_session)
+read_async_sessions = [
+    sessionmaker(  # type: ignore
+        read_engine, expire_on_commit=False, class_=AsyncSession  # type: ignore
+    )
+    for read_engine in read_engines
+]
+
+primary_read_async_session = (
+    sessionmaker(  # type: ignore
+        primary_read_engine,  # type: ignore
+        expire_on_commit=False,
+        class_=AsyncSession,  # type: ignore
+    )
+    if primary_read_engine
+    else None
+)
+
+group_committer = (
+    GroupCommitter(
+        async_session,
+        GROUP_COMMIT_MAX_DELAY / 1000,
+        GROUP_COMMIT_MAX_BATCH_SIZE,
+    )
+    if GROUP_COMMIT
+    else None
+)
+
+sa_repo_config = SARepoConfig(
+    connection_povider=async_session,
+    read_connection_providers=read_async_sessions,
+    primary_read_connection_provider=primary_read_async_session,
+    group_committer=group_committer,
+)
 
 if DB_PROVIDER == "sqlite":
 
     @event.listens_for(Engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+
         cursor.close()
+
+    # The engine's listeners run after the ones of Engine,
+    # so the pragmas above are already set
+    def set_sqlite_query_only_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    for read_engine in (*read_engines, primary_read_engine):
+        if read_engine:
+            event.listen(
+                read_engine.sync_engine,
+                "connect",
+                set_sqlite_query_only_pragma,
+            )
+
+
+def get_pools_statuses() -> dict[str, PoolStatus]:
+    """Returns the statuses of the pools of the primary
+    and the read replicas' engines by their names
+    """
+    engines = {"primary": engine} | {
+        f"replica {i}": read_engine
+        for i, read_engine in enumerate(read_engines, 1)
+    }
+
+    if primary_read_engine:
+        engines["primary reads"] = primary_read_engine
+
+    return {
+        name: status
+        for name, engine in engines.items()
+        if (status := get_pool_status(engine))
+    }
@@ -0,0 +1,29 @@
+"""counted statistics counters
+
+Revision ID: 3e6a0f5c2b18
+Revises: 8d8ea5482ec0
+Create Date: 2026-10-18 14:21:06.583912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e6a0f5c2b18'
+down_revision = '8d8ea5482ec0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The stored counters were counted from scratch when they were created
+    op.add_column('statistics_counters', sa.Column('is_counted', sa.Boolean(), server_default=sa.true(), nullable=False))
+
+
+def downgrade() -> None:
+    # The counters that weren't counted would be read as counted ones
+    statistics_counters = sa.table('statistics_counters', sa.column('is_counted', sa.Boolean()))
+    op.execute(statistics_counters.delete().where(statistics_counters.c.is_counted == sa.false()))
+
+    op.drop_column('statistics_counters', 'is_counted')
@@ -0,0 +1,56 @@
+"""questions status
+
+Revision ID: 9f2b6c1d8e47
+Revises: c4d8a2f61e93
+Create Date: 2026-10-18 09:14:52.301846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f2b6c1d8e47'
+down_revision = 'c4d8a2f61e93'
+branch_labels = None
+depends_on = None
+
+
+question_status = sa.Enum('OPEN', 'BOUND', 'ANSWERED', 'CLOSED', name='questionstatus')
+
+
+def upgrade() -> None:
+    # The enum type isn't created by add_column on PostgreSQL
+    question_status.create(op.get_bind(), checkfirst=True)
+
+    op.add_column('questions', sa.Column('status', question_status, server_default='OPEN', nullable=False))
+    op.add_column('questions', sa.Column('answers_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('questions', sa.Column('first_answered_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill, every status overrides the previous ones
+    op.execute(
+        'UPDATE questions SET '
+        'answers_count = (SELECT count(answers.id) FROM answers WHERE answers.question_id = questions.id), '
+        'first_answered_at = (SELECT min(answers.date) FROM answers WHERE answers.question_id = questions.id)'
+    )
+    op.execute(
+        "UPDATE questions SET status = 'BOUND' WHERE EXISTS "
+        '(SELECT support_users.id FROM support_users WHERE support_users.current_question_id = questions.id)'
+    )
+    op.execute("UPDATE questions SET status = 'ANSWERED' WHERE answers_count > 0")
+    op.execute(
+        "UPDATE questions SET status = 'CLOSED' WHERE EXISTS "
+        '(SELECT answers.id FROM answers WHERE answers.question_id = questions.id AND answers.is_useful IS NOT NULL)'
+    )
+
+    # The index is built after the backfill, so it isn't updated by it
+    op.create_index('ix_questions_status_date', 'questions', ['status', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_status_date', table_name='questions')
+    op.drop_column('questions', 'first_answered_at')
+    op.drop_column('questions', 'answers_count')
+    op.drop_column('questions', 'status')
+
+    question_status.drop(op.get_bind(), checkfirst=True)
@@ -7,16 +7,21 @@ from sqlalchemy.orm import (
     mapped_column,
 )
 from sqlalchemy import (
+    inspect,
     ForeignKey,
+    Index,
     DateTime,
     String,
     Enum,
     Boolean,
     Integer,
     Text,
+    true,
 )
 from sqlalchemy_utils import UUIDType
+from typing import Any
 from uuid import uuid4, UUID
+from enum import Enum as PyEnum
 
 from bot.entities.answer import AnswerAttachment
 from bot.utils import AttachmentType
@@ -26,12 +31,27 @@ from bot.entities.support_user import SupportUser
 from bot.entities.role import Role, RolePermissions
 from bot.entities.question_attachment import QuestionAttachment
 from bot.entities.question import Question
+from bot.services.statistics import (
+    GlobalStatistics,
+    RegularUserStatistics,
+    RoleStatistics,
+    SupportUserStatistics,
+)
 
 
 class ModelBase(DeclarativeBase):
     pass
 
 
+def _is_loaded(model: ModelBase, relationship_name: str) -> bool:
+    """Whether the relationship of the model was loaded by its query
+
+    The relationships that weren't loaded are left for the entities
+    to resolve, since they can't be loaded implicitly with asyncio.
+    """
+    return relationship_name in inspect(model).dict
+
+
 class RoleModel(ModelBase):
     __tablename__ = "roles"
 
@@ -155,6 +175,14 @@ class RegularUserModel(ModelBase):
         return RegularUser(self.id, self.tg_bot_user_id, self.join_date)
 
 
+# Keyset pagination order
+Index(
+    "ix_regular_users_join_date_id",
+    RegularUserModel.join_date,
+    RegularUserModel.id,
+)
+
+
 class SupportUserModel(ModelBase):
     __tablename__ = "support_users"
 
@@ -222,15 +250,9 @@ class SupportUserModel(ModelBase):
         if support_user_entity.id:
             self.id = support_user_entity.id
 
-        self.current_question_id = (
-            support_user_entity.current_question.id
-            if support_user_entity.current_question
-            else None
-        )
+        self.current_question_id = support_user_entity.current_question_id
 
-        self.role_id = (
-            support_user_entity.role.id if support_user_entity.role else None
-        )
+        self.role_id = support_user_entity.role_id
 
         self.descriptive_name = support_user_entity.descriptive_name
 
@@ -262,11 +284,15 @@ class SupportUserModel(ModelBase):
         self.answers.append(answer)
 
     def as_support_user_entity(self) -> SupportUser:
-        role = self.role.as_role_entity() if self.role else None
+        role = (
+            self.role.as_role_entity()
+            if _is_loaded(self, "role") and self.role
+            else None
+        )
 
         current_question = (
             self.current_question.as_question_entity()
-            if self.current_question
+            if _is_loaded(self, "current_question") and self.current_question
             else None
         )
 
@@ -279,9 +305,43 @@ class SupportUserModel(ModelBase):
             join_date=self.join_date,
             is_owner=self.is_owner,
             is_active=self.is_active,
+            role_id=self.role_id,
+            current_question_id=self.current_question_id,
         )
 
 
+Index(
+    "ix_support_users_current_question_id",
+    SupportUserModel.current_question_id,
+    postgresql_where=SupportUserModel.current_question_id.isnot(None),
+    sqlite_where=SupportUserModel.current_question_id.isnot(None),
+)
+
+Index("ix_support_users_role_id", SupportUserModel.role_id)
+
+# Keyset pagination order
+Index(
+    "ix_support_users_join_date_id",
+    SupportUserModel.join_date,
+    SupportUserModel.id,
+)
+
+
+class QuestionStatus(PyEnum):
+    """Where the question is in its lifecycle"""
+
+    # Nobody is answering the question
+    OPEN = "open"
+
+    # A support user has bound the question, but hasn't answered it yet
+    BOUND = "bound"
+
+    ANSWERED = "answered"
+
+    # One of the answers was estimated by the regular user
+    CLOSED = "closed"
+
+
 class QuestionModel(ModelBase):
     __tablename__ = "questions"
 
@@ -329,13 +389,33 @@ class QuestionModel(ModelBase):
         DateTime(timezone=True), nullable=False, default=datetime.now
     )
 
+    # DENORMALIZED PROPERTIES
+
+    # Kept by the repo on every write that changes the question's answers
+    # or bindings, so the queue and the statistics don't derive them
+    # from the answers and the support users
+    status: Mapped[QuestionStatus] = mapped_column(
+        Enum(QuestionStatus),
+        nullable=False,
+        default=QuestionStatus.OPEN,
+        server_default=QuestionStatus.OPEN.name,
+    )
+
+    answers_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    first_answered_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=None
+    )
+
     # METHODS
 
     def __init__(self, question_entitity: Question):
         if question_entitity.id:
             self.id = question_entitity.id
 
-        self.regular_user_id = question_entitity.regular_user.id
+        self.regular_user_id = question_entitity.regular_user_id
 
         self.message = question_entitity.message
 
@@ -355,7 +435,11 @@ class QuestionModel(ModelBase):
         self.answers.append(answer)
 
     def as_question_entity(self) -> Question:
-        regular_user = self.regular_user.as_regular_user_entity()
+        regular_user = (
+            self.regular_user.as_regular_user_entity()
+            if _is_loaded(self, "regular_user")
+            else None
+        )
 
         return Question(
             id=self.id,
@@ -363,9 +447,23 @@ class QuestionModel(ModelBase):
             message=self.message,
             tg_message_id=self.tg_message_id,
             date=self.date,
+            regular_user_id=self.regular_user_id,
         )
 
 
+Index(
+    "ix_questions_regular_user_id_date",
+    QuestionModel.regular_user_id,
+    QuestionModel.date.desc(),
+)
+
+# Keyset pagination order
+Index("ix_questions_date_id", QuestionModel.date, QuestionModel.id)
+
+# The queue of open questions and the counts by status
+Index("ix_questions_status_date", QuestionModel.status, QuestionModel.date)
+
+
 class AnswerModel(ModelBase):
     __tablename__ = "answers"
 
@@ -417,17 +515,25 @@ class AnswerModel(ModelBase):
         if answer_entity.id:
             self.id = answer_entity.id
 
-        self.support_user_id = answer_entity.support_user.id
-        self.question_id = answer_entity.question.id
+        self.support_user_id = answer_entity.support_user_id
+        self.question_id = answer_entity.question_id
         self.message = answer_entity.message
         self.tg_message_id = answer_entity.tg_message_id
         self.is_useful = answer_entity.is_useful
         self.date = answer_entity.date
 
     def as_answer_entity(self) -> Answer:
-        support_user = self.support_user.as_support_user_entity()
+        support_user = (
+            self.support_user.as_support_user_entity()
+            if _is_loaded(self, "support_user")
+            else None
+        )
 
-        question = self.question.as_question_entity()
+        question = (
+            self.question.as_question_entity()
+            if _is_loaded(self, "question")
+            else None
+        )
 
         return Answer(
             id=self.id,
@@ -437,9 +543,36 @@ class AnswerModel(ModelBase):
             tg_message_id=self.tg_message_id,
             is_useful=self.is_useful,
             date=self.date,
+            support_user_id=self.support_user_id,
+            question_id=self.question_id,
         )
 
 
+Index(
+    "ix_answers_question_id_date",
+    AnswerModel.question_id,
+    AnswerModel.date.desc(),
+)
+
+# Keyset pagination order
+Index("ix_answers_date_id", AnswerModel.date, AnswerModel.id)
+
+Index(
+    "ix_answers_support_user_id_is_useful",
+    AnswerModel.support_user_id,
+    AnswerModel.is_useful,
+)
+
+# Most of the answers are never estimated,
+# so only the estimated ones are indexed
+Index(
+    "ix_answers_is_useful",
+    AnswerModel.is_useful,
+    postgresql_where=AnswerModel.is_useful.isnot(None),
+    sqlite_where=AnswerModel.is_useful.isnot(None),
+)
+
+
 class QuestionAttachmentModel(ModelBase):
     __tablename__ = "questions_attachments"
 
@@ -489,7 +622,7 @@ class QuestionAttachmentModel(ModelBase):
     def as_question_attachment_entity(self) -> QuestionAttachment:
         return QuestionAttachment(
             id=self.id,
-            question_id=self.question.id,
+            question_id=self.question_id,
             tg_file_id=self.tg_file_id,
             attachment_type=self.attachment_type,
             caption=self.caption,
@@ -497,6 +630,16 @@ class QuestionAttachmentModel(ModelBase):
         )
 
 
+Index(
+    "ix_questions_attachments_question_id", QuestionAttachmentModel.question_id
+)
+Index(
+    "ix_questions_attachments_date_id",
+    QuestionAttachmentModel.date,
+    QuestionAttachmentModel.id,
+)
+
+
 class AnswerAttachmentModel(ModelBase):
     __tablename__ = "answers_attachments"
 
@@ -550,3 +693,349 @@ class AnswerAttachmentModel(ModelBase):
             caption=self.caption,
             date=self.date,
         )
+
+
+Index("ix_answers_attachments_answer_id", AnswerAttachmentModel.answer_id)
+Index(
+    "ix_answers_attachments_date_id",
+    AnswerAttachmentModel.date,
+    AnswerAttachmentModel.id,
+)
+
+
+# ARCHIVE MODELS
+
+# Old closed questions are moved into the archive tables together with
+# their answers and attachments, so the hot tables and their indexes
+# don't grow with the history. The archive tables have the columns
+# of the hot ones without the denormalized ones, rows are moved between
+# them with INSERT ... SELECT by the columns' names.
+
+
+class QuestionArchiveModel(ModelBase):
+    __tablename__ = "questions_archive"
+
+    regular_user_id: Mapped[UUID] = mapped_column(
+        UUIDType(binary=False),
+        ForeignKey("regular_users.id", ondelete="CASCADE"),
+    )
+
+    id: Mapped[UUID] = mapped_column(UUIDType(binary=False), primary_key=True)
+
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+
+    tg_message_id: Mapped[int] = mapped_column(Integer, unique=True)
+
+    date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+Index(
+    "ix_questions_archive_regular_user_id",
+    QuestionArchiveModel.regular_user_id,
+)
+
+# Keyset pagination order, the pages merge the archive with the hot table
+Index(
+    "ix_questions_archive_date_id",
+    QuestionArchiveModel.date,
+    QuestionArchiveModel.id,
+)
+
+
+class AnswerArchiveModel(ModelBase):
+    __tablename__ = "answers_archive"
+
+    support_user_id: Mapped[UUID] = mapped_column(
+        UUIDType(binary=False),
+        ForeignKey("support_users.id", ondelete="CASCADE"),
+    )
+
+    question_id: Mapped[UUID] = mapped_column(
+        UUIDType(binary=False),
+        ForeignKey("questions_archive.id", ondelete="CASCADE"),
+    )
+
+    id: Mapped[UUID] = mapped_column(UUIDType(binary=False), primary_key=True)
+
+    message: Mapped[str] = mapped_column(Text)
+
+    is_useful: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+
+    tg_message_id: Mapped[int] = mapped_column(Integer, unique=True)
+
+    date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+Index("ix_answers_archive_question_id", AnswerArchiveModel.question_id)
+Index("ix_answers_archive_support_user_id", AnswerArchiveModel.support_user_id)
+Index(
+    "ix_answers_archive_date_id",
+    AnswerArchiveModel.date,
+    AnswerArchiveModel.id,
+)
+
+
+class QuestionAttachmentArchiveModel(ModelBase):
+    __tablename__ = "questions_attachments_archive"
+
+    question_id: Mapped[UUID] = mapped_column(
+        UUIDType(binary=False),
+        ForeignKey("questions_archive.id", ondelete="CASCADE"),
+    )
+
+    id: Mapped[UUID] = mapped_column(UUIDType(binary=False), primary_key=True)
+
+    tg_file_id: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    attachment_type: Mapped[AttachmentType] = mapped_column(
+        Enum(AttachmentType), nullable=False
+    )
+
+    caption: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+Index(
+    "ix_questions_attachments_archive_question_id",
+    QuestionAttachmentArchiveModel.question_id,
+)
+Index(
+    "ix_questions_attachments_archive_date_id",
+    QuestionAttachmentArchiveModel.date,
+    QuestionAttachmentArchiveModel.id,
+)
+
+
+class AnswerAttachmentArchiveModel(ModelBase):
+    __tablename__ = "answers_attachments_archive"
+
+    answer_id: Mapped[UUID] = mapped_column(
+        UUIDType(binary=False),
+        ForeignKey("answers_archive.id", ondelete="CASCADE"),
+    )
+
+    id: Mapped[UUID] = mapped_column(UUIDType(binary=False), primary_key=True)
+
+    tg_file_id: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    attachment_type: Mapped[AttachmentType] = mapped_column(
+        Enum(AttachmentType), nullable=False
+    )
+
+    caption: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+Index(
+    "ix_answers_attachments_archive_answer_id",
+    AnswerAttachmentArchiveModel.answer_id,
+)
+Index(
+    "ix_answers_attachments_archive_date_id",
+    AnswerAttachmentArchiveModel.date,
+    AnswerAttachmentArchiveModel.id,
+)
+
+
+class StatisticsScope(PyEnum):
+    GLOBAL = "global"
+    ROLE = "role"
+    REGULAR_USER = "regular_user"
+    SUPPORT_USER = "support_user"
+
+
+class StatisticsCountersModel(ModelBase):
+    """Counters that are updated in the same transaction as the data
+    they count, so statistics can be read without scanning the tables
+
+    There is one row for the global statistics and one row per role,
+    regular user and support user. Every scope uses only the counters
+    that make sense for it, the rest stay zeros.
+
+    The counters that aren't counted hold only the changes made
+    since they were created or invalidated by a deletion.
+    They are counted from scratch when they are read.
+    """
+
+    __tablename__ = "statistics_counters"
+
+    # PROPERTIES
+    scope: Mapped[StatisticsScope] = mapped_column(
+        Enum(StatisticsScope), primary_key=True
+    )
+
+    # Id of the role or the user, empty string for the global scope
+    scope_id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=""
+    )
+
+    roles: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    regular_users: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    support_users: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    questions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    answered_questions: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    answers: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    useful_answers: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    unuseful_answers: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    questions_attachments: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    answers_attachments: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    is_counted: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=True, server_default=true()
+    )
+
+    # METHODS
+
+    @classmethod
+    def from_global_statistics(
+        cls, statistics: GlobalStatistics
+    ) -> StatisticsCountersModel:
+        return cls(
+            scope=StatisticsScope.GLOBAL,
+            scope_id="",
+            roles=statistics.total_roles,
+            regular_users=statistics.total_regular_users,
+            support_users=statistics.total_support_users,
+            questions=statistics.total_questions,
+            answered_questions=statistics.total_answered_questions,
+            answers=statistics.total_answers,
+            useful_answers=statistics.total_useful_answers,
+            unuseful_answers=statistics.total_unuseful_answers,
+            questions_attachments=statistics.total_questions_attachments,
+            answers_attachments=statistics.total_answers_attachments,
+        )
+
+    @classmethod
+    def from_role_statistics(
+        cls, role_id: int, statistics: RoleStatistics
+    ) -> StatisticsCountersModel:
+        return cls(
+            scope=StatisticsScope.ROLE,
+            scope_id=str(role_id),
+            support_users=statistics.total_users,
+        )
+
+    @classmethod
+    def from_regular_user_statistics(
+        cls, regular_user_id: UUID, statistics: RegularUserStatistics
+    ) -> StatisticsCountersModel:
+        return cls(
+            scope=StatisticsScope.REGULAR_USER,
+            scope_id=str(regular_user_id),
+            questions=statistics.asked_questions,
+            answered_questions=statistics.answered_questions,
+            answers=statistics.answers_for_questions,
+            useful_answers=statistics.useful_answers,
+            unuseful_answers=statistics.unuseful_answers,
+        )
+
+    @classmethod
+    def from_support_user_statistics(
+        cls, support_user_id: UUID, statistics: SupportUserStatistics
+    ) -> StatisticsCountersModel:
+        return cls(
+            scope=StatisticsScope.SUPPORT_USER,
+            scope_id=str(support_user_id),
+            answers=statistics.total_answers,
+            useful_answers=statistics.useful_answers,
+            unuseful_answers=statistics.unuseful_answers,
+        )
+
+    def as_values(self) -> dict[str, Any]:
+        # Counters that weren't set are skipped to get their default values
+        return {
+            column.key: getattr(self, column.key)
+            for column in self.__table__.columns
+            if getattr(self, column.key) is not None
+        }
+
+    def as_global_statistics(self) -> GlobalStatistics:
+        statistics = GlobalStatistics()
+
+        statistics.total_roles = self.roles
+        statistics.total_regular_users = self.regular_users
+        statistics.total_support_users = self.support_users
+        statistics.total_questions = self.questions
+        statistics.total_answered_questions = self.answered_questions
+        statistics.total_unanswered_questions = (
+            self.questions - self.answered_questions
+        )
+        statistics.total_answers = self.answers
+        statistics.total_useful_answers = self.useful_answers
+        statistics.total_unuseful_answers = self.unuseful_answers
+        statistics.total_unestimated_ansers = (
+            self.answers - self.useful_answers - self.unuseful_answers
+        )
+        statistics.total_questions_attachments = self.questions_attachments
+        statistics.total_answers_attachments = self.answers_attachments
+
+        return statistics
+
+    def as_role_statistics(self) -> RoleStatistics:
+        statistics = RoleStatistics()
+
+        statistics.total_users = self.support_users
+
+        return statistics
+
+    def as_regular_user_statistics(self) -> RegularUserStatistics:
+        statistics = RegularUserStatistics()
+
+        statistics.asked_questions = self.questions
+        statistics.answered_questions = self.answered_questions
+        statistics.unanswered_questions = (
+            self.questions - self.answered_questions
+        )
+        statistics.answers_for_questions = self.answers
+        statistics.useful_answers = self.useful_answers
+        statistics.unuseful_answers = self.unuseful_answers
+        statistics.unestimated_answers = (
+            self.answers - self.useful_answers - self.unuseful_answers
+        )
+
+        return statistics
+
+    def as_support_user_statistics(self) -> SupportUserStatistics:
+        statistics = SupportUserStatistics()
+
+        statistics.total_answers = self.answers
+        statistics.useful_answers = self.useful_answers
+        statistics.unuseful_answers = self.unuseful_answers
+        statistics.unestimated_answers = (
+            self.answers - self.useful_answers - self.unuseful_answers
+        )
+
+        return statistics
@@ -0,0 +1,148 @@
+from __future__ import annotations
+from bisect import bisect_left
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    QueuePool,
+)
+import time
+
+
+# Upper bounds of the buckets of the checkout wait time histogram, seconds.
+# The last bucket has no upper bound.
+WAIT_TIME_BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0)
+
+
+class PoolMetrics:
+    """Counters of the checkouts of a connection pool
+
+    They are counted since the process started,
+    so they survive the recreations of the pool.
+    """
+
+    checkouts: int
+    timeouts: int
+    max_checked_out: int
+    total_wait_time: float
+    max_wait_time: float
+
+    # Numbers of the checkouts by the buckets of WAIT_TIME_BUCKETS,
+    # plus the bucket of the longer waits
+    wait_time_histogram: list[int]
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_checked_out = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.wait_time_histogram = [0] * (len(WAIT_TIME_BUCKETS) + 1)
+
+    @property
+    def average_wait_time(self) -> float:
+        return self.total_wait_time / self.checkouts if self.checkouts else 0
+
+    def add_checkout(self, wait_time: float, checked_out: int) -> None:
+        self.checkouts += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        self.max_checked_out = max(self.max_checked_out, checked_out)
+        self.wait_time_histogram[
+            bisect_left(WAIT_TIME_BUCKETS, wait_time)
+        ] += 1
+
+
+class PoolStatus:
+    """Live state of a connection pool along with its metrics"""
+
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    metrics: PoolMetrics
+
+    def __init__(
+        self,
+        size: int,
+        checked_out: int,
+        idle: int,
+        overflow: int,
+        max_overflow: int,
+        metrics: PoolMetrics,
+    ):
+        self.size = size
+        self.checked_out = checked_out
+        self.idle = idle
+        self.overflow = overflow
+        self.max_overflow = max_overflow
+        self.metrics = metrics
+
+
+class MeteredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """The default pool of the async engines,
+    which also measures how long the checkouts wait
+
+    The wait includes opening a new connection,
+    if the pool has no idle ones.
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+
+        # The pool is recreated with the same class,
+        # so the metrics are carried over to it
+        if isinstance(pool, MeteredAsyncAdaptedQueuePool):
+            pool.metrics = self.metrics
+
+        return pool
+
+    def get_status(self) -> PoolStatus:
+        # overflow() counts from -pool_size,
+        # so it's only positive when the overflow is in use
+        return PoolStatus(
+            self.size(),
+            self.checkedout(),
+            self.checkedin(),
+            max(self.overflow(), 0),
+            self._max_overflow,
+            self.metrics,
+        )
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+
+        try:
+            entry = super()._do_get()
+
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+
+            raise
+
+        self.metrics.add_checkout(
+            time.perf_counter() - start, self.checkedout()
+        )
+
+        return entry
+
+
+def get_pool_status(engine: AsyncEngine) -> PoolStatus | None:
+    """Returns the status of the engine's pool,
+    None if the pool isn't metered
+    """
+    pool = engine.pool
+
+    if isinstance(pool, MeteredAsyncAdaptedQueuePool):
+        return pool.get_status()
+
+    return None
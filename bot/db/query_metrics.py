@@ -0,0 +1,241 @@
+from __future__ import annotations
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Iterator
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+import logging
+import re
+import time
+
+
+# Upper bounds of the buckets of the query time histograms, seconds.
+# The last bucket has no upper bound.
+QUERY_TIME_BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0)
+
+# How many statements are shown by /querystats and how much of each of them
+TOP_STATEMENTS = 10
+_STATEMENT_PREVIEW_LENGTH = 1000
+
+logger = logging.getLogger(__name__)
+
+# String literals, numbers and placeholders of all the supported drivers
+_PARAMETER_PATTERN = re.compile(
+    r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|%s|\?|\b\d+(?:\.\d+)?\b"
+)
+
+# Lists of the parameters, e.g. of the expanded IN or of the VALUES
+_PARAMETERS_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+# Repeated lists of the parameters of the multi-row inserts
+_PARAMETERS_LISTS_PATTERN = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Key of the start time of the running query in Connection.info
+_QUERY_START_TIME = "query_start_time"
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """Replaces the literals and the parameters of the statement with ?,
+    so the statements that differ only by them are counted together
+    """
+    statement = _PARAMETER_PATTERN.sub("?", statement)
+    statement = _PARAMETERS_LIST_PATTERN.sub("(...)", statement)
+    statement = _PARAMETERS_LISTS_PATTERN.sub("(...), ...", statement)
+
+    return _WHITESPACE_PATTERN.sub(" ", statement).strip()
+
+
+def get_statement_preview(statement: str) -> str:
+    """Shortens the statement to be shown in a Markdown inline code,
+    where the quotes of MySQL identifiers can't be put
+    """
+    return statement[:_STATEMENT_PREVIEW_LENGTH].replace("`", '"')
+
+
+class StatementMetrics:
+    """Timings of the executions of a normalized statement"""
+
+    executions: int
+    total_time: float
+    max_time: float
+
+    # Numbers of the executions by the buckets of QUERY_TIME_BUCKETS,
+    # plus the bucket of the longer ones
+    time_histogram: list[int]
+
+    def __init__(self):
+        self.executions = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.time_histogram = [0] * (len(QUERY_TIME_BUCKETS) + 1)
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.executions if self.executions else 0
+
+    def add_execution(self, duration: float) -> None:
+        self.executions += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.time_histogram[bisect_left(QUERY_TIME_BUCKETS, duration)] += 1
+
+
+class HandlerCall:
+    """Queries run while a single update is handled"""
+
+    handler: str
+    queries: int
+    db_time: float
+
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.queries = 0
+        self.db_time = 0.0
+
+
+class HandlerMetrics:
+    """Queries of all the calls of a handler"""
+
+    calls: int
+    queries: int
+    max_queries: int
+    db_time: float
+
+    def __init__(self):
+        self.calls = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+
+    @property
+    def average_queries(self) -> float:
+        return self.queries / self.calls if self.calls else 0
+
+    @property
+    def average_db_time(self) -> float:
+        return self.db_time / self.calls if self.calls else 0
+
+    def add_call(self, call: HandlerCall) -> None:
+        self.calls += 1
+        self.queries += call.queries
+        self.max_queries = max(self.max_queries, call.queries)
+        self.db_time += call.db_time
+
+
+# The call of the handler, which is handling the update
+# in the current task, None outside of the handlers
+current_handler_call: ContextVar[HandlerCall | None] = ContextVar(
+    "current_handler_call", default=None
+)
+
+
+class QueryMetrics:
+    """Timings of the queries of the instrumented engines by the statements
+    and by the handlers that ran them
+
+    They are counted since the process started. The queries that take
+    slow_query_threshold seconds or longer are logged as warnings,
+    without their parameters.
+    """
+
+    slow_query_threshold: float
+    statements: dict[str, StatementMetrics]
+    handlers: dict[str, HandlerMetrics]
+
+    def __init__(self, slow_query_threshold: float):
+        self.slow_query_threshold = slow_query_threshold
+        self.statements = {}
+        self.handlers = {}
+
+    def add_query(self, statement: str, duration: float) -> None:
+        normalized_statement = normalize_sql(statement)
+
+        statement_metrics = self.statements.get(normalized_statement)
+
+        if statement_metrics is None:
+            statement_metrics = self.statements[
+                normalized_statement
+            ] = StatementMetrics()
+
+        statement_metrics.add_execution(duration)
+
+        call = current_handler_call.get()
+
+        if call:
+            call.queries += 1
+            call.db_time += duration
+
+        if duration >= self.slow_query_threshold:
+            logger.warning(
+                "Slow query took %.2f ms in %s: %s",
+                duration * 1000,
+                call.handler if call else "no handler",
+                normalized_statement,
+            )
+
+    @contextmanager
+    def account_queries(self, handler: str) -> Iterator[HandlerCall]:
+        """Attributes the queries run inside of the block,
+        including the ones of the tasks it starts, to the handler
+        """
+        call = HandlerCall(handler)
+
+        token = current_handler_call.set(call)
+
+        try:
+            yield call
+
+        finally:
+            current_handler_call.reset(token)
+
+            handler_metrics = self.handlers.get(handler)
+
+            if handler_metrics is None:
+                handler_metrics = self.handlers[handler] = HandlerMetrics()
+
+            handler_metrics.add_call(call)
+
+    def get_top_statements(
+        self, limit: int
+    ) -> list[tuple[str, StatementMetrics]]:
+        """Returns the statements that took the most time in total"""
+        return sorted(
+            self.statements.items(),
+            key=lambda item: item[1].total_time,
+            reverse=True,
+        )[:limit]
+
+    def get_top_handlers(self) -> list[tuple[str, HandlerMetrics]]:
+        """Returns the handlers that spent the most time in the DB first"""
+        return sorted(
+            self.handlers.items(),
+            key=lambda item: item[1].db_time,
+            reverse=True,
+        )
+
+
+def instrument_engine(engine: AsyncEngine, metrics: QueryMetrics) -> None:
+    """Times every query of the engine and adds it to the metrics"""
+
+    def before_cursor_execute(conn, cursor, statement: str, *args: Any):
+        conn.info[_QUERY_START_TIME] = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement: str, *args: Any):
+        # The start time is missing if the instrumentation
+        # was added while the query was running
+        start = conn.info.pop(_QUERY_START_TIME, None)
+
+        if start is not None:
+            metrics.add_query(statement, time.perf_counter() - start)
+
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    event.listen(
+        engine.sync_engine, "after_cursor_execute", after_cursor_execute
+    )
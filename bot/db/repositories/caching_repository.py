@@ -0,0 +1,1020 @@
+from __future__ import annotations
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import UUID
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    TypeVar,
+)
+from bot.entities.answer import Answer
+from bot.entities.answer_attachment import AnswerAttachment
+from bot.entities.question import Question
+from bot.entities.question_attachment import QuestionAttachment
+from bot.entities.regular_user import RegularUser
+from bot.entities.role import Role
+from bot.entities.support_user import SupportUser
+from bot.services.statistics import (
+    GlobalStatistics,
+    QuestionStatistics,
+    RegularUserStatistics,
+    RoleStatistics,
+    SupportUserStatistics,
+)
+from bot.db.repositories.repository import (
+    ARCHIVE_BATCH_SIZE,
+    BULK_INSERT_BATCH_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DELETE_BATCH_SIZE,
+    Identity,
+    LoaderProfile,
+    Page,
+    PageCursor,
+    ProgressCallback,
+    Repo,
+)
+from bot.db.repositories.ttl_cache import CacheMetrics, TTLCache
+import copy
+
+
+T = TypeVar("T")
+
+REPO_CACHE_SIZE = 10_000
+
+REPO_CACHE_TTL = 60.0
+
+# Names of RepoCaches' caches
+SUPPORT_USERS_CACHE = "support_users"
+IDENTITIES_CACHE = "identities"
+ROLES_CACHE = "roles"
+QUESTIONS_CACHE = "questions"
+ANSWERS_CACHE = "answers"
+
+_ALL_CACHES = (
+    SUPPORT_USERS_CACHE,
+    IDENTITIES_CACHE,
+    ROLES_CACHE,
+    QUESTIONS_CACHE,
+    ANSWERS_CACHE,
+)
+
+# Answers and identities contain their support users,
+# so they are dropped together with the support users
+_SUPPORT_USERS_CACHES = (SUPPORT_USERS_CACHE, IDENTITIES_CACHE, ANSWERS_CACHE)
+
+
+class RepoCaches:
+    """Caches of the hot lookups of CachingRepo
+
+    Shared by all the caching repos of the process,
+    so the entities cached by one repo are seen by the others.
+    """
+
+    support_users: TTLCache[tuple[int, LoaderProfile], SupportUser]
+    identities: TTLCache[int, Identity]
+    roles: TTLCache[tuple[int, LoaderProfile], Role]
+    questions: TTLCache[tuple[int, LoaderProfile], Question]
+    answers: TTLCache[int, Answer]
+
+    def __init__(
+        self, maxsize: int = REPO_CACHE_SIZE, ttl: float = REPO_CACHE_TTL
+    ):
+        self.support_users = TTLCache(maxsize, ttl)
+        self.identities = TTLCache(maxsize, ttl)
+        self.roles = TTLCache(maxsize, ttl)
+        self.questions = TTLCache(maxsize, ttl)
+        self.answers = TTLCache(maxsize, ttl)
+
+    def get_cache(self, name: str) -> TTLCache:
+        return getattr(self, name)
+
+    def get_metrics(self) -> dict[str, CacheMetrics]:
+        return {name: self.get_cache(name).metrics for name in _ALL_CACHES}
+
+
+class CachingRepo(Repo):
+    """Wraps another repo and caches the entities
+    returned by its hottest lookups in memory
+
+    The other methods call the same methods of the wrapped repo,
+    the write methods also drop the caches their changes may make stale.
+    Every entity is copied when it's cached and returned, so the entities
+    changed by their own methods never change the cached ones.
+    """
+
+    repo: Repo
+    caches: RepoCaches
+
+    def __init__(
+        self,
+        repo: Repo,
+        caches: RepoCaches | None = None,
+        in_unit_of_work: bool = False,
+    ):
+        self.repo = repo
+        self.repo_config = repo.repo_config
+        self.caches = caches or RepoCaches()
+        self._in_unit_of_work = in_unit_of_work
+
+        # Whether the unit of work has changed anything yet
+        self._has_writes = False
+
+        # Caches changed by the unit of work, they are dropped
+        # again when it's finished and its changes are visible
+        self._invalidated_caches: set[str] = set()
+
+    # UNIT OF WORK METHODS
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[CachingRepo]:
+        if self._in_unit_of_work:
+            yield self
+
+            return
+
+        async with self.repo.unit_of_work() as repo:
+            unit_of_work_repo = CachingRepo(repo, self.caches, True)
+
+            yield unit_of_work_repo
+
+        # Other repos might have cached the old entities
+        # while the changes weren't commited yet
+        unit_of_work_repo._invalidate_again()
+
+    # CACHE METHODS
+
+    def get_cache_metrics(self) -> dict[str, CacheMetrics]:
+        return self.repo.get_cache_metrics() | self.caches.get_metrics()
+
+    def _invalidate(self, cache_names: tuple[str, ...]) -> None:
+        for name in cache_names:
+            self.caches.get_cache(name).clear()
+
+        if self._in_unit_of_work:
+            self._has_writes = True
+            self._invalidated_caches.update(cache_names)
+
+    async def _write(
+        self, write: Awaitable[T], invalidated_caches: tuple[str, ...] = ()
+    ) -> T:
+        """Awaits the write of the wrapped repo and drops the caches
+        that may have stale entities after it
+
+        The deletes cascade to the related rows, so they drop all the caches.
+        The inserts don't need to drop anything, since None is never cached,
+        except for the users' inserts: the identities are cached even
+        when the support user or the regular user doesn't exist yet.
+        """
+        try:
+            return await write
+
+        except Exception:
+            # The write may have failed because of the entities
+            # changed by another process, e.g. a deleted user,
+            # that are still cached
+            self._invalidate(_ALL_CACHES)
+
+            raise
+
+        finally:
+            self._invalidate(invalidated_caches)
+
+    def _invalidate_again(self) -> None:
+        for name in self._invalidated_caches:
+            self.caches.get_cache(name).clear()
+
+    async def _get_cached(
+        self,
+        cache: TTLCache[Any, T],
+        key: Hashable,
+        load: Callable[[], Awaitable[T | None]],
+    ) -> T | None:
+        # The unit of work would see its own changes that aren't commited,
+        # so they must neither be cached nor be taken from the cache
+        if self._has_writes:
+            return await load()
+
+        cached_entity = cache.get(key)
+
+        if cached_entity is not None:
+            return copy.deepcopy(cached_entity)
+
+        version = cache.version
+        entity = await load()
+
+        # If the cache was dropped while the entity was loaded,
+        # the entity might be stale already
+        if entity is not None and cache.version == version:
+            cache.set(key, copy.deepcopy(entity))
+
+        return entity
+
+    # CACHED METHODS
+
+    async def resolve_identity(self, tg_bot_user_id: int) -> Identity:
+        # Identities are never None, only the users in them may be
+        return await self._get_cached(  # type: ignore
+            self.caches.identities,
+            tg_bot_user_id,
+            lambda: self.repo.resolve_identity(tg_bot_user_id),
+        )
+
+    async def get_role_by_id(
+        self, id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
+        return await self._get_cached(
+            self.caches.roles,
+            (id, loader_profile),
+            lambda: self.repo.get_role_by_id(id, loader_profile),
+        )
+
+    async def get_support_user_by_tg_bot_user_id(
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> SupportUser | None:
+        return await self._get_cached(
+            self.caches.support_users,
+            (tg_bot_user_id, loader_profile),
+            lambda: self.repo.get_support_user_by_tg_bot_user_id(
+                tg_bot_user_id, loader_profile
+            ),
+        )
+
+    async def get_question_by_tg_message_id(
+        self,
+        tg_message_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
+        return await self._get_cached(
+            self.caches.questions,
+            (tg_message_id, loader_profile),
+            lambda: self.repo.get_question_by_tg_message_id(
+                tg_message_id, loader_profile
+            ),
+        )
+
+    async def get_answer_by_tg_message_id(
+        self, tg_message_id: int
+    ) -> Answer | None:
+        return await self._get_cached(
+            self.caches.answers,
+            tg_message_id,
+            lambda: self.repo.get_answer_by_tg_message_id(tg_message_id),
+        )
+
+    # The methods below call the wrapped repo
+
+    # ROLES METHODS
+
+    async def add_role(self, role: Role) -> Role:
+        return await self._write(self.repo.add_role(role))
+
+    async def bulk_add_roles(
+        self,
+        roles: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return await self._write(self.repo.bulk_add_roles(roles, batch_size))
+
+    async def get_role_by_name(
+        self, name: str, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
+        return await self.repo.get_role_by_name(name, loader_profile)
+
+    async def get_all_roles(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Role]:
+        return await self.repo.get_all_roles(loader_profile)
+
+    async def get_all_roles_sorted_by_date(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[Role]:
+        return await self.repo.get_all_roles_sorted_by_date(
+            desc_order, loader_profile
+        )
+
+    async def delete_role_with_id(self, role_id: int) -> None:
+        return await self._write(
+            self.repo.delete_role_with_id(role_id), _ALL_CACHES
+        )
+
+    async def delete_all_roles(self) -> None:
+        return await self._write(self.repo.delete_all_roles(), _ALL_CACHES)
+
+    async def count_all_roles(self) -> int:
+        return await self.repo.count_all_roles()
+
+    # REGULAR USERS METHODS
+
+    async def add_regular_user(self, regular_user: RegularUser) -> RegularUser:
+        return await self._write(
+            self.repo.add_regular_user(regular_user), (IDENTITIES_CACHE,)
+        )
+
+    async def bulk_add_regular_users(
+        self,
+        regular_users: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return await self._write(
+            self.repo.bulk_add_regular_users(regular_users, batch_size),
+            (IDENTITIES_CACHE,),
+        )
+
+    async def get_regular_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> RegularUser | None:
+        return await self.repo.get_regular_user_by_id(id, loader_profile)
+
+    async def get_regular_user_by_tg_bot_user_id(
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> RegularUser | None:
+        return await self.repo.get_regular_user_by_tg_bot_user_id(
+            tg_bot_user_id, loader_profile
+        )
+
+    async def get_all_regular_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[RegularUser]:
+        return await self.repo.get_all_regular_users(loader_profile)
+
+    async def get_all_regular_users_sorted_by_date(
+        self,
+        desc_order: bool,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[RegularUser]:
+        return await self.repo.get_all_regular_users_sorted_by_date(
+            desc_order, loader_profile
+        )
+
+    async def delete_regular_user_with_id(self, id: UUID) -> None:
+        return await self._write(
+            self.repo.delete_regular_user_with_id(id), _ALL_CACHES
+        )
+
+    async def delete_all_regular_users(self) -> None:
+        return await self._write(
+            self.repo.delete_all_regular_users(), _ALL_CACHES
+        )
+
+    async def count_all_regular_users(self) -> int:
+        return await self.repo.count_all_regular_users()
+
+    async def get_regular_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[RegularUser]:
+        return await self.repo.get_regular_users_page(
+            cursor, limit, desc_order, loader_profile
+        )
+
+    def iter_regular_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[RegularUser]:
+        return self.repo.iter_regular_users(desc_order, loader_profile)
+
+    # SUPPORT USERS METHODS
+
+    async def add_support_user(self, support_user: SupportUser) -> SupportUser:
+        return await self._write(
+            self.repo.add_support_user(support_user), (IDENTITIES_CACHE,)
+        )
+
+    async def bulk_add_support_users(
+        self,
+        support_users: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return await self._write(
+            self.repo.bulk_add_support_users(support_users, batch_size),
+            (IDENTITIES_CACHE,),
+        )
+
+    async def change_support_user_role(
+        self, support_user_id: UUID, new_role_id: int
+    ) -> None:
+        return await self._write(
+            self.repo.change_support_user_role(support_user_id, new_role_id),
+            _SUPPORT_USERS_CACHES,
+        )
+
+    async def deactivate_support_user(self, support_user_id: UUID) -> None:
+        return await self._write(
+            self.repo.deactivate_support_user(support_user_id),
+            _SUPPORT_USERS_CACHES,
+        )
+
+    async def activate_support_user(self, support_user_id: UUID) -> None:
+        return await self._write(
+            self.repo.activate_support_user(support_user_id),
+            _SUPPORT_USERS_CACHES,
+        )
+
+    async def make_support_user_owner(self, support_user_id: UUID) -> None:
+        return await self._write(
+            self.repo.make_support_user_owner(support_user_id),
+            _SUPPORT_USERS_CACHES,
+        )
+
+    async def remove_owner_rights_from_support_user(
+        self, support_user_id: UUID
+    ) -> None:
+        return await self._write(
+            self.repo.remove_owner_rights_from_support_user(support_user_id),
+            _SUPPORT_USERS_CACHES,
+        )
+
+    async def get_support_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
+        return await self.repo.get_support_user_by_id(id, loader_profile)
+
+    async def get_owner(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
+        return await self.repo.get_owner(loader_profile)
+
+    async def get_support_users_with_role_id(
+        self, role_id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[SupportUser]:
+        return await self.repo.get_support_users_with_role_id(
+            role_id, loader_profile
+        )
+
+    async def get_all_support_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[SupportUser]:
+        return await self.repo.get_all_support_users(loader_profile)
+
+    async def get_all_support_users_sorted_by_date(
+        self,
+        desc_order: bool,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[SupportUser]:
+        return await self.repo.get_all_support_users_sorted_by_date(
+            desc_order, loader_profile
+        )
+
+    async def delete_support_user_with_id(self, id: UUID) -> None:
+        return await self._write(
+            self.repo.delete_support_user_with_id(id), _ALL_CACHES
+        )
+
+    async def delete_all_support_users(self) -> None:
+        return await self._write(
+            self.repo.delete_all_support_users(), _ALL_CACHES
+        )
+
+    async def count_all_support_users(self) -> int:
+        return await self.repo.count_all_support_users()
+
+    async def count_support_users_with_role(self, role_id: int) -> int:
+        return await self.repo.count_support_users_with_role(role_id)
+
+    async def count_activated_support_users(self) -> int:
+        return await self.repo.count_activated_support_users()
+
+    async def count_deactivated_support_users(self) -> int:
+        return await self.repo.count_deactivated_support_users()
+
+    async def get_support_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[SupportUser]:
+        return await self.repo.get_support_users_page(
+            cursor, limit, desc_order, loader_profile
+        )
+
+    def iter_support_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[SupportUser]:
+        return self.repo.iter_support_users(desc_order, loader_profile)
+
+    # QUESTIONS METHODS
+
+    async def get_random_unbinded_question(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Question | None:
+        return await self.repo.get_random_unbinded_question(loader_profile)
+
+    async def claim_question(self, support_user_id: UUID) -> Question | None:
+        return await self._write(
+            self.repo.claim_question(support_user_id), _SUPPORT_USERS_CACHES
+        )
+
+    async def get_all_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        return await self.repo.get_all_questions(loader_profile)
+
+    async def get_question_by_id(
+        self,
+        question_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
+        return await self.repo.get_question_by_id(question_id, loader_profile)
+
+    async def get_regular_user_last_asked_question(
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
+        return await self.repo.get_regular_user_last_asked_question(
+            regular_user_id, loader_profile
+        )
+
+    async def get_questions_with_regular_user_id(
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[Question]:
+        return await self.repo.get_questions_with_regular_user_id(
+            regular_user_id, loader_profile
+        )
+
+    async def get_unbinded_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        return await self.repo.get_unbinded_questions(loader_profile)
+
+    async def get_unanswered_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        return await self.repo.get_unanswered_questions(loader_profile)
+
+    async def delete_question_with_id(self, question_id: UUID) -> None:
+        return await self._write(
+            self.repo.delete_question_with_id(question_id), _ALL_CACHES
+        )
+
+    async def delete_questions_with_regular_user_id(
+        self, regular_user_id: UUID
+    ) -> None:
+        return await self._write(
+            self.repo.delete_questions_with_regular_user_id(regular_user_id),
+            _ALL_CACHES,
+        )
+
+    async def delete_all_questions(self) -> None:
+        return await self._write(self.repo.delete_all_questions(), _ALL_CACHES)
+
+    async def add_question(self, question: Question) -> Question:
+        return await self._write(self.repo.add_question(question))
+
+    async def bulk_add_questions(
+        self,
+        questions: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return await self._write(
+            self.repo.bulk_add_questions(questions, batch_size)
+        )
+
+    async def bind_question_to_support_user(
+        self, support_user_id, question_id
+    ) -> None:
+        return await self._write(
+            self.repo.bind_question_to_support_user(
+                support_user_id, question_id
+            ),
+            _SUPPORT_USERS_CACHES,
+        )
+
+    async def unbind_question_from_support_user(
+        self, support_user_id: UUID
+    ) -> None:
+        return await self._write(
+            self.repo.unbind_question_from_support_user(support_user_id),
+            _SUPPORT_USERS_CACHES,
+        )
+
+    async def count_answered_questions(self) -> int:
+        return await self.repo.count_answered_questions()
+
+    async def count_unanswered_questions(self) -> int:
+        return await self.repo.count_unanswered_questions()
+
+    async def count_regular_users_questions(
+        self, regular_user_id: UUID
+    ) -> int:
+        return await self.repo.count_regular_users_questions(regular_user_id)
+
+    async def count_all_questions(self) -> int:
+        return await self.repo.count_all_questions()
+
+    async def count_regular_user_answered_questions(
+        self, regular_user_id: UUID
+    ) -> int:
+        return await self.repo.count_regular_user_answered_questions(
+            regular_user_id
+        )
+
+    async def get_questions_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Question]:
+        return await self.repo.get_questions_page(
+            cursor, limit, desc_order, loader_profile
+        )
+
+    def iter_questions(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Question]:
+        return self.repo.iter_questions(desc_order, loader_profile)
+
+    # ANSWERS METHODS
+
+    async def get_all_answers(self) -> list[Answer]:
+        return await self.repo.get_all_answers()
+
+    async def get_answer_by_id(self, answer_id: UUID) -> Answer | None:
+        return await self.repo.get_answer_by_id(answer_id)
+
+    async def get_question_last_answer(
+        self, question_id: UUID
+    ) -> Answer | None:
+        return await self.repo.get_question_last_answer(question_id)
+
+    async def get_answers_with_question_id(
+        self, question_id: UUID
+    ) -> list[Answer]:
+        return await self.repo.get_answers_with_question_id(question_id)
+
+    async def delete_answer_with_id(self, answer_id: UUID) -> None:
+        return await self._write(
+            self.repo.delete_answer_with_id(answer_id), _ALL_CACHES
+        )
+
+    async def delete_support_user_answers_with_id(
+        self, support_user_id: UUID
+    ) -> None:
+        return await self._write(
+            self.repo.delete_support_user_answers_with_id(support_user_id),
+            _ALL_CACHES,
+        )
+
+    async def delete_all_answers(self) -> None:
+        return await self._write(self.repo.delete_all_answers(), _ALL_CACHES)
+
+    async def get_support_user_answers_with_id(
+        self, support_user_id: UUID
+    ) -> list[Answer]:
+        return await self.repo.get_support_user_answers_with_id(
+            support_user_id
+        )
+
+    async def delete_answers_with_question_id(self, question_id: UUID) -> None:
+        return await self._write(
+            self.repo.delete_answers_with_question_id(question_id), _ALL_CACHES
+        )
+
+    async def estimate_answer_as_useful(self, answer_id: UUID) -> None:
+        return await self._write(
+            self.repo.estimate_answer_as_useful(answer_id), (ANSWERS_CACHE,)
+        )
+
+    async def estimate_answer_as_unuseful(self, answer_id: UUID) -> None:
+        return await self._write(
+            self.repo.estimate_answer_as_unuseful(answer_id), (ANSWERS_CACHE,)
+        )
+
+    async def add_answer(
+        self,
+        answer: Answer,
+    ) -> Answer:
+        return await self._write(self.repo.add_answer(answer))
+
+    async def bulk_add_answers(
+        self,
+        answers: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return await self._write(
+            self.repo.bulk_add_answers(answers, batch_size)
+        )
+
+    async def count_all_answers(self) -> int:
+        return await self.repo.count_all_answers()
+
+    async def count_all_useful_answers(self) -> int:
+        return await self.repo.count_all_useful_answers()
+
+    async def count_all_unuseful_answers(self) -> int:
+        return await self.repo.count_all_unuseful_answers()
+
+    async def count_question_answers(self, question_id: UUID) -> int:
+        return await self.repo.count_question_answers(question_id)
+
+    async def count_support_user_answers(self, support_user_id: UUID) -> int:
+        return await self.repo.count_support_user_answers(support_user_id)
+
+    async def count_support_user_useful_answers(
+        self, support_user: UUID
+    ) -> int:
+        return await self.repo.count_support_user_useful_answers(support_user)
+
+    async def count_support_user_unuseful_answers(
+        self, support_user: UUID
+    ) -> int:
+        return await self.repo.count_support_user_unuseful_answers(
+            support_user
+        )
+
+    async def count_regular_user_questions_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return await self.repo.count_regular_user_questions_answers(
+            regular_user_id
+        )
+
+    async def count_regular_user_questions_useful_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return await self.repo.count_regular_user_questions_useful_answers(
+            regular_user_id
+        )
+
+    async def count_regular_user_questions_unuseful_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return await self.repo.count_regular_user_questions_unuseful_answers(
+            regular_user_id
+        )
+
+    async def count_regular_user_questions_unestimated_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return (
+            await self.repo.count_regular_user_questions_unestimated_answers(
+                regular_user_id
+            )
+        )
+
+    async def get_answers_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        return await self.repo.get_answers_page(
+            cursor, limit, desc_order, loader_profile
+        )
+
+    def iter_answers(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        return self.repo.iter_answers(desc_order, loader_profile)
+
+    async def get_question_answers_page(
+        self,
+        question_id: UUID,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        return await self.repo.get_question_answers_page(
+            question_id, cursor, limit, desc_order, loader_profile
+        )
+
+    def iter_question_answers(
+        self,
+        question_id: UUID,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        return self.repo.iter_question_answers(
+            question_id, desc_order, loader_profile
+        )
+
+    # QUESTIONS ATTACHMENTS METHODS
+
+    async def add_question_attachment(
+        self, question_attachment: QuestionAttachment
+    ) -> QuestionAttachment:
+        return await self._write(
+            self.repo.add_question_attachment(question_attachment)
+        )
+
+    async def bulk_add_questions_attachments(
+        self,
+        questions_attachments: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return await self._write(
+            self.repo.bulk_add_questions_attachments(
+                questions_attachments, batch_size
+            )
+        )
+
+    async def get_question_attachment_by_id(
+        self, id: UUID
+    ) -> QuestionAttachment | None:
+        return await self.repo.get_question_attachment_by_id(id)
+
+    async def get_question_attachments(
+        self, question_id: UUID
+    ) -> list[QuestionAttachment]:
+        return await self.repo.get_question_attachments(question_id)
+
+    async def get_all_questions_attachments(self) -> list[QuestionAttachment]:
+        return await self.repo.get_all_questions_attachments()
+
+    async def delete_question_attachment_with_id(
+        self, question_attachment_id: UUID
+    ) -> None:
+        return await self._write(
+            self.repo.delete_question_attachment_with_id(
+                question_attachment_id
+            )
+        )
+
+    async def count_all_questions_attachments(self) -> int:
+        return await self.repo.count_all_questions_attachments()
+
+    async def count_question_attachments(self, question_id: UUID) -> int:
+        return await self.repo.count_question_attachments(question_id)
+
+    async def get_questions_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[QuestionAttachment]:
+        return await self.repo.get_questions_attachments_page(
+            cursor, limit, desc_order
+        )
+
+    # ANSWERS ATTACHMENTS METHODS
+
+    async def add_answer_attachment(
+        self, answer_attachment: AnswerAttachment
+    ) -> AnswerAttachment:
+        return await self._write(
+            self.repo.add_answer_attachment(answer_attachment)
+        )
+
+    async def bulk_add_answers_attachments(
+        self,
+        answers_attachments: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return await self._write(
+            self.repo.bulk_add_answers_attachments(
+                answers_attachments, batch_size
+            )
+        )
+
+    async def get_answer_attachment_by_id(
+        self, id: UUID
+    ) -> AnswerAttachment | None:
+        return await self.repo.get_answer_attachment_by_id(id)
+
+    async def get_answer_attachments(
+        self, answer_id: UUID
+    ) -> list[AnswerAttachment]:
+        return await self.repo.get_answer_attachments(answer_id)
+
+    async def get_all_answers_attachments(self) -> list[AnswerAttachment]:
+        return await self.repo.get_all_answers_attachments()
+
+    async def delete_answer_attachment_with_id(
+        self, answer_attachment_id: UUID
+    ) -> None:
+        return await self._write(
+            self.repo.delete_answer_attachment_with_id(answer_attachment_id)
+        )
+
+    async def count_all_answers_attachments(self) -> int:
+        return await self.repo.count_all_answers_attachments()
+
+    async def count_answer_attachments(self, answer_id: UUID) -> int:
+        return await self.repo.count_answer_attachments(answer_id)
+
+    async def get_answers_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[AnswerAttachment]:
+        return await self.repo.get_answers_attachments_page(
+            cursor, limit, desc_order
+        )
+
+    # STATISTICS METHODS
+
+    async def get_global_statistics(self) -> GlobalStatistics:
+        return await self.repo.get_global_statistics()
+
+    async def get_role_statistics(self, role_id: int) -> RoleStatistics:
+        return await self.repo.get_role_statistics(role_id)
+
+    async def get_regular_user_statistics(
+        self, regular_user_id: UUID
+    ) -> RegularUserStatistics:
+        return await self.repo.get_regular_user_statistics(regular_user_id)
+
+    async def get_regular_users_statistics(
+        self, regular_users_ids: list[UUID]
+    ) -> dict[UUID, RegularUserStatistics]:
+        return await self.repo.get_regular_users_statistics(regular_users_ids)
+
+    async def get_support_user_statistics(
+        self, support_user_id: UUID
+    ) -> SupportUserStatistics:
+        return await self.repo.get_support_user_statistics(support_user_id)
+
+    async def get_support_users_statistics(
+        self, support_users_ids: list[UUID]
+    ) -> dict[UUID, SupportUserStatistics]:
+        return await self.repo.get_support_users_statistics(support_users_ids)
+
+    async def get_question_statistics(
+        self, question_id: UUID
+    ) -> QuestionStatistics:
+        return await self.repo.get_question_statistics(question_id)
+
+    async def get_questions_statistics(
+        self, questions_ids: list[UUID]
+    ) -> dict[UUID, QuestionStatistics]:
+        return await self.repo.get_questions_statistics(questions_ids)
+
+    async def rebuild_statistics(self) -> None:
+        return await self._write(self.repo.rebuild_statistics())
+
+    # ARCHIVE METHODS
+
+    async def archive_questions(
+        self, older_than: datetime, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> int:
+        return await self._write(
+            self.repo.archive_questions(older_than, batch_size)
+        )
+
+    # RETENTION METHODS
+
+    async def delete_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        return await self._write(
+            self.repo.delete_questions_older_than(
+                older_than, batch_size, on_progress
+            ),
+            _ALL_CACHES,
+        )
+
+    async def anonymize_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        return await self._write(
+            self.repo.anonymize_questions_older_than(
+                older_than, batch_size, on_progress
+            ),
+            _ALL_CACHES,
+        )
+
+    async def erase_regular_user(
+        self,
+        regular_user_id: UUID,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        return await self._write(
+            self.repo.erase_regular_user(
+                regular_user_id, batch_size, on_progress
+            ),
+            _ALL_CACHES,
+        )
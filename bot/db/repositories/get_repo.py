@@ -1,11 +1,68 @@
+from typing import TypeVar
+from weakref import WeakKeyDictionary
 from bot.db.repositories.repository import Repo, RepoConfig
-from bot.db.repositories.sa_repository import SARepo
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.db.repositories.caching_repository import CachingRepo, RepoCaches
+from bot.db.repositories.memory_repository import MemoryRepo, MemoryRepoConfig
 from bot.db.db_sa_settings import sa_repo_config
 
 
+C = TypeVar("C", bound=RepoConfig)
+
+# Caches of the caching repos, shared by all the repos made with the config
+_repos_caches: WeakKeyDictionary[RepoConfig, RepoCaches] = WeakKeyDictionary()
+
+# Storage of the memory repos made without a config
+_memory_repo_config = MemoryRepoConfig()
+
+
+def _get_repo_config(
+    repo_config: RepoConfig | None, config_type: type[C], default: C
+) -> C:
+    """Returns the config, or the default one if there is no config
+
+    Raises:
+        TypeError: the config isn't of the type the repo needs
+    """
+    if repo_config is None:
+        return default
+
+    if not isinstance(repo_config, config_type):
+        raise TypeError(
+            f"The repo needs {config_type.__name__}, "
+            + f"got {type(repo_config).__name__}"
+        )
+
+    return repo_config
+
+
 def get_repo(repo_type: str, repo_config: RepoConfig | None = None) -> Repo:
     match repo_type:
         case "sa":
-            return SARepo(repo_config or sa_repo_config)
+            return SARepo(
+                _get_repo_config(repo_config, SARepoConfig, sa_repo_config)
+            )
+
+        case "caching_sa":
+            sa_config = _get_repo_config(
+                repo_config, SARepoConfig, sa_repo_config
+            )
+
+            caches = _repos_caches.get(sa_config)
+
+            if caches is None:
+                caches = _repos_caches[sa_config] = RepoCaches()
+
+            return CachingRepo(SARepo(sa_config), caches)
+
+        case "memory":
+            return MemoryRepo(
+                _get_repo_config(
+                    repo_config, MemoryRepoConfig, _memory_repo_config
+                )
+            )
 
-    raise ValueError(f"No such repo type: {repo_type}. Available types: 'sa'.")
+    raise ValueError(
+        f"No such repo type: {repo_type}. "
+        + "Available types: 'sa', 'caching_sa', 'memory'."
+    )
@@ -0,0 +1,128 @@
+from __future__ import annotations
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Awaitable, Callable, TypeVar
+import asyncio
+
+
+T = TypeVar("T")
+
+# Write run by the group committer on the session of the batch
+Write = Callable[[AsyncSession], Awaitable[Any]]
+
+GROUP_COMMIT_MAX_DELAY = 0.005
+
+GROUP_COMMIT_MAX_BATCH_SIZE = 100
+
+
+class GroupCommitter:
+    """Collects the writes that arrive within max_delay of the first one
+    and commits them in a single transaction
+
+    So a burst of writes pays for one commit (and one fsync) instead of
+    a commit per write. Every write is awaited until its batch is commited,
+    so the row is durable once the write returns. If the batch fails,
+    its writes are retried one by one in their own transactions, so a
+    failing write doesn't fail the other writes of the batch.
+
+    The writes aren't isolated with SAVEPOINTs instead, since SQLite's
+    driver doesn't begin the transaction before a SAVEPOINT, and
+    releasing the first one would commit it on its own.
+    """
+
+    max_delay: float
+    max_batch_size: int
+
+    def __init__(
+        self,
+        session_maker: Callable[..., AsyncSession],
+        max_delay: float = GROUP_COMMIT_MAX_DELAY,
+        max_batch_size: int = GROUP_COMMIT_MAX_BATCH_SIZE,
+    ):
+        """
+        Args:
+            session_maker (Callable[..., AsyncSession]): sessions
+            of the database the writes are commited to
+            max_delay (float, optional): seconds the first write
+            of a batch waits for the others.
+            Defaults to GROUP_COMMIT_MAX_DELAY.
+            max_batch_size (int, optional): the batch is commited as soon
+            as it has that many writes.
+            Defaults to GROUP_COMMIT_MAX_BATCH_SIZE.
+        """
+        if max_batch_size < 1:
+            raise ValueError("The batch size must be at least 1")
+
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+
+        self._session_maker = session_maker
+        self._batch: list[tuple[Write, asyncio.Future]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+
+        # Flushing tasks are referenced until they are done,
+        # so they aren't garbage collected in the middle
+        self._flushes: set[asyncio.Task] = set()
+
+    async def write(self, write: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Runs the write with the next batch of writes
+
+        Args:
+            write (Callable[[AsyncSession], Awaitable[T]]): adds the changes
+            to the session, mustn't commit it
+
+        Returns:
+            T: what the write returned, once it's commited
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._batch.append((write, future))
+
+        if len(self._batch) >= self.max_batch_size:
+            self._flush()
+
+        elif not self._flush_timer:
+            self._flush_timer = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        batch, self._batch = self._batch, []
+
+        task = asyncio.create_task(self._commit_batch(batch))
+
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _commit_batch(
+        self, batch: list[tuple[Write, asyncio.Future]]
+    ) -> None:
+        try:
+            async with self._session_maker() as session:
+                results = [await write(session) for write, _ in batch]
+
+                await session.commit()
+
+        except Exception as e:
+            if len(batch) > 1:
+                for write in batch:
+                    await self._commit_batch([write])
+
+                return
+
+            _, future = batch[0]
+
+            if not future.done():
+                future.set_exception(e)
+
+            return
+
+        # The futures of the writes that were cancelled are done already,
+        # the writes themselves are commited anyway
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,1764 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Iterable
+from uuid import UUID, uuid4
+from bot.entities.answer import Answer
+from bot.entities.answer_attachment import AnswerAttachment
+from bot.entities.question import Question
+from bot.entities.question_attachment import QuestionAttachment
+from bot.entities.regular_user import RegularUser
+from bot.entities.role import Role, RolePermissions
+from bot.entities.support_user import SupportUser
+from bot.services.statistics import (
+    GlobalStatistics,
+    QuestionStatistics,
+    RegularUserStatistics,
+    RoleStatistics,
+    SupportUserStatistics,
+)
+from bot.db.repositories.repository import (
+    ANONYMIZED_MESSAGE,
+    ARCHIVE_BATCH_SIZE,
+    BULK_INSERT_BATCH_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DELETE_BATCH_SIZE,
+    Identity,
+    LoaderProfile,
+    Page,
+    PageCursor,
+    ProgressCallback,
+    Repo,
+    RepoConfig,
+)
+
+
+# Rows are dicts with the same keys as the columns of the SQL tables
+Row = dict[str, Any]
+
+# How many rows are taken at once by the iter methods
+_ITER_BATCH_SIZE = 500
+
+
+class MemoryTable:
+    """Rows of a table indexed by their columns
+
+    The rows are found by their ids and unique columns with dict lookups,
+    the (date, id) keys are kept sorted for the date ordered queries.
+    """
+
+    name: str
+    rows: dict[Any, Row]
+
+    def __init__(
+        self,
+        name: str,
+        date_column: str,
+        unique_columns: tuple[str, ...] = (),
+        indexed_columns: tuple[str, ...] = (),
+        foreign_keys: dict[str, MemoryTable] | None = None,
+        defaults: dict[str, Callable[[], Any]] | None = None,
+    ):
+        self.name = name
+        self.rows = {}
+        self._date_column = date_column
+        self._unique_indexes: dict[str, dict[Any, Any]] = {
+            column: {} for column in unique_columns
+        }
+        # The values are dicts, so the ids keep the insertion order
+        self._indexes: dict[str, dict[Any, dict[Any, None]]] = {
+            column: {} for column in indexed_columns
+        }
+        self._foreign_keys = foreign_keys or {}
+        # Factories of the values of the columns missing in the rows,
+        # as the column defaults of the SQL tables
+        self._defaults = defaults or {}
+        self._keys: list[tuple[datetime, Any]] = []
+
+    def get(self, id: Any) -> Row | None:
+        return self.rows.get(id)
+
+    def get_by(self, column: str, value: Any) -> Row | None:
+        id = self._unique_indexes[column].get(value)
+
+        return None if id is None else self.rows[id]
+
+    def find(self, column: str, value: Any) -> list[Row]:
+        """Returns the rows with the value of the indexed column
+        sorted by their dates and ids
+        """
+        ids = self._indexes[column].get(value, {})
+
+        return sorted((self.rows[id] for id in ids), key=self.get_key)
+
+    def count(self, column: str, value: Any) -> int:
+        return len(self._indexes[column].get(value, {}))
+
+    def count_values(self, column: str) -> int:
+        """Returns how many different values the indexed column has"""
+        return len(self._indexes[column])
+
+    def get_key(self, row: Row) -> tuple[datetime, Any]:
+        return (row[self._date_column], row["id"])
+
+    def insert(self, row: Row) -> None:
+        for column, default in self._defaults.items():
+            if column not in row:
+                row[column] = default()
+
+        if row["id"] in self.rows:
+            raise ValueError(f"{self.name} already have id {row['id']}")
+
+        for column, index in self._unique_indexes.items():
+            if row[column] is not None and row[column] in index:
+                raise ValueError(
+                    f"{self.name} already have {column} {row[column]}"
+                )
+
+        self._check_foreign_keys(row)
+
+        self.rows[row["id"]] = row
+
+        self._index(row)
+
+        insort(self._keys, self.get_key(row))
+
+    def update(self, id: Any, **values: Any) -> None:
+        row = self.rows[id]
+
+        self._check_foreign_keys(values)
+
+        self._unindex(row)
+
+        row.update(values)
+
+        self._index(row)
+
+    def delete(self, id: Any) -> Row | None:
+        row = self.rows.pop(id, None)
+
+        if row is None:
+            return None
+
+        self._unindex(row)
+
+        del self._keys[bisect_left(self._keys, self.get_key(row))]
+
+        return row
+
+    def first(self, desc_order: bool = False) -> Row | None:
+        if not self._keys:
+            return None
+
+        return self.rows[self._keys[-1 if desc_order else 0][1]]
+
+    def ordered(self, desc_order: bool = False) -> list[Row]:
+        keys = reversed(self._keys) if desc_order else self._keys
+
+        return [self.rows[id] for _, id in keys]
+
+    def page(
+        self,
+        cursor: PageCursor | None,
+        limit: int,
+        desc_order: bool,
+        keys: list[tuple[datetime, Any]] | None = None,
+    ) -> tuple[list[Row], PageCursor | None]:
+        """Returns the rows that go right after the cursor
+        in the (date, id) order and the cursor of the next page
+
+        Args:
+            cursor (PageCursor | None): key of the last row of
+            the previous page, None for the first page
+            limit (int): max number of the rows
+            desc_order (bool): whether the rows go from the newest
+            keys (list[tuple[datetime, Any]] | None, optional): sorted
+            keys of the rows to paginate. Defaults to all the rows.
+        """
+        if limit < 1:
+            raise ValueError("Page limit must be a positive number")
+
+        keys = self._keys if keys is None else keys
+
+        if desc_order:
+            end = len(keys) if cursor is None else bisect_left(keys, cursor)
+            page_keys = keys[max(end - limit - 1, 0) : end][::-1]
+
+        else:
+            start = 0 if cursor is None else bisect_right(keys, cursor)
+            page_keys = keys[start : start + limit + 1]
+
+        next_cursor = page_keys[limit - 1] if len(page_keys) > limit else None
+
+        return [self.rows[id] for _, id in page_keys[:limit]], next_cursor
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self._keys.clear()
+
+        for index in (*self._unique_indexes.values(), *self._indexes.values()):
+            index.clear()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _check_foreign_keys(self, values: Row) -> None:
+        for column, table in self._foreign_keys.items():
+            value = values.get(column)
+
+            if value is not None and value not in table.rows:
+                raise ValueError(
+                    f"{table.name} have no id {value} "
+                    + f"referenced by {self.name}.{column}"
+                )
+
+    def _index(self, row: Row) -> None:
+        for column, unique_index in self._unique_indexes.items():
+            if row[column] is not None:
+                unique_index[row[column]] = row["id"]
+
+        for column, index in self._indexes.items():
+            index.setdefault(row[column], {})[row["id"]] = None
+
+    def _unindex(self, row: Row) -> None:
+        for column, unique_index in self._unique_indexes.items():
+            unique_index.pop(row[column], None)
+
+        for column, index in self._indexes.items():
+            ids = index[row[column]]
+
+            del ids[row["id"]]
+
+            if not ids:
+                del index[row[column]]
+
+
+class MemoryStorage:
+    """Tables of MemoryRepo, live as long as the process does"""
+
+    roles: MemoryTable
+    regular_users: MemoryTable
+    support_users: MemoryTable
+    questions: MemoryTable
+    answers: MemoryTable
+    questions_attachments: MemoryTable
+    answers_attachments: MemoryTable
+
+    # Id of the next role added without an id, as a DB sequence
+    next_role_id: int
+
+    def __init__(self):
+        self.roles = MemoryTable(
+            "roles",
+            "created_date",
+            ("name",),
+            defaults={
+                "description": str,
+                "can_answer_questions": lambda: True,
+                "can_manage_support_users": lambda: False,
+                "created_date": datetime.now,
+            },
+        )
+        self.regular_users = MemoryTable(
+            "regular_users",
+            "join_date",
+            ("tg_bot_user_id",),
+            defaults={"id": uuid4, "join_date": datetime.now},
+        )
+        self.questions = MemoryTable(
+            "questions",
+            "date",
+            ("tg_message_id",),
+            ("regular_user_id",),
+            {"regular_user_id": self.regular_users},
+            {"id": uuid4, "date": datetime.now},
+        )
+        self.support_users = MemoryTable(
+            "support_users",
+            "join_date",
+            ("tg_bot_user_id",),
+            ("role_id", "current_question_id", "is_owner"),
+            {"role_id": self.roles, "current_question_id": self.questions},
+            {
+                "id": uuid4,
+                "role_id": lambda: None,
+                "current_question_id": lambda: None,
+                "is_owner": lambda: False,
+                "is_active": lambda: True,
+                "join_date": datetime.now,
+            },
+        )
+        self.answers = MemoryTable(
+            "answers",
+            "date",
+            ("tg_message_id",),
+            ("question_id", "support_user_id"),
+            {
+                "question_id": self.questions,
+                "support_user_id": self.support_users,
+            },
+            {"id": uuid4, "is_useful": lambda: None, "date": datetime.now},
+        )
+        self.questions_attachments = MemoryTable(
+            "questions_attachments",
+            "date",
+            (),
+            ("question_id",),
+            {"question_id": self.questions},
+            {"id": uuid4, "caption": lambda: None, "date": datetime.now},
+        )
+        self.answers_attachments = MemoryTable(
+            "answers_attachments",
+            "date",
+            (),
+            ("answer_id",),
+            {"answer_id": self.answers},
+            {"id": uuid4, "caption": lambda: None, "date": datetime.now},
+        )
+        self.next_role_id = 1
+
+
+class MemoryRepoConfig(RepoConfig):
+    connection_provider: Callable[..., AsyncContextManager[MemoryStorage]]
+
+    storage: MemoryStorage
+
+    def __init__(self, storage: MemoryStorage | None = None):
+        self.storage = storage or MemoryStorage()
+        self.connection_provider = lambda: nullcontext(self.storage)
+
+
+class MemoryRepo(Repo):
+    """Keeps all the data in the process memory
+
+    Made for the tests and the benchmarks: every method is a few dict
+    lookups, so nothing but the callers' own code is measured. The repo
+    has no transactions, the changes are visible as soon as they are
+    made. Since the methods never await, each of them is atomic.
+    """
+
+    def __init__(self, repo_config: MemoryRepoConfig | None = None):
+        self.repo_config = repo_config or MemoryRepoConfig()
+        self._storage = self.repo_config.storage
+
+    # IDENTITY METHODS
+
+    async def resolve_identity(self, tg_bot_user_id: int) -> Identity:
+        support_user = self._storage.support_users.get_by(
+            "tg_bot_user_id", tg_bot_user_id
+        )
+        regular_user = self._storage.regular_users.get_by(
+            "tg_bot_user_id", tg_bot_user_id
+        )
+
+        return Identity(
+            None
+            if support_user is None
+            else self._as_support_user_entity(support_user),
+            None
+            if regular_user is None
+            else self._as_regular_user_entity(regular_user),
+        )
+
+    # BULK INSERT METHODS
+
+    def _bulk_insert(
+        self, table: MemoryTable, rows: Iterable[Row], batch_size: int
+    ) -> int:
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1")
+
+        inserted = 0
+
+        for row in rows:
+            table.insert(dict(row))
+
+            inserted += 1
+
+        return inserted
+
+    # PAGINATION METHODS
+
+    def _get_page(
+        self,
+        table: MemoryTable,
+        as_entity: Callable[[Row], Any],
+        cursor: PageCursor | None,
+        limit: int,
+        desc_order: bool,
+        rows: list[Row] | None = None,
+    ) -> Page:
+        rows_page, next_cursor = table.page(
+            cursor,
+            limit,
+            desc_order,
+            None if rows is None else [table.get_key(row) for row in rows],
+        )
+
+        return Page([as_entity(row) for row in rows_page], next_cursor)
+
+    async def _iter(
+        self,
+        get_page: Callable[[PageCursor | None, int], Page],
+    ) -> AsyncIterator[Any]:
+        # Rows are taken page by page, so the changes
+        # made while iterating don't break the iteration
+        cursor = None
+
+        while True:
+            page = get_page(cursor, _ITER_BATCH_SIZE)
+
+            for elem in page.items:
+                yield elem
+
+            if page.next_cursor is None:
+                return
+
+            cursor = page.next_cursor
+
+    # ROLES METHODS
+
+    async def add_role(self, role: Role) -> Role:
+        # If id equals to zero, the id must be
+        # created by the repo as by a DB sequence
+        if not role.id:
+            role.id = self._storage.next_role_id
+
+        self._storage.roles.insert(
+            {
+                "id": role.id,
+                "name": role.name,
+                "description": role.description,
+                "can_answer_questions": role.permissions.can_answer_questions,
+                "can_manage_support_users": (
+                    role.permissions.can_manage_support_users
+                ),
+                "created_date": role.created_date,
+            }
+        )
+
+        self._storage.next_role_id = max(
+            self._storage.next_role_id, role.id + 1
+        )
+
+        return role
+
+    async def bulk_add_roles(
+        self,
+        roles: Iterable[Row],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return self._bulk_insert(
+            self._storage.roles,
+            # The rows without ids get them as from a DB sequence
+            (self._with_role_id(row) for row in roles),
+            batch_size,
+        )
+
+    async def change_support_user_role(
+        self, support_user_id: UUID, new_role_id: int
+    ) -> None:
+        self._storage.support_users.update(
+            support_user_id, role_id=new_role_id
+        )
+
+    async def get_role_by_id(
+        self, id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
+        row = self._storage.roles.get(id)
+
+        return None if row is None else self._as_role_entity(row)
+
+    async def get_role_by_name(
+        self, name: str, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
+        row = self._storage.roles.get_by("name", name)
+
+        return None if row is None else self._as_role_entity(row)
+
+    async def get_all_roles(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Role]:
+        return [
+            self._as_role_entity(row)
+            for row in self._storage.roles.rows.values()
+        ]
+
+    async def get_all_roles_sorted_by_date(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[Role]:
+        return [
+            self._as_role_entity(row)
+            for row in self._storage.roles.ordered(desc_order)
+        ]
+
+    async def delete_role_with_id(self, id: int) -> None:
+        self._delete_role(id)
+
+    async def delete_all_roles(self) -> None:
+        for id in list(self._storage.roles.rows):
+            self._delete_role(id)
+
+    async def count_all_roles(self) -> int:
+        return len(self._storage.roles)
+
+    def _with_role_id(self, row: Row) -> Row:
+        if row.get("id") is None:
+            row = {**row, "id": self._storage.next_role_id}
+
+        self._storage.next_role_id = max(
+            self._storage.next_role_id, row["id"] + 1
+        )
+
+        return row
+
+    def _delete_role(self, id: int) -> None:
+        # As ON DELETE SET DEFAULT of support_users.role_id
+        for support_user in self._storage.support_users.find("role_id", id):
+            self._storage.support_users.update(
+                support_user["id"], role_id=None
+            )
+
+        self._storage.roles.delete(id)
+
+    # REGULAR USERS METHODS
+
+    async def add_regular_user(self, regular_user: RegularUser) -> RegularUser:
+        self._storage.regular_users.insert(
+            {
+                "id": regular_user.id,
+                "tg_bot_user_id": regular_user.tg_bot_user_id,
+                "join_date": regular_user.join_date,
+            }
+        )
+
+        return regular_user
+
+    async def bulk_add_regular_users(
+        self,
+        regular_users: Iterable[Row],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return self._bulk_insert(
+            self._storage.regular_users, regular_users, batch_size
+        )
+
+    async def get_regular_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> RegularUser | None:
+        row = self._storage.regular_users.get(id)
+
+        return None if row is None else self._as_regular_user_entity(row)
+
+    async def get_regular_user_by_tg_bot_user_id(
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> RegularUser | None:
+        row = self._storage.regular_users.get_by(
+            "tg_bot_user_id", tg_bot_user_id
+        )
+
+        return None if row is None else self._as_regular_user_entity(row)
+
+    async def get_all_regular_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[RegularUser]:
+        return [
+            self._as_regular_user_entity(row)
+            for row in self._storage.regular_users.rows.values()
+        ]
+
+    async def get_all_regular_users_sorted_by_date(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[RegularUser]:
+        return [
+            self._as_regular_user_entity(row)
+            for row in self._storage.regular_users.ordered(desc_order)
+        ]
+
+    async def delete_regular_user_with_id(self, id: UUID) -> None:
+        self._delete_regular_users([id])
+
+    async def delete_all_regular_users(self) -> None:
+        self._delete_regular_users(list(self._storage.regular_users.rows))
+
+    async def count_all_regular_users(self) -> int:
+        return len(self._storage.regular_users)
+
+    async def get_regular_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[RegularUser]:
+        return self._get_page(
+            self._storage.regular_users,
+            self._as_regular_user_entity,
+            cursor,
+            limit,
+            desc_order,
+        )
+
+    async def iter_regular_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[RegularUser]:
+        async for elem in self._iter(
+            lambda cursor, limit: self._get_page(
+                self._storage.regular_users,
+                self._as_regular_user_entity,
+                cursor,
+                limit,
+                desc_order,
+            )
+        ):
+            yield elem
+
+    def _delete_regular_users(self, ids: list[UUID]) -> None:
+        self._delete_questions(
+            [
+                question["id"]
+                for id in ids
+                for question in self._storage.questions.find(
+                    "regular_user_id", id
+                )
+            ]
+        )
+
+        for id in ids:
+            self._storage.regular_users.delete(id)
+
+    # SUPPORT USERS METHODS
+
+    async def add_support_user(self, support_user: SupportUser) -> SupportUser:
+        self._storage.support_users.insert(
+            {
+                "id": support_user.id,
+                "tg_bot_user_id": support_user.tg_bot_user_id,
+                "descriptive_name": support_user.descriptive_name,
+                "role_id": support_user.role_id,
+                "current_question_id": support_user.current_question_id,
+                "is_owner": support_user.is_owner,
+                "is_active": support_user.is_active,
+                "join_date": support_user.join_date,
+            }
+        )
+
+        return support_user
+
+    async def bulk_add_support_users(
+        self,
+        support_users: Iterable[Row],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return self._bulk_insert(
+            self._storage.support_users, support_users, batch_size
+        )
+
+    async def bind_question_to_support_user(
+        self, support_user_id: UUID, question_id: UUID
+    ) -> None:
+        self._storage.support_users.update(
+            support_user_id, current_question_id=question_id
+        )
+
+    async def unbind_question_from_support_user(
+        self, support_user_id: UUID
+    ) -> None:
+        self._storage.support_users.update(
+            support_user_id, current_question_id=None
+        )
+
+    async def deactivate_support_user(self, support_user_id: UUID) -> None:
+        self._storage.support_users.update(support_user_id, is_active=False)
+
+    async def activate_support_user(self, support_user_id: UUID) -> None:
+        self._storage.support_users.update(support_user_id, is_active=True)
+
+    async def make_support_user_owner(self, support_user_id: UUID) -> None:
+        self._storage.support_users.update(support_user_id, is_owner=True)
+
+    async def remove_owner_rights_from_support_user(
+        self, support_user_id: UUID
+    ) -> None:
+        self._storage.support_users.update(support_user_id, is_owner=False)
+
+    async def get_owner(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
+        owners = self._storage.support_users.find("is_owner", True)
+
+        return self._as_support_user_entity(owners[0]) if owners else None
+
+    async def get_support_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
+        row = self._storage.support_users.get(id)
+
+        return None if row is None else self._as_support_user_entity(row)
+
+    async def get_support_user_by_tg_bot_user_id(
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> SupportUser | None:
+        row = self._storage.support_users.get_by(
+            "tg_bot_user_id", tg_bot_user_id
+        )
+
+        return None if row is None else self._as_support_user_entity(row)
+
+    async def get_support_users_with_role_id(
+        self, role_id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[SupportUser]:
+        return [
+            self._as_support_user_entity(row)
+            for row in self._storage.support_users.find("role_id", role_id)
+        ]
+
+    async def get_all_support_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[SupportUser]:
+        return [
+            self._as_support_user_entity(row)
+            for row in self._storage.support_users.rows.values()
+        ]
+
+    async def get_all_support_users_sorted_by_date(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[SupportUser]:
+        return [
+            self._as_support_user_entity(row)
+            for row in self._storage.support_users.ordered(desc_order)
+        ]
+
+    async def delete_support_user_with_id(self, id: UUID) -> None:
+        self._delete_support_user(id)
+
+    async def delete_all_support_users(self) -> None:
+        for id in list(self._storage.support_users.rows):
+            self._delete_support_user(id)
+
+    async def count_all_support_users(self) -> int:
+        return len(self._storage.support_users)
+
+    async def count_support_users_with_role(self, role_id: int) -> int:
+        return self._storage.support_users.count("role_id", role_id)
+
+    async def count_activated_support_users(self) -> int:
+        return sum(
+            row["is_active"]
+            for row in self._storage.support_users.rows.values()
+        )
+
+    async def count_deactivated_support_users(self) -> int:
+        return sum(
+            not row["is_active"]
+            for row in self._storage.support_users.rows.values()
+        )
+
+    async def get_support_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[SupportUser]:
+        return self._get_page(
+            self._storage.support_users,
+            self._as_support_user_entity,
+            cursor,
+            limit,
+            desc_order,
+        )
+
+    async def iter_support_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[SupportUser]:
+        async for elem in self._iter(
+            lambda cursor, limit: self._get_page(
+                self._storage.support_users,
+                self._as_support_user_entity,
+                cursor,
+                limit,
+                desc_order,
+            )
+        ):
+            yield elem
+
+    def _delete_support_user(self, id: UUID) -> None:
+        for answer in self._storage.answers.find("support_user_id", id):
+            self._delete_answer(answer["id"])
+
+        self._storage.support_users.delete(id)
+
+    # QUESTIONS METHODS
+
+    async def add_question(self, question: Question) -> Question:
+        self._storage.questions.insert(
+            {
+                "id": question.id,
+                "regular_user_id": question.regular_user_id,
+                "message": question.message,
+                "tg_message_id": question.tg_message_id,
+                "date": question.date,
+            }
+        )
+
+        return question
+
+    async def bulk_add_questions(
+        self,
+        questions: Iterable[Row],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return self._bulk_insert(
+            self._storage.questions, questions, batch_size
+        )
+
+    async def get_random_unbinded_question(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Question | None:
+        for row in self._storage.questions.rows.values():
+            if not self._is_question_binded(row["id"]):
+                return self._as_question_entity(row)
+
+        return None
+
+    async def claim_question(self, support_user_id: UUID) -> Question | None:
+        """Binds the oldest unanswered and unbinded question
+        to the support user
+
+        Args:
+            support_user_id (UUID): id of the claiming support user
+
+        Returns:
+            Question | None: the claimed question or None
+            if there are no unanswered unbinded questions left
+        """
+        for row in self._storage.questions.ordered():
+            if self._is_question_binded(
+                row["id"]
+            ) or self._is_question_answered(row["id"]):
+                continue
+
+            self._storage.support_users.update(
+                support_user_id, current_question_id=row["id"]
+            )
+
+            return self._as_question_entity(row)
+
+        return None
+
+    async def get_all_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        return [
+            self._as_question_entity(row)
+            for row in self._storage.questions.rows.values()
+        ]
+
+    async def get_question_by_id(
+        self,
+        question_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
+        row = self._storage.questions.get(question_id)
+
+        return None if row is None else self._as_question_entity(row)
+
+    async def get_regular_user_last_asked_question(
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
+        rows = self._storage.questions.find("regular_user_id", regular_user_id)
+
+        return self._as_question_entity(rows[-1]) if rows else None
+
+    async def get_question_by_tg_message_id(
+        self,
+        tg_message_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
+        row = self._storage.questions.get_by("tg_message_id", tg_message_id)
+
+        return None if row is None else self._as_question_entity(row)
+
+    async def get_questions_with_regular_user_id(
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> list[Question]:
+        return [
+            self._as_question_entity(row)
+            for row in self._storage.questions.find(
+                "regular_user_id", regular_user_id
+            )
+        ]
+
+    async def get_unbinded_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        return [
+            self._as_question_entity(row)
+            for row in self._storage.questions.rows.values()
+            if not self._is_question_binded(row["id"])
+        ]
+
+    async def get_unanswered_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        return [
+            self._as_question_entity(row)
+            for row in self._storage.questions.rows.values()
+            if not self._is_question_binded(row["id"])
+            and not self._is_question_answered(row["id"])
+        ]
+
+    async def delete_question_with_id(self, question_id: UUID) -> None:
+        self._delete_questions([question_id])
+
+    async def delete_questions_with_regular_user_id(
+        self, regular_user_id: UUID
+    ) -> None:
+        self._delete_questions(
+            [
+                row["id"]
+                for row in self._storage.questions.find(
+                    "regular_user_id", regular_user_id
+                )
+            ]
+        )
+
+    async def delete_all_questions(self) -> None:
+        self._delete_questions(list(self._storage.questions.rows))
+
+    async def count_all_questions(self) -> int:
+        return len(self._storage.questions)
+
+    async def count_regular_users_questions(
+        self, regular_user_id: UUID
+    ) -> int:
+        return self._storage.questions.count(
+            "regular_user_id", regular_user_id
+        )
+
+    async def count_unanswered_questions(self) -> int:
+        return len(self._storage.questions) - self._count_answered_questions()
+
+    async def count_answered_questions(self) -> int:
+        return self._count_answered_questions()
+
+    async def count_regular_user_answered_questions(
+        self, regular_user_id: UUID
+    ) -> int:
+        return sum(
+            self._is_question_answered(row["id"])
+            for row in self._storage.questions.find(
+                "regular_user_id", regular_user_id
+            )
+        )
+
+    async def get_questions_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Question]:
+        return self._get_page(
+            self._storage.questions,
+            self._as_question_entity,
+            cursor,
+            limit,
+            desc_order,
+        )
+
+    async def iter_questions(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Question]:
+        async for elem in self._iter(
+            lambda cursor, limit: self._get_page(
+                self._storage.questions,
+                self._as_question_entity,
+                cursor,
+                limit,
+                desc_order,
+            )
+        ):
+            yield elem
+
+    def _is_question_binded(self, question_id: UUID) -> bool:
+        return bool(
+            self._storage.support_users.count(
+                "current_question_id", question_id
+            )
+        )
+
+    def _is_question_answered(self, question_id: UUID) -> bool:
+        return bool(self._storage.answers.count("question_id", question_id))
+
+    def _count_answered_questions(self) -> int:
+        return self._storage.answers.count_values("question_id")
+
+    def _delete_questions(self, ids: list[UUID]) -> None:
+        """Deletes the questions with their answers and attachments
+
+        Raises:
+            ValueError: if any of the questions is binded to a support user,
+            as support_users.current_question_id restricts the deletion
+        """
+        # Nothing is deleted if a question can't be,
+        # as the whole DELETE statement fails
+        for id in ids:
+            if self._is_question_binded(id):
+                raise ValueError(
+                    f"questions id {id} is referenced "
+                    + "by support_users.current_question_id"
+                )
+
+        for id in ids:
+            for answer in self._storage.answers.find("question_id", id):
+                self._delete_answer(answer["id"])
+
+            for attachment in self._storage.questions_attachments.find(
+                "question_id", id
+            ):
+                self._storage.questions_attachments.delete(attachment["id"])
+
+            self._storage.questions.delete(id)
+
+    # ANSWERS METHODS
+
+    async def add_answer(self, answer: Answer) -> Answer:
+        self._storage.answers.insert(
+            {
+                "id": answer.id,
+                "question_id": answer.question_id,
+                "support_user_id": answer.support_user_id,
+                "message": answer.message,
+                "tg_message_id": answer.tg_message_id,
+                "is_useful": answer.is_useful,
+                "date": answer.date,
+            }
+        )
+
+        return answer
+
+    async def bulk_add_answers(
+        self,
+        answers: Iterable[Row],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return self._bulk_insert(self._storage.answers, answers, batch_size)
+
+    async def estimate_answer_as_useful(self, answer_id: UUID) -> None:
+        self._storage.answers.update(answer_id, is_useful=True)
+
+    async def estimate_answer_as_unuseful(self, answer_id: UUID) -> None:
+        self._storage.answers.update(answer_id, is_useful=False)
+
+    async def get_all_answers(self) -> list[Answer]:
+        return [
+            self._as_answer_entity(row)
+            for row in self._storage.answers.rows.values()
+        ]
+
+    async def get_answer_by_id(self, answer_id: UUID) -> Answer | None:
+        row = self._storage.answers.get(answer_id)
+
+        return None if row is None else self._as_answer_entity(row)
+
+    async def get_question_last_answer(
+        self, question_id: UUID
+    ) -> Answer | None:
+        rows = self._storage.answers.find("question_id", question_id)
+
+        return self._as_answer_entity(rows[-1]) if rows else None
+
+    async def get_support_user_answers_with_id(
+        self, support_user_id: UUID
+    ) -> list[Answer]:
+        return [
+            self._as_answer_entity(row)
+            for row in self._storage.answers.find(
+                "support_user_id", support_user_id
+            )
+        ]
+
+    async def get_answers_with_question_id(
+        self, question_id: UUID
+    ) -> list[Answer]:
+        return [
+            self._as_answer_entity(row)
+            for row in self._storage.answers.find("question_id", question_id)
+        ]
+
+    async def get_answer_by_tg_message_id(
+        self, tg_message_id: int
+    ) -> Answer | None:
+        row = self._storage.answers.get_by("tg_message_id", tg_message_id)
+
+        return None if row is None else self._as_answer_entity(row)
+
+    async def delete_answer_with_id(self, answer_id: UUID) -> None:
+        self._delete_answer(answer_id)
+
+    async def delete_all_answers(self) -> None:
+        for id in list(self._storage.answers.rows):
+            self._delete_answer(id)
+
+    async def delete_support_user_answers_with_id(
+        self, support_user_id: UUID
+    ) -> None:
+        for row in self._storage.answers.find(
+            "support_user_id", support_user_id
+        ):
+            self._delete_answer(row["id"])
+
+    async def delete_answers_with_question_id(self, question_id: UUID) -> None:
+        for row in self._storage.answers.find("question_id", question_id):
+            self._delete_answer(row["id"])
+
+    async def count_all_answers(self) -> int:
+        return len(self._storage.answers)
+
+    async def count_all_useful_answers(self) -> int:
+        return self._count_estimated(self._storage.answers.rows.values(), True)
+
+    async def count_all_unuseful_answers(self) -> int:
+        return self._count_estimated(
+            self._storage.answers.rows.values(), False
+        )
+
+    async def count_question_answers(self, question_id: UUID) -> int:
+        return self._storage.answers.count("question_id", question_id)
+
+    async def count_support_user_answers(self, support_user_id: UUID) -> int:
+        return self._storage.answers.count("support_user_id", support_user_id)
+
+    async def count_support_user_useful_answers(
+        self, support_user_id: UUID
+    ) -> int:
+        return self._count_estimated(
+            self._storage.answers.find("support_user_id", support_user_id),
+            True,
+        )
+
+    async def count_support_user_unuseful_answers(
+        self, support_user_id: UUID
+    ) -> int:
+        return self._count_estimated(
+            self._storage.answers.find("support_user_id", support_user_id),
+            False,
+        )
+
+    async def count_regular_user_questions_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return len(self._get_regular_user_answers(regular_user_id))
+
+    async def count_regular_user_questions_useful_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return self._count_estimated(
+            self._get_regular_user_answers(regular_user_id), True
+        )
+
+    async def count_regular_user_questions_unuseful_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return self._count_estimated(
+            self._get_regular_user_answers(regular_user_id), False
+        )
+
+    async def count_regular_user_questions_unestimated_answers(
+        self, regular_user_id: UUID
+    ) -> int:
+        return self._count_estimated(
+            self._get_regular_user_answers(regular_user_id), None
+        )
+
+    async def get_answers_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        return self._get_page(
+            self._storage.answers,
+            self._as_answer_entity,
+            cursor,
+            limit,
+            desc_order,
+        )
+
+    async def iter_answers(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        async for elem in self._iter(
+            lambda cursor, limit: self._get_page(
+                self._storage.answers,
+                self._as_answer_entity,
+                cursor,
+                limit,
+                desc_order,
+            )
+        ):
+            yield elem
+
+    async def get_question_answers_page(
+        self,
+        question_id: UUID,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        return self._get_page(
+            self._storage.answers,
+            self._as_answer_entity,
+            cursor,
+            limit,
+            desc_order,
+            self._storage.answers.find("question_id", question_id),
+        )
+
+    async def iter_question_answers(
+        self,
+        question_id: UUID,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        async for elem in self._iter(
+            lambda cursor, limit: self._get_page(
+                self._storage.answers,
+                self._as_answer_entity,
+                cursor,
+                limit,
+                desc_order,
+                self._storage.answers.find("question_id", question_id),
+            )
+        ):
+            yield elem
+
+    def _get_regular_user_answers(self, regular_user_id: UUID) -> list[Row]:
+        return [
+            answer
+            for question in self._storage.questions.find(
+                "regular_user_id", regular_user_id
+            )
+            for answer in self._storage.answers.find(
+                "question_id", question["id"]
+            )
+        ]
+
+    def _count_estimated(
+        self, answers: Iterable[Row], is_useful: bool | None
+    ) -> int:
+        return sum(answer["is_useful"] is is_useful for answer in answers)
+
+    def _delete_answer(self, id: UUID) -> None:
+        for attachment in self._storage.answers_attachments.find(
+            "answer_id", id
+        ):
+            self._storage.answers_attachments.delete(attachment["id"])
+
+        self._storage.answers.delete(id)
+
+    # QUESTIONS ATTACHMENTS METHODS
+
+    async def add_question_attachment(
+        self, question_attachment: QuestionAttachment
+    ) -> QuestionAttachment:
+        self._storage.questions_attachments.insert(
+            {
+                "id": question_attachment.id,
+                "question_id": question_attachment.question_id,
+                "tg_file_id": question_attachment.tg_file_id,
+                "attachment_type": question_attachment.attachment_type,
+                "caption": question_attachment.caption,
+                "date": question_attachment.date,
+            }
+        )
+
+        return question_attachment
+
+    async def bulk_add_questions_attachments(
+        self,
+        questions_attachments: Iterable[Row],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return self._bulk_insert(
+            self._storage.questions_attachments,
+            questions_attachments,
+            batch_size,
+        )
+
+    async def get_question_attachment_by_id(
+        self, id: UUID
+    ) -> QuestionAttachment | None:
+        row = self._storage.questions_attachments.get(id)
+
+        return (
+            None if row is None else self._as_question_attachment_entity(row)
+        )
+
+    async def get_question_attachments(
+        self, question_id: UUID
+    ) -> list[QuestionAttachment]:
+        return [
+            self._as_question_attachment_entity(row)
+            for row in self._storage.questions_attachments.find(
+                "question_id", question_id
+            )
+        ]
+
+    async def get_all_questions_attachments(self) -> list[QuestionAttachment]:
+        return [
+            self._as_question_attachment_entity(row)
+            for row in self._storage.questions_attachments.rows.values()
+        ]
+
+    async def delete_question_attachment_with_id(
+        self, question_attachment_id: UUID
+    ) -> None:
+        self._storage.questions_attachments.delete(question_attachment_id)
+
+    async def count_all_questions_attachments(self) -> int:
+        return len(self._storage.questions_attachments)
+
+    async def count_question_attachments(self, question_id: UUID) -> int:
+        return self._storage.questions_attachments.count(
+            "question_id", question_id
+        )
+
+    async def get_questions_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[QuestionAttachment]:
+        return self._get_page(
+            self._storage.questions_attachments,
+            self._as_question_attachment_entity,
+            cursor,
+            limit,
+            desc_order,
+        )
+
+    # ANSWERS ATTACHMENTS METHODS
+
+    async def add_answer_attachment(
+        self, answer_attachment: AnswerAttachment
+    ) -> AnswerAttachment:
+        self._storage.answers_attachments.insert(
+            {
+                "id": answer_attachment.id,
+                "answer_id": answer_attachment.answer_id,
+                "tg_file_id": answer_attachment.tg_file_id,
+                "attachment_type": answer_attachment.attachment_type,
+                "caption": answer_attachment.caption,
+                "date": answer_attachment.date,
+            }
+        )
+
+        return answer_attachment
+
+    async def bulk_add_answers_attachments(
+        self,
+        answers_attachments: Iterable[Row],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        return self._bulk_insert(
+            self._storage.answers_attachments, answers_attachments, batch_size
+        )
+
+    async def get_answer_attachment_by_id(
+        self, id: UUID
+    ) -> AnswerAttachment | None:
+        row = self._storage.answers_attachments.get(id)
+
+        return None if row is None else self._as_answer_attachment_entity(row)
+
+    async def get_answer_attachments(
+        self, answer_id: UUID
+    ) -> list[AnswerAttachment]:
+        return [
+            self._as_answer_attachment_entity(row)
+            for row in self._storage.answers_attachments.find(
+                "answer_id", answer_id
+            )
+        ]
+
+    async def get_all_answers_attachments(self) -> list[AnswerAttachment]:
+        return [
+            self._as_answer_attachment_entity(row)
+            for row in self._storage.answers_attachments.rows.values()
+        ]
+
+    async def delete_answer_attachment_with_id(
+        self, answer_attachment_id: UUID
+    ) -> None:
+        self._storage.answers_attachments.delete(answer_attachment_id)
+
+    async def count_all_answers_attachments(self) -> int:
+        return len(self._storage.answers_attachments)
+
+    async def count_answer_attachments(self, answer_id: UUID) -> int:
+        return self._storage.answers_attachments.count("answer_id", answer_id)
+
+    async def get_answers_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[AnswerAttachment]:
+        return self._get_page(
+            self._storage.answers_attachments,
+            self._as_answer_attachment_entity,
+            cursor,
+            limit,
+            desc_order,
+        )
+
+    # STATISTICS METHODS
+
+    async def get_global_statistics(self) -> GlobalStatistics:
+        answers = self._storage.answers.rows.values()
+
+        statistics = GlobalStatistics()
+
+        statistics.total_roles = len(self._storage.roles)
+        statistics.total_regular_users = len(self._storage.regular_users)
+        statistics.total_support_users = len(self._storage.support_users)
+        statistics.total_questions = len(self._storage.questions)
+        statistics.total_answered_questions = self._count_answered_questions()
+        statistics.total_unanswered_questions = (
+            statistics.total_questions - statistics.total_answered_questions
+        )
+        statistics.total_answers = len(answers)
+        statistics.total_useful_answers = self._count_estimated(answers, True)
+        statistics.total_unuseful_answers = self._count_estimated(
+            answers, False
+        )
+        statistics.total_unestimated_ansers = self._count_estimated(
+            answers, None
+        )
+        statistics.total_questions_attachments = len(
+            self._storage.questions_attachments
+        )
+        statistics.total_answers_attachments = len(
+            self._storage.answers_attachments
+        )
+
+        return statistics
+
+    async def get_role_statistics(self, role_id: int) -> RoleStatistics:
+        statistics = RoleStatistics()
+
+        statistics.total_users = self._storage.support_users.count(
+            "role_id", role_id
+        )
+
+        return statistics
+
+    async def get_regular_user_statistics(
+        self, regular_user_id: UUID
+    ) -> RegularUserStatistics:
+        questions = self._storage.questions.find(
+            "regular_user_id", regular_user_id
+        )
+        answers = self._get_regular_user_answers(regular_user_id)
+
+        statistics = RegularUserStatistics()
+
+        statistics.asked_questions = len(questions)
+        statistics.answered_questions = sum(
+            self._is_question_answered(question["id"])
+            for question in questions
+        )
+        statistics.unanswered_questions = (
+            statistics.asked_questions - statistics.answered_questions
+        )
+        statistics.answers_for_questions = len(answers)
+        statistics.useful_answers = self._count_estimated(answers, True)
+        statistics.unuseful_answers = self._count_estimated(answers, False)
+        statistics.unestimated_answers = self._count_estimated(answers, None)
+
+        return statistics
+
+    async def get_regular_users_statistics(
+        self, regular_users_ids: list[UUID]
+    ) -> dict[UUID, RegularUserStatistics]:
+        return {
+            id: await self.get_regular_user_statistics(id)
+            for id in regular_users_ids
+        }
+
+    async def get_support_user_statistics(
+        self, support_user_id: UUID
+    ) -> SupportUserStatistics:
+        answers = self._storage.answers.find(
+            "support_user_id", support_user_id
+        )
+
+        statistics = SupportUserStatistics()
+
+        statistics.total_answers = len(answers)
+        statistics.useful_answers = self._count_estimated(answers, True)
+        statistics.unuseful_answers = self._count_estimated(answers, False)
+        statistics.unestimated_answers = self._count_estimated(answers, None)
+
+        return statistics
+
+    async def get_support_users_statistics(
+        self, support_users_ids: list[UUID]
+    ) -> dict[UUID, SupportUserStatistics]:
+        return {
+            id: await self.get_support_user_statistics(id)
+            for id in support_users_ids
+        }
+
+    async def get_question_statistics(
+        self, question_id: UUID
+    ) -> QuestionStatistics:
+        statistics = QuestionStatistics()
+
+        statistics.total_answers = self._storage.answers.count(
+            "question_id", question_id
+        )
+        statistics.total_attachments = (
+            self._storage.questions_attachments.count(
+                "question_id", question_id
+            )
+        )
+
+        return statistics
+
+    async def get_questions_statistics(
+        self, questions_ids: list[UUID]
+    ) -> dict[UUID, QuestionStatistics]:
+        return {
+            id: await self.get_question_statistics(id) for id in questions_ids
+        }
+
+    async def rebuild_statistics(self) -> None:
+        # The statistics are counted from the indexes on every read,
+        # so there are no counters to rebuild
+        return None
+
+    # ARCHIVE METHODS
+
+    async def archive_questions(
+        self, older_than: datetime, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> int:
+        # All the data is in memory anyway, so there is no archive
+        return 0
+
+    # RETENTION METHODS
+
+    async def delete_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        return self._run_in_batches(
+            self._delete_questions,
+            [
+                row["id"]
+                for row in self._storage.questions.ordered()
+                if row["date"] < older_than
+                and not self._is_question_binded(row["id"])
+            ],
+            batch_size,
+            on_progress,
+        )
+
+    async def anonymize_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        return self._run_in_batches(
+            self._anonymize_questions,
+            [
+                row["id"]
+                for row in self._storage.questions.ordered()
+                if row["date"] < older_than
+                and row["message"] != ANONYMIZED_MESSAGE
+            ],
+            batch_size,
+            on_progress,
+        )
+
+    async def erase_regular_user(
+        self,
+        regular_user_id: UUID,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        questions_ids = [
+            row["id"]
+            for row in self._storage.questions.find(
+                "regular_user_id", regular_user_id
+            )
+        ]
+
+        for question_id in questions_ids:
+            for support_user in self._storage.support_users.find(
+                "current_question_id", question_id
+            ):
+                self._storage.support_users.update(
+                    support_user["id"], current_question_id=None
+                )
+
+        erased = self._run_in_batches(
+            self._delete_questions, questions_ids, batch_size, on_progress
+        )
+
+        self._delete_regular_users([regular_user_id])
+
+        return erased
+
+    def _run_in_batches(
+        self,
+        run_batch: Callable[[list[UUID]], None],
+        ids: list[UUID],
+        batch_size: int,
+        on_progress: ProgressCallback | None,
+    ) -> int:
+        """Runs the batch for every batch_size ids, reporting the progress
+        the same way as SARepo does
+        """
+        for start in range(0, len(ids), batch_size):
+            run_batch(ids[start : start + batch_size])
+
+            if on_progress:
+                on_progress(min(start + batch_size, len(ids)))
+
+        return len(ids)
+
+    def _anonymize_questions(self, ids: list[UUID]) -> None:
+        for id in ids:
+            for answer in self._storage.answers.find("question_id", id):
+                for attachment in self._storage.answers_attachments.find(
+                    "answer_id", answer["id"]
+                ):
+                    self._storage.answers_attachments.delete(attachment["id"])
+
+                self._storage.answers.update(
+                    answer["id"], message=ANONYMIZED_MESSAGE
+                )
+
+            for attachment in self._storage.questions_attachments.find(
+                "question_id", id
+            ):
+                self._storage.questions_attachments.delete(attachment["id"])
+
+            self._storage.questions.update(id, message=ANONYMIZED_MESSAGE)
+
+    # ENTITIES METHODS
+
+    def _as_role_entity(self, row: Row) -> Role:
+        return Role(
+            id=row["id"],
+            name=row["name"],
+            description=row["description"],
+            permissions=RolePermissions(
+                row["can_answer_questions"], row["can_manage_support_users"]
+            ),
+            created_date=row["created_date"],
+        )
+
+    def _as_regular_user_entity(self, row: Row) -> RegularUser:
+        return RegularUser(
+            id=row["id"],
+            tg_bot_user_id=row["tg_bot_user_id"],
+            join_date=row["join_date"],
+        )
+
+    def _as_support_user_entity(self, row: Row) -> SupportUser:
+        role = self._storage.roles.get(row["role_id"])
+        current_question = self._storage.questions.get(
+            row["current_question_id"]
+        )
+
+        return SupportUser(
+            id=row["id"],
+            role=None if role is None else self._as_role_entity(role),
+            tg_bot_user_id=row["tg_bot_user_id"],
+            descriptive_name=row["descriptive_name"],
+            current_question=None
+            if current_question is None
+            else self._as_question_entity(current_question),
+            join_date=row["join_date"],
+            is_owner=row["is_owner"],
+            is_active=row["is_active"],
+        )
+
+    def _as_question_entity(self, row: Row) -> Question:
+        return Question(
+            id=row["id"],
+            regular_user=self._as_regular_user_entity(
+                self._storage.regular_users.rows[row["regular_user_id"]]
+            ),
+            message=row["message"],
+            tg_message_id=row["tg_message_id"],
+            date=row["date"],
+        )
+
+    def _as_answer_entity(self, row: Row) -> Answer:
+        return Answer(
+            id=row["id"],
+            support_user=self._as_support_user_entity(
+                self._storage.support_users.rows[row["support_user_id"]]
+            ),
+            question=self._as_question_entity(
+                self._storage.questions.rows[row["question_id"]]
+            ),
+            message=row["message"],
+            tg_message_id=row["tg_message_id"],
+            is_useful=row["is_useful"],
+            date=row["date"],
+        )
+
+    def _as_question_attachment_entity(self, row: Row) -> QuestionAttachment:
+        return QuestionAttachment(
+            id=row["id"],
+            question_id=row["question_id"],
+            tg_file_id=row["tg_file_id"],
+            attachment_type=row["attachment_type"],
+            caption=row["caption"],
+            date=row["date"],
+        )
+
+    def _as_answer_attachment_entity(self, row: Row) -> AnswerAttachment:
+        return AnswerAttachment(
+            id=row["id"],
+            answer_id=row["answer_id"],
+            tg_file_id=row["tg_file_id"],
+            attachment_type=row["attachment_type"],
+            caption=row["caption"],
+            date=row["date"],
+        )
@@ -1,6 +1,18 @@
 from __future__ import annotations
 from uuid import UUID
-from typing import TYPE_CHECKING, Any, AsyncContextManager, Callable
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterable,
+    TypeVar,
+)
+from contextlib import nullcontext
+from enum import Enum
 import abc
 
 if TYPE_CHECKING:
@@ -11,6 +23,91 @@ if TYPE_CHECKING:
     from bot.entities.question_attachment import QuestionAttachment
     from bot.entities.regular_user import RegularUser
     from bot.entities.role import Role
+    from bot.db.repositories.ttl_cache import CacheMetrics
+    from bot.services.statistics import (
+        GlobalStatistics,
+        QuestionStatistics,
+        RegularUserStatistics,
+        RoleStatistics,
+        SupportUserStatistics,
+    )
+
+
+class LoaderProfile(Enum):
+    """How much of the related data is loaded with the requested objects"""
+
+    # Only the data needed to build the entities,
+    # should be used on the paths that run on every message.
+    # The related entities that are rarely needed, like the support
+    # users' bound questions, are left to be resolved by the entities.
+    IDENTITY = "identity"
+
+    # The entities together with all their related collections
+    FULL = "full"
+
+
+# Position of an object in the (date, id) order,
+# pages continue right after the object with this key
+PageCursor = tuple[datetime, Any]
+
+DEFAULT_PAGE_SIZE = 100
+
+# How many rows are inserted by a single statement of the bulk methods
+BULK_INSERT_BATCH_SIZE = 1000
+
+# How many questions are moved into the archive by a single transaction
+ARCHIVE_BATCH_SIZE = 1000
+
+# How many rows are deleted or anonymized by a single transaction
+# of the deleting methods, which may touch a lot of rows
+DELETE_BATCH_SIZE = 1000
+
+# Seconds the batched methods wait between their transactions,
+# so the other transactions aren't held by them for long
+BATCH_PAUSE = 0.05
+
+# Message the texts of the anonymized questions and answers are replaced by
+ANONYMIZED_MESSAGE = "[anonymized]"
+
+# Called by the batched methods after every batch
+# with the number of the rows processed so far
+ProgressCallback = Callable[[int], Any]
+
+T = TypeVar("T")
+
+
+class Page(Generic[T]):
+    """A chunk of objects sorted by their dates and ids
+
+    To get the next page, pass next_cursor to the same method.
+    The page is the last one if next_cursor is None.
+    """
+
+    items: list[T]
+    next_cursor: PageCursor | None
+
+    def __init__(self, items: list[T], next_cursor: PageCursor | None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+class Identity:
+    """Who the telegram user is for the bot
+
+    A telegram user may be a support user and a regular user at the same
+    time, so both of them are returned if they exist.
+    """
+
+    support_user: SupportUser | None
+    regular_user: RegularUser | None
+
+    def __init__(
+        self,
+        support_user: SupportUser | None,
+        regular_user: RegularUser | None,
+    ):
+        self.support_user = support_user
+        self.regular_user = regular_user
 
 
 class RepoConfig(abc.ABC):
@@ -24,32 +121,95 @@ class RepoConfig(abc.ABC):
 
 
 class Repo(abc.ABC):
-    # ROLES METHODS
     repo_config: RepoConfig
 
     @abc.abstractmethod
     def __init__(self, repo_config: RepoConfig):
         raise NotImplementedError()
 
+    # UNIT OF WORK METHODS
+
+    def unit_of_work(self) -> AsyncContextManager[Repo]:
+        """Returns a context manager that yields a repo whose methods
+        share one transaction, which is commited when the context exits
+
+        Repos that have no transactions yield themselves.
+        """
+        return nullcontext(self)
+
+    # CACHE METHODS
+
+    def get_cache_metrics(self) -> dict[str, CacheMetrics]:
+        """Returns the metrics of the in-process caches by their names
+
+        Repos that don't cache anything return no metrics.
+        """
+        return {}
+
+    # IDENTITY METHODS
+
+    @abc.abstractmethod
+    async def resolve_identity(self, tg_bot_user_id: int) -> Identity:
+        """Finds the support user and the regular user with the telegram id
+
+        Called for almost every update, so it must be cheap: both users
+        are taken at once, loaded as with LoaderProfile.IDENTITY.
+        """
+        raise NotImplementedError()
+
+    # ROLES METHODS
+
     @abc.abstractmethod
     async def add_role(self, role: Role) -> Role:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_role_by_id(self, id: int) -> Role | None:
+    async def bulk_add_roles(
+        self,
+        roles: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """Inserts the rows into the roles table in a single transaction
+
+        Unlike add_role, the rows are inserted with multi-row statements
+        of batch_size rows each, so it's the way to import large amounts
+        of data. The rows are dicts with the columns names as the keys
+        and must contain all the columns, including the ids.
+
+        Args:
+            roles (Iterable[dict[str, Any]]): the rows to insert,
+            consumed lazily
+            batch_size (int, optional): how many rows are inserted by a
+            single statement. Defaults to BULK_INSERT_BATCH_SIZE.
+
+        Returns:
+            int: number of the inserted rows
+        """
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_role_by_name(self, name: str) -> Role | None:
+    async def get_role_by_id(
+        self, id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_all_roles(self) -> list[Role]:
+    async def get_role_by_name(
+        self, name: str, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_all_roles(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Role]:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_all_roles_sorted_by_date(
-        self, desc_order: bool = False
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[Role]:
         raise NotImplementedError()
 
@@ -72,22 +232,41 @@ class Repo(abc.ABC):
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_regular_user_by_id(self, id: UUID) -> RegularUser | None:
+    async def bulk_add_regular_users(
+        self,
+        regular_users: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """Inserts the rows into the regular_users table,
+        see bulk_add_roles
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_regular_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> RegularUser | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_regular_user_by_tg_bot_user_id(
-        self, tg_bot_user_id: int
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> RegularUser | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_all_regular_users(self) -> list[RegularUser]:
+    async def get_all_regular_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[RegularUser]:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_all_regular_users_sorted_by_date(
-        self, desc_order: bool
+        self,
+        desc_order: bool,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[RegularUser]:
         raise NotImplementedError()
 
@@ -103,12 +282,41 @@ class Repo(abc.ABC):
     async def count_all_regular_users(self) -> int:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def get_regular_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[RegularUser]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def iter_regular_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[RegularUser]:
+        raise NotImplementedError()
+
     # SUPPORT USERS METHODS
 
     @abc.abstractmethod
     async def add_support_user(self, support_user: SupportUser) -> SupportUser:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def bulk_add_support_users(
+        self,
+        support_users: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """Inserts the rows into the support_users table,
+        see bulk_add_roles
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def change_support_user_role(
         self, support_user_id: UUID, new_role_id: int
@@ -134,32 +342,42 @@ class Repo(abc.ABC):
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_support_user_by_id(self, id: UUID) -> SupportUser | None:
+    async def get_support_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_support_user_by_tg_bot_user_id(
-        self, tg_bot_user_id: int
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> SupportUser | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_owner(self) -> SupportUser | None:
+    async def get_owner(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_support_users_with_role_id(
-        self, role_id: int
+        self, role_id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
     ) -> list[SupportUser]:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_all_support_users(self) -> list[SupportUser]:
+    async def get_all_support_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[SupportUser]:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_all_support_users_sorted_by_date(
-        self, desc_order: bool
+        self,
+        desc_order: bool,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[SupportUser]:
         raise NotImplementedError()
 
@@ -187,47 +405,84 @@ class Repo(abc.ABC):
     async def count_deactivated_support_users(self) -> int:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def get_support_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[SupportUser]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def iter_support_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[SupportUser]:
+        raise NotImplementedError()
+
     # QUESTIONS METHODS
 
     @abc.abstractmethod
-    async def get_random_unbinded_question(self) -> Question | None:
+    async def get_random_unbinded_question(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Question | None:
         raise NotImplementedError()
 
-    async def get_random_unanswered_unbinded_question(self) -> Question | None:
+    @abc.abstractmethod
+    async def claim_question(self, support_user_id: UUID) -> Question | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_all_questions(self) -> list[Question]:
+    async def get_all_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_question_by_id(self, question_id: UUID) -> Question | None:
+    async def get_question_by_id(
+        self,
+        question_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_regular_user_last_asked_question(
-        self, regular_user_id: UUID
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> Question | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_question_by_tg_message_id(
-        self, tg_message_id: int
+        self,
+        tg_message_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> Question | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
     async def get_questions_with_regular_user_id(
-        self, regular_user_id: UUID
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[Question]:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_unbinded_questions(self) -> list[Question]:
+    async def get_unbinded_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_unanswered_questions(self) -> list[Question]:
+    async def get_unanswered_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
         raise NotImplementedError()
 
     @abc.abstractmethod
@@ -248,6 +503,17 @@ class Repo(abc.ABC):
     async def add_question(self, question: Question) -> Question:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def bulk_add_questions(
+        self,
+        questions: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """Inserts the rows into the questions table,
+        see bulk_add_roles
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def bind_question_to_support_user(
         self, support_user_id, question_id
@@ -285,6 +551,24 @@ class Repo(abc.ABC):
     ) -> int:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def get_questions_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Question]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def iter_questions(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Question]:
+        raise NotImplementedError()
+
     # ANSWERS METHODS
 
     @abc.abstractmethod
@@ -352,6 +636,17 @@ class Repo(abc.ABC):
     ) -> Answer:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def bulk_add_answers(
+        self,
+        answers: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """Inserts the rows into the answers table,
+        see bulk_add_roles
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def count_all_answers(self) -> int:
         raise NotImplementedError()
@@ -408,6 +703,44 @@ class Repo(abc.ABC):
     ) -> int:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def get_answers_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def iter_answers(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_question_answers_page(
+        self,
+        question_id: UUID,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def iter_question_answers(
+        self,
+        question_id: UUID,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        raise NotImplementedError()
+
     # QUESTIONS ATTACHMENTS METHODS
 
     @abc.abstractmethod
@@ -416,10 +749,21 @@ class Repo(abc.ABC):
     ) -> QuestionAttachment:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def bulk_add_questions_attachments(
+        self,
+        questions_attachments: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """Inserts the rows into the questions_attachments table,
+        see bulk_add_roles
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def get_question_attachment_by_id(
         self, id: UUID
-    ) -> QuestionAttachment:
+    ) -> QuestionAttachment | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
@@ -446,6 +790,15 @@ class Repo(abc.ABC):
     async def count_question_attachments(self, question_id: UUID) -> int:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def get_questions_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[QuestionAttachment]:
+        raise NotImplementedError()
+
     # ANSWERS ATTACHMENTS METHODS
     @abc.abstractmethod
     async def add_answer_attachment(
@@ -454,7 +807,20 @@ class Repo(abc.ABC):
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_answer_attachment_by_id(self, id: UUID) -> AnswerAttachment:
+    async def bulk_add_answers_attachments(
+        self,
+        answers_attachments: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """Inserts the rows into the answers_attachments table,
+        see bulk_add_roles
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_answer_attachment_by_id(
+        self, id: UUID
+    ) -> AnswerAttachment | None:
         raise NotImplementedError()
 
     @abc.abstractmethod
@@ -480,3 +846,127 @@ class Repo(abc.ABC):
     @abc.abstractmethod
     async def count_answer_attachments(self, answer_id: UUID) -> int:
         raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_answers_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[AnswerAttachment]:
+        raise NotImplementedError()
+
+    # STATISTICS METHODS
+
+    @abc.abstractmethod
+    async def get_global_statistics(self) -> GlobalStatistics:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_role_statistics(self, role_id: int) -> RoleStatistics:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_regular_user_statistics(
+        self, regular_user_id: UUID
+    ) -> RegularUserStatistics:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_regular_users_statistics(
+        self, regular_users_ids: list[UUID]
+    ) -> dict[UUID, RegularUserStatistics]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_support_user_statistics(
+        self, support_user_id: UUID
+    ) -> SupportUserStatistics:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_support_users_statistics(
+        self, support_users_ids: list[UUID]
+    ) -> dict[UUID, SupportUserStatistics]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_question_statistics(
+        self, question_id: UUID
+    ) -> QuestionStatistics:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_questions_statistics(
+        self, questions_ids: list[UUID]
+    ) -> dict[UUID, QuestionStatistics]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def rebuild_statistics(self) -> None:
+        raise NotImplementedError()
+
+    # ARCHIVE METHODS
+
+    @abc.abstractmethod
+    async def archive_questions(
+        self, older_than: datetime, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> int:
+        """Moves the closed questions asked before the date into the archive
+        together with their answers and attachments, returns their number
+
+        The archived questions are still found by their ids
+        and telegram message ids, listed by the pages and the per-user
+        lookups and still counted by the statistics.
+        """
+        raise NotImplementedError()
+
+    # RETENTION METHODS
+
+    # The retention methods commit every batch, and the rows that
+    # are processed already don't satisfy their conditions anymore.
+    # So, if one of them fails, running it again finishes the job.
+
+    @abc.abstractmethod
+    async def delete_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        """Deletes the questions asked before the date with their answers
+        and attachments, returns their number
+
+        The questions bound by support users are kept.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def anonymize_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        """Replaces the messages of the questions asked before the date
+        and of their answers with ANONYMIZED_MESSAGE and deletes their
+        attachments, returns the number of the anonymized questions
+
+        The questions and the answers are kept, so they are still
+        counted by the statistics.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def erase_regular_user(
+        self,
+        regular_user_id: UUID,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        """Deletes the regular user with all their questions, answers
+        for them and attachments, returns the number of the questions
+
+        The support users bound to the user's questions are unbound.
+        """
+        raise NotImplementedError()
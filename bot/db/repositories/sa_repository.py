@@ -1,7 +1,34 @@
 from __future__ import annotations
+from datetime import datetime
 from uuid import UUID
-from sqlalchemy import delete, func, Select, select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Executable,
+    bindparam,
+    delete,
+    literal,
+    func,
+    insert,
+    update,
+    Select,
+    select,
+    and_,
+    case,
+    cast,
+    distinct,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import (
+    joinedload,
+    selectinload,
+    InstrumentedAttribute,
+)
 from bot.entities.answer import Answer
 from bot.entities.answer_attachment import AnswerAttachment
 from bot.entities.question import Question
@@ -9,31 +36,845 @@ from bot.entities.question_attachment import QuestionAttachment
 from bot.entities.regular_user import RegularUser
 from bot.entities.role import Role
 from bot.entities.support_user import SupportUser
+from bot.services.statistics import (
+    GlobalStatistics,
+    QuestionStatistics,
+    RegularUserStatistics,
+    RoleStatistics,
+    SupportUserStatistics,
+)
 from bot.db.models.sa_models import (
+    ModelBase,
     QuestionModel,
+    QuestionStatus,
     QuestionAttachmentModel,
     AnswerModel,
     AnswerAttachmentModel,
+    QuestionArchiveModel,
+    AnswerArchiveModel,
+    QuestionAttachmentArchiveModel,
+    AnswerAttachmentArchiveModel,
     RegularUserModel,
     SupportUserModel,
     RoleModel,
+    StatisticsCountersModel,
+    StatisticsScope,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Callable
+from contextlib import asynccontextmanager, nullcontext
+from itertools import cycle, islice
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Sequence,
+    TypeVar,
+)
+
+from bot.db.repositories.repository import (
+    ANONYMIZED_MESSAGE,
+    ARCHIVE_BATCH_SIZE,
+    BATCH_PAUSE,
+    BULK_INSERT_BATCH_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DELETE_BATCH_SIZE,
+    Identity,
+    LoaderProfile,
+    Page,
+    PageCursor,
+    ProgressCallback,
+    Repo,
+    RepoConfig,
+)
+from bot.db.repositories.group_commit import GroupCommitter
+from bot.db.repositories.sa_row_mappers import (
+    ANSWERS_ARCHIVE_ROWS,
+    ANSWERS_ATTACHMENTS_ARCHIVE_ROWS,
+    ANSWERS_ATTACHMENTS_ROWS,
+    ANSWERS_ROWS,
+    QUESTIONS_ARCHIVE_ROWS,
+    QUESTIONS_ATTACHMENTS_ARCHIVE_ROWS,
+    QUESTIONS_ATTACHMENTS_ROWS,
+    QUESTIONS_ROWS,
+    REGULAR_USERS_ROWS,
+    SUPPORT_USERS_ROWS,
+    RowMapper,
+)
+from bot.db.repositories.ttl_cache import CacheMetrics, TTLCache
+import asyncio
+
+
+T = TypeVar("T")
+
+
+IDENTITY_CACHE_SIZE = 10_000
+
+# How many questions are refreshed by a statement
+# of SARepo._refresh_questions_status
+QUESTIONS_STATUS_BATCH_SIZE = 1000
+
+ANSWERED_STATUSES = (QuestionStatus.ANSWERED, QuestionStatus.CLOSED)
+
+UNANSWERED_STATUSES = (QuestionStatus.OPEN, QuestionStatus.BOUND)
+
+# The identities changed by other processes, e.g. the users erased
+# by the CLI, may be returned from the cache for up to this long.
+# The writes that fail on them drop the cache, see SARepo._commit.
+IDENTITY_CACHE_TTL = 60.0
+
+# Statements of the hottest lookups by their keys. They are built once
+# and their parameters are bound when they are executed, so every call
+# executes the same statement: its cache key is memoized and its compiled
+# form is always found in the compiled cache.
+_hot_statements: dict[Hashable, Executable] = {}
 
-from bot.db.repositories.repository import Repo, RepoConfig
+
+def _get_hot_statement(
+    key: Hashable, build: Callable[[], Executable]
+) -> Executable:
+    statement = _hot_statements.get(key)
+
+    if statement is None:
+        statement = _hot_statements[key] = build()
+
+    return statement
 
 
 class SARepoConfig(RepoConfig):
     connection_provider: Callable[..., AsyncSession]
 
-    def __init__(self, connection_povider: Callable[..., AsyncSession]):
+    # Sessions of the read replicas, the read-only methods
+    # take them in turns instead of the primary's sessions
+    read_connection_providers: list[Callable[..., AsyncSession]]
+
+    # Sessions that read the primary database without taking
+    # the connections of the writes, e.g. the read-only connections
+    # to the SQLite file, when all the writes share a single connection.
+    # They are used instead of the primary's sessions until a repo writes.
+    primary_read_connection_provider: Callable[..., AsyncSession] | None
+
+    # Shared by all the repos made with the config,
+    # so it lives as long as the process does
+    identity_cache: TTLCache[int, Identity]
+
+    # Commits the inserts of questions, answers and their attachments
+    # made outside of the units of work in batches, if it's set
+    group_committer: GroupCommitter | None
+
+    def __init__(
+        self,
+        connection_povider: Callable[..., AsyncSession],
+        identity_cache: TTLCache[int, Identity] | None = None,
+        read_connection_providers: Sequence[Callable[..., AsyncSession]] = (),
+        primary_read_connection_provider: Callable[..., AsyncSession]
+        | None = None,
+        group_committer: GroupCommitter | None = None,
+    ):
         self.connection_provider = connection_povider
+        self.read_connection_providers = list(read_connection_providers)
+        self.primary_read_connection_provider = (
+            primary_read_connection_provider
+        )
+        self.group_committer = group_committer
+        # An empty cache is falsy, so it's compared with None
+        self.identity_cache = (
+            identity_cache
+            if identity_cache is not None
+            else TTLCache(IDENTITY_CACHE_SIZE, IDENTITY_CACHE_TTL)
+        )
+
+        self._read_connection_providers = cycle(
+            self.read_connection_providers or [connection_povider]
+        )
+
+    def get_read_connection_provider(self) -> Callable[..., AsyncSession]:
+        """Returns the sessions of the next read replica in turn,
+        or the primary's sessions if there are no replicas
+        """
+        return next(self._read_connection_providers)
 
 
 class SARepo(Repo):
-    def __init__(self, repo_config: RepoConfig) -> None:
-        self._session = repo_config.connection_provider
+    repo_config: SARepoConfig
+
+    def __init__(
+        self,
+        repo_config: SARepoConfig,
+        unit_of_work_session: AsyncSession | None = None,
+    ) -> None:
+        self.repo_config = repo_config
+        self._session_maker = repo_config.connection_provider
+        self._unit_of_work_session = unit_of_work_session
+
+        # Session the unit of work reads with until it writes,
+        # if the config has the primary's read sessions
+        self._unit_of_work_read_session: AsyncSession | None = None
+
+        # Telegram ids whose identities were changed by the unit of work,
+        # None if all of them might have been changed
+        self._changed_identities: set[int] | None = set()
+
+        # Whether the repo has written anything yet. After that it reads
+        # from the primary, since the replicas may not have the changes.
+        self._has_writes = False
+
+        # Entities looked up by their ids during the unit of work,
+        # so the related entities resolved by the handlers of an update
+        # are loaded once. It's cleared after every write.
+        self._identity_map: dict[Hashable, Any] = {}
+
+    # UNIT OF WORK METHODS
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[SARepo]:
+        """Opens a unit of work bound to a single session and transaction
+
+        All the methods of the yielded repo share the session,
+        so only one connection is checked out from the pool.
+        The transaction is commited when the context is exited
+        and rolled back if an exception was raised.
+
+        If the config has the primary's read sessions, the unit of work
+        reads with one of them until it writes, so the connection
+        of the writes is only taken for the writes and the commit.
+
+        Yields:
+            SARepo: a repo bound to the unit of work's session
+        """
+        if self._unit_of_work_session:
+            yield self
+
+            return
+
+        async with self._session_maker() as session:
+            unit_of_work_repo = SARepo(self.repo_config, session)
+            unit_of_work_repo._has_writes = self._has_writes
+
+            read_session_maker = (
+                self.repo_config.primary_read_connection_provider
+            )
+
+            if read_session_maker and not self._has_writes:
+                unit_of_work_repo._unit_of_work_read_session = (
+                    read_session_maker()
+                )
+
+            try:
+                async with session.begin():
+                    yield unit_of_work_repo
+
+            finally:
+                await unit_of_work_repo._close_unit_of_work_read_session()
+
+                # The identities might have been cached by other repos
+                # before the changes were commited or rolled back
+                unit_of_work_repo._invalidate_changed_identities()
+
+    def _session(self) -> AsyncContextManager[AsyncSession]:
+        if self._unit_of_work_session:
+            return nullcontext(self._unit_of_work_session)
+
+        return self._session_maker()
+
+    def _read_session(self) -> AsyncContextManager[AsyncSession]:
+        """Returns a session for the read-only methods
+
+        It's a session of a read replica, unless the repo reads
+        from the primary, see _reads_from_replicas
+        """
+        if not self._reads_from_replicas():
+            return self._primary_read_session()
+
+        return self.repo_config.get_read_connection_provider()()
+
+    def _primary_read_session(self) -> AsyncContextManager[AsyncSession]:
+        """Returns a session, that reads the latest data of the primary
+
+        It's a read session of the primary, if the config has them,
+        until the repo writes. Then it's the session of the writes,
+        so the repo reads its own writes.
+        """
+        if self._has_writes:
+            return self._session()
+
+        if self._unit_of_work_read_session:
+            return nullcontext(self._unit_of_work_read_session)
+
+        read_session_maker = self.repo_config.primary_read_connection_provider
+
+        if read_session_maker and not self._unit_of_work_session:
+            return read_session_maker()
+
+        return self._session()
+
+    async def _close_unit_of_work_read_session(self) -> None:
+        if self._unit_of_work_read_session:
+            await self._unit_of_work_read_session.close()
+
+            self._unit_of_work_read_session = None
+
+    def _reads_from_replicas(self) -> bool:
+        """Whether the read-only methods read from the replicas
+
+        The unit of work reads with its own session, so its checks
+        see the primary's data, which it writes next, and all of its reads
+        use one connection. The repo, which has written anything already,
+        reads from the primary too, so it reads its own writes.
+        """
+        return bool(
+            self.repo_config.read_connection_providers
+            and not self._unit_of_work_session
+            and not self._has_writes
+        )
+
+    async def _commit(self, session: AsyncSession) -> None:
+        self._has_writes = True
+        self._identity_map.clear()
+
+        try:
+            # Inside of a unit of work the changes are only flushed,
+            # they will be commited when the unit of work is finished
+            if session is self._unit_of_work_session:
+                await session.flush()
+
+            else:
+                await session.commit()
+
+        except IntegrityError:
+            # The write may refer to a user deleted by another process,
+            # whose identity is still cached, so the next lookups
+            # must read the identities from the database
+            self.repo_config.identity_cache.clear()
+
+            raise
+
+        if session is self._unit_of_work_session:
+            # Objects are detached after every write, so the next methods
+            # load them from the DB, as if they had their own sessions
+            session.expunge_all()
+
+            # The next reads are made with the session of the writes
+            await self._close_unit_of_work_read_session()
+
+    async def _group_write(
+        self, write: Callable[[AsyncSession], Awaitable[T]]
+    ) -> T:
+        """Runs the write and commits it
+
+        Outside of a unit of work the write is commited together with
+        the concurrent writes of the other repos, if the config has
+        a group committer. Either way it returns once the write is commited
+        or, inside of a unit of work, flushed.
+        """
+        group_committer = self.repo_config.group_committer
+
+        if group_committer is None or self._unit_of_work_session:
+            async with self._session() as session:
+                result = await write(session)
+
+                await self._commit(session)
+
+                return result
+
+        self._has_writes = True
+        self._identity_map.clear()
+
+        try:
+            return await group_committer.write(write)
+
+        except IntegrityError:
+            # See _commit
+            self.repo_config.identity_cache.clear()
+
+            raise
+
+    async def _get_identity_mapped(
+        self, key: Hashable, load: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Returns the entity loaded with the key before in the unit
+        of work, or loads it. Outside of a unit of work it's always loaded,
+        since the repo may live much longer than an update.
+        """
+        if not self._unit_of_work_session:
+            return await load()
+
+        if key not in self._identity_map:
+            self._identity_map[key] = await load()
+
+        return self._identity_map[key]
+
+    # CACHE METHODS
+
+    def get_cache_metrics(self) -> dict[str, CacheMetrics]:
+        return {
+            "regular_users_identities": self.repo_config.identity_cache.metrics
+        }
+
+    # IDENTITY METHODS
+
+    async def resolve_identity(self, tg_bot_user_id: int) -> Identity:
+        """Finds the support user and the regular user with one query
+
+        The identities of the users who aren't support users are cached,
+        since they are the most of the updates and don't change until
+        the user becomes a support user. Support users aren't cached,
+        because they carry their roles and bound questions.
+        The identities read from the replicas aren't cached either,
+        since the replicas may not have the latest changes yet.
+
+        Args:
+            tg_bot_user_id (int): telegram id of the user
+
+        Returns:
+            Identity: the support user and the regular user if they exist
+        """
+        identity_cache = self.repo_config.identity_cache
+
+        # Changes of the unit of work aren't commited yet,
+        # so they mustn't be read from or put into the cache
+        is_cacheable = (
+            self._changed_identities is not None
+            and tg_bot_user_id not in self._changed_identities
+        )
+
+        if is_cacheable and (identity := identity_cache.get(tg_bot_user_id)):
+            return identity
+
+        # The identity read before an invalidation mustn't be cached after it
+        cache_version = identity_cache.version
+        is_cacheable = is_cacheable and not self._reads_from_replicas()
+
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                "resolve_identity", self._build_resolve_identity_query
+            )
+
+            support_user, regular_user = (
+                await session.execute(q, {"tg_bot_user_id": tg_bot_user_id})
+            ).one()
+
+            identity = Identity(
+                support_user and support_user.as_support_user_entity(),
+                regular_user and regular_user.as_regular_user_entity(),
+            )
+
+        if (
+            is_cacheable
+            and not identity.support_user
+            and identity_cache.version == cache_version
+        ):
+            identity_cache.set(tg_bot_user_id, identity)
+
+        return identity
+
+    def _build_resolve_identity_query(self) -> Select:
+        tg_user = select(
+            bindparam(
+                "tg_bot_user_id", type_=SupportUserModel.tg_bot_user_id.type
+            ).label("tg_bot_user_id")
+        ).subquery()
+
+        return self._get_support_user_query_with_options(
+            select(SupportUserModel, RegularUserModel)
+            .select_from(tg_user)
+            .outerjoin(
+                SupportUserModel,
+                SupportUserModel.tg_bot_user_id == tg_user.c.tg_bot_user_id,
+            )
+            .outerjoin(
+                RegularUserModel,
+                RegularUserModel.tg_bot_user_id == tg_user.c.tg_bot_user_id,
+            ),
+            LoaderProfile.IDENTITY,
+        )
+
+    def _invalidate_identities(
+        self, tg_bot_users_ids: list[int] | None = None
+    ) -> None:
+        """Drops the cached identities of the users
+
+        Args:
+            tg_bot_users_ids (list[int] | None, optional): telegram ids of
+            the users. Defaults to None, which means all the users.
+        """
+        identity_cache = self.repo_config.identity_cache
+
+        if tg_bot_users_ids is None:
+            identity_cache.clear()
+
+        else:
+            for tg_bot_user_id in tg_bot_users_ids:
+                identity_cache.invalidate(tg_bot_user_id)
+
+        if not self._unit_of_work_session:
+            return
+
+        if tg_bot_users_ids is None or self._changed_identities is None:
+            self._changed_identities = None
+
+        else:
+            self._changed_identities.update(tg_bot_users_ids)
+
+    def _invalidate_changed_identities(self) -> None:
+        if self._changed_identities is None:
+            self.repo_config.identity_cache.clear()
+
+        else:
+            for tg_bot_user_id in self._changed_identities:
+                self.repo_config.identity_cache.invalidate(tg_bot_user_id)
+
+    # BULK INSERT METHODS
+
+    async def _bulk_insert(
+        self,
+        session: AsyncSession,
+        model: type[ModelBase],
+        rows: Iterable[dict[str, Any]],
+        batch_size: int,
+    ) -> int:
+        """Inserts the rows into the table of the model in batches
+
+        Args:
+            session (AsyncSession): session to insert the rows with
+            model (type[ModelBase]): model of the table
+            rows (Iterable[dict[str, Any]]): the rows to insert,
+            consumed lazily, so only a batch of them is kept in memory
+            batch_size (int): how many rows are inserted by a statement
+
+        Raises:
+            ValueError: if batch_size is less than 1
+
+        Returns:
+            int: number of the inserted rows
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1")
+
+        rows = iter(rows)
+        inserted = 0
+
+        # The rows are inserted into the table directly, the ORM
+        # would only spend time on the objects that aren't needed
+        table = model.__table__
+
+        while batch := list(islice(rows, batch_size)):
+            match session.get_bind().dialect.name:
+                case "sqlite":
+                    # SQLite has no network round trips, so executemany
+                    # of a prepared single row INSERT is the fastest way
+                    await session.execute(insert(table), batch)
+
+                case _:
+                    await session.execute(insert(table).values(batch))
+
+            inserted += len(batch)
+
+        if inserted:
+            # The bulk inserts are imports, so all the counters of the scopes
+            # that count the rows are counted from scratch on the next read
+            # instead of working out the changes of every one of them here
+            await self._invalidate_counters(session, StatisticsScope.GLOBAL)
+
+            for scope in _BULK_INSERTS_SCOPES.get(model, ()):
+                await self._invalidate_counters(session, scope)
+
+        return inserted
+
+    # BATCHED METHODS
+
+    async def _run_in_batches(
+        self,
+        run_batch: Callable[[AsyncSession], Awaitable[int]],
+        batch_size: int,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        """Runs the batch by its own transaction again and again, until
+        it processes less than batch_size rows
+
+        The other tasks run between the batches, so the live traffic
+        isn't held by the long jobs. Since every batch is commited,
+        an interrupted job continues from where it stopped once it's
+        run again. Inside of a unit of work all the batches are
+        commited together.
+
+        Returns:
+            int: number of the rows processed by all the batches
+        """
+        processed = 0
+
+        while True:
+            async with self._session() as session:
+                processed_by_batch = await run_batch(session)
+
+                await self._commit(session)
+
+            processed += processed_by_batch
+
+            if on_progress and processed_by_batch:
+                on_progress(processed)
+
+            if processed_by_batch < batch_size:
+                return processed
+
+            await asyncio.sleep(BATCH_PAUSE)
+
+    async def _delete_in_batches(
+        self,
+        model: type[ModelBase],
+        where: Callable[[Any], ColumnElement[bool]] | None = None,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+        columns: tuple[str, ...] = (),
+        after_delete: Callable[[AsyncSession, Sequence[Row]], Awaitable[Any]]
+        | None = None,
+    ) -> int:
+        """Deletes the rows of the model's table and of its archive table,
+        if it has one, that satisfy the condition built for each of them
+
+        The rows are deleted by batches of their ids, see _run_in_batches.
+        Every batch invalidates the counters of the rows it deletes.
+        after_delete is called with the rows of the ids and the columns
+        of the deleted rows, e.g. to refresh the questions they belonged to.
+
+        Returns:
+            int: number of the deleted rows
+        """
+        deleted = 0
+
+        for table in (model, _ARCHIVE_MODELS.get(model)):
+            if table is None:
+                continue
+
+            q = select(
+                table.id, *(getattr(table, name) for name in columns)
+            ).limit(batch_size)
+
+            if where is not None:
+                q = q.where(where(table))
+
+            async def delete_batch(
+                session: AsyncSession, table: Any = table, q: Select = q
+            ) -> int:
+                rows = (await session.execute(q)).all()
+
+                if not rows:
+                    return 0
+
+                ids = [row.id for row in rows]
+
+                await self._invalidate_counters_of(session, model, ids)
+
+                await session.execute(
+                    delete(table)
+                    .where(table.id.in_(ids))
+                    .execution_options(synchronize_session=False)
+                )
+
+                if after_delete:
+                    await after_delete(session, rows)
+
+                return len(rows)
+
+            deleted += await self._run_in_batches(
+                delete_batch,
+                batch_size,
+                on_progress
+                and (lambda processed: on_progress(deleted + processed)),
+            )
+
+        return deleted
+
+    def _refresh_questions_of(
+        self, column: str
+    ) -> Callable[[AsyncSession, Sequence[Row]], Awaitable[None]]:
+        """Returns after_delete of _delete_in_batches, which refreshes
+        the statuses of the questions referenced by the column
+        of the deleted rows
+        """
+
+        async def refresh(session: AsyncSession, rows: Sequence[Row]):
+            await self._refresh_questions_status(
+                session,
+                set(_not_none(*(row._mapping[column] for row in rows))),
+            )
+
+        return refresh
+
+    # PAGINATION METHODS
+
+    async def _get_page(
+        self,
+        q: Select,
+        date_column: InstrumentedAttribute,
+        id_column: InstrumentedAttribute,
+        as_entity: Callable[[Any], T],
+        cursor: PageCursor | None,
+        limit: int,
+        desc_order: bool,
+        rows: bool = False,
+    ) -> Page[T]:
+        """Returns a page of the query results using keyset pagination
+
+        Instead of skipping the previous rows with OFFSET, the page starts
+        right after the cursor in the (date, id) order. So, any page
+        is taken with an index search, no matter how deep it is.
+
+        If rows is True, the query selects columns instead of models
+        and its rows are passed to as_entity as they are.
+        """
+        if limit < 1:
+            raise ValueError("Page limit must be a positive number")
+
+        q = _order_by_keyset(q, date_column, id_column, desc_order)
+
+        if cursor is not None:
+            q = q.where(
+                _keyset_after(date_column, id_column, cursor, desc_order)
+            )
+
+        async with self._read_session() as session:
+            # One more row is taken to find out if there is a next page
+            query_result = await session.execute(q.limit(limit + 1))
+
+            result = (
+                query_result.all() if rows else query_result.scalars().all()
+            )
+
+            last = result[limit - 1] if len(result) > limit else None
+
+            return Page(
+                [as_entity(elem) for elem in result[:limit]],
+                last
+                and (
+                    getattr(last, date_column.key),
+                    getattr(last, id_column.key),
+                ),
+            )
+
+    async def _iter(
+        self,
+        q: Select,
+        date_column: InstrumentedAttribute,
+        id_column: InstrumentedAttribute,
+        as_entity: Callable[[Any], T],
+        desc_order: bool,
+        rows: bool = False,
+    ) -> AsyncIterator[T]:
+        """Streams the query results using a server-side cursor
+
+        Rows are fetched by batches, so only one batch
+        is kept in memory at a time. If rows is True, the rows
+        are passed to as_entity as they are, as in _get_page.
+        """
+        q = _order_by_keyset(
+            q, date_column, id_column, desc_order
+        ).execution_options(yield_per=_STREAM_BATCH_SIZE)
+
+        async with self._read_session() as session:
+            result = await (
+                session.stream(q) if rows else session.stream_scalars(q)
+            )
+
+            async for elem in result:
+                yield as_entity(elem)
+
+    async def _get_rows_page(
+        self,
+        row_mapper: RowMapper[T],
+        cursor: PageCursor | None,
+        limit: int,
+        desc_order: bool,
+        where: ColumnElement[bool] | None = None,
+    ) -> Page[T]:
+        """Returns a page of the entities built straight from the rows
+        of the mapper's Core select, without loading any models
+
+        The entities of the page share their related entities
+        that are never changed, see SharedEntities.
+        """
+        return await self._get_page(
+            row_mapper.query
+            if where is None
+            else row_mapper.query.where(where),
+            row_mapper.date_column,  # type: ignore
+            row_mapper.id_column,  # type: ignore
+            row_mapper.make_as_entity(),
+            cursor,
+            limit,
+            desc_order,
+            rows=True,
+        )
+
+    def _iter_rows(
+        self,
+        row_mapper: RowMapper[T],
+        desc_order: bool,
+        where: ColumnElement[bool] | None = None,
+    ) -> AsyncIterator[T]:
+        return self._iter(
+            row_mapper.query
+            if where is None
+            else row_mapper.query.where(where),
+            row_mapper.date_column,  # type: ignore
+            row_mapper.id_column,  # type: ignore
+            row_mapper.make_as_entity(),
+            desc_order,
+            rows=True,
+        )
+
+    async def _get_page_with_archive(
+        self,
+        page: Page[T],
+        archive_row_mapper: RowMapper[T],
+        cursor: PageCursor | None,
+        limit: int,
+        desc_order: bool,
+        where: Callable[[Any], ColumnElement[bool]] | None = None,
+    ) -> Page[T]:
+        """Merges the page of the hot table with the rows of the archive
+        table that go after the same cursor
+
+        The open questions are never archived, so the archived rows
+        are interleaved with the hot ones by their dates. Both tables are
+        read after the cursor and the first rows of the two are taken.
+        The hot table is read first, so a row archived in between is
+        read twice rather than missed, and the second one is dropped.
+        """
+        archived = await self._get_rows_page(
+            archive_row_mapper,
+            cursor,
+            limit,
+            desc_order,
+            None if where is None else where(archive_row_mapper.table.c),
+        )
+
+        hot_ids = {elem.id for elem in page.items}  # type: ignore
+
+        items = sorted(
+            page.items
+            + [
+                elem
+                for elem in archived.items
+                if elem.id not in hot_ids  # type: ignore
+            ],
+            key=_get_keyset,
+            reverse=desc_order,
+        )
+
+        has_next = (
+            len(items) > limit
+            or page.next_cursor is not None
+            or archived.next_cursor is not None
+        )
+
+        return Page(
+            items[:limit], _get_keyset(items[limit - 1]) if has_next else None
+        )
 
     # ROLES METHODS
 
@@ -43,12 +884,44 @@ class SARepo(Repo):
 
             session.add(role_model)
 
-            await session.commit()
+            await self._update_counters(
+                session, StatisticsScope.GLOBAL, "", roles=1
+            )
+
+            await self._commit(session)
 
             role.id = role_model.id  # type: ignore
 
             return role
 
+    async def bulk_add_roles(
+        self,
+        roles: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        async with self._session() as session:
+            inserted = await self._bulk_insert(
+                session, RoleModel, roles, batch_size
+            )
+
+            if inserted and session.get_bind().dialect.name == "postgresql":
+                # The ids were inserted explicitly, so the sequence
+                # must be moved past them for the next add_role calls
+                await session.execute(
+                    select(
+                        func.setval(
+                            func.pg_get_serial_sequence(
+                                RoleModel.__tablename__, "id"
+                            ),
+                            select(func.max(RoleModel.id)).scalar_subquery(),
+                        )
+                    )
+                )
+
+            await self._commit(session)
+
+            return inserted
+
     async def change_support_user_role(
         self, support_user_id: UUID, new_role_id: int
     ) -> None:
@@ -63,48 +936,79 @@ class SARepo(Repo):
 
             role = (await session.execute(role_q)).scalars().first()
 
+            if support_user.role_id is not None:
+                await self._update_counters(
+                    session,
+                    StatisticsScope.ROLE,
+                    support_user.role_id,
+                    support_users=-1,
+                )
+
+            await self._update_counters(
+                session, StatisticsScope.ROLE, new_role_id, support_users=1
+            )
+
             support_user.role = role
 
-            session.commit()
+            await self._commit(session)
 
-    async def get_role_by_id(self, id: int) -> Role | None:
-        async with self._session() as session:
+    async def get_role_by_id(
+        self, id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
+        return await self._get_identity_mapped(
+            (Role, id, loader_profile),
+            lambda: self._get_role_by_id(id, loader_profile),
+        )
+
+    async def _get_role_by_id(
+        self, id: int, loader_profile: LoaderProfile
+    ) -> Role | None:
+        async with self._read_session() as session:
             q = self._get_role_query_with_options(
-                select(RoleModel).where(RoleModel.id == id)
+                select(RoleModel).where(RoleModel.id == id), loader_profile
             )
 
             result = (await session.execute(q)).scalars().first()
 
             return result and result.as_role_entity()
 
-    async def get_role_by_name(self, name: str) -> Role | None:
-        async with self._session() as session:
+    async def get_role_by_name(
+        self, name: str, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Role | None:
+        async with self._read_session() as session:
             q = self._get_role_query_with_options(
-                select(RoleModel).where(RoleModel.name == name)
+                select(RoleModel).where(RoleModel.name == name), loader_profile
             )
 
             result = (await session.execute(q)).scalars().first()
 
             return result and result.as_role_entity()
 
-    async def get_all_roles(self) -> list[Role]:
-        async with self._session() as session:
-            q = select(RoleModel).options(selectinload(RoleModel.users))
+    async def get_all_roles(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Role]:
+        async with self._read_session() as session:
+            q = self._get_role_query_with_options(
+                select(RoleModel), loader_profile
+            )
 
             result = (await session.execute(q)).scalars().all()
 
             return [elem.as_role_entity() for elem in result]
 
     async def get_all_roles_sorted_by_date(
-        self, desc_order: bool = False
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[Role]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_role_query_with_options(
                 select(RoleModel).order_by(
                     RoleModel.created_date.desc()
                     if desc_order
                     else RoleModel.created_date.asc()
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().all()
@@ -113,28 +1017,32 @@ class SARepo(Repo):
 
     async def delete_role_with_id(self, id: int) -> None:
         async with self._session() as session:
+            await self._invalidate_counters_of(session, RoleModel, [id])
+
             q = delete(RoleModel).where(RoleModel.id == id)
 
             await session.execute(q)
 
-            await session.commit()
+            await self._commit(session)
 
     async def delete_all_roles(self) -> None:
-        async with self._session() as session:
-            q = delete(RoleModel)
-
-            await session.execute(q)
-
-            await session.commit()
+        await self._delete_in_batches(RoleModel)
 
     async def count_all_roles(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(RoleModel.id))
 
             return (await session.execute(q)).scalar()
 
-    def _get_role_query_with_options(self, q: Select):
-        return q.options(selectinload(RoleModel.users))
+    def _get_role_query_with_options(
+        self, q: Select, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ):
+        match loader_profile:
+            case LoaderProfile.IDENTITY:
+                return q
+
+            case LoaderProfile.FULL:
+                return q.options(selectinload(RoleModel.users))
 
     # REGULAR USERS METHODS
 
@@ -144,14 +1052,47 @@ class SARepo(Repo):
 
             session.add(regular_user_model)
 
-            await session.commit()
+            await self._update_counters(
+                session, StatisticsScope.GLOBAL, "", regular_users=1
+            )
+
+            await self._commit(session)
+
+            self._invalidate_identities([regular_user.tg_bot_user_id])
 
             return regular_user
 
-    async def get_regular_user_by_id(self, id: UUID) -> RegularUser | None:
+    async def bulk_add_regular_users(
+        self,
+        regular_users: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
         async with self._session() as session:
+            inserted = await self._bulk_insert(
+                session, RegularUserModel, regular_users, batch_size
+            )
+
+            await self._commit(session)
+
+            self._invalidate_identities()
+
+            return inserted
+
+    async def get_regular_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> RegularUser | None:
+        return await self._get_identity_mapped(
+            (RegularUser, id, loader_profile),
+            lambda: self._get_regular_user_by_id(id, loader_profile),
+        )
+
+    async def _get_regular_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile
+    ) -> RegularUser | None:
+        async with self._read_session() as session:
             q = self._get_regular_user_query_with_options(
-                select(RegularUserModel).where(RegularUserModel.id == id)
+                select(RegularUserModel).where(RegularUserModel.id == id),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().first()
@@ -159,23 +1100,36 @@ class SARepo(Repo):
             return result and result.as_regular_user_entity()
 
     async def get_regular_user_by_tg_bot_user_id(
-        self, tg_bot_user_id: int
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> RegularUser | None:
-        async with self._session() as session:
-            q = self._get_regular_user_query_with_options(
-                select(RegularUserModel).where(
-                    RegularUserModel.tg_bot_user_id == tg_bot_user_id
-                )
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                ("get_regular_user_by_tg_bot_user_id", loader_profile),
+                lambda: self._get_regular_user_query_with_options(
+                    select(RegularUserModel).where(
+                        RegularUserModel.tg_bot_user_id
+                        == bindparam("tg_bot_user_id")
+                    ),
+                    loader_profile,
+                ),
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (
+                (await session.execute(q, {"tg_bot_user_id": tg_bot_user_id}))
+                .scalars()
+                .first()
+            )
 
             return result and result.as_regular_user_entity()
 
-    async def get_all_regular_users(self) -> list[RegularUser]:
-        async with self._session() as session:
+    async def get_all_regular_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[RegularUser]:
+        async with self._read_session() as session:
             q = self._get_regular_user_query_with_options(
-                select(RegularUserModel)
+                select(RegularUserModel), loader_profile
             )
 
             result = (await session.execute(q)).scalars().all()
@@ -183,15 +1137,18 @@ class SARepo(Repo):
             return [elem.as_regular_user_entity() for elem in result]
 
     async def get_all_regular_users_sorted_by_date(
-        self, desc_order: bool = False
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[RegularUser]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_regular_user_query_with_options(
                 select(RegularUserModel).order_by(
                     RegularUserModel.join_date.desc()
                     if desc_order
                     else RegularUserModel.join_date.asc()
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().all()
@@ -199,29 +1156,89 @@ class SARepo(Repo):
             return [elem.as_regular_user_entity() for elem in result]
 
     async def delete_regular_user_with_id(self, id: UUID) -> None:
+        # The questions are deleted by batches first,
+        # so deleting the user doesn't cascade to all of them at once
+        await self.delete_questions_with_regular_user_id(id)
+
         async with self._session() as session:
+            await self._invalidate_counters_of(session, RegularUserModel, [id])
+
             q = delete(RegularUserModel).where(RegularUserModel.id == id)
 
             await session.execute(q)
 
-            await session.commit()
+            await self._commit(session)
+
+            self._invalidate_identities()
 
     async def delete_all_regular_users(self) -> None:
-        async with self._session() as session:
-            q = delete(RegularUserModel)
+        await self._delete_in_batches(QuestionModel)
 
-            await session.execute(q)
+        await self._delete_in_batches(RegularUserModel)
 
-            await session.commit()
+        self._invalidate_identities()
 
     async def count_all_regular_users(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(RegularUserModel.id))
 
             return (await session.execute(q)).scalar()
 
-    def _get_regular_user_query_with_options(self, q: Select):
-        return q.options(selectinload(RegularUserModel.questions))
+    async def get_regular_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[RegularUser]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            return await self._get_rows_page(
+                REGULAR_USERS_ROWS, cursor, limit, desc_order
+            )
+
+        return await self._get_page(
+            self._get_regular_user_query_with_options(
+                select(RegularUserModel), loader_profile
+            ),
+            RegularUserModel.join_date,
+            RegularUserModel.id,
+            RegularUserModel.as_regular_user_entity,
+            cursor,
+            limit,
+            desc_order,
+        )
+
+    async def iter_regular_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[RegularUser]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            async for elem in self._iter_rows(REGULAR_USERS_ROWS, desc_order):
+                yield elem
+
+            return
+
+        async for elem in self._iter(
+            self._get_regular_user_query_with_options(
+                select(RegularUserModel), loader_profile
+            ),
+            RegularUserModel.join_date,
+            RegularUserModel.id,
+            RegularUserModel.as_regular_user_entity,
+            desc_order,
+        ):
+            yield elem
+
+    def _get_regular_user_query_with_options(
+        self, q: Select, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ):
+        match loader_profile:
+            case LoaderProfile.IDENTITY:
+                return q
+
+            case LoaderProfile.FULL:
+                return q.options(selectinload(RegularUserModel.questions))
 
     # SUPPORT USERS METHODS
 
@@ -233,14 +1250,55 @@ class SARepo(Repo):
 
             session.add(support_user_model)
 
-            await session.commit()
+            await self._update_counters(
+                session, StatisticsScope.GLOBAL, "", support_users=1
+            )
+
+            if support_user_model.role_id is not None:
+                await self._update_counters(
+                    session,
+                    StatisticsScope.ROLE,
+                    support_user_model.role_id,
+                    support_users=1,
+                )
+
+            await self._commit(session)
+
+            self._invalidate_identities([support_user.tg_bot_user_id])
 
             return support_user
 
+    async def bulk_add_support_users(
+        self,
+        support_users: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        bound_questions_ids: set[UUID] = set()
+
+        async with self._session() as session:
+            inserted = await self._bulk_insert(
+                session,
+                SupportUserModel,
+                _collect_values(
+                    support_users, "current_question_id", bound_questions_ids
+                ),
+                batch_size,
+            )
+
+            await self._refresh_questions_status(session, bound_questions_ids)
+
+            await self._commit(session)
+
+            self._invalidate_identities()
+
+            return inserted
+
     async def bind_question_to_support_user(
         self, support_user_id: UUID, question_id: UUID
     ) -> None:
         async with self._session() as session:
+            await self._restore_archived_questions(session, [question_id])
+
             q = (
                 select(SupportUserModel)
                 .where(SupportUserModel.id == support_user_id)
@@ -249,9 +1307,17 @@ class SARepo(Repo):
 
             support_user = (await session.execute(q)).scalars().first()
 
+            previous_question_id = support_user.current_question_id
+
             support_user.current_question_id = question_id
 
-            await session.commit()
+            await session.flush()
+
+            await self._refresh_questions_status(
+                session, _not_none(question_id, previous_question_id)
+            )
+
+            await self._commit(session)
 
     async def unbind_question_from_support_user(
         self, support_user_id: UUID
@@ -265,9 +1331,17 @@ class SARepo(Repo):
                 (await session.execute(q)).scalars().first()
             )
 
+            previous_question_id = support_user.current_question_id
+
             support_user.current_question = None  # type: ignore
 
-            await session.commit()
+            await session.flush()
+
+            await self._refresh_questions_status(
+                session, _not_none(previous_question_id)
+            )
+
+            await self._commit(session)
 
     async def deactivate_support_user(self, support_user_id: UUID) -> None:
         async with self._session() as session:
@@ -281,7 +1355,7 @@ class SARepo(Repo):
 
             support_user.is_active = False  # type: ignore
 
-            await session.commit()
+            await self._commit(session)
 
     async def activate_support_user(self, support_user_id: UUID) -> None:
         async with self._session() as session:
@@ -295,7 +1369,7 @@ class SARepo(Repo):
 
             support_user.is_active = True  # type: ignore
 
-            await session.commit()
+            await self._commit(session)
 
     async def make_support_user_owner(self, support_user_id: UUID) -> None:
         async with self._session() as session:
@@ -309,7 +1383,7 @@ class SARepo(Repo):
 
             support_user.is_owner = True  # type: ignore
 
-            await session.commit()
+            await self._commit(session)
 
     async def remove_owner_rights_from_support_user(
         self, support_user_id: UUID
@@ -325,24 +1399,38 @@ class SARepo(Repo):
 
             support_user.is_owner = False  # type: ignore
 
-            await session.commit()
+            await self._commit(session)
 
-    async def get_owner(self) -> SupportUser | None:
-        async with self._session() as session:
+    async def get_owner(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
+        async with self._read_session() as session:
             q = self._get_support_user_query_with_options(
                 select(SupportUserModel).where(
                     SupportUserModel.is_owner == True  # noqa: E712
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().first()
 
             return result and result.as_support_user_entity()
 
-    async def get_support_user_by_id(self, id: UUID) -> SupportUser | None:
-        async with self._session() as session:
+    async def get_support_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> SupportUser | None:
+        return await self._get_identity_mapped(
+            (SupportUser, id, loader_profile),
+            lambda: self._get_support_user_by_id(id, loader_profile),
+        )
+
+    async def _get_support_user_by_id(
+        self, id: UUID, loader_profile: LoaderProfile
+    ) -> SupportUser | None:
+        async with self._read_session() as session:
             q = self._get_support_user_query_with_options(
-                select(SupportUserModel).where(SupportUserModel.id == id)
+                select(SupportUserModel).where(SupportUserModel.id == id),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().first()
@@ -350,37 +1438,51 @@ class SARepo(Repo):
             return result and result.as_support_user_entity()
 
     async def get_support_user_by_tg_bot_user_id(
-        self, tg_bot_user_id: int
+        self,
+        tg_bot_user_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> SupportUser | None:
-        async with self._session() as session:
-            q = self._get_support_user_query_with_options(
-                select(SupportUserModel).where(
-                    SupportUserModel.tg_bot_user_id == tg_bot_user_id
-                )
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                ("get_support_user_by_tg_bot_user_id", loader_profile),
+                lambda: self._get_support_user_query_with_options(
+                    select(SupportUserModel).where(
+                        SupportUserModel.tg_bot_user_id
+                        == bindparam("tg_bot_user_id")
+                    ),
+                    loader_profile,
+                ),
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (
+                (await session.execute(q, {"tg_bot_user_id": tg_bot_user_id}))
+                .scalars()
+                .first()
+            )
 
             return result and result.as_support_user_entity()
 
     async def get_support_users_with_role_id(
-        self, role_id: int
+        self, role_id: int, loader_profile: LoaderProfile = LoaderProfile.FULL
     ) -> list[SupportUser]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_support_user_query_with_options(
                 select(SupportUserModel).where(
                     SupportUserModel.role_id == role_id
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().all()
 
             return [elem.as_support_user_entity() for elem in result]
 
-    async def get_all_support_users(self) -> list[SupportUser]:
-        async with self._session() as session:
+    async def get_all_support_users(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[SupportUser]:
+        async with self._read_session() as session:
             q = self._get_support_user_query_with_options(
-                select(SupportUserModel)
+                select(SupportUserModel), loader_profile
             )
 
             result = (await session.execute(q)).scalars().all()
@@ -388,15 +1490,18 @@ class SARepo(Repo):
             return [elem.as_support_user_entity() for elem in result]
 
     async def get_all_support_users_sorted_by_date(
-        self, desc_order: bool = False
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[SupportUser]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_support_user_query_with_options(
                 select(SupportUserModel).order_by(
                     SupportUserModel.join_date.desc()
                     if desc_order
                     else SupportUserModel.join_date.asc()
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().all()
@@ -404,29 +1509,63 @@ class SARepo(Repo):
             return [elem.as_support_user_entity() for elem in result]
 
     async def delete_support_user_with_id(self, id: UUID) -> None:
+        await self.delete_support_user_answers_with_id(id)
+
         async with self._session() as session:
+            # The question the user bound loses the binding
+            questions_ids = await self._get_support_user_questions_ids(
+                session, id
+            )
+
+            await self._invalidate_counters_of(session, SupportUserModel, [id])
+
             q = delete(SupportUserModel).where(SupportUserModel.id == id)
 
             await session.execute(q)
 
-            await session.commit()
+            await self._refresh_questions_status(session, questions_ids)
+
+            await self._commit(session)
 
     async def delete_all_support_users(self) -> None:
-        async with self._session() as session:
-            q = delete(SupportUserModel)
+        await self._delete_in_batches(
+            AnswerModel,
+            columns=("question_id",),
+            after_delete=self._refresh_questions_of("question_id"),
+        )
 
-            await session.execute(q)
+        await self._delete_in_batches(
+            SupportUserModel,
+            columns=("current_question_id",),
+            after_delete=self._refresh_questions_of("current_question_id"),
+        )
 
-            await session.commit()
+    async def _get_support_user_questions_ids(
+        self, session: AsyncSession, support_user_id: UUID
+    ) -> list[UUID]:
+        q = (
+            select(AnswerModel.question_id)
+            .where(AnswerModel.support_user_id == support_user_id)
+            .union(
+                select(SupportUserModel.current_question_id).where(
+                    and_(
+                        SupportUserModel.id == support_user_id,
+                        SupportUserModel.current_question_id != None,  # noqa
+                    )
+                )
+            )
+        )
+
+        return list((await session.execute(q)).scalars().all())
 
     async def count_all_support_users(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(SupportUserModel.id))
 
             return (await session.execute(q)).scalar()
 
     async def count_support_users_with_role(self, role_id: int) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(SupportUserModel.id)).where(
                 SupportUserModel.role_id == role_id
             )
@@ -434,7 +1573,7 @@ class SARepo(Repo):
             return (await session.execute(q)).scalar()
 
     async def count_activated_support_users(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(SupportUserModel.id)).where(
                 SupportUserModel.is_active == True  # noqa: E712
             )
@@ -442,145 +1581,397 @@ class SARepo(Repo):
             return (await session.execute(q)).scalar()
 
     async def count_deactivated_support_users(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(SupportUserModel.id)).where(
                 SupportUserModel.is_active == False  # noqa: E712
             )
 
             return (await session.execute(q)).scalar()
 
-    def _get_support_user_query_with_options(self, q: Select):
-        return q.options(
-            selectinload(SupportUserModel.current_question).selectinload(
-                QuestionModel.regular_user
-            ),
-            selectinload(SupportUserModel.current_question).selectinload(
-                QuestionModel.current_support_user
-            ),
-            selectinload(SupportUserModel.current_question).selectinload(
-                QuestionModel.question_attachments
-            ),
-            selectinload(SupportUserModel.role),
-            selectinload(SupportUserModel.current_question).selectinload(
-                QuestionModel.regular_user
+    async def get_support_users_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[SupportUser]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            return await self._get_rows_page(
+                SUPPORT_USERS_ROWS, cursor, limit, desc_order
+            )
+
+        return await self._get_page(
+            self._get_support_user_query_with_options(
+                select(SupportUserModel), loader_profile
             ),
+            SupportUserModel.join_date,
+            SupportUserModel.id,
+            SupportUserModel.as_support_user_entity,
+            cursor,
+            limit,
+            desc_order,
         )
 
+    async def iter_support_users(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[SupportUser]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            async for elem in self._iter_rows(SUPPORT_USERS_ROWS, desc_order):
+                yield elem
+
+            return
+
+        async for elem in self._iter(
+            self._get_support_user_query_with_options(
+                select(SupportUserModel), loader_profile
+            ),
+            SupportUserModel.join_date,
+            SupportUserModel.id,
+            SupportUserModel.as_support_user_entity,
+            desc_order,
+        ):
+            yield elem
+
+    def _get_support_user_query_with_options(
+        self, q: Select, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ):
+        match loader_profile:
+            case LoaderProfile.IDENTITY:
+                # The role is checked on almost every update, while
+                # the bound question is resolved only by the handlers
+                # that need it, with SupportUser.get_current_question
+                return q.options(joinedload(SupportUserModel.role))
+
+            case LoaderProfile.FULL:
+                return q.options(
+                    selectinload(
+                        SupportUserModel.current_question
+                    ).selectinload(QuestionModel.regular_user),
+                    selectinload(
+                        SupportUserModel.current_question
+                    ).selectinload(QuestionModel.current_support_user),
+                    selectinload(
+                        SupportUserModel.current_question
+                    ).selectinload(QuestionModel.question_attachments),
+                    selectinload(SupportUserModel.role),
+                )
+
     # QUESTIONS METHODS
 
     async def add_question(self, question: Question) -> Question:
-        async with self._session() as session:
-            question_model = QuestionModel(question)
+        return await self._group_write(
+            lambda session: self._add_question(session, question)
+        )
+
+    async def _add_question(
+        self, session: AsyncSession, question: Question
+    ) -> Question:
+        question_model = QuestionModel(question)
 
-            session.add(question_model)
+        session.add(question_model)
+
+        await self._update_counters(
+            session, StatisticsScope.GLOBAL, "", questions=1
+        )
 
-            await session.commit()
+        await self._update_counters(
+            session,
+            StatisticsScope.REGULAR_USER,
+            question_model.regular_user_id,
+            questions=1,
+        )
 
-            return question
+        return question
 
-    async def get_random_unbinded_question(self) -> Question | None:
+    async def bulk_add_questions(
+        self,
+        questions: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
         async with self._session() as session:
+            inserted = await self._bulk_insert(
+                session, QuestionModel, questions, batch_size
+            )
+
+            await self._commit(session)
+
+            return inserted
+
+    async def get_random_unbinded_question(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> Question | None:
+        async with self._read_session() as session:
             q = self._get_question_query_with_options(
                 select(QuestionModel).where(
                     QuestionModel.current_support_user == None
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().first()
 
             return result and result.as_question_entity()
 
-    async def get_random_unanswered_unbinded_question(self) -> Question | None:
+    async def claim_question(self, support_user_id: UUID) -> Question | None:
+        """Binds the oldest unanswered and unbinded question
+        to the support user
+
+        The question is picked and binded in one statement, so support
+        users claiming questions at the same time never get the same one.
+        On PostgreSQL the picked question is locked, while the questions
+        locked by others are skipped instead of waited for. SQLite runs
+        the statement under its write lock, which gives the same result.
+
+        Args:
+            support_user_id (UUID): id of the claiming support user
+
+        Returns:
+            Question | None: the claimed question or None
+            if there are no unanswered unbinded questions left
+        """
         async with self._session() as session:
-            q = self._get_question_query_with_options(
-                select(QuestionModel)
-                .where(QuestionModel.current_support_user == None)
-                .where(QuestionModel.answers == None)
+            previous_question_id = (
+                await session.execute(
+                    select(SupportUserModel.current_question_id).where(
+                        SupportUserModel.id == support_user_id
+                    )
+                )
+            ).scalar()
+
+            # Open questions are the unanswered and unbinded ones,
+            # the oldest of them is taken by the status index
+            claimable_q = (
+                select(
+                    QuestionModel.id,
+                    literal(support_user_id, SupportUserModel.id.type).label(
+                        "support_user_id"
+                    ),
+                )
+                .where(QuestionModel.status == QuestionStatus.OPEN)
+                .order_by(QuestionModel.date)
+                .limit(1)
+                .with_for_update(skip_locked=True)
             )
 
-            result = (await session.execute(q)).scalars().first()
+            match session.get_bind().dialect.name:
+                case "postgresql" | "sqlite":
+                    # Nothing is updated if there are no questions to claim,
+                    # so the currently binded question is kept
+                    claimable = claimable_q.subquery()
+
+                    q = (
+                        update(SupportUserModel)
+                        .where(
+                            SupportUserModel.id == claimable.c.support_user_id
+                        )
+                        .values(current_question_id=claimable.c.id)
+                        .returning(SupportUserModel.current_question_id)
+                        .execution_options(synchronize_session=False)
+                    )
+
+                    question_id = (await session.execute(q)).scalar()
+
+                case _:
+                    # MySQL doesn't allow selecting from the updated table
+                    # in a subquery, so the question is locked first
+                    question_id = (await session.execute(claimable_q)).scalar()
+
+                    if question_id is not None:
+                        q = (
+                            update(SupportUserModel)
+                            .where(SupportUserModel.id == support_user_id)
+                            .values(current_question_id=question_id)
+                            .execution_options(synchronize_session=False)
+                        )
+
+                        await session.execute(q)
+
+            if question_id is not None:
+                await self._refresh_questions_status(
+                    session, _not_none(question_id, previous_question_id)
+                )
+
+            await self._commit(session)
+
+            if question_id is None:
+                return None
+
+            question_q = self._get_question_query_with_options(
+                select(QuestionModel).where(QuestionModel.id == question_id),
+                LoaderProfile.IDENTITY,
+            )
+
+            result = (await session.execute(question_q)).scalars().first()
 
             return result and result.as_question_entity()
 
-    async def get_all_questions(self) -> list[Question]:
-        async with self._session() as session:
-            q = self._get_question_query_with_options(select(QuestionModel))
+    async def get_all_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        async with self._read_session() as session:
+            q = self._get_question_query_with_options(
+                select(QuestionModel), loader_profile
+            )
 
             result = (await session.execute(q)).scalars().all()
 
             return [elem.as_question_entity() for elem in result]
 
-    async def get_question_by_id(self, question_id: UUID) -> Question | None:
-        async with self._session() as session:
-            q = self._get_question_query_with_options(
-                select(QuestionModel).where(QuestionModel.id == question_id)
+    async def get_question_by_id(
+        self,
+        question_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Question | None:
+        return await self._get_identity_mapped(
+            (Question, question_id, loader_profile),
+            lambda: self._get_question_by_id(question_id, loader_profile),
+        )
+
+    async def _get_question_by_id(
+        self, question_id: UUID, loader_profile: LoaderProfile
+    ) -> Question | None:
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                ("get_question_by_id", loader_profile),
+                lambda: self._get_question_query_with_options(
+                    select(QuestionModel).where(
+                        QuestionModel.id == bindparam("question_id")
+                    ),
+                    loader_profile,
+                ),
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (
+                (await session.execute(q, {"question_id": question_id}))
+                .scalars()
+                .first()
+            )
 
-            return result and result.as_question_entity()
+            if result:
+                return result.as_question_entity()
+
+            archived = await self._get_archived(
+                session,
+                QUESTIONS_ARCHIVE_ROWS,
+                lambda columns: columns.id == question_id,
+            )
+
+            return archived[0] if archived else None
 
     async def get_regular_user_last_asked_question(
-        self, regular_user_id: UUID
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> Question | None:
-        async with self._session() as session:
-            q = self._get_question_query_with_options(
-                select(QuestionModel)
-                .where(QuestionModel.regular_user_id == regular_user_id)
-                .order_by(QuestionModel.date.desc())
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                ("get_regular_user_last_asked_question", loader_profile),
+                lambda: self._get_question_query_with_options(
+                    select(QuestionModel)
+                    .where(
+                        QuestionModel.regular_user_id
+                        == bindparam("regular_user_id")
+                    )
+                    .order_by(QuestionModel.date.desc()),
+                    loader_profile,
+                ),
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (
+                (
+                    await session.execute(
+                        q, {"regular_user_id": regular_user_id}
+                    )
+                )
+                .scalars()
+                .first()
+            )
 
             return result and result.as_question_entity()
 
     async def get_question_by_tg_message_id(
-        self, tg_message_id: int
+        self,
+        tg_message_id: int,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> Question | None:
-        async with self._session() as session:
-            q = self._get_question_query_with_options(
-                select(QuestionModel).where(
-                    QuestionModel.tg_message_id == tg_message_id
-                )
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                ("get_question_by_tg_message_id", loader_profile),
+                lambda: self._get_question_query_with_options(
+                    select(QuestionModel).where(
+                        QuestionModel.tg_message_id
+                        == bindparam("tg_message_id")
+                    ),
+                    loader_profile,
+                ),
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (
+                (await session.execute(q, {"tg_message_id": tg_message_id}))
+                .scalars()
+                .first()
+            )
 
-            return result and result.as_question_entity()
+            if result:
+                return result.as_question_entity()
+
+            archived = await self._get_archived(
+                session,
+                QUESTIONS_ARCHIVE_ROWS,
+                lambda columns: columns.tg_message_id == tg_message_id,
+            )
+
+            return archived[0] if archived else None
 
     async def get_questions_with_regular_user_id(
-        self, regular_user_id: UUID
+        self,
+        regular_user_id: UUID,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
     ) -> list[Question]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_question_query_with_options(
                 select(QuestionModel).where(
                     QuestionModel.regular_user_id == regular_user_id
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().all()
 
-            return [elem.as_question_entity() for elem in result]
+            archived = await self._get_archived(
+                session,
+                QUESTIONS_ARCHIVE_ROWS,
+                lambda columns: columns.regular_user_id == regular_user_id,
+            )
 
-    async def get_unbinded_questions(self) -> list[Question]:
-        async with self._session() as session:
+            return [elem.as_question_entity() for elem in result] + archived
+
+    async def get_unbinded_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        async with self._read_session() as session:
             q = self._get_question_query_with_options(
                 select(QuestionModel).where(
                     QuestionModel.current_support_user == None
-                )
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().all()
 
             return [elem.as_question_entity() for elem in result]
 
-    async def get_unanswered_questions(self) -> list[Question]:
-        async with self._session() as session:
+    async def get_unanswered_questions(
+        self, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ) -> list[Question]:
+        async with self._read_session() as session:
             q = self._get_question_query_with_options(
                 select(QuestionModel).where(
-                    QuestionModel.current_support_user == None
-                    and QuestionModel.answers == []
-                )
+                    QuestionModel.status == QuestionStatus.OPEN
+                ),
+                loader_profile,
             )
 
             result = (await session.execute(q)).scalars().all()
@@ -589,32 +1980,29 @@ class SARepo(Repo):
 
     async def delete_question_with_id(self, question_id: UUID):
         async with self._session() as session:
-            q = delete(QuestionModel).where(QuestionModel.id == question_id)
+            await self._invalidate_counters_of(
+                session, QuestionModel, [question_id]
+            )
 
-            await session.execute(q)
+            await self._delete_with_archive(
+                session, QuestionModel, lambda table: table.id == question_id
+            )
 
-            await session.commit()
+            await self._commit(session)
 
     async def delete_questions_with_regular_user_id(
-        self, reguar_user_id: UUID
+        self, regular_user_id: UUID
     ):
-        async with self._session() as session:
-            q = delete(QuestionModel).where(QuestionModel.id == reguar_user_id)
-
-            await session.execute(q)
-
-            await session.commit()
+        await self._delete_in_batches(
+            QuestionModel,
+            lambda table: table.regular_user_id == regular_user_id,
+        )
 
     async def delete_all_questions(self):
-        async with self._session() as session:
-            q = delete(QuestionModel)
-
-            await session.execute(q)
-
-            await session.commit()
+        await self._delete_in_batches(QuestionModel)
 
     async def count_all_questions(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(QuestionModel.id))
 
             return (await session.execute(q)).scalar()
@@ -622,25 +2010,31 @@ class SARepo(Repo):
     async def count_regular_users_questions(
         self, regular_user_id: UUID
     ) -> int:
-        async with self._session() as session:
-            q = select(func.count(QuestionModel.id)).where(
-                QuestionModel.regular_user_id == regular_user_id
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                "count_regular_users_questions",
+                lambda: select(func.count(QuestionModel.id)).where(
+                    QuestionModel.regular_user_id
+                    == bindparam("regular_user_id")
+                ),
             )
 
-            return (await session.execute(q)).scalar()
+            return (
+                await session.execute(q, {"regular_user_id": regular_user_id})
+            ).scalar()
 
     async def count_unanswered_questions(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(QuestionModel.id)).where(
-                QuestionModel.answers == None
+                QuestionModel.status.in_(UNANSWERED_STATUSES)
             )
 
             return (await session.execute(q)).scalar()
 
     async def count_answered_questions(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(QuestionModel.id)).where(
-                QuestionModel.answers != None
+                QuestionModel.status.in_(ANSWERED_STATUSES)
             )
 
             return (await session.execute(q)).scalar()
@@ -648,102 +2042,381 @@ class SARepo(Repo):
     async def count_regular_user_answered_questions(
         self, regular_user_id: UUID
     ) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(QuestionModel.id)).where(
                 and_(
                     QuestionModel.regular_user_id == regular_user_id,
-                    QuestionModel.answers != None,  # noqa: 712
+                    QuestionModel.status.in_(ANSWERED_STATUSES),
                 )
             )
 
             return (await session.execute(q)).scalar()
 
-    def _get_question_query_with_options(self, q: Select):
-        return q.options(
-            selectinload(QuestionModel.regular_user),
-            selectinload(QuestionModel.current_support_user),
-            selectinload(QuestionModel.question_attachments),
+    async def get_questions_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Question]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            page = await self._get_rows_page(
+                QUESTIONS_ROWS, cursor, limit, desc_order
+            )
+
+        else:
+            page = await self._get_page(
+                self._get_question_query_with_options(
+                    select(QuestionModel), loader_profile
+                ),
+                QuestionModel.date,
+                QuestionModel.id,
+                QuestionModel.as_question_entity,
+                cursor,
+                limit,
+                desc_order,
+            )
+
+        return await self._get_page_with_archive(
+            page, QUESTIONS_ARCHIVE_ROWS, cursor, limit, desc_order
         )
 
-    # ANSWERS METHODS
+    async def iter_questions(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Question]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            async for elem in self._iter_rows(QUESTIONS_ROWS, desc_order):
+                yield elem
+
+            return
+
+        async for elem in self._iter(
+            self._get_question_query_with_options(
+                select(QuestionModel), loader_profile
+            ),
+            QuestionModel.date,
+            QuestionModel.id,
+            QuestionModel.as_question_entity,
+            desc_order,
+        ):
+            yield elem
+
+    def _get_question_query_with_options(
+        self, q: Select, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ):
+        match loader_profile:
+            case LoaderProfile.IDENTITY:
+                return q.options(joinedload(QuestionModel.regular_user))
+
+            case LoaderProfile.FULL:
+                return q.options(
+                    selectinload(QuestionModel.regular_user),
+                    selectinload(QuestionModel.current_support_user),
+                    selectinload(QuestionModel.question_attachments),
+                )
 
-    async def add_answer(
+    async def _refresh_questions_status(
         self,
-        answer: Answer,
-    ) -> Answer:
-        async with self._session() as session:
-            answer_model = AnswerModel(answer)
+        session: AsyncSession,
+        questions_ids: Iterable[UUID] | None = None,
+    ) -> None:
+        """Counts the statuses, the answers and the first answers' dates
+        of the questions again from their answers and bound support users
+
+        Used by the writes that may change them in many ways at once,
+        like the deletions and the bulk inserts. All the questions
+        are refreshed if no ids are passed.
+        """
+        answers_q = select(AnswerModel.id).where(
+            AnswerModel.question_id == QuestionModel.id
+        )
 
-            session.add(answer_model)
+        is_bound = (
+            select(SupportUserModel.id)
+            .where(SupportUserModel.current_question_id == QuestionModel.id)
+            .exists()
+        )
+
+        q = (
+            update(QuestionModel)
+            .values(
+                answers_count=select(func.count(AnswerModel.id))
+                .where(AnswerModel.question_id == QuestionModel.id)
+                .scalar_subquery(),
+                first_answered_at=select(func.min(AnswerModel.date))
+                .where(AnswerModel.question_id == QuestionModel.id)
+                .scalar_subquery(),
+                status=case(
+                    (
+                        answers_q.where(
+                            AnswerModel.is_useful != None
+                        ).exists(),  # noqa
+                        _status_literal(QuestionStatus.CLOSED),
+                    ),
+                    (
+                        answers_q.exists(),
+                        _status_literal(QuestionStatus.ANSWERED),
+                    ),
+                    (is_bound, _status_literal(QuestionStatus.BOUND)),
+                    else_=_status_literal(QuestionStatus.OPEN),
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-            await session.commit()
+        if questions_ids is None:
+            await session.execute(q)
 
-            return answer
+            return
 
-    async def estimate_answer_as_useful(self, answer_id: UUID) -> None:
-        async with self._session() as session:
-            q = (
-                select(AnswerModel)
-                .where(AnswerModel.id == answer_id)
-                .options(selectinload(AnswerModel.support_user))
-            )
+        questions_ids = iter(questions_ids)
 
-            answer = (await session.execute(q)).scalars().first()
+        while batch := list(
+            islice(questions_ids, QUESTIONS_STATUS_BATCH_SIZE)
+        ):
+            await session.execute(q.where(QuestionModel.id.in_(batch)))
 
-            answer.is_useful = True
+    # ANSWERS METHODS
 
-            await session.commit()
+    async def add_answer(self, answer: Answer) -> Answer:
+        return await self._group_write(
+            lambda session: self._add_answer(session, answer)
+        )
 
-    async def estimate_answer_as_unuseful(self, answer_id: UUID) -> None:
-        async with self._session() as session:
-            q = (
-                select(AnswerModel)
-                .where(AnswerModel.id == answer_id)
-                .options(selectinload(AnswerModel.support_user))
+    async def _add_answer(
+        self, session: AsyncSession, answer: Answer
+    ) -> Answer:
+        answer_model = AnswerModel(answer)
+
+        session.add(answer_model)
+
+        # The question is updated before its answers count is read,
+        # so the concurrent answers wait for each other, and only
+        # the first one of them counts the question as answered.
+        # Closed questions stay closed.
+        await session.execute(
+            update(QuestionModel)
+            .where(QuestionModel.id == answer_model.question_id)
+            .values(
+                answers_count=QuestionModel.answers_count + 1,
+                first_answered_at=func.coalesce(
+                    QuestionModel.first_answered_at, answer_model.date
+                ),
+                status=case(
+                    (
+                        QuestionModel.status == QuestionStatus.CLOSED,
+                        QuestionModel.status,
+                    ),
+                    else_=_status_literal(QuestionStatus.ANSWERED),
+                ),
             )
+            .execution_options(synchronize_session=False)
+        )
 
-            answer = (await session.execute(q)).scalars().first()
+        question_q = select(
+            QuestionModel.regular_user_id, QuestionModel.answers_count
+        ).where(QuestionModel.id == answer_model.question_id)
 
-            answer.is_useful = False
+        question = (await session.execute(question_q)).one()
 
-            await session.commit()
+        answered_questions = 1 if question.answers_count == 1 else 0
 
-    async def get_all_answers(self) -> list[Answer]:
-        async with self._session() as session:
-            q = self._get_answer_query_with_options(select(AnswerModel))
+        await self._update_counters(
+            session,
+            StatisticsScope.GLOBAL,
+            "",
+            answers=1,
+            answered_questions=answered_questions,
+        )
 
-            result = (await session.execute(q)).scalars().all()
+        await self._update_counters(
+            session,
+            StatisticsScope.REGULAR_USER,
+            question.regular_user_id,
+            answers=1,
+            answered_questions=answered_questions,
+        )
 
-            return [elem.as_answer_entity() for elem in result]
+        await self._update_counters(
+            session,
+            StatisticsScope.SUPPORT_USER,
+            answer_model.support_user_id,
+            answers=1,
+        )
+
+        return answer
+
+    async def bulk_add_answers(
+        self,
+        answers: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        answered_questions_ids: set[UUID] = set()
 
-    async def get_answer_by_id(self, answer_id: UUID) -> Answer | None:
         async with self._session() as session:
-            q = self._get_answer_query_with_options(
-                select(AnswerModel).where(AnswerModel.id == answer_id)
+            inserted = await self._bulk_insert(
+                session,
+                AnswerModel,
+                _collect_values(
+                    answers, "question_id", answered_questions_ids
+                ),
+                batch_size,
             )
 
-            result = (await session.execute(q)).scalars().first()
+            await self._refresh_questions_status(
+                session, answered_questions_ids
+            )
 
-            return result and result.as_answer_entity()
+            await self._commit(session)
 
-    async def get_question_last_answer(
-        self, question_id: UUID
-    ) -> Answer | None:
+            return inserted
+
+    async def estimate_answer_as_useful(self, answer_id: UUID) -> None:
+        await self._estimate_answer(answer_id, True)
+
+    async def estimate_answer_as_unuseful(self, answer_id: UUID) -> None:
+        await self._estimate_answer(answer_id, False)
+
+    async def _estimate_answer(self, answer_id: UUID, is_useful: bool) -> None:
         async with self._session() as session:
-            q = self._get_answer_query_with_options(
-                select(AnswerModel)
-                .where(AnswerModel.question_id == question_id)
-                .order_by(AnswerModel.date.desc())
+            answer = await self._get_answer_to_estimate(session, answer_id)
+
+            estimated, not_estimated = (
+                ("useful_answers", "unuseful_answers")
+                if is_useful
+                else ("unuseful_answers", "useful_answers")
             )
 
-            result = (await session.execute(q)).scalars().first()
+            # The previous estimation is checked by the conditions
+            # of the updates, so the concurrent estimations of the answer
+            # wait for each other and see the estimations they change
+            for previous_estimation, deltas in (
+                (None, {estimated: 1}),
+                (not is_useful, {estimated: 1, not_estimated: -1}),
+            ):
+                q = (
+                    update(AnswerModel)
+                    .where(
+                        and_(
+                            AnswerModel.id == answer_id,
+                            AnswerModel.is_useful.is_(previous_estimation),
+                        )
+                    )
+                    .values(is_useful=is_useful)
+                    .execution_options(synchronize_session=False)
+                )
 
-            return result and result.as_answer_entity()
+                if (await session.execute(q)).rowcount:
+                    await self._update_answer_estimation_counters(
+                        session, answer, **deltas
+                    )
 
-    async def get_support_user_answers_with_id(
+                    break
+
+            await self._commit(session)
+
+    async def _get_answer_to_estimate(
+        self, session: AsyncSession, answer_id: UUID
+    ) -> AnswerModel:
+        q = (
+            select(AnswerModel)
+            .where(AnswerModel.id == answer_id)
+            .options(selectinload(AnswerModel.support_user))
+        )
+
+        answer = (await session.execute(q)).scalars().first()
+
+        if answer:
+            return answer
+
+        # Late estimations of the archived answers
+        # bring their questions back from the archive
+        question_q = select(AnswerArchiveModel.question_id).where(
+            AnswerArchiveModel.id == answer_id
+        )
+
+        await self._restore_archived_questions(
+            session, (await session.execute(question_q)).scalars().all()
+        )
+
+        return (await session.execute(q)).scalars().first()
+
+    async def _update_answer_estimation_counters(
+        self, session: AsyncSession, answer: AnswerModel, **deltas: int
+    ) -> None:
+        regular_user_q = select(QuestionModel.regular_user_id).where(
+            QuestionModel.id == answer.question_id
+        )
+
+        regular_user_id = (await session.execute(regular_user_q)).scalar()
+
+        await session.execute(
+            update(QuestionModel)
+            .where(QuestionModel.id == answer.question_id)
+            .values(status=QuestionStatus.CLOSED)
+            .execution_options(synchronize_session=False)
+        )
+
+        await self._update_counters(
+            session, StatisticsScope.GLOBAL, "", **deltas
+        )
+
+        await self._update_counters(
+            session, StatisticsScope.REGULAR_USER, regular_user_id, **deltas
+        )
+
+        await self._update_counters(
+            session,
+            StatisticsScope.SUPPORT_USER,
+            answer.support_user_id,
+            **deltas,
+        )
+
+    async def get_all_answers(self) -> list[Answer]:
+        async with self._read_session() as session:
+            q = self._get_answer_query_with_options(select(AnswerModel))
+
+            result = (await session.execute(q)).scalars().all()
+
+            return [elem.as_answer_entity() for elem in result]
+
+    async def get_answer_by_id(self, answer_id: UUID) -> Answer | None:
+        async with self._read_session() as session:
+            q = self._get_answer_query_with_options(
+                select(AnswerModel).where(AnswerModel.id == answer_id)
+            )
+
+            result = (await session.execute(q)).scalars().first()
+
+            return result and result.as_answer_entity()
+
+    async def get_question_last_answer(
+        self, question_id: UUID
+    ) -> Answer | None:
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                "get_question_last_answer",
+                lambda: self._get_answer_query_with_options(
+                    select(AnswerModel)
+                    .where(AnswerModel.question_id == bindparam("question_id"))
+                    .order_by(AnswerModel.date.desc())
+                ),
+            )
+
+            result = (
+                (await session.execute(q, {"question_id": question_id}))
+                .scalars()
+                .first()
+            )
+
+            return result and result.as_answer_entity()
+
+    async def get_support_user_answers_with_id(
         self, support_user_id: UUID
     ) -> list[Answer]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_answer_query_with_options(
                 select(AnswerModel).where(
                     AnswerModel.support_user_id == support_user_id
@@ -752,12 +2425,18 @@ class SARepo(Repo):
 
             result = (await session.execute(q)).scalars().all()
 
-            return [elem.as_answer_entity() for elem in result]
+            archived = await self._get_archived(
+                session,
+                ANSWERS_ARCHIVE_ROWS,
+                lambda columns: columns.support_user_id == support_user_id,
+            )
+
+            return [elem.as_answer_entity() for elem in result] + archived
 
     async def get_answers_with_question_id(
         self, question_id: UUID
     ) -> list[Answer]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_answer_query_with_options(
                 select(AnswerModel).where(
                     AnswerModel.question_id == question_id
@@ -766,68 +2445,107 @@ class SARepo(Repo):
 
             result = (await session.execute(q)).scalars().all()
 
-            return [elem.as_answer_entity() for elem in result]
+            if result:
+                return [elem.as_answer_entity() for elem in result]
+
+            return await self._get_archived(
+                session,
+                ANSWERS_ARCHIVE_ROWS,
+                lambda columns: columns.question_id == question_id,
+            )
 
     async def get_answer_by_tg_message_id(
         self, tg_mesage_id: int
     ) -> Answer | None:
-        async with self._session() as session:
-            q = self._get_answer_query_with_options(
-                select(AnswerModel).where(
-                    AnswerModel.tg_message_id == tg_mesage_id
-                )
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                "get_answer_by_tg_message_id",
+                lambda: self._get_answer_query_with_options(
+                    select(AnswerModel).where(
+                        AnswerModel.tg_message_id == bindparam("tg_message_id")
+                    )
+                ),
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (
+                (await session.execute(q, {"tg_message_id": tg_mesage_id}))
+                .scalars()
+                .first()
+            )
 
-            return result and result.as_answer_entity()
+            if result:
+                return result.as_answer_entity()
+
+            archived = await self._get_archived(
+                session,
+                ANSWERS_ARCHIVE_ROWS,
+                lambda columns: columns.tg_message_id == tg_mesage_id,
+            )
+
+            return archived[0] if archived else None
 
     async def delete_answer_with_id(self, answer_id: UUID) -> None:
         async with self._session() as session:
-            q = delete(AnswerModel).where(AnswerModel.id == answer_id)
+            question_q = select(AnswerModel.question_id).where(
+                AnswerModel.id == answer_id
+            )
 
-            await session.execute(q)
+            questions_ids = (await session.execute(question_q)).scalars().all()
 
-            await session.commit()
+            await self._invalidate_counters_of(
+                session, AnswerModel, [answer_id]
+            )
 
-    async def delete_all_answers(self) -> None:
-        async with self._session() as session:
-            q = delete(AnswerModel)
+            await self._delete_with_archive(
+                session, AnswerModel, lambda table: table.id == answer_id
+            )
 
-            await session.execute(q)
+            await self._refresh_questions_status(session, questions_ids)
+
+            await self._commit(session)
 
-            await session.commit()
+    async def delete_all_answers(self) -> None:
+        await self._delete_in_batches(
+            AnswerModel,
+            columns=("question_id",),
+            after_delete=self._refresh_questions_of("question_id"),
+        )
 
     async def delete_support_user_answers_with_id(
         self, support_user_id: UUID
     ) -> None:
-        async with self._session() as session:
-            q = delete(AnswerModel).where(
-                AnswerModel.support_user_id == support_user_id
-            )
-
-            await session.execute(q)
-
-            await session.commit()
+        await self._delete_in_batches(
+            AnswerModel,
+            lambda table: table.support_user_id == support_user_id,
+            columns=("question_id",),
+            after_delete=self._refresh_questions_of("question_id"),
+        )
 
     async def delete_answers_with_question_id(self, question_id: UUID) -> None:
         async with self._session() as session:
-            q = delete(AnswerModel).where(
-                AnswerModel.question_id == question_id
+            # The answers are counted by the same scopes as their question
+            await self._invalidate_counters_of(
+                session, QuestionModel, [question_id]
             )
 
-            await session.execute(q)
+            await self._delete_with_archive(
+                session,
+                AnswerModel,
+                lambda table: table.question_id == question_id,
+            )
+
+            await self._refresh_questions_status(session, [question_id])
 
-            await session.commit()
+            await self._commit(session)
 
     async def count_all_answers(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id))
 
             return (await session.execute(q)).scalar()
 
     async def count_all_useful_answers(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 AnswerModel.is_useful == True  # noqa: 712
             )
@@ -835,7 +2553,7 @@ class SARepo(Repo):
             return (await session.execute(q)).scalar()
 
     async def count_all_unuseful_answers(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 AnswerModel.is_useful == False  # noqa: 712
             )
@@ -843,15 +2561,20 @@ class SARepo(Repo):
             return (await session.execute(q)).scalar()
 
     async def count_question_answers(self, question_id: UUID) -> int:
-        async with self._session() as session:
-            q = select(func.count(AnswerModel.id)).where(
-                AnswerModel.question_id == question_id
+        async with self._read_session() as session:
+            q = _get_hot_statement(
+                "count_question_answers",
+                lambda: select(func.count(AnswerModel.id)).where(
+                    AnswerModel.question_id == bindparam("question_id")
+                ),
             )
 
-            return (await session.execute(q)).scalar()
+            return (
+                await session.execute(q, {"question_id": question_id})
+            ).scalar()
 
     async def count_support_user_answers(self, support_user_id: UUID) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 AnswerModel.support_user_id == support_user_id
             )
@@ -861,10 +2584,10 @@ class SARepo(Repo):
     async def count_support_user_useful_answers(
         self, support_user_id: UUID
     ) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 and_(
-                    AnswerModel.is_useful == False,  # noqa: 712
+                    AnswerModel.is_useful == True,  # noqa: 712
                     AnswerModel.support_user_id == support_user_id,
                 )
             )
@@ -874,10 +2597,10 @@ class SARepo(Repo):
     async def count_support_user_unuseful_answers(
         self, support_user_id: UUID
     ) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 and_(
-                    AnswerModel.is_useful == True,  # noqa: 712
+                    AnswerModel.is_useful == False,  # noqa: 712
                     AnswerModel.support_user_id == support_user_id,
                 )
             )
@@ -887,7 +2610,7 @@ class SARepo(Repo):
     async def count_regular_user_questions_answers(
         self, regular_user_id: UUID
     ) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 and_(
                     AnswerModel.question.and_(
@@ -901,7 +2624,7 @@ class SARepo(Repo):
     async def count_regular_user_questions_useful_answers(
         self, regular_user_id: UUID
     ) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 and_(
                     AnswerModel.question.and_(
@@ -916,7 +2639,7 @@ class SARepo(Repo):
     async def count_regular_user_questions_unuseful_answers(
         self, regular_user_id: UUID
     ) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 and_(
                     AnswerModel.question.and_(
@@ -931,7 +2654,7 @@ class SARepo(Repo):
     async def count_regular_user_questions_unestimated_answers(
         self, regular_user_id: UUID
     ) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerModel.id)).where(
                 and_(
                     AnswerModel.question.and_(
@@ -943,47 +2666,211 @@ class SARepo(Repo):
 
             return (await session.execute(q)).scalar()
 
-    def _get_answer_query_with_options(self, q: Select):
-        return q.options(
-            selectinload(AnswerModel.question).selectinload(
-                QuestionModel.regular_user
-            ),
-            selectinload(AnswerModel.question).selectinload(
-                QuestionModel.question_attachments
-            ),
-            # SUPPORT USER AND ITS CURRENT QUESTIONS PROPERTIES
-            selectinload(AnswerModel.support_user)
-            .selectinload(SupportUserModel.current_question)
-            .selectinload(QuestionModel.regular_user),
-            selectinload(AnswerModel.support_user)
-            .selectinload(SupportUserModel.current_question)
-            .selectinload(QuestionModel.question_attachments),
-            # SUPPORT USER ROLE
-            selectinload(AnswerModel.support_user).selectinload(
-                SupportUserModel.role
+    async def get_answers_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            page = await self._get_rows_page(
+                ANSWERS_ROWS, cursor, limit, desc_order
+            )
+
+        else:
+            page = await self._get_page(
+                self._get_answer_query_with_options(
+                    select(AnswerModel), loader_profile
+                ),
+                AnswerModel.date,
+                AnswerModel.id,
+                AnswerModel.as_answer_entity,
+                cursor,
+                limit,
+                desc_order,
+            )
+
+        return await self._get_page_with_archive(
+            page, ANSWERS_ARCHIVE_ROWS, cursor, limit, desc_order
+        )
+
+    async def iter_answers(
+        self,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            async for elem in self._iter_rows(ANSWERS_ROWS, desc_order):
+                yield elem
+
+            return
+
+        async for elem in self._iter(
+            self._get_answer_query_with_options(
+                select(AnswerModel), loader_profile
             ),
+            AnswerModel.date,
+            AnswerModel.id,
+            AnswerModel.as_answer_entity,
+            desc_order,
+        ):
+            yield elem
+
+    async def get_question_answers_page(
+        self,
+        question_id: UUID,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> Page[Answer]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            page = await self._get_rows_page(
+                ANSWERS_ROWS,
+                cursor,
+                limit,
+                desc_order,
+                ANSWERS_ROWS.table.c.question_id == question_id,
+            )
+
+        else:
+            page = await self._get_page(
+                self._get_answer_query_with_options(
+                    select(AnswerModel).where(
+                        AnswerModel.question_id == question_id
+                    ),
+                    loader_profile,
+                ),
+                AnswerModel.date,
+                AnswerModel.id,
+                AnswerModel.as_answer_entity,
+                cursor,
+                limit,
+                desc_order,
+            )
+
+        return await self._get_page_with_archive(
+            page,
+            ANSWERS_ARCHIVE_ROWS,
+            cursor,
+            limit,
+            desc_order,
+            lambda columns: columns.question_id == question_id,
         )
 
+    async def iter_question_answers(
+        self,
+        question_id: UUID,
+        desc_order: bool = False,
+        loader_profile: LoaderProfile = LoaderProfile.FULL,
+    ) -> AsyncIterator[Answer]:
+        if loader_profile == LoaderProfile.IDENTITY:
+            async for elem in self._iter_rows(
+                ANSWERS_ROWS,
+                desc_order,
+                ANSWERS_ROWS.table.c.question_id == question_id,
+            ):
+                yield elem
+
+            return
+
+        async for elem in self._iter(
+            self._get_answer_query_with_options(
+                select(AnswerModel).where(
+                    AnswerModel.question_id == question_id
+                ),
+                loader_profile,
+            ),
+            AnswerModel.date,
+            AnswerModel.id,
+            AnswerModel.as_answer_entity,
+            desc_order,
+        ):
+            yield elem
+
+    def _get_answer_query_with_options(
+        self, q: Select, loader_profile: LoaderProfile = LoaderProfile.FULL
+    ):
+        match loader_profile:
+            case LoaderProfile.IDENTITY:
+                return q.options(
+                    joinedload(AnswerModel.question).joinedload(
+                        QuestionModel.regular_user
+                    ),
+                    joinedload(AnswerModel.support_user).joinedload(
+                        SupportUserModel.role
+                    ),
+                )
+
+            case LoaderProfile.FULL:
+                return q.options(
+                    selectinload(AnswerModel.question).selectinload(
+                        QuestionModel.regular_user
+                    ),
+                    selectinload(AnswerModel.question).selectinload(
+                        QuestionModel.question_attachments
+                    ),
+                    # SUPPORT USER AND ITS CURRENT QUESTIONS PROPERTIES
+                    selectinload(AnswerModel.support_user)
+                    .selectinload(SupportUserModel.current_question)
+                    .selectinload(QuestionModel.regular_user),
+                    selectinload(AnswerModel.support_user)
+                    .selectinload(SupportUserModel.current_question)
+                    .selectinload(QuestionModel.question_attachments),
+                    # SUPPORT USER ROLE
+                    selectinload(AnswerModel.support_user).selectinload(
+                        SupportUserModel.role
+                    ),
+                )
+
     # QUESTION ATTACHMENTS METHODS
 
     async def add_question_attachment(
         self, question_attachment: QuestionAttachment
     ) -> QuestionAttachment:
-        async with self._session() as session:
-            question_attachment_model = QuestionAttachmentModel(
-                question_attachment
+        return await self._group_write(
+            lambda session: self._add_question_attachment(
+                session, question_attachment
             )
+        )
+
+    async def _add_question_attachment(
+        self, session: AsyncSession, question_attachment: QuestionAttachment
+    ) -> QuestionAttachment:
+        question_attachment_model = QuestionAttachmentModel(
+            question_attachment
+        )
+
+        session.add(question_attachment_model)
 
-            session.add(question_attachment_model)
+        await self._update_counters(
+            session, StatisticsScope.GLOBAL, "", questions_attachments=1
+        )
+
+        return question_attachment
+
+    async def bulk_add_questions_attachments(
+        self,
+        questions_attachments: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        async with self._session() as session:
+            inserted = await self._bulk_insert(
+                session,
+                QuestionAttachmentModel,
+                questions_attachments,
+                batch_size,
+            )
 
-            await session.commit()
+            await self._commit(session)
 
-            return question_attachment
+            return inserted
 
     async def get_question_attachment_by_id(
         self, id: UUID
-    ) -> QuestionAttachment:
-        async with self._session() as session:
+    ) -> QuestionAttachment | None:
+        async with self._read_session() as session:
             q = self._get_question_attachment_query_with_options(
                 select(QuestionAttachmentModel).where(
                     QuestionAttachmentModel.id == id
@@ -997,7 +2884,7 @@ class SARepo(Repo):
     async def get_question_attachments(
         self, question_id: UUID
     ) -> list[QuestionAttachment]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_question_attachment_query_with_options(
                 select(QuestionAttachmentModel).where(
                     QuestionAttachmentModel.question_id == question_id
@@ -1006,15 +2893,24 @@ class SARepo(Repo):
 
             result = (await session.execute(q)).scalars().all()
 
-            return [elem.as_question_attachment_entity() for elem in result]
+            if result:
+                return [
+                    elem.as_question_attachment_entity() for elem in result
+                ]
+
+            return await self._get_archived(
+                session,
+                QUESTIONS_ATTACHMENTS_ARCHIVE_ROWS,
+                lambda columns: columns.question_id == question_id,
+            )
 
     async def get_all_questions_attachments(self) -> list[QuestionAttachment]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_question_attachment_query_with_options(
                 select(QuestionAttachmentModel)
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (await session.execute(q)).scalars().all()
 
             return [elem.as_question_attachment_entity() for elem in result]
 
@@ -1022,48 +2918,81 @@ class SARepo(Repo):
         self, answer_attachment_id: UUID
     ) -> None:
         async with self._session() as session:
-            q = delete(QuestionAttachmentModel).where(
-                QuestionAttachmentModel.id == answer_attachment_id
+            deleted = await self._delete_with_archive(
+                session,
+                QuestionAttachmentModel,
+                lambda table: table.id == answer_attachment_id,
             )
 
-            await session.execute(q)
+            await self._update_counters(
+                session,
+                StatisticsScope.GLOBAL,
+                "",
+                questions_attachments=-deleted,
+            )
 
-            await session.commit()
+            await self._commit(session)
 
     async def delete_question_attachment_with_question_id(
         self, question_id: UUID
     ) -> None:
         async with self._session() as session:
-            q = delete(QuestionAttachmentModel).where(
-                QuestionAttachmentModel.question_id == question_id
+            deleted = await self._delete_with_archive(
+                session,
+                QuestionAttachmentModel,
+                lambda table: table.question_id == question_id,
             )
 
-            await session.execute(q)
+            await self._update_counters(
+                session,
+                StatisticsScope.GLOBAL,
+                "",
+                questions_attachments=-deleted,
+            )
 
-            await session.commit()
+            await self._commit(session)
 
     async def delete_all_questions_attachments(self) -> None:
-        async with self._session() as session:
-            q = delete(QuestionAttachmentModel)
-
-            await session.execute(q)
-
-            await session.commit()
+        await self._delete_in_batches(
+            QuestionAttachmentModel,
+            after_delete=lambda session, rows: self._update_counters(
+                session,
+                StatisticsScope.GLOBAL,
+                "",
+                questions_attachments=-len(rows),
+            ),
+        )
 
     async def count_all_questions_attachments(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(QuestionAttachmentModel.id))
 
             return (await session.execute(q)).scalar()
 
     async def count_question_attachments(self, question_id: UUID):
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(QuestionAttachmentModel.id)).where(
                 QuestionAttachmentModel.question_id == question_id
             )
 
             return (await session.execute(q)).scalar()
 
+    async def get_questions_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[QuestionAttachment]:
+        return await self._get_page_with_archive(
+            await self._get_rows_page(
+                QUESTIONS_ATTACHMENTS_ROWS, cursor, limit, desc_order
+            ),
+            QUESTIONS_ATTACHMENTS_ARCHIVE_ROWS,
+            cursor,
+            limit,
+            desc_order,
+        )
+
     def _get_question_attachment_query_with_options(self, q: Select):
         return q.options(selectinload(QuestionAttachmentModel.question))
 
@@ -1072,17 +3001,43 @@ class SARepo(Repo):
     async def add_answer_attachment(
         self, answer_attachment: AnswerAttachment
     ) -> AnswerAttachment:
-        async with self._session() as session:
-            answer_attachment_model = AnswerAttachmentModel(answer_attachment)
+        return await self._group_write(
+            lambda session: self._add_answer_attachment(
+                session, answer_attachment
+            )
+        )
 
-            session.add(answer_attachment_model)
+    async def _add_answer_attachment(
+        self, session: AsyncSession, answer_attachment: AnswerAttachment
+    ) -> AnswerAttachment:
+        answer_attachment_model = AnswerAttachmentModel(answer_attachment)
+
+        session.add(answer_attachment_model)
 
-            await session.commit()
+        await self._update_counters(
+            session, StatisticsScope.GLOBAL, "", answers_attachments=1
+        )
 
-            return answer_attachment
+        return answer_attachment
 
-    async def get_answer_attachment_by_id(self, id: UUID) -> AnswerAttachment:
+    async def bulk_add_answers_attachments(
+        self,
+        answers_attachments: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
         async with self._session() as session:
+            inserted = await self._bulk_insert(
+                session, AnswerAttachmentModel, answers_attachments, batch_size
+            )
+
+            await self._commit(session)
+
+            return inserted
+
+    async def get_answer_attachment_by_id(
+        self, id: UUID
+    ) -> AnswerAttachment | None:
+        async with self._read_session() as session:
             q = self._get_answer_attachment_query_with_options(
                 select(AnswerAttachmentModel)
                 .where(AnswerAttachmentModel.id == id)
@@ -1096,74 +3051,1343 @@ class SARepo(Repo):
     async def get_answer_attachments(
         self, answer_id: UUID
     ) -> list[AnswerAttachment]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_answer_attachment_query_with_options(
                 select(AnswerAttachmentModel)
                 .where(AnswerAttachmentModel.answer_id == answer_id)
                 .options(selectinload(AnswerAttachmentModel.answer))
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (await session.execute(q)).scalars().all()
 
-            return result and result.as_answer_attachment_entity()
+            if result:
+                return [elem.as_answer_attachment_entity() for elem in result]
+
+            return await self._get_archived(
+                session,
+                ANSWERS_ATTACHMENTS_ARCHIVE_ROWS,
+                lambda columns: columns.answer_id == answer_id,
+            )
 
     async def get_all_answers_attachments(self) -> list[AnswerAttachment]:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = self._get_answer_attachment_query_with_options(
                 select(AnswerAttachmentModel).options(
                     selectinload(AnswerAttachmentModel.answer)
                 )
             )
 
-            result = (await session.execute(q)).scalars().first()
+            result = (await session.execute(q)).scalars().all()
 
-            return result and result.as_answer_attachment_entity()
+            return [elem.as_answer_attachment_entity() for elem in result]
 
     async def delete_answer_attachment_with_id(
         self, answer_attachment_id: UUID
     ) -> None:
         async with self._session() as session:
-            q = delete(AnswerAttachmentModel).where(
-                AnswerAttachmentModel.id == answer_attachment_id
+            deleted = await self._delete_with_archive(
+                session,
+                AnswerAttachmentModel,
+                lambda table: table.id == answer_attachment_id,
             )
 
-            await session.execute(q)
+            await self._update_counters(
+                session,
+                StatisticsScope.GLOBAL,
+                "",
+                answers_attachments=-deleted,
+            )
 
-            await session.commit()
+            await self._commit(session)
 
     async def delete_answer_attachment_with_answer_id(
         self, answer_id: UUID
     ) -> None:
         async with self._session() as session:
-            q = delete(AnswerAttachmentModel).where(
-                AnswerAttachmentModel.answer_id == answer_id
+            deleted = await self._delete_with_archive(
+                session,
+                AnswerAttachmentModel,
+                lambda table: table.answer_id == answer_id,
             )
 
-            await session.execute(q)
+            await self._update_counters(
+                session,
+                StatisticsScope.GLOBAL,
+                "",
+                answers_attachments=-deleted,
+            )
 
-            await session.commit()
+            await self._commit(session)
 
     async def delete_all_answer_attachments(self) -> None:
-        async with self._session() as session:
-            q = delete(AnswerAttachmentModel)
-
-            await session.execute(q)
-
-            await session.commit()
+        await self._delete_in_batches(
+            AnswerAttachmentModel,
+            after_delete=lambda session, rows: self._update_counters(
+                session,
+                StatisticsScope.GLOBAL,
+                "",
+                answers_attachments=-len(rows),
+            ),
+        )
 
     async def count_all_answers_attachments(self) -> int:
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerAttachmentModel.id))
 
             return (await session.execute(q)).scalar()
 
     async def count_answer_attachments(self, answer_id: UUID):
-        async with self._session() as session:
+        async with self._read_session() as session:
             q = select(func.count(AnswerAttachmentModel.id)).where(
                 AnswerAttachmentModel.answer_id == answer_id
             )
 
             return (await session.execute(q)).scalar()
 
+    async def get_answers_attachments_page(
+        self,
+        cursor: PageCursor | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        desc_order: bool = False,
+    ) -> Page[AnswerAttachment]:
+        return await self._get_page_with_archive(
+            await self._get_rows_page(
+                ANSWERS_ATTACHMENTS_ROWS, cursor, limit, desc_order
+            ),
+            ANSWERS_ATTACHMENTS_ARCHIVE_ROWS,
+            cursor,
+            limit,
+            desc_order,
+        )
+
     def _get_answer_attachment_query_with_options(self, q: Select):
         return q.options(selectinload(AnswerAttachmentModel.answer))
+
+    # ARCHIVE METHODS
+
+    async def archive_questions(
+        self, older_than: datetime, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> int:
+        """Moves the closed questions asked before the date into the archive
+        tables together with their answers and attachments
+
+        Every batch of the questions is moved by its own transaction,
+        so the hot tables aren't locked for long and the moved batches
+        are kept if it's interrupted. The questions bound by support users
+        are left, since the support users reference them. The totals
+        don't change, so the statistics counters are kept as they are.
+
+        Args:
+            older_than (datetime): questions asked before it are archived
+            batch_size (int, optional): questions moved by a transaction.
+            Defaults to ARCHIVE_BATCH_SIZE.
+
+        Returns:
+            int: number of the archived questions
+        """
+        q = (
+            select(QuestionModel.id)
+            .where(
+                and_(
+                    QuestionModel.status == QuestionStatus.CLOSED,
+                    QuestionModel.date < older_than,
+                    ~_is_bound(QuestionModel),
+                )
+            )
+            .order_by(QuestionModel.date)
+            .limit(batch_size)
+        )
+
+        async def archive_batch(session: AsyncSession) -> int:
+            questions_ids = (await session.execute(q)).scalars().all()
+
+            if questions_ids:
+                await self._move_questions(
+                    session, questions_ids, to_archive=True
+                )
+
+            return len(questions_ids)
+
+        return await self._run_in_batches(archive_batch, batch_size)
+
+    async def _restore_archived_questions(
+        self, session: AsyncSession, questions_ids: Sequence[UUID]
+    ) -> None:
+        """Moves the archived questions of the ids back into the hot tables
+
+        Used by the writes, which change the questions, so the archive
+        is never written to, except for moving the rows.
+        """
+        q = select(QuestionArchiveModel.id).where(
+            QuestionArchiveModel.id.in_(questions_ids)
+        )
+
+        archived_ids = (await session.execute(q)).scalars().all()
+
+        if not archived_ids:
+            return
+
+        await self._move_questions(session, archived_ids, to_archive=False)
+
+        await self._refresh_questions_status(session, archived_ids)
+
+    async def _move_questions(
+        self,
+        session: AsyncSession,
+        questions_ids: Sequence[UUID],
+        to_archive: bool,
+    ) -> None:
+        """Copies the questions with their answers and attachments into
+        the archive tables or back into the hot ones, then deletes them
+        from the tables they were copied from
+        """
+        answers = AnswerModel if to_archive else AnswerArchiveModel
+
+        # Rows of the questions in the tables of the hot models
+        # or their archive models, by the hot models
+        conditions: dict[type[ModelBase], Callable[[Any], Any]] = {
+            QuestionModel: lambda table: table.id.in_(questions_ids),
+            AnswerModel: lambda table: table.question_id.in_(questions_ids),
+            QuestionAttachmentModel: lambda table: table.question_id.in_(
+                questions_ids
+            ),
+            AnswerAttachmentModel: lambda table: table.answer_id.in_(
+                select(answers.id).where(
+                    answers.question_id.in_(questions_ids)
+                )
+            ),
+        }
+
+        for model, archive_model in _ARCHIVE_MODELS.items():
+            source, target = (
+                (model, archive_model)
+                if to_archive
+                else (archive_model, model)
+            )
+
+            # The hot tables also have the denormalized columns,
+            # which are refreshed when the rows are restored
+            columns = [column.key for column in archive_model.__table__.c]
+
+            q = insert(target).from_select(
+                columns,
+                select(*(getattr(source, name) for name in columns)).where(
+                    conditions[model](source)
+                ),
+            )
+
+            await session.execute(q)
+
+        # The answers and the attachments are deleted by the cascades
+        source = QuestionModel if to_archive else QuestionArchiveModel
+
+        await session.execute(
+            delete(source)
+            .where(source.id.in_(questions_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _delete_with_archive(
+        self,
+        session: AsyncSession,
+        model: type[ModelBase],
+        where: Callable[[Any], ColumnElement[bool]] | None = None,
+    ) -> int:
+        """Deletes the rows of the model's table and its archive table,
+        that satisfy the condition built for each of the models
+
+        Returns:
+            int: number of the deleted rows
+        """
+        deleted = 0
+
+        for table in (model, _ARCHIVE_MODELS[model]):
+            q = delete(table)
+
+            deleted += (
+                await session.execute(
+                    q if where is None else q.where(where(table))
+                )
+            ).rowcount
+
+        return deleted
+
+    async def _get_archived(
+        self,
+        session: AsyncSession,
+        rows: RowMapper[T],
+        where: Callable[[Any], ColumnElement[bool]],
+    ) -> list[T]:
+        """Builds the entities from the rows of the archive table
+        that satisfy the condition, used by the lookups that found
+        nothing in the hot tables
+        """
+        as_entity = rows.make_as_entity()
+
+        result = await session.execute(rows.query.where(where(rows.table.c)))
+
+        return [as_entity(row) for row in result.all()]
+
+    # RETENTION METHODS
+
+    async def delete_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        # The archived questions are never bound, so the condition
+        # only leaves the questions in the hot table
+        return await self._delete_in_batches(
+            QuestionModel,
+            lambda table: and_(table.date < older_than, ~_is_bound(table)),
+            batch_size,
+            on_progress,
+        )
+
+    async def anonymize_questions_older_than(
+        self,
+        older_than: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        anonymized = 0
+
+        # The hot tables first, then the archive ones
+        for questions, answers, questions_attachments, answers_attachments in (
+            tuple(_ARCHIVE_MODELS),
+            tuple(_ARCHIVE_MODELS.values()),
+        ):
+            q = _order_by_keyset(
+                select(questions.date, questions.id).where(
+                    and_(
+                        questions.date < older_than,
+                        questions.message != ANONYMIZED_MESSAGE,
+                    )
+                ),
+                questions.date,
+                questions.id,
+                desc_order=False,
+            ).limit(batch_size)
+
+            # The already anonymized questions are skipped by the condition
+            # on the next runs and by the cursor on the next batches
+            cursor: list[PageCursor] = []
+
+            async def anonymize_batch(
+                session: AsyncSession,
+                questions: Any = questions,
+                answers: Any = answers,
+                questions_attachments: Any = questions_attachments,
+                answers_attachments: Any = answers_attachments,
+                q: Select = q,
+                cursor: list[PageCursor] = cursor,
+            ) -> int:
+                rows = (
+                    await session.execute(
+                        q.where(
+                            _keyset_after(
+                                questions.date, questions.id, cursor[0], False
+                            )
+                        )
+                        if cursor
+                        else q
+                    )
+                ).all()
+
+                if not rows:
+                    return 0
+
+                cursor[:] = [tuple(rows[-1])]
+
+                questions_ids = [row.id for row in rows]
+
+                deleted_questions_attachments = (
+                    await session.execute(
+                        delete(questions_attachments)
+                        .where(
+                            questions_attachments.question_id.in_(
+                                questions_ids
+                            )
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                ).rowcount
+
+                deleted_answers_attachments = (
+                    await session.execute(
+                        delete(answers_attachments)
+                        .where(
+                            answers_attachments.answer_id.in_(
+                                select(answers.id).where(
+                                    answers.question_id.in_(questions_ids)
+                                )
+                            )
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                ).rowcount
+
+                for table, column in (
+                    (answers, answers.question_id),
+                    (questions, questions.id),
+                ):
+                    await session.execute(
+                        update(table)
+                        .where(column.in_(questions_ids))
+                        .values(message=ANONYMIZED_MESSAGE)
+                        .execution_options(synchronize_session=False)
+                    )
+
+                await self._update_counters(
+                    session,
+                    StatisticsScope.GLOBAL,
+                    "",
+                    questions_attachments=-deleted_questions_attachments,
+                    answers_attachments=-deleted_answers_attachments,
+                )
+
+                return len(rows)
+
+            anonymized += await self._run_in_batches(
+                anonymize_batch,
+                batch_size,
+                on_progress
+                and (lambda processed: on_progress(anonymized + processed)),
+            )
+
+        return anonymized
+
+    async def erase_regular_user(
+        self,
+        regular_user_id: UUID,
+        batch_size: int = DELETE_BATCH_SIZE,
+        on_progress: ProgressCallback | None = None,
+    ) -> int:
+        async with self._session() as session:
+            q = (
+                update(SupportUserModel)
+                .where(
+                    SupportUserModel.current_question_id.in_(
+                        select(QuestionModel.id).where(
+                            QuestionModel.regular_user_id == regular_user_id
+                        )
+                    )
+                )
+                .values(current_question_id=None)
+                .execution_options(synchronize_session=False)
+            )
+
+            await session.execute(q)
+
+            await self._commit(session)
+
+        erased = await self._delete_in_batches(
+            QuestionModel,
+            lambda table: table.regular_user_id == regular_user_id,
+            batch_size,
+            on_progress,
+        )
+
+        async with self._session() as session:
+            await self._invalidate_counters_of(
+                session, RegularUserModel, [regular_user_id]
+            )
+
+            q = delete(RegularUserModel).where(
+                RegularUserModel.id == regular_user_id
+            )
+
+            await session.execute(q)
+
+            await self._commit(session)
+
+        self._invalidate_identities()
+
+        return erased
+
+    # STATISTICS METHODS
+
+    async def get_global_statistics(self) -> GlobalStatistics:
+        """Reads the global statistics from the statistics counters
+
+        If the counters aren't counted, they are counted from scratch
+        and stored, so the next calls are primary key reads.
+
+        Returns:
+            GlobalStatistics: the global statistics
+        """
+        return (
+            await self._get_statistics_from_counters(
+                StatisticsScope.GLOBAL, [""]
+            )
+        )[""]
+
+    async def get_role_statistics(self, role_id: int) -> RoleStatistics:
+        return (
+            await self._get_statistics_from_counters(
+                StatisticsScope.ROLE, [role_id]
+            )
+        )[role_id]
+
+    async def get_regular_user_statistics(
+        self, regular_user_id: UUID
+    ) -> RegularUserStatistics:
+        return (await self.get_regular_users_statistics([regular_user_id]))[
+            regular_user_id
+        ]
+
+    async def get_regular_users_statistics(
+        self, regular_users_ids: list[UUID]
+    ) -> dict[UUID, RegularUserStatistics]:
+        """Reads statistics of every passed regular user from the counters
+
+        Args:
+            regular_users_ids (list[UUID]): ids of the regular users
+
+        Returns:
+            dict[UUID, RegularUserStatistics]: statistics by regular user id
+        """
+        return await self._get_statistics_from_counters(
+            StatisticsScope.REGULAR_USER, regular_users_ids
+        )
+
+    async def get_support_user_statistics(
+        self, support_user_id: UUID
+    ) -> SupportUserStatistics:
+        return (await self.get_support_users_statistics([support_user_id]))[
+            support_user_id
+        ]
+
+    async def get_support_users_statistics(
+        self, support_users_ids: list[UUID]
+    ) -> dict[UUID, SupportUserStatistics]:
+        """Reads statistics of every passed support user from the counters
+
+        Args:
+            support_users_ids (list[UUID]): ids of the support users
+
+        Returns:
+            dict[UUID, SupportUserStatistics]: statistics by support user id
+        """
+        return await self._get_statistics_from_counters(
+            StatisticsScope.SUPPORT_USER, support_users_ids
+        )
+
+    async def get_question_statistics(
+        self, question_id: UUID
+    ) -> QuestionStatistics:
+        return (await self.get_questions_statistics([question_id]))[
+            question_id
+        ]
+
+    async def get_questions_statistics(
+        self, questions_ids: list[UUID]
+    ) -> dict[UUID, QuestionStatistics]:
+        """Counts statistics of every passed question using one statement
+
+        Args:
+            questions_ids (list[UUID]): ids of the questions
+
+        Returns:
+            dict[UUID, QuestionStatistics]: statistics by question id
+        """
+        async with self._primary_read_session() as session:
+            q = select(
+                QuestionModel.id,
+                QuestionModel.answers_count.label("total_answers"),
+                select(func.count(QuestionAttachmentModel.id))
+                .where(QuestionAttachmentModel.question_id == QuestionModel.id)
+                .scalar_subquery()
+                .label("total_attachments"),
+            ).where(QuestionModel.id.in_(questions_ids))
+
+            rows = {row.id: row for row in (await session.execute(q)).all()}
+
+            archived_ids = [id for id in questions_ids if id not in rows]
+
+            if archived_ids:
+                q = select(
+                    QuestionArchiveModel.id,
+                    select(func.count(AnswerArchiveModel.id))
+                    .where(
+                        AnswerArchiveModel.question_id
+                        == QuestionArchiveModel.id
+                    )
+                    .scalar_subquery()
+                    .label("total_answers"),
+                    select(func.count(QuestionAttachmentArchiveModel.id))
+                    .where(
+                        QuestionAttachmentArchiveModel.question_id
+                        == QuestionArchiveModel.id
+                    )
+                    .scalar_subquery()
+                    .label("total_attachments"),
+                ).where(QuestionArchiveModel.id.in_(archived_ids))
+
+                rows.update(
+                    (row.id, row) for row in (await session.execute(q)).all()
+                )
+
+            return {
+                id: _as_question_statistics(rows.get(id))
+                for id in questions_ids
+            }
+
+    async def rebuild_statistics(self) -> None:
+        """Recounts all the statistics counters
+        and the statuses of the questions from scratch
+        """
+        async with self._session() as session:
+            await self._refresh_questions_status(session)
+
+            # The counters of the deleted roles and users are dropped too
+            await session.execute(delete(StatisticsCountersModel))
+
+            await self._recount_counters(session, StatisticsScope.GLOBAL, [""])
+
+            for scope, model in _STATISTICS_SCOPES_MODELS.items():
+                ids = (await session.execute(select(model.id))).scalars()
+
+                while batch := list(
+                    islice(ids, _STATISTICS_COUNTERS_BATCH_SIZE)
+                ):
+                    await self._recount_counters(session, scope, batch)
+
+            await self._commit(session)
+
+    async def _get_statistics_from_counters(
+        self, scope: StatisticsScope, ids: list[Any]
+    ) -> dict[Any, Any]:
+        """Reads the statistics of the scope from the counters,
+        the ones that aren't counted are counted and stored
+        """
+        q = select(StatisticsCountersModel).where(
+            and_(
+                StatisticsCountersModel.scope == scope,
+                StatisticsCountersModel.scope_id.in_([str(id) for id in ids]),
+                StatisticsCountersModel.is_counted == True,  # noqa: E712
+            )
+        )
+
+        async with self._primary_read_session() as session:
+            counters = {
+                elem.scope_id: elem
+                for elem in (await session.execute(q)).scalars().all()
+            }
+
+        missing_ids = [id for id in ids if str(id) not in counters]
+
+        counted_statistics = {}
+
+        if missing_ids:
+            async with self._session() as session:
+                counted_statistics = await self._recount_counters(
+                    session, scope, missing_ids
+                )
+
+                await self._commit(session)
+
+        return {
+            id: counted_statistics[id]
+            if id in counted_statistics
+            else _STATISTICS_FROM_COUNTERS[scope](counters[str(id)])
+            for id in ids
+        }
+
+    async def _recount_counters(
+        self, session: AsyncSession, scope: StatisticsScope, ids: list[Any]
+    ) -> dict[Any, Any]:
+        """Counts the statistics of the scope from scratch
+        and stores them into the counters
+
+        The counters are locked first, the missing ones are created.
+        So the concurrent transactions, that change the counters,
+        either are commited before the statistics are counted,
+        or wait for the counted counters and add their changes to them.
+
+        Returns:
+            dict[Any, Any]: the counted statistics by the ids
+        """
+        # The counters are locked in the same order by every transaction
+        ids = sorted(ids, key=str)
+
+        await self._store_counters(
+            session,
+            [
+                {"scope": scope, "scope_id": str(id), "is_counted": False}
+                for id in ids
+            ],
+            lambda inserted: {"is_counted": inserted.is_counted},
+        )
+
+        counted_statistics = await self._count_statistics(session, scope, ids)
+
+        await self._store_counters(
+            session,
+            [
+                {
+                    **_STATISTICS_COUNTERS_FACTORIES[scope](
+                        id, statistics
+                    ).as_values(),
+                    "is_counted": True,
+                }
+                for id, statistics in counted_statistics.items()
+            ],
+            lambda inserted: {
+                column.key: getattr(inserted, column.key)
+                for column in StatisticsCountersModel.__table__.columns
+                if not column.primary_key
+            },
+        )
+
+        return counted_statistics
+
+    async def _store_counters(
+        self,
+        session: AsyncSession,
+        counters: list[dict[str, Any]],
+        on_conflict: Callable[[Any], dict[str, Any]],
+    ) -> None:
+        """Inserts the counters, the existing ones are updated instead
+        with the values that on_conflict builds from the inserted columns
+        """
+        if not counters:
+            return
+
+        table = StatisticsCountersModel.__table__
+
+        match session.get_bind().dialect.name:
+            case "postgresql":
+                q = postgresql_insert(table)
+                q = q.on_conflict_do_update(
+                    index_elements=table.primary_key.columns,
+                    set_=on_conflict(q.excluded),
+                )
+
+            case "sqlite":
+                q = sqlite_insert(table)
+                q = q.on_conflict_do_update(
+                    index_elements=table.primary_key.columns,
+                    set_=on_conflict(q.excluded),
+                )
+
+            case _:
+                q = mysql_insert(table)
+                q = q.on_duplicate_key_update(on_conflict(q.inserted))
+
+        for i in range(0, len(counters), _STATISTICS_COUNTERS_BATCH_SIZE):
+            await session.execute(
+                q, counters[i : i + _STATISTICS_COUNTERS_BATCH_SIZE]
+            )
+
+    async def _update_counters(
+        self,
+        session: AsyncSession,
+        scope: StatisticsScope,
+        scope_id: Any,
+        **deltas: int,
+    ) -> None:
+        """Adds the deltas to the counters of the scope
+
+        The missing counters are created with the deltas and aren't
+        counted, so they are counted from scratch when they are read.
+        Since it's a single statement, the deltas aren't lost when
+        the counters are created by a concurrent transaction.
+        """
+        table = StatisticsCountersModel.__table__
+
+        await self._store_counters(
+            session,
+            [
+                {
+                    "scope": scope,
+                    "scope_id": str(scope_id),
+                    "is_counted": False,
+                    **deltas,
+                }
+            ],
+            lambda inserted: {
+                name: table.c[name] + getattr(inserted, name)
+                for name in deltas
+            },
+        )
+
+    async def _invalidate_counters(
+        self,
+        session: AsyncSession,
+        scope: StatisticsScope,
+        ids: Iterable[Any] | None = None,
+    ) -> None:
+        """Marks the counters of the scope with the ids, or all of them
+        if no ids are passed, as not counted, so they are counted
+        from scratch when they are read next time
+
+        Used by the writes that change the counters in many ways
+        at once, like the deletions and the bulk inserts.
+        """
+        q = (
+            update(StatisticsCountersModel)
+            .where(StatisticsCountersModel.scope == scope)
+            .values(is_counted=False)
+            .execution_options(synchronize_session=False)
+        )
+
+        if ids is None:
+            await session.execute(q)
+
+            return
+
+        scope_ids = iter({str(id) for id in ids if id is not None})
+
+        while batch := list(
+            islice(scope_ids, _STATISTICS_COUNTERS_BATCH_SIZE)
+        ):
+            await session.execute(
+                q.where(StatisticsCountersModel.scope_id.in_(batch))
+            )
+
+    async def _invalidate_counters_of(
+        self,
+        session: AsyncSession,
+        model: type[ModelBase],
+        ids: Sequence[Any],
+    ) -> None:
+        """Invalidates the counters of the scopes, which count the rows
+        of the model with the ids and the rows their deletion cascades to
+
+        Must be called before the rows are deleted, since the scopes
+        are found by them. The archived rows are looked up as well.
+        The counters of the deleted roles and users are deleted.
+        """
+        scopes_queries: list[tuple[StatisticsScope, Select]] = []
+
+        if model is RoleModel:
+            await self._delete_counters(session, StatisticsScope.ROLE, ids)
+
+        elif model is RegularUserModel:
+            await self._delete_counters(
+                session, StatisticsScope.REGULAR_USER, ids
+            )
+
+            scopes_queries += [
+                (
+                    StatisticsScope.SUPPORT_USER,
+                    select(answers.support_user_id)
+                    .join(questions, answers.question_id == questions.id)
+                    .where(questions.regular_user_id.in_(ids)),
+                )
+                for questions, answers in _QUESTIONS_AND_ANSWERS_MODELS
+            ]
+
+        elif model is SupportUserModel:
+            await self._delete_counters(
+                session, StatisticsScope.SUPPORT_USER, ids
+            )
+
+            scopes_queries.append(
+                (
+                    StatisticsScope.ROLE,
+                    select(SupportUserModel.role_id).where(
+                        SupportUserModel.id.in_(ids)
+                    ),
+                )
+            )
+
+            scopes_queries += [
+                (
+                    StatisticsScope.REGULAR_USER,
+                    select(questions.regular_user_id)
+                    .join(answers, answers.question_id == questions.id)
+                    .where(answers.support_user_id.in_(ids)),
+                )
+                for questions, answers in _QUESTIONS_AND_ANSWERS_MODELS
+            ]
+
+        elif model is QuestionModel:
+            for questions, answers in _QUESTIONS_AND_ANSWERS_MODELS:
+                scopes_queries += [
+                    (
+                        StatisticsScope.REGULAR_USER,
+                        select(questions.regular_user_id).where(
+                            questions.id.in_(ids)
+                        ),
+                    ),
+                    (
+                        StatisticsScope.SUPPORT_USER,
+                        select(answers.support_user_id).where(
+                            answers.question_id.in_(ids)
+                        ),
+                    ),
+                ]
+
+        elif model is AnswerModel:
+            for questions, answers in _QUESTIONS_AND_ANSWERS_MODELS:
+                scopes_queries += [
+                    (
+                        StatisticsScope.REGULAR_USER,
+                        select(questions.regular_user_id)
+                        .join(answers, answers.question_id == questions.id)
+                        .where(answers.id.in_(ids)),
+                    ),
+                    (
+                        StatisticsScope.SUPPORT_USER,
+                        select(answers.support_user_id).where(
+                            answers.id.in_(ids)
+                        ),
+                    ),
+                ]
+
+        else:
+            # The attachments are counted only by the global counters,
+            # their deletions update them with the deltas
+            return
+
+        await self._invalidate_counters(session, StatisticsScope.GLOBAL)
+
+        for scope, q in scopes_queries:
+            await self._invalidate_counters(
+                session, scope, (await session.execute(q)).scalars().all()
+            )
+
+    async def _delete_counters(
+        self, session: AsyncSession, scope: StatisticsScope, ids: Sequence[Any]
+    ) -> None:
+        await session.execute(
+            delete(StatisticsCountersModel)
+            .where(
+                and_(
+                    StatisticsCountersModel.scope == scope,
+                    StatisticsCountersModel.scope_id.in_(
+                        [str(id) for id in ids]
+                    ),
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _count_statistics(
+        self,
+        session: AsyncSession,
+        scope: StatisticsScope,
+        ids: list[Any] | None = None,
+    ) -> dict[Any, Any]:
+        match scope:
+            case StatisticsScope.GLOBAL:
+                return {"": await self._count_global_statistics(session)}
+
+            case StatisticsScope.ROLE:
+                return await self._count_roles_statistics(session, ids)
+
+            case StatisticsScope.REGULAR_USER:
+                return await self._count_regular_users_statistics(session, ids)
+
+            case StatisticsScope.SUPPORT_USER:
+                return await self._count_support_users_statistics(session, ids)
+
+        raise ValueError(f"No statistics for {scope} scope")
+
+    async def _count_global_statistics(
+        self, session: AsyncSession
+    ) -> GlobalStatistics:
+        """Counts all the global statistics using one statement
+
+        Every table is scanned once and the answers counters are collected
+        with conditional aggregation. Since it's a single statement,
+        all the totals are taken from the same snapshot of the DB.
+        The archived rows are counted as well, all the archived
+        questions are closed, so they are answered.
+        """
+        answers = _with_archive(AnswerModel, "id", "is_useful")
+
+        is_useful = answers.c.is_useful == True  # noqa: E712
+        is_unuseful = answers.c.is_useful == False  # noqa: E712
+
+        answers_subquery = select(
+            func.count(answers.c.id).label("total_answers"),
+            _count_where(is_useful).label("total_useful_answers"),
+            _count_where(is_unuseful).label("total_unuseful_answers"),
+        ).subquery()
+
+        archived_questions = _count_all(QuestionArchiveModel.id)
+
+        q = select(
+            answers_subquery,
+            _count_all(RoleModel.id).label("total_roles"),
+            _count_all(RegularUserModel.id).label("total_regular_users"),
+            _count_all(SupportUserModel.id).label("total_support_users"),
+            (_count_all(QuestionModel.id) + archived_questions).label(
+                "total_questions"
+            ),
+            (
+                select(func.count(QuestionModel.id))
+                .where(QuestionModel.status.in_(ANSWERED_STATUSES))
+                .scalar_subquery()
+                + archived_questions
+            ).label("total_answered_questions"),
+            (
+                _count_all(QuestionAttachmentModel.id)
+                + _count_all(QuestionAttachmentArchiveModel.id)
+            ).label("total_questions_attachments"),
+            (
+                _count_all(AnswerAttachmentModel.id)
+                + _count_all(AnswerAttachmentArchiveModel.id)
+            ).label("total_answers_attachments"),
+        )
+
+        row = (await session.execute(q)).one()
+
+        statistics = GlobalStatistics()
+
+        statistics.total_roles = row.total_roles
+        statistics.total_regular_users = row.total_regular_users
+        statistics.total_support_users = row.total_support_users
+        statistics.total_questions = row.total_questions
+        statistics.total_answered_questions = row.total_answered_questions
+        statistics.total_unanswered_questions = (
+            row.total_questions - row.total_answered_questions
+        )
+        statistics.total_answers = row.total_answers
+        statistics.total_useful_answers = row.total_useful_answers
+        statistics.total_unuseful_answers = row.total_unuseful_answers
+        statistics.total_unestimated_ansers = (
+            row.total_answers
+            - row.total_useful_answers
+            - row.total_unuseful_answers
+        )
+        statistics.total_questions_attachments = (
+            row.total_questions_attachments
+        )
+        statistics.total_answers_attachments = row.total_answers_attachments
+
+        return statistics
+
+    async def _count_roles_statistics(
+        self, session: AsyncSession, roles_ids: list[int] | None = None
+    ) -> dict[int, RoleStatistics]:
+        q = select(
+            SupportUserModel.role_id,
+            func.count(SupportUserModel.id).label("total_users"),
+        ).group_by(SupportUserModel.role_id)
+
+        q = (
+            q.where(SupportUserModel.role_id.in_(roles_ids))
+            if roles_ids is not None
+            else q.where(SupportUserModel.role_id != None)  # noqa: E711
+        )
+
+        rows = {row.role_id: row for row in (await session.execute(q)).all()}
+
+        return {
+            id: _as_role_statistics(rows.get(id))
+            for id in (roles_ids if roles_ids is not None else rows)
+        }
+
+    async def _count_regular_users_statistics(
+        self,
+        session: AsyncSession,
+        regular_users_ids: list[UUID] | None = None,
+    ) -> dict[UUID, RegularUserStatistics]:
+        """Counts statistics of the regular users using one statement
+
+        Statistics of all the regular users, who asked questions,
+        are counted if no ids are passed. The archived questions
+        and answers are counted by the same query of the archive tables,
+        its counters are summed up with the counters of the hot tables.
+        """
+
+        def count(questions: Any, answers: Any) -> Select:
+            is_useful = answers.is_useful == True  # noqa: E712
+            is_unuseful = answers.is_useful == False  # noqa: E712
+            is_unestimated = and_(
+                answers.id != None,  # noqa: E711
+                answers.is_useful == None,  # noqa: E711
+            )
+
+            q = (
+                select(
+                    questions.regular_user_id,
+                    func.count(distinct(questions.id)).label(
+                        "asked_questions"
+                    ),
+                    func.count(distinct(answers.question_id)).label(
+                        "answered_questions"
+                    ),
+                    func.count(answers.id).label("answers_for_questions"),
+                    _count_where(is_useful).label("useful_answers"),
+                    _count_where(is_unuseful).label("unuseful_answers"),
+                    _count_where(is_unestimated).label("unestimated_answers"),
+                )
+                .outerjoin(answers, answers.question_id == questions.id)
+                .group_by(questions.regular_user_id)
+            )
+
+            if regular_users_ids is not None:
+                q = q.where(questions.regular_user_id.in_(regular_users_ids))
+
+            return q
+
+        counters = union_all(
+            count(QuestionModel, AnswerModel),
+            count(QuestionArchiveModel, AnswerArchiveModel),
+        ).subquery()
+
+        q = select(
+            counters.c.regular_user_id,
+            *(
+                func.sum(column).label(column.name)
+                for column in counters.c
+                if column.name != "regular_user_id"
+            ),
+        ).group_by(counters.c.regular_user_id)
+
+        rows = {
+            row.regular_user_id: row
+            for row in (await session.execute(q)).all()
+        }
+
+        return {
+            id: _as_regular_user_statistics(rows.get(id))
+            for id in (
+                regular_users_ids if regular_users_ids is not None else rows
+            )
+        }
+
+    async def _count_support_users_statistics(
+        self,
+        session: AsyncSession,
+        support_users_ids: list[UUID] | None = None,
+    ) -> dict[UUID, SupportUserStatistics]:
+        """Counts statistics of the support users using one statement
+
+        Statistics of all the support users, who answered questions,
+        are counted if no ids are passed. The archived answers
+        are counted as well.
+        """
+        answers = _with_archive(
+            AnswerModel, "id", "support_user_id", "is_useful"
+        )
+
+        is_useful = answers.c.is_useful == True  # noqa: E712
+        is_unuseful = answers.c.is_useful == False  # noqa: E712
+
+        q = select(
+            answers.c.support_user_id,
+            func.count(answers.c.id).label("total_answers"),
+            _count_where(is_useful).label("useful_answers"),
+            _count_where(is_unuseful).label("unuseful_answers"),
+        ).group_by(answers.c.support_user_id)
+
+        if support_users_ids is not None:
+            q = q.where(answers.c.support_user_id.in_(support_users_ids))
+
+        rows = {
+            row.support_user_id: row
+            for row in (await session.execute(q)).all()
+        }
+
+        return {
+            id: _as_support_user_statistics(rows.get(id))
+            for id in (
+                support_users_ids if support_users_ids is not None else rows
+            )
+        }
+
+
+def _order_by_keyset(
+    q: Select,
+    date_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    desc_order: bool,
+) -> Select:
+    return (
+        q.order_by(date_column.desc(), id_column.desc())
+        if desc_order
+        else q.order_by(date_column.asc(), id_column.asc())
+    )
+
+
+def _keyset_after(
+    date_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: PageCursor,
+    desc_order: bool,
+):
+    key = tuple_(date_column, id_column)
+
+    cursor_key = tuple_(
+        literal(cursor[0], date_column.type),
+        literal(cursor[1], id_column.type),
+    )
+
+    return key < cursor_key if desc_order else key > cursor_key
+
+
+def _get_keyset(entity: Any) -> PageCursor:
+    return (entity.date, entity.id)
+
+
+def _is_bound(questions: Any):
+    """Whether a support user has bound the question"""
+    return (
+        select(SupportUserModel.id)
+        .where(SupportUserModel.current_question_id == questions.id)
+        .exists()
+    )
+
+
+def _status_literal(status: QuestionStatus):
+    # The type is cast explicitly, since PostgreSQL takes the parameters
+    # of CASE for text, which isn't assigned to its enum types implicitly
+    status_type = QuestionModel.status.type
+
+    return cast(literal(status, status_type), status_type)
+
+
+def _collect_values(
+    rows: Iterable[dict[str, Any]], key: str, values: set[Any]
+) -> Iterator[dict[str, Any]]:
+    """Yields the rows, adding their values of the key to the set"""
+    for row in rows:
+        if row.get(key) is not None:
+            values.add(row[key])
+
+        yield row
+
+
+def _not_none(*values: T | None) -> list[T]:
+    return [value for value in values if value is not None]
+
+
+def _with_archive(model: type[ModelBase], *columns: str):
+    """Subquery of the columns of the rows of the model's table
+    and its archive table
+    """
+    return union_all(
+        *(
+            select(*(getattr(table, name) for name in columns))
+            for table in (model, _ARCHIVE_MODELS[model])
+        )
+    ).subquery()
+
+
+def _count_all(column):
+    return select(func.count(column)).scalar_subquery()
+
+
+def _count_where(condition):
+    # SUM(CASE ...) is used instead of COUNT(*) FILTER (...),
+    # since FILTER is not supported by MySQL
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _as_regular_user_statistics(row) -> RegularUserStatistics:
+    statistics = RegularUserStatistics()
+
+    statistics.asked_questions = row.asked_questions if row else 0
+    statistics.answered_questions = row.answered_questions if row else 0
+    statistics.unanswered_questions = (
+        statistics.asked_questions - statistics.answered_questions
+    )
+    statistics.answers_for_questions = row.answers_for_questions if row else 0
+    statistics.useful_answers = row.useful_answers if row else 0
+    statistics.unuseful_answers = row.unuseful_answers if row else 0
+    statistics.unestimated_answers = row.unestimated_answers if row else 0
+
+    return statistics
+
+
+def _as_support_user_statistics(row) -> SupportUserStatistics:
+    statistics = SupportUserStatistics()
+
+    statistics.total_answers = row.total_answers if row else 0
+    statistics.useful_answers = row.useful_answers if row else 0
+    statistics.unuseful_answers = row.unuseful_answers if row else 0
+    statistics.unestimated_answers = (
+        statistics.total_answers
+        - statistics.useful_answers
+        - statistics.unuseful_answers
+    )
+
+    return statistics
+
+
+def _as_role_statistics(row) -> RoleStatistics:
+    statistics = RoleStatistics()
+
+    statistics.total_users = row.total_users if row else 0
+
+    return statistics
+
+
+def _as_question_statistics(row) -> QuestionStatistics:
+    statistics = QuestionStatistics()
+
+    statistics.total_answers = row.total_answers if row else 0
+    statistics.total_attachments = row.total_attachments if row else 0
+
+    return statistics
+
+
+# Hot models and their archive models, in the order of their references
+_ARCHIVE_MODELS: dict[type[ModelBase], type[ModelBase]] = {
+    QuestionModel: QuestionArchiveModel,
+    AnswerModel: AnswerArchiveModel,
+    QuestionAttachmentModel: QuestionAttachmentArchiveModel,
+    AnswerAttachmentModel: AnswerAttachmentArchiveModel,
+}
+
+_STATISTICS_COUNTERS_BATCH_SIZE = 1000
+
+_STREAM_BATCH_SIZE = 500
+
+_STATISTICS_COUNTERS_FACTORIES: dict[
+    StatisticsScope, Callable[[Any, Any], StatisticsCountersModel]
+] = {
+    StatisticsScope.GLOBAL: (
+        lambda _, statistics: StatisticsCountersModel.from_global_statistics(
+            statistics
+        )
+    ),
+    StatisticsScope.ROLE: StatisticsCountersModel.from_role_statistics,
+    StatisticsScope.REGULAR_USER: (
+        StatisticsCountersModel.from_regular_user_statistics
+    ),
+    StatisticsScope.SUPPORT_USER: (
+        StatisticsCountersModel.from_support_user_statistics
+    ),
+}
+
+_STATISTICS_FROM_COUNTERS: dict[
+    StatisticsScope, Callable[[StatisticsCountersModel], Any]
+] = {
+    StatisticsScope.GLOBAL: StatisticsCountersModel.as_global_statistics,
+    StatisticsScope.ROLE: StatisticsCountersModel.as_role_statistics,
+    StatisticsScope.REGULAR_USER: (
+        StatisticsCountersModel.as_regular_user_statistics
+    ),
+    StatisticsScope.SUPPORT_USER: (
+        StatisticsCountersModel.as_support_user_statistics
+    ),
+}
+
+# Models of the entities, which have the counters of their scopes
+_STATISTICS_SCOPES_MODELS: dict[StatisticsScope, type[ModelBase]] = {
+    StatisticsScope.ROLE: RoleModel,
+    StatisticsScope.REGULAR_USER: RegularUserModel,
+    StatisticsScope.SUPPORT_USER: SupportUserModel,
+}
+
+# The answers of the hot questions are hot, the ones of the archived
+# questions are archived
+_QUESTIONS_AND_ANSWERS_MODELS: tuple[tuple[Any, Any], ...] = (
+    (QuestionModel, AnswerModel),
+    (QuestionArchiveModel, AnswerArchiveModel),
+)
+
+# Scopes, which count the rows of the models besides the global one
+_BULK_INSERTS_SCOPES: dict[type[ModelBase], tuple[StatisticsScope, ...]] = {
+    SupportUserModel: (StatisticsScope.ROLE,),
+    QuestionModel: (StatisticsScope.REGULAR_USER,),
+    AnswerModel: (StatisticsScope.REGULAR_USER, StatisticsScope.SUPPORT_USER),
+}
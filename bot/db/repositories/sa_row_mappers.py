@@ -0,0 +1,445 @@
+from __future__ import annotations
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Generic, Iterator, TypeVar
+from sqlalchemy import Column, FromClause, Row, Select, Table, select
+from bot.db.models.sa_models import (
+    AnswerArchiveModel,
+    AnswerAttachmentArchiveModel,
+    AnswerAttachmentModel,
+    AnswerModel,
+    QuestionArchiveModel,
+    QuestionAttachmentArchiveModel,
+    QuestionAttachmentModel,
+    QuestionModel,
+    RegularUserModel,
+    RoleModel,
+    SupportUserModel,
+)
+from bot.entities.answer import Answer
+from bot.entities.answer_attachment import AnswerAttachment
+from bot.entities.question import Question
+from bot.entities.question_attachment import QuestionAttachment
+from bot.entities.regular_user import RegularUser
+from bot.entities.role import Role, RolePermissions
+from bot.entities.support_user import SupportUser
+
+
+T = TypeVar("T")
+
+# Values of a row, every entity takes its own columns from it in turn
+Values = Iterator[Any]
+
+# Number of the related entities shared by the entities built from rows
+SHARED_ENTITIES_SIZE = 10_000
+
+
+class SharedEntities:
+    """Related entities already built from the rows, by their types and ids
+
+    Rows repeat the same related entities, e.g. all the answers for
+    a question repeat the question's columns. The entities built from
+    them are shared instead of being built again. Only the entities
+    that none of their methods change are shared: roles, regular users
+    and questions. Support users are changed by their methods, so
+    every row gets its own one. There is
+    an upper bound of the entities kept, so streams of any length
+    don't pile all their related entities up.
+    """
+
+    maxsize: int
+
+    def __init__(self, maxsize: int = SHARED_ENTITIES_SIZE):
+        self.maxsize = maxsize
+        self._entities: dict[tuple[type, Any], Any] = {}
+
+    def get(self, entity_type: type[T], id: Any) -> T | None:
+        return self._entities.get((entity_type, id))
+
+    def add(self, entity: T) -> T:
+        if len(self._entities) >= self.maxsize:
+            self._entities.clear()
+
+        self._entities[(type(entity), entity.id)] = entity  # type: ignore
+
+        return entity
+
+
+class RowMapper(Generic[T]):
+    """Core select of the columns of entities and the function
+    that builds the entities straight from its rows
+
+    No models are created and nothing is put into the identity map
+    of the session, so it's much cheaper than loading the models and
+    converting them into entities. The entities are the same as the ones
+    loaded with LoaderProfile.IDENTITY, except that the related entities
+    that are never changed are shared by all the entities built by
+    the same function returned by make_as_entity, see SharedEntities.
+    So they must not be changed by assigning their attributes either.
+    Since there are no models, it's only suitable for the read-only paths.
+    """
+
+    # Table of the entities, the related entities are joined
+    # from the aliases of their tables
+    table: Table
+    query: Select
+    date_column: Column
+    id_column: Column
+
+    def __init__(
+        self,
+        table: Table,
+        query: Select,
+        date_column: str,
+        take_entity: Callable[[Values, SharedEntities], T],
+    ):
+        self.table = table
+        self.query = query
+        self.date_column = table.c[date_column]
+        self.id_column = table.c.id
+        self._take_entity = take_entity
+
+    def make_as_entity(self) -> Callable[[Row], T]:
+        """Returns a function that builds an entity from a row, the entities
+        it builds share their read-only related entities with each other
+        """
+        shared = SharedEntities()
+        take_entity = self._take_entity
+
+        def as_entity(row: Row) -> T:
+            return take_entity(iter(row), shared)  # type: ignore
+
+        return as_entity
+
+
+# Columns of every entity, in the order its function takes them
+
+_REGULAR_USER_COLUMNS = ("id", "tg_bot_user_id", "join_date")
+
+_ROLE_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "can_answer_questions",
+    "can_manage_support_users",
+    "created_date",
+)
+
+_QUESTION_COLUMNS = ("id", "message", "tg_message_id", "date")
+
+_SUPPORT_USER_COLUMNS = (
+    "id",
+    "descriptive_name",
+    "tg_bot_user_id",
+    "join_date",
+    "is_owner",
+    "is_active",
+    "current_question_id",
+)
+
+_ANSWER_COLUMNS = ("id", "message", "tg_message_id", "is_useful", "date")
+
+_ATTACHMENT_COLUMNS = ("tg_file_id", "attachment_type", "caption", "date")
+
+
+def _columns(table: FromClause, names: tuple[str, ...]) -> list[Column]:
+    return [table.c[name] for name in names]
+
+
+# The functions below take the entity's columns from the values.
+# The related read-only entities are always shared, the entity itself
+# is shared unless share is False. Support users are never shared.
+
+
+def _take_regular_user(
+    values: Values, shared: SharedEntities, share: bool = True
+) -> RegularUser:
+    id, tg_bot_user_id, join_date = islice(values, 3)
+
+    if share and (regular_user := shared.get(RegularUser, id)):
+        return regular_user
+
+    regular_user = RegularUser(id, tg_bot_user_id, join_date)
+
+    return shared.add(regular_user) if share else regular_user
+
+
+def _take_role(values: Values, shared: SharedEntities) -> Role | None:
+    (
+        id,
+        name,
+        description,
+        can_answer_questions,
+        can_manage_support_users,
+        created_date,
+    ) = islice(values, 6)
+
+    # The role is outer joined, its id is NULL if the user has no role
+    if id is None:
+        return None
+
+    if role := shared.get(Role, id):
+        return role
+
+    return shared.add(
+        Role(
+            id=id,
+            name=name,
+            description=description,
+            permissions=RolePermissions(
+                can_answer_questions, can_manage_support_users
+            ),
+            created_date=created_date,
+        )
+    )
+
+
+def _take_question(
+    values: Values, shared: SharedEntities, share: bool = True
+) -> Question:
+    id, message, tg_message_id, date = islice(values, 4)
+
+    regular_user = _take_regular_user(values, shared)
+
+    if share and (question := shared.get(Question, id)):
+        return question
+
+    question = Question(
+        id=id,
+        regular_user=regular_user,
+        message=message,
+        tg_message_id=tg_message_id,
+        date=date,
+    )
+
+    return shared.add(question) if share else question
+
+
+def _take_support_user(values: Values, shared: SharedEntities) -> SupportUser:
+    (
+        id,
+        descriptive_name,
+        tg_bot_user_id,
+        join_date,
+        is_owner,
+        is_active,
+        current_question_id,
+    ) = islice(values, 7)
+
+    role = _take_role(values, shared)
+
+    return SupportUser(
+        id=id,
+        role=role,
+        tg_bot_user_id=tg_bot_user_id,
+        descriptive_name=descriptive_name,
+        join_date=join_date,
+        is_owner=is_owner,
+        is_active=is_active,
+        current_question_id=current_question_id,
+    )
+
+
+def _take_answer(values: Values, shared: SharedEntities) -> Answer:
+    id, message, tg_message_id, is_useful, date = islice(values, 5)
+
+    support_user = _take_support_user(values, shared)
+    question = _take_question(values, shared)
+
+    return Answer(
+        id=id,
+        support_user=support_user,
+        question=question,
+        message=message,
+        tg_message_id=tg_message_id,
+        is_useful=is_useful,
+        date=date,
+    )
+
+
+def _take_question_attachment(
+    values: Values, shared: SharedEntities
+) -> QuestionAttachment:
+    id, question_id, tg_file_id, attachment_type, caption, date = values
+
+    return QuestionAttachment(
+        id=id,
+        question_id=question_id,
+        tg_file_id=tg_file_id,
+        attachment_type=attachment_type,
+        caption=caption,
+        date=date,
+    )
+
+
+def _take_answer_attachment(
+    values: Values, shared: SharedEntities
+) -> AnswerAttachment:
+    id, answer_id, tg_file_id, attachment_type, caption, date = values
+
+    return AnswerAttachment(
+        id=id,
+        answer_id=answer_id,
+        tg_file_id=tg_file_id,
+        attachment_type=attachment_type,
+        caption=caption,
+        date=date,
+    )
+
+
+# The functions below add the columns of the entity joined
+# from the left table to the query, in the order they are taken
+
+
+def _join_regular_user(q: Select, left: FromClause) -> Select:
+    regular_users = RegularUserModel.__table__.alias()
+
+    return q.add_columns(
+        *_columns(regular_users, _REGULAR_USER_COLUMNS)
+    ).join_from(
+        left, regular_users, left.c.regular_user_id == regular_users.c.id
+    )
+
+
+def _join_role(q: Select, left: FromClause) -> Select:
+    roles = RoleModel.__table__.alias()
+
+    return q.add_columns(*_columns(roles, _ROLE_COLUMNS)).outerjoin_from(
+        left, roles, left.c.role_id == roles.c.id
+    )
+
+
+def _join_question(q: Select, left: FromClause, table: Table) -> Select:
+    questions = table.alias()
+
+    q = q.add_columns(*_columns(questions, _QUESTION_COLUMNS)).join_from(
+        left, questions, left.c.question_id == questions.c.id
+    )
+
+    return _join_regular_user(q, questions)
+
+
+def _join_support_user(q: Select, left: FromClause) -> Select:
+    support_users = SupportUserModel.__table__.alias()
+
+    q = q.add_columns(
+        *_columns(support_users, _SUPPORT_USER_COLUMNS)
+    ).join_from(
+        left, support_users, left.c.support_user_id == support_users.c.id
+    )
+
+    return _join_role(q, support_users)
+
+
+def _make_regular_users_mapper() -> RowMapper[RegularUser]:
+    table = RegularUserModel.__table__
+
+    return RowMapper(
+        table,  # type: ignore
+        select(*_columns(table, _REGULAR_USER_COLUMNS)),
+        "join_date",
+        partial(_take_regular_user, share=False),
+    )
+
+
+def _make_support_users_mapper() -> RowMapper[SupportUser]:
+    table = SupportUserModel.__table__
+
+    q = _join_role(select(*_columns(table, _SUPPORT_USER_COLUMNS)), table)
+
+    return RowMapper(
+        table,  # type: ignore
+        q,
+        "join_date",
+        _take_support_user,
+    )
+
+
+# The archive tables have the same columns as the hot ones,
+# so the same mappers are made for both of them
+
+
+def _make_questions_mapper(table: Table) -> RowMapper[Question]:
+    q = _join_regular_user(select(*_columns(table, _QUESTION_COLUMNS)), table)
+
+    return RowMapper(
+        table, q, "date", partial(_take_question, share=False)  # type: ignore
+    )
+
+
+def _make_answers_mapper(
+    table: Table, questions_table: Table
+) -> RowMapper[Answer]:
+    q = select(*_columns(table, _ANSWER_COLUMNS))
+    q = _join_support_user(q, table)
+    q = _join_question(q, table, questions_table)
+
+    return RowMapper(table, q, "date", _take_answer)  # type: ignore
+
+
+def _make_questions_attachments_mapper(
+    table: Table,
+) -> RowMapper[QuestionAttachment]:
+    return RowMapper(
+        table,  # type: ignore
+        select(
+            table.c.id,
+            table.c.question_id,
+            *_columns(table, _ATTACHMENT_COLUMNS),
+        ),
+        "date",
+        _take_question_attachment,
+    )
+
+
+def _make_answers_attachments_mapper(
+    table: Table,
+) -> RowMapper[AnswerAttachment]:
+    return RowMapper(
+        table,  # type: ignore
+        select(
+            table.c.id,
+            table.c.answer_id,
+            *_columns(table, _ATTACHMENT_COLUMNS),
+        ),
+        "date",
+        _take_answer_attachment,
+    )
+
+
+REGULAR_USERS_ROWS = _make_regular_users_mapper()
+
+SUPPORT_USERS_ROWS = _make_support_users_mapper()
+
+QUESTIONS_ROWS = _make_questions_mapper(
+    QuestionModel.__table__  # type: ignore
+)
+
+ANSWERS_ROWS = _make_answers_mapper(
+    AnswerModel.__table__, QuestionModel.__table__  # type: ignore
+)
+
+QUESTIONS_ATTACHMENTS_ROWS = _make_questions_attachments_mapper(
+    QuestionAttachmentModel.__table__  # type: ignore
+)
+
+ANSWERS_ATTACHMENTS_ROWS = _make_answers_attachments_mapper(
+    AnswerAttachmentModel.__table__  # type: ignore
+)
+
+QUESTIONS_ARCHIVE_ROWS = _make_questions_mapper(
+    QuestionArchiveModel.__table__  # type: ignore
+)
+
+ANSWERS_ARCHIVE_ROWS = _make_answers_mapper(
+    AnswerArchiveModel.__table__,  # type: ignore
+    QuestionArchiveModel.__table__,  # type: ignore
+)
+
+QUESTIONS_ATTACHMENTS_ARCHIVE_ROWS = _make_questions_attachments_mapper(
+    QuestionAttachmentArchiveModel.__table__  # type: ignore
+)
+
+ANSWERS_ATTACHMENTS_ARCHIVE_ROWS = _make_answers_attachments_mapper(
+    AnswerAttachmentArchiveModel.__table__  # type: ignore
+)
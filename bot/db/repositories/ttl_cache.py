@@ -0,0 +1,111 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+import time
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheMetrics:
+    """Counters of what happened to a cache since it was created"""
+
+    hits: int
+    misses: int
+
+    # Entries removed to make room for the new ones
+    evictions: int
+
+    # Entries removed because their ttl had passed
+    expirations: int
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """A bounded in-process cache whose entries expire after ttl seconds
+
+    When the cache is full, the least recently used entry is evicted.
+    None can't be cached, since get returns it for the missing entries.
+    """
+
+    maxsize: int
+    ttl: float
+    metrics: CacheMetrics
+
+    # Grows on every invalidation, so a value loaded before
+    # an invalidation can be told apart and not be cached
+    version: int
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("The cache size must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.metrics = CacheMetrics()
+        self.version = 0
+        self._timer = timer
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.metrics.misses += 1
+
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= self._timer():
+            del self._entries[key]
+
+            self.metrics.expirations += 1
+            self.metrics.misses += 1
+
+            return None
+
+        self._entries.move_to_end(key)
+
+        self.metrics.hits += 1
+
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = (self._timer() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+            self.metrics.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+        self.version += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+        self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
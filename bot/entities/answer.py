@@ -2,8 +2,9 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
 from typing import TYPE_CHECKING
+from bot.db.repositories.repository import LoaderProfile
 from bot.typing import Repo
-from bot.utils import IdComparable, AttachmentType
+from bot.utils import IdComparable, AttachmentType, Relationship
 from bot.entities.answer_attachment import AnswerAttachment
 from bot.services.statistics import AnswerStatistics
 
@@ -14,9 +15,23 @@ if TYPE_CHECKING:
 
 
 class Answer(IdComparable):
+    __slots__ = (
+        "id",
+        "support_user_id",
+        "_support_user",
+        "question_id",
+        "_question",
+        "message",
+        "tg_message_id",
+        "is_useful",
+        "date",
+    )
+
     id: UUID
-    support_user: SupportUser
-    question: Question
+    support_user: Relationship[SupportUser] = Relationship()
+    support_user_id: UUID
+    question: Relationship[Question] = Relationship()
+    question_id: UUID
     message: str
     tg_message_id: int
     is_useful: bool | None
@@ -25,21 +40,39 @@ class Answer(IdComparable):
     def __init__(
         self,
         id: UUID,
-        support_user: SupportUser,
-        question: Question,
+        support_user: SupportUser | None,
+        question: Question | None,
         message: str,
         tg_message_id: int,
         is_useful: bool | None = None,
         date: datetime = datetime.now(),
+        support_user_id: UUID | None = None,
+        question_id: UUID | None = None,
     ):
         self.id = id
-        self.support_user = support_user
-        self.question = question
+        Answer.support_user.init(self, support_user, support_user_id)
+        Answer.question.init(self, question, question_id)
         self.message = message
         self.tg_message_id = tg_message_id
         self.is_useful = is_useful
         self.date = date
 
+    async def get_support_user(self, repo: Repo) -> SupportUser:
+        return await Answer.support_user.resolve(
+            self,
+            lambda id: repo.get_support_user_by_id(
+                id, loader_profile=LoaderProfile.IDENTITY
+            ),
+        )
+
+    async def get_question(self, repo: Repo) -> Question:
+        return await Answer.question.resolve(
+            self,
+            lambda id: repo.get_question_by_id(
+                id, loader_profile=LoaderProfile.IDENTITY
+            ),
+        )
+
     async def estimate_as_useful(self, repo: Repo) -> None:
         if not (self.is_useful is None):
             return None
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 
 
 class AnswerAttachment(Attachment, IdComparable):
+    __slots__ = ("answer_id",)
+
     id: UUID
 
     answer_id: UUID
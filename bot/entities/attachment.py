@@ -5,6 +5,8 @@ import abc
 
 
 class Attachment(abc.ABC):
+    __slots__ = ("id", "tg_file_id", "attachment_type", "caption", "date")
+
     id: UUID
 
     tg_file_id: str
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
+from bot.db.repositories.repository import LoaderProfile
 from bot.entities.question_attachment import QuestionAttachment
 from bot.typing import Repo
-from bot.utils import IdComparable, AttachmentType
+from bot.utils import IdComparable, AttachmentType, Relationship
 from bot.services.statistics import QuestionStatistics
 
 from typing import TYPE_CHECKING
@@ -14,9 +15,20 @@ if TYPE_CHECKING:
 
 
 class Question(IdComparable):
+    __slots__ = (
+        "id",
+        "regular_user_id",
+        "_regular_user",
+        "message",
+        "tg_message_id",
+        "date",
+    )
+
     id: UUID
 
-    regular_user: RegularUser
+    regular_user: Relationship[RegularUser] = Relationship()
+
+    regular_user_id: UUID
 
     message: str
 
@@ -27,17 +39,26 @@ class Question(IdComparable):
     def __init__(
         self,
         id: UUID,
-        regular_user: RegularUser,
+        regular_user: RegularUser | None,
         message: str,
         tg_message_id: int,
         date: datetime = datetime.now(),
+        regular_user_id: UUID | None = None,
     ):
         self.id = id
-        self.regular_user = regular_user
+        Question.regular_user.init(self, regular_user, regular_user_id)
         self.message = message
         self.tg_message_id = tg_message_id
         self.date = date
 
+    async def get_regular_user(self, repo: Repo) -> RegularUser:
+        return await Question.regular_user.resolve(
+            self,
+            lambda id: repo.get_regular_user_by_id(
+                id, loader_profile=LoaderProfile.IDENTITY
+            ),
+        )
+
     async def get_attachments(self, repo: Repo) -> list[QuestionAttachment]:
         return await repo.get_question_attachments(self.id)
 
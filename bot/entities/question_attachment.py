@@ -16,6 +16,8 @@ if TYPE_CHECKING:
 
 
 class QuestionAttachment(Attachment, IdComparable):
+    __slots__ = ("question_id",)
+
     id: UUID
 
     question_id: UUID
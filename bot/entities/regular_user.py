@@ -9,6 +9,8 @@ from bot.services.statistics import RegularUserStatistics
 
 
 class RegularUser(IdComparable):
+    __slots__ = ("id", "tg_bot_user_id", "join_date")
+
     id: UUID
     tg_bot_user_id: int
     join_date: datetime
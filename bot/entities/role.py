@@ -6,6 +6,8 @@ from bot.services.statistics import RoleStatistics
 
 
 class Role(IdComparable):
+    __slots__ = ("id", "name", "description", "permissions", "created_date")
+
     id: int
 
     name: str
@@ -14,7 +16,7 @@ class Role(IdComparable):
 
     permissions: RolePermissions
 
-    created_date: datetime = datetime.now()
+    created_date: datetime
 
     def __init__(
         self,
@@ -61,6 +63,8 @@ class Role(IdComparable):
 
 
 class RolePermissions:
+    __slots__ = ("can_answer_questions", "can_manage_support_users")
+
     can_answer_questions: bool
     can_manage_support_users: bool
 
@@ -1,22 +1,39 @@
 from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
+from bot.db.repositories.repository import LoaderProfile
 from bot.typing import Repo
 from bot.entities.answer import Answer
 from bot.entities.question import Question
 from bot.entities.role import Role
-from bot.utils import IdComparable
+from bot.utils import IdComparable, Relationship
 from bot.services.statistics import SupportUserStatistics
 
 
 class SupportUser(IdComparable):
+    __slots__ = (
+        "id",
+        "current_question_id",
+        "_current_question",
+        "role_id",
+        "_role",
+        "tg_bot_user_id",
+        "descriptive_name",
+        "join_date",
+        "is_owner",
+        "is_active",
+    )
+
     id: UUID
-    current_question: Question | None
-    role: Role | None
+    current_question: Relationship[Question | None] = Relationship()
+    current_question_id: UUID | None
+    role: Relationship[Role | None] = Relationship()
+    role_id: int | None
     tg_bot_user_id: int
     descriptive_name: str
-    join_date: datetime = datetime.now()
-    is_owner: bool = False
+    join_date: datetime
+    is_owner: bool
+    is_active: bool
 
     def __init__(
         self,
@@ -28,10 +45,14 @@ class SupportUser(IdComparable):
         join_date: datetime = datetime.now(),
         is_owner: bool = False,
         is_active: bool = True,
+        role_id: int | None = None,
+        current_question_id: UUID | None = None,
     ):
         self.id = id
-        self.current_question = current_question
-        self.role = role
+        SupportUser.current_question.init(
+            self, current_question, current_question_id
+        )
+        SupportUser.role.init(self, role, role_id)
         self.tg_bot_user_id = tg_bot_user_id
         self.descriptive_name = descriptive_name
         self.join_date = join_date
@@ -45,14 +66,23 @@ class SupportUser(IdComparable):
         repo: Repo,
         answer_date: datetime = datetime.now(),
     ) -> Answer | None:
-        if self.current_question:
+        if self.current_question_id:
+            # The answer's question is left to be resolved,
+            # unless the bound question is loaded already
+            current_question = (
+                self.current_question
+                if SupportUser.current_question.is_loaded(self)
+                else None
+            )
+
             answer = Answer(
                 uuid4(),
                 self,
-                self.current_question,
+                current_question,
                 message,
                 tg_message_id,
                 date=answer_date,
+                question_id=self.current_question_id,
             )
 
             await repo.add_answer(answer)
@@ -61,6 +91,22 @@ class SupportUser(IdComparable):
 
         return None
 
+    async def get_current_question(self, repo: Repo) -> Question | None:
+        return await SupportUser.current_question.resolve(
+            self,
+            lambda id: repo.get_question_by_id(
+                id, loader_profile=LoaderProfile.IDENTITY
+            ),
+        )
+
+    async def get_role(self, repo: Repo) -> Role | None:
+        return await SupportUser.role.resolve(
+            self,
+            lambda id: repo.get_role_by_id(
+                id, loader_profile=LoaderProfile.IDENTITY
+            ),
+        )
+
     async def make_owner(self, repo: Repo) -> None:
         if self.is_owner:
             return
@@ -86,15 +132,23 @@ class SupportUser(IdComparable):
         self.role = new_role
 
     async def bind_question(self, question: Question, repo: Repo) -> None:
-        if question == self.current_question:
+        if question.id == self.current_question_id:
             return
 
         await repo.bind_question_to_support_user(self.id, question.id)
 
         self.current_question = question
 
+    async def claim_question(self, repo: Repo) -> Question | None:
+        question = await repo.claim_question(self.id)
+
+        if question:
+            self.current_question = question
+
+        return question
+
     async def unbind_question(self, repo: Repo) -> None:
-        if not self.current_question:
+        if not self.current_question_id:
             return
 
         await repo.unbind_question_from_support_user(self.id)
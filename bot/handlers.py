@@ -5,7 +5,7 @@ from bot.utils import (
     get_file_type_and_file_id,
     is_string_int,
 )
-from bot.bot_messages import TextToSend
+from bot.bot_messages import CallbackQueryAnswerToSend, Outbox, TextToSend
 from bot.settings import (
     OWNER_PASSWORD,
     OWNER_DEFAULT_DESCRIPTIVE_NAME,
@@ -14,26 +14,85 @@ from bot.settings import (
     REPO_TYPE,
 )
 from bot.db.repositories.get_repo import get_repo
+from bot.db.db_sa_settings import query_metrics
 from bot.managers.support_user_manager import SupportUserManager
 from bot.managers.regular_user_manager import RegularUserManager
+from bot.services.data_export import ExportDataset, ExportFormat
+from bot.typing import Repo
+from telegram import Update
 from telegram.ext import ContextTypes, CallbackContext
+from typing import Any, Callable, Coroutine
+from functools import wraps
 
 import json
 
+# Callback of the telegram handlers
+Handler = Callable[
+    [Update, ContextTypes.DEFAULT_TYPE], Coroutine[Any, Any, None]
+]
 
-async def handle_start(update, context: ContextTypes.DEFAULT_TYPE) -> None:
+
+def with_query_accounting(handler: Handler) -> Handler:
+    """Attributes the queries run while handling an update to the handler,
+    see /querystats command
+    """
+
+    @wraps(handler)
+    async def wrapper(
+        update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        with query_metrics.account_queries(handler.__name__):
+            await handler(update, context)
+
+    return wrapper
+
+
+def with_unit_of_work(
+    handler: Callable[
+        [Update, ContextTypes.DEFAULT_TYPE, Repo], Coroutine[Any, Any, None]
+    ]
+) -> Handler:
+    """Runs the handler inside of a single unit of work of the repo
+
+    The repo is passed to the handler as the third argument. All the changes
+    made while handling an update are commited once the handler is finished,
+    and only then the messages sent by the handler are sent, see Outbox.
+    The queries of the handler, including the commit, are accounted
+    with with_query_accounting.
+    """
+
+    @with_query_accounting
+    @wraps(handler)
+    async def wrapper(
+        update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        outbox = Outbox()
+
+        with outbox.collect():
+            async with get_repo(REPO_TYPE).unit_of_work() as repo:
+                await handler(update, context, repo)
+
+        await outbox.send()
+
+    return wrapper
+
+
+@with_unit_of_work
+async def handle_start(
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
+) -> None:
     """
     Handles /start command
     """
 
     user = update.effective_user
-    repo = get_repo(REPO_TYPE)
-
     messages = get_messages(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    support_user = await repo.get_support_user_by_tg_bot_user_id(user.id)
+    identity = await repo.resolve_identity(user.id)
+
+    support_user = identity.support_user
 
     if support_user:
         if support_user.is_owner:
@@ -52,9 +111,9 @@ async def handle_start(update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
             return
 
-    regular_user = await repo.get_regular_user_by_tg_bot_user_id(
-        user.id
-    ) or await RegularUser.add_regular_user(user.id, repo)
+    regular_user = identity.regular_user or await RegularUser.add_regular_user(
+        user.id, repo
+    )
 
     if regular_user:
         await TextToSend(
@@ -64,8 +123,9 @@ async def handle_start(update, context: ContextTypes.DEFAULT_TYPE) -> None:
         return
 
 
+@with_unit_of_work
 async def handle_init_owner(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /initowner command
@@ -74,7 +134,6 @@ async def handle_init_owner(
     messages = get_messages(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
-    repo = get_repo(REPO_TYPE)
 
     support_user = await repo.get_owner()
 
@@ -112,8 +171,9 @@ async def handle_init_owner(
     ).send(update)
 
 
+@with_unit_of_work
 async def handle_help_command(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -121,9 +181,9 @@ async def handle_help_command(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
+    identity = await repo.resolve_identity(user.id)
 
-    support_user = await repo.get_support_user_by_tg_bot_user_id(user.id)
+    support_user = identity.support_user
 
     if support_user and support_user.is_active:
         if support_user.is_owner:
@@ -139,9 +199,7 @@ async def handle_help_command(
 
         return
 
-    regular_user = await repo.get_regular_user_by_tg_bot_user_id(user.id)
-
-    if regular_user:
+    if identity.regular_user:
         await TextToSend(
             await messages.get_regular_user_help_message(user)
         ).send(update)
@@ -165,8 +223,9 @@ async def handle_get_id(update, context: ContextTypes.DEFAULT_TYPE) -> None:
 # REGULAR USERS
 
 
+@with_unit_of_work
 async def handle_get_regular_user(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -174,8 +233,6 @@ async def handle_get_regular_user(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     if not (context.args and is_string_int(context.args[0])):  # type: ignore
         await TextToSend(
             await messages.get_incorrect_num_of_arguments_message(
@@ -200,8 +257,9 @@ async def handle_get_regular_user(
 # STATISTICS
 
 
+@with_unit_of_work
 async def handle_global_statistics(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /globalstats command
@@ -212,10 +270,8 @@ async def handle_global_statistics(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     support_user_manager = await SupportUserManager.get_manager(
-        user, user.user.id, messages, repo
+        user, user.id, messages, repo
     )
 
     messages_to_send = await support_user_manager.get_global_statistics()
@@ -224,18 +280,112 @@ async def handle_global_statistics(
         await message.send(update)
 
 
+@with_unit_of_work
+async def handle_pools_statistics(
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
+) -> None:
+    """
+    Handles /poolstats command
+    """
+    user = update.effective_user
+
+    messages = get_messages(
+        user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
+    )
+
+    support_user_manager = await SupportUserManager.get_manager(
+        user, user.id, messages, repo
+    )
+
+    messages_to_send = await support_user_manager.get_pools_statistics()
+
+    for message in messages_to_send:
+        await message.send(update)
+
+
+@with_unit_of_work
+async def handle_query_statistics(
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
+) -> None:
+    """
+    Handles /querystats command
+    """
+    user = update.effective_user
+
+    messages = get_messages(
+        user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
+    )
+
+    support_user_manager = await SupportUserManager.get_manager(
+        user, user.id, messages, repo
+    )
+
+    messages_to_send = await support_user_manager.get_query_statistics()
+
+    for message in messages_to_send:
+        await message.send(update)
+
+
+@with_query_accounting
+async def handle_export(update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Handles /export command
+
+    Unlike the other handlers, it doesn't run in a unit of work: every page
+    of the export is read in its own short transaction instead of keeping
+    a single one open (and the SQLite database locked) for the whole export.
+    """
+    user = update.effective_user
+
+    messages = get_messages(
+        user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
+    )
+
+    datasets = [dataset.value for dataset in ExportDataset]
+    formats = [export_format.value for export_format in ExportFormat]
+
+    if (
+        not context.args
+        or len(context.args) > 2
+        or context.args[0] not in datasets
+        or (len(context.args) == 2 and context.args[1] not in formats)
+    ):
+        await TextToSend(
+            await messages.get_export_usage_message(datasets, formats)
+        ).send(update)
+
+        return
+
+    dataset = ExportDataset(context.args[0])
+    export_format = (
+        ExportFormat(context.args[1])
+        if len(context.args) == 2
+        else ExportFormat.JSONL
+    )
+
+    manager = await SupportUserManager.get_manager(
+        user, user.id, messages, get_repo(REPO_TYPE)
+    )
+
+    messages_to_send = await manager.export_data(dataset, export_format)
+
+    for message in messages_to_send:
+        await message.send(update)
+
+
 # ROLES
 
 
-async def handle_add_role(update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@with_unit_of_work
+async def handle_add_role(
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
+) -> None:
     user = update.effective_user
 
     messages = get_messages(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     if not context.args or len(context.args) < 3 or len(context.args) > 3:
         await TextToSend(
             await messages.get_incorrect_num_of_arguments_message(
@@ -275,15 +425,16 @@ async def handle_add_role(update, context: ContextTypes.DEFAULT_TYPE) -> None:
         await message.send(update)
 
 
-async def handle_get_role(update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@with_unit_of_work
+async def handle_get_role(
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
+) -> None:
     user = update.effective_user
 
     messages = get_messages(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     if not context.args:
         await TextToSend(
             await messages.get_incorrect_num_of_arguments_message(
@@ -294,9 +445,9 @@ async def handle_get_role(update, context: ContextTypes.DEFAULT_TYPE) -> None:
         return
 
     if not is_string_int(context.args[0]):
-        await update.message.reply_text(
-            messages.get_incorrect_arguments_passed_message()
-        )
+        await TextToSend(
+            await messages.get_incorrect_arguments_passed_message()
+        ).send(update)
 
         return
 
@@ -312,16 +463,15 @@ async def handle_get_role(update, context: ContextTypes.DEFAULT_TYPE) -> None:
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_get_all_roles(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /allroles command
     """
     user = update.effective_user
 
-    repo = get_repo(REPO_TYPE)
-
     messages = get_messages(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
@@ -336,8 +486,9 @@ async def handle_get_all_roles(
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_delete_role(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -345,8 +496,6 @@ async def handle_delete_role(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     if not context.args:
         await TextToSend(
             await messages.get_incorrect_num_of_arguments_message(
@@ -357,9 +506,9 @@ async def handle_delete_role(
         return
 
     if not is_string_int(context.args[0]):
-        await update.message.reply_text(
-            messages.get_incorrect_arguments_passed_message()
-        )
+        await TextToSend(
+            await messages.get_incorrect_arguments_passed_message()
+        ).send(update)
 
         return
 
@@ -378,8 +527,9 @@ async def handle_delete_role(
 # SUPPORT USERS
 
 
+@with_unit_of_work
 async def handle_add_support_user(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -387,8 +537,6 @@ async def handle_add_support_user(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -425,8 +573,9 @@ async def handle_add_support_user(
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_activate_support_user(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -434,8 +583,6 @@ async def handle_activate_support_user(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -463,8 +610,9 @@ async def handle_activate_support_user(
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_deactivate_support_user(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -472,8 +620,6 @@ async def handle_deactivate_support_user(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -502,8 +648,9 @@ async def handle_deactivate_support_user(
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_get_support_user(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /getsupuser command
@@ -514,8 +661,6 @@ async def handle_get_support_user(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -544,16 +689,15 @@ async def handle_get_support_user(
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_get_all_suppurt_users(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /allsupusers command
     """
     user = update.effective_user
 
-    repo = get_repo(REPO_TYPE)
-
     messages = get_messages(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
@@ -571,8 +715,9 @@ async def handle_get_all_suppurt_users(
 # QUESTIONS
 
 
+@with_unit_of_work
 async def handle_get_question(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /question command
@@ -583,8 +728,6 @@ async def handle_get_question(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -606,7 +749,7 @@ async def handle_get_question(
 
         return
 
-    messages_to_send = await manager.get_random_unanswered_question()
+    messages_to_send = await manager.claim_question()
 
     for message in messages_to_send:
         await message.send(update)
@@ -614,16 +757,15 @@ async def handle_get_question(
     return
 
 
+@with_unit_of_work
 async def handle_get_question_answers(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /answers [question_id: int] command
     """
     user = update.effective_user
 
-    repo = get_repo(REPO_TYPE)
-
     messages = get_messages(
         update.effective_user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
@@ -656,8 +798,9 @@ async def handle_get_question_answers(
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_bind_question(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /bind command
@@ -668,8 +811,6 @@ async def handle_bind_question(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -698,8 +839,9 @@ async def handle_bind_question(
         await message.send(update)
 
 
+@with_unit_of_work
 async def handle_unbind_question(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /unbind command
@@ -710,8 +852,6 @@ async def handle_unbind_question(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -725,8 +865,9 @@ async def handle_unbind_question(
 # ANSWERS
 
 
+@with_unit_of_work
 async def handle_get_answer(
-    update, context: ContextTypes.DEFAULT_TYPE
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
 ) -> None:
     """
     Handles /answer [answerId] command
@@ -737,8 +878,6 @@ async def handle_get_answer(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
@@ -753,9 +892,9 @@ async def handle_get_answer(
         return
 
     if not is_string_int(context.args[0]):
-        await update.message.reply_text(
-            messages.get_incorrect_arguments_passed_message()
-        )
+        await TextToSend(
+            await messages.get_incorrect_arguments_passed_message()
+        ).send(update)
 
         return
 
@@ -772,7 +911,10 @@ async def handle_get_answer(
 # MESSAGE HANDLERS
 
 
-async def handle_message(update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@with_unit_of_work
+async def handle_message(
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
+) -> None:
     """
     Handles all text messages
     """
@@ -783,11 +925,11 @@ async def handle_message(update, context: ContextTypes.DEFAULT_TYPE) -> None:
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     message = update.message
 
-    support_user = await repo.get_support_user_by_tg_bot_user_id(user.id)
+    identity = await repo.resolve_identity(user.id)
+
+    support_user = identity.support_user
 
     if support_user and support_user.is_active:
         support_user_manager = SupportUserManager(
@@ -803,8 +945,8 @@ async def handle_message(update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
         return
 
-    regular_user_manager = await RegularUserManager.get_manager(
-        user, user.id, messages, repo
+    regular_user_manager = RegularUserManager(
+        user, identity.regular_user, messages, repo
     )
 
     messages_for_regular_user = await regular_user_manager.ask_question(
@@ -817,15 +959,16 @@ async def handle_message(update, context: ContextTypes.DEFAULT_TYPE) -> None:
     return
 
 
-async def handle_file(update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@with_unit_of_work
+async def handle_file(
+    update, context: ContextTypes.DEFAULT_TYPE, repo: Repo
+) -> None:
     user = update.effective_user
 
     messages = get_messages(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     file_type, file_id = get_file_type_and_file_id(update)
 
     if not (file_type and file_id):
@@ -835,7 +978,9 @@ async def handle_file(update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
         return
 
-    support_user = await repo.get_support_user_by_tg_bot_user_id(user.id)
+    identity = await repo.resolve_identity(user.id)
+
+    support_user = identity.support_user
 
     if support_user and support_user.is_active:
         support_user_manager = SupportUserManager(
@@ -853,8 +998,8 @@ async def handle_file(update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
         return
 
-    regular_user_manager = await RegularUserManager.get_manager(
-        user, user.id, messages, repo
+    regular_user_manager = RegularUserManager(
+        user, identity.regular_user, messages, repo
     )
 
     messages_to_send = (
@@ -898,8 +1043,9 @@ async def handle_unknown_command(
 # BUTTONS HANDLERS
 
 
+@with_unit_of_work
 async def handle_bind_question_button(
-    update, context: CallbackContext
+    update, context: CallbackContext, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -907,14 +1053,10 @@ async def handle_bind_question_button(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
 
-    query = update.callback_query
-
     data = json.loads(update.callback_query.data)
 
     messages_to_send = await manager.bind_question(data["id"])
@@ -922,11 +1064,12 @@ async def handle_bind_question_button(
     for message in messages_to_send:
         await message.send(update)
 
-    await query.answer()
+    await CallbackQueryAnswerToSend().send(update)
 
 
+@with_unit_of_work
 async def handle_unbind_question_button(
-    update, context: CallbackContext
+    update, context: CallbackContext, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -934,26 +1077,23 @@ async def handle_unbind_question_button(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
 
-    query = update.callback_query
-
     messages_to_send = await manager.unbind_question()
 
     for message in messages_to_send:
         await message.send(update)
 
-    await query.answer()
+    await CallbackQueryAnswerToSend().send(update)
 
     return
 
 
+@with_unit_of_work
 async def handle_estimate_question_as_useful_button(
-    update, context: CallbackContext
+    update, context: CallbackContext, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -961,26 +1101,23 @@ async def handle_estimate_question_as_useful_button(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await RegularUserManager.get_manager(
         user, user.id, messages, repo
     )
 
-    query = update.callback_query
-
-    data = json.loads(query.data)
+    data = json.loads(update.callback_query.data)
 
     messages_to_send = await manager.estimate_answer_as_useful(data["id"])
 
     for message in messages_to_send:
         await message.send(update)
 
-    await query.answer()
+    await CallbackQueryAnswerToSend().send(update)
 
 
+@with_unit_of_work
 async def handle_estimate_question_as_unuseful_button(
-    update, context: CallbackContext
+    update, context: CallbackContext, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -988,26 +1125,23 @@ async def handle_estimate_question_as_unuseful_button(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await RegularUserManager.get_manager(
         user, user.id, messages, repo
     )
 
-    query = update.callback_query
-
-    data = json.loads(query.data)
+    data = json.loads(update.callback_query.data)
 
     messages_to_send = await manager.estimate_answer_as_unuseful(data["id"])
 
     for message in messages_to_send:
         await message.send(update)
 
-    await query.answer()
+    await CallbackQueryAnswerToSend().send(update)
 
 
+@with_unit_of_work
 async def handle_show_attachments_button(
-    update, context: CallbackContext
+    update, context: CallbackContext, repo: Repo
 ) -> None:
     user = update.effective_user
 
@@ -1015,21 +1149,17 @@ async def handle_show_attachments_button(
         user.language_code, TIMEZONE, DEFAULT_LANGUAGE_CODE
     )
 
-    repo = get_repo(REPO_TYPE)
-
     manager = await SupportUserManager.get_manager(
         user, user.id, messages, repo
     )
 
-    query = update.callback_query
-
-    data = json.loads(query.data)
+    data = json.loads(update.callback_query.data)
 
     messages_to_send = await manager.get_attachments_for_question(data["id"])
 
     for message in messages_to_send:
         await message.send(update)
 
-    await query.answer()
+    await CallbackQueryAnswerToSend().send(update)
 
     return
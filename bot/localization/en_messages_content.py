@@ -13,6 +13,14 @@ from bot.services.statistics import (
     SupportUserStatistics,
     RegularUserStatistics,
 )
+from bot.db.pool_metrics import PoolStatus, WAIT_TIME_BUCKETS
+from bot.db.repositories.ttl_cache import CacheMetrics
+from bot.db.query_metrics import (
+    QueryMetrics,
+    QUERY_TIME_BUCKETS,
+    TOP_STATEMENTS,
+    get_statement_preview,
+)
 from pytz.tzinfo import DstTzInfo, BaseTzInfo, StaticTzInfo
 from datetime import timezone
 
@@ -98,6 +106,10 @@ class ENMessagesContent(MessagesContent):
                 "/start",
                 "/help",
                 "/getid",
+                "/globalstats",
+                "/poolstats",
+                "/querystats",
+                "/export",
             ]
         )
 
@@ -598,6 +610,116 @@ class ENMessagesContent(MessagesContent):
             + f"Total answers attachments: *{global_statistics.total_answers_attachments}*\n"
         ]
 
+    async def get_export_usage_message(
+        self, datasets: list[str], formats: list[str]
+    ) -> list[str]:
+        return [
+            "Usage: /export <dataset> [format]\n\n"
+            + "Datasets: "
+            + ", ".join(f"`{dataset}`" for dataset in datasets)
+            + "\n"
+            + "Formats: "
+            + ", ".join(f"`{format}`" for format in formats)
+        ]
+
+    async def get_data_export_message(
+        self, dataset: str, exported_rows: int
+    ) -> list[str]:
+        return [f"Exported {exported_rows} rows of {dataset}"]
+
+    async def get_pools_statistics_message(
+        self, pools_statuses: dict[str, PoolStatus]
+    ) -> list[str]:
+        if not pools_statuses:
+            return ["The bot doesn't use any connection pools"]
+
+        return [
+            f"Connection pool of the {name}:\n"
+            + f"Checked out connections: *{status.checked_out}*\n"
+            + f"Idle connections: *{status.idle}*\n"
+            + f"Pool size: *{status.size}*\n"
+            + f"Overflow: *{status.overflow}* of *{status.max_overflow}*\n"
+            + f"Max checked out connections: *{status.metrics.max_checked_out}*\n"
+            + f"Checkouts: *{status.metrics.checkouts}*\n"
+            + f"Timed out checkouts: *{status.metrics.timeouts}*\n"
+            + f"Average wait: *{status.metrics.average_wait_time * 1000:.2f} ms*\n"
+            + f"Max wait: *{status.metrics.max_wait_time * 1000:.2f} ms*\n"
+            + "Waits:\n"
+            + "\n".join(
+                f"{bucket}: *{checkouts}*"
+                for bucket, checkouts in zip(
+                    [
+                        f"up to {bound * 1000:g} ms"
+                        for bound in WAIT_TIME_BUCKETS
+                    ]
+                    + [f"over {WAIT_TIME_BUCKETS[-1] * 1000:g} ms"],
+                    status.metrics.wait_time_histogram,
+                )
+            )
+            for name, status in pools_statuses.items()
+        ]
+
+    async def get_query_statistics_message(
+        self,
+        query_metrics: QueryMetrics,
+        cache_metrics: dict[str, CacheMetrics],
+    ) -> list[str]:
+        caches_statistics = (
+            [
+                "Caches:\n"
+                + "\n".join(
+                    f"`{name}`: *{metrics.hits}* hits, "
+                    + f"*{metrics.misses}* misses "
+                    + f"(*{metrics.hit_rate:.0%}* hit rate), "
+                    + f"*{metrics.evictions}* evicted and "
+                    + f"*{metrics.expirations}* expired entries"
+                    for name, metrics in cache_metrics.items()
+                )
+            ]
+            if cache_metrics
+            else []
+        )
+
+        if not query_metrics.statements:
+            return ["The bot hasn't run any queries yet"] + caches_statistics
+
+        return (
+            [
+                "Queries by handlers:\n"
+                + "\n".join(
+                    f"`{handler}`: *{metrics.calls}* calls, "
+                    + f"*{metrics.average_queries:.1f}* queries "
+                    + f"(max *{metrics.max_queries}*) and "
+                    + f"*{metrics.average_db_time * 1000:.2f} ms* in the DB per call"
+                    for handler, metrics in query_metrics.get_top_handlers()
+                )
+                or "No handlers have run queries yet"
+            ]
+            + [
+                f"`{get_statement_preview(statement)}`\n"
+                + f"Executions: *{metrics.executions}*\n"
+                + f"Total time: *{metrics.total_time * 1000:.2f} ms*\n"
+                + f"Average time: *{metrics.average_time * 1000:.2f} ms*\n"
+                + f"Max time: *{metrics.max_time * 1000:.2f} ms*\n"
+                + "Times:\n"
+                + "\n".join(
+                    f"{bucket}: *{executions}*"
+                    for bucket, executions in zip(
+                        [
+                            f"up to {bound * 1000:g} ms"
+                            for bound in QUERY_TIME_BUCKETS
+                        ]
+                        + [f"over {QUERY_TIME_BUCKETS[-1] * 1000:g} ms"],
+                        metrics.time_histogram,
+                    )
+                )
+                for statement, metrics in query_metrics.get_top_statements(
+                    TOP_STATEMENTS
+                )
+            ]
+            + caches_statistics
+        )
+
     async def get_id_message(self, id: int) -> list[str]:
         return ["Your user's ID for this bot:", str(id)]
 
@@ -12,6 +12,9 @@ from bot.services.statistics import (
     RegularUserStatistics,
     RoleStatistics,
 )
+from bot.db.pool_metrics import PoolStatus
+from bot.db.query_metrics import QueryMetrics
+from bot.db.repositories.ttl_cache import CacheMetrics
 from pytz.tzinfo import DstTzInfo, BaseTzInfo, StaticTzInfo
 from datetime import timezone
 
@@ -350,6 +353,32 @@ class MessagesContent(abc.ABC):
     ) -> list[str]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_export_usage_message(
+        self, datasets: list[str], formats: list[str]
+    ) -> list[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_data_export_message(
+        self, dataset: str, exported_rows: int
+    ) -> list[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_pools_statistics_message(
+        self, pools_statuses: dict[str, PoolStatus]
+    ) -> list[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_query_statistics_message(
+        self,
+        query_metrics: QueryMetrics,
+        cache_metrics: dict[str, CacheMetrics],
+    ) -> list[str]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_id_message(self, id: int) -> list[str]:
         raise NotImplementedError
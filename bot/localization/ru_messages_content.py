@@ -13,6 +13,14 @@ from bot.services.statistics import (
     SupportUserStatistics,
     RegularUserStatistics,
 )
+from bot.db.pool_metrics import PoolStatus, WAIT_TIME_BUCKETS
+from bot.db.repositories.ttl_cache import CacheMetrics
+from bot.db.query_metrics import (
+    QueryMetrics,
+    QUERY_TIME_BUCKETS,
+    TOP_STATEMENTS,
+    get_statement_preview,
+)
 from pytz.tzinfo import DstTzInfo, BaseTzInfo, StaticTzInfo
 from datetime import timezone
 from bot.utils import get_eu_formated_datetime
@@ -96,6 +104,10 @@ class RUMessagesContent(MessagesContent):
                 "/start",
                 "/help",
                 "/getid",
+                "/globalstats",
+                "/poolstats",
+                "/querystats",
+                "/export",
             ]
         )
 
@@ -599,6 +611,119 @@ class RUMessagesContent(MessagesContent):
             + f"Всего приложений к ответам: *{global_statistics.total_answers_attachments}*\n"
         ]
 
+    async def get_export_usage_message(
+        self, datasets: list[str], formats: list[str]
+    ) -> list[str]:
+        return [
+            "Использование: /export <набор данных> [формат]\n\n"
+            + "Наборы данных: "
+            + ", ".join(f"`{dataset}`" for dataset in datasets)
+            + "\n"
+            + "Форматы: "
+            + ", ".join(f"`{format}`" for format in formats)
+        ]
+
+    async def get_data_export_message(
+        self, dataset: str, exported_rows: int
+    ) -> list[str]:
+        return [f"Выгружено строк из {dataset}: {exported_rows}"]
+
+    async def get_pools_statistics_message(
+        self, pools_statuses: dict[str, PoolStatus]
+    ) -> list[str]:
+        if not pools_statuses:
+            return ["Бот не использует пулы соединений"]
+
+        names = {"primary": "основной базы данных"}
+
+        return [
+            "Пул соединений "
+            + names.get(name, name.replace("replica", "реплики"))
+            + ":\n"
+            + f"Занятых соединений: *{status.checked_out}*\n"
+            + f"Свободных соединений: *{status.idle}*\n"
+            + f"Размер пула: *{status.size}*\n"
+            + f"Сверх размера пула: *{status.overflow}* из *{status.max_overflow}*\n"
+            + f"Максимум занятых соединений: *{status.metrics.max_checked_out}*\n"
+            + f"Получений соединений: *{status.metrics.checkouts}*\n"
+            + f"Получений, прерванных по таймауту: *{status.metrics.timeouts}*\n"
+            + f"Среднее ожидание: *{status.metrics.average_wait_time * 1000:.2f} мс*\n"
+            + f"Максимальное ожидание: *{status.metrics.max_wait_time * 1000:.2f} мс*\n"
+            + "Ожидания:\n"
+            + "\n".join(
+                f"{bucket}: *{checkouts}*"
+                for bucket, checkouts in zip(
+                    [f"до {bound * 1000:g} мс" for bound in WAIT_TIME_BUCKETS]
+                    + [f"более {WAIT_TIME_BUCKETS[-1] * 1000:g} мс"],
+                    status.metrics.wait_time_histogram,
+                )
+            )
+            for name, status in pools_statuses.items()
+        ]
+
+    async def get_query_statistics_message(
+        self,
+        query_metrics: QueryMetrics,
+        cache_metrics: dict[str, CacheMetrics],
+    ) -> list[str]:
+        caches_statistics = (
+            [
+                "Кэши:\n"
+                + "\n".join(
+                    f"`{name}`: попаданий *{metrics.hits}*, "
+                    + f"промахов *{metrics.misses}* "
+                    + f"(*{metrics.hit_rate:.0%}* попаданий), "
+                    + f"вытеснено *{metrics.evictions}* и "
+                    + f"устарело *{metrics.expirations}* записей"
+                    for name, metrics in cache_metrics.items()
+                )
+            ]
+            if cache_metrics
+            else []
+        )
+
+        if not query_metrics.statements:
+            return [
+                "Бот ещё не выполнил ни одного запроса"
+            ] + caches_statistics
+
+        return (
+            [
+                "Запросы по обработчикам:\n"
+                + "\n".join(
+                    f"`{handler}`: вызовов *{metrics.calls}*, "
+                    + f"в среднем *{metrics.average_queries:.1f}* запросов "
+                    + f"(максимум *{metrics.max_queries}*) и "
+                    + f"*{metrics.average_db_time * 1000:.2f} мс* в базе данных за вызов"
+                    for handler, metrics in query_metrics.get_top_handlers()
+                )
+                or "Обработчики ещё не выполнили ни одного запроса"
+            ]
+            + [
+                f"`{get_statement_preview(statement)}`\n"
+                + f"Выполнений: *{metrics.executions}*\n"
+                + f"Общее время: *{metrics.total_time * 1000:.2f} мс*\n"
+                + f"Среднее время: *{metrics.average_time * 1000:.2f} мс*\n"
+                + f"Максимальное время: *{metrics.max_time * 1000:.2f} мс*\n"
+                + "Время выполнения:\n"
+                + "\n".join(
+                    f"{bucket}: *{executions}*"
+                    for bucket, executions in zip(
+                        [
+                            f"до {bound * 1000:g} мс"
+                            for bound in QUERY_TIME_BUCKETS
+                        ]
+                        + [f"более {QUERY_TIME_BUCKETS[-1] * 1000:g} мс"],
+                        metrics.time_histogram,
+                    )
+                )
+                for statement, metrics in query_metrics.get_top_statements(
+                    TOP_STATEMENTS
+                )
+            ]
+            + caches_statistics
+        )
+
     async def get_id_message(self, id: int) -> list[str]:
         return ["Ваш ID пользователя для этого бота:", str(id)]
 
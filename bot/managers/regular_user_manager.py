@@ -2,6 +2,7 @@ from __future__ import annotations
 from bot.localization.messages_content import MessagesContent
 from bot.entities.regular_user import RegularUser
 from bot.markup import Markup
+from bot.db.repositories.repository import LoaderProfile
 from bot.typing import Repo
 from telegram import User
 from datetime import datetime
@@ -31,7 +32,7 @@ class RegularUserManager:
         repo: Repo,
     ) -> RegularUserManager:
         regular_user = await repo.get_regular_user_by_tg_bot_user_id(
-            regular_user_id
+            regular_user_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         return RegularUserManager(
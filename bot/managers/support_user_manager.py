@@ -4,6 +4,7 @@ from bot.entities.support_user import SupportUser
 from bot.entities.role import Role, RolePermissions
 from bot.states import States
 from bot.markup import Markup
+from bot.db.repositories.repository import LoaderProfile
 from bot.typing import Repo
 from telegram import User
 from datetime import datetime
@@ -13,11 +14,20 @@ from bot.utils import (
 from bot.bot_messages import (
     MessageToSend,
     TextToSend,
+    GeneratedDocumentToSend,
     get_file_to_send_from_attachment_entity,
 )
 from bot.services.statistics import GlobalStatistics
+from bot.db.db_sa_settings import get_pools_statuses, query_metrics
+from bot.services.data_export import (
+    ExportDataset,
+    ExportFormat,
+    get_export_file_name,
+    write_export,
+)
 
 import json
+import tempfile
 
 
 class SupportUserManager:
@@ -47,7 +57,7 @@ class SupportUserManager:
         repo: Repo,
     ) -> SupportUserManager:
         support_user = await repo.get_support_user_by_tg_bot_user_id(
-            support_user_id
+            support_user_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         return SupportUserManager(
@@ -72,6 +82,70 @@ class SupportUserManager:
             )
         ]
 
+    async def get_pools_statistics(self) -> list[MessageToSend]:
+        if not self.support_user or not self.support_user.is_owner:
+            return [
+                TextToSend(
+                    await self.msgs.get_permission_denied_message(self.tg_user)
+                )
+            ]
+
+        return [
+            TextToSend(
+                await self.msgs.get_pools_statistics_message(
+                    get_pools_statuses()
+                )
+            )
+        ]
+
+    async def get_query_statistics(self) -> list[MessageToSend]:
+        if not self.support_user or not self.support_user.is_owner:
+            return [
+                TextToSend(
+                    await self.msgs.get_permission_denied_message(self.tg_user)
+                )
+            ]
+
+        return [
+            TextToSend(
+                await self.msgs.get_query_statistics_message(
+                    query_metrics, self.repo.get_cache_metrics()
+                )
+            )
+        ]
+
+    async def export_data(
+        self, dataset: ExportDataset, export_format: ExportFormat
+    ) -> list[MessageToSend]:
+        if not self.support_user or not self.support_user.is_owner:
+            return [
+                TextToSend(
+                    await self.msgs.get_permission_denied_message(self.tg_user)
+                )
+            ]
+
+        # The export is spooled to disk, so only a page of rows
+        # is kept in memory whatever the size of the dataset
+        export_file = tempfile.TemporaryFile()
+
+        exported_rows = await write_export(
+            self.repo, dataset, export_format, export_file
+        )
+
+        export_file.seek(0)
+
+        return [
+            GeneratedDocumentToSend(
+                export_file,
+                get_export_file_name(dataset, export_format),
+                caption="\n".join(
+                    await self.msgs.get_data_export_message(
+                        dataset.value, exported_rows
+                    )
+                ),
+            )
+        ]
+
     async def get_regular_user_info(self, tg_id: int) -> list[MessageToSend]:
         if (
             not self.support_user
@@ -84,7 +158,7 @@ class SupportUserManager:
             ]
 
         regular_user = await self.repo.get_regular_user_by_tg_bot_user_id(
-            tg_id
+            tg_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not regular_user:
@@ -118,7 +192,7 @@ class SupportUserManager:
             ]
 
         question = await self.repo.get_question_by_tg_message_id(
-            question_tg_message_id
+            question_tg_message_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not question:
@@ -149,7 +223,7 @@ class SupportUserManager:
                 )
             ]
 
-        if not self.support_user.current_question:
+        if not self.support_user.current_question_id:
             return [
                 TextToSend(await self.msgs.get_no_binded_question_message())
             ]
@@ -227,7 +301,9 @@ class SupportUserManager:
                 )
             ]
 
-        roles = await self.repo.get_all_roles()
+        roles = await self.repo.get_all_roles(
+            loader_profile=LoaderProfile.IDENTITY
+        )
 
         return [TextToSend(await self.msgs.get_roles_list_message(roles))]
 
@@ -286,7 +362,7 @@ class SupportUserManager:
             ]
 
         regular_user = await self.repo.get_regular_user_by_tg_bot_user_id(
-            regular_user_tg_bot_id
+            regular_user_tg_bot_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not regular_user:
@@ -299,7 +375,7 @@ class SupportUserManager:
             ]
 
         support_user = await self.repo.get_support_user_by_tg_bot_user_id(
-            regular_user.tg_bot_user_id
+            regular_user.tg_bot_user_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if support_user:
@@ -340,7 +416,7 @@ class SupportUserManager:
             ]
 
         support_user = await self.repo.get_support_user_by_tg_bot_user_id(
-            support_user_tg_id
+            support_user_tg_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not support_user:
@@ -394,7 +470,7 @@ class SupportUserManager:
             ]
 
         question = await self.repo.get_question_by_tg_message_id(
-            question_tg_message_id
+            question_tg_message_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not question:
@@ -435,7 +511,7 @@ class SupportUserManager:
             )
         ]
 
-    async def get_random_unanswered_question(self) -> list[MessageToSend]:
+    async def claim_question(self) -> list[MessageToSend]:
         if (
             not self.support_user
             or self.is_answer_questions_permission_denied()
@@ -446,7 +522,7 @@ class SupportUserManager:
                 )
             ]
 
-        question = await self.repo.get_random_unanswered_unbinded_question()
+        question = await self.support_user.claim_question(self.repo)
 
         if not question:
             return [
@@ -456,6 +532,9 @@ class SupportUserManager:
             ]
 
         return [
+            TextToSend(
+                await self.msgs.get_successful_binding_message(question)
+            ),
             TextToSend(
                 await self.msgs.get_question_info_message(
                     question, await question.get_statistics(self.repo)
@@ -480,7 +559,7 @@ class SupportUserManager:
                         }
                     ),
                 ),
-            )
+            ),
         ]
 
     async def get_answer_by_id(
@@ -531,7 +610,7 @@ class SupportUserManager:
             ]
 
         question = await self.repo.get_question_by_tg_message_id(
-            question_tg_message_id
+            question_tg_message_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not question:
@@ -560,7 +639,7 @@ class SupportUserManager:
             ]
 
         support_user = await self.repo.get_support_user_by_tg_bot_user_id(
-            support_user_tg_id
+            support_user_tg_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not support_user:
@@ -593,7 +672,7 @@ class SupportUserManager:
             ]
 
         support_user = await self.repo.get_support_user_by_tg_bot_user_id(
-            support_user_tg_id
+            support_user_tg_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not support_user:
@@ -628,7 +707,9 @@ class SupportUserManager:
                 )
             ]
 
-        question = self.support_user.current_question
+        # The question is loaded together with its regular user,
+        # who the answer is sent to
+        question = await self.support_user.get_current_question(self.repo)
 
         if not question:
             return [
@@ -684,13 +765,13 @@ class SupportUserManager:
                 )
             ]
 
-        if not self.support_user.current_question:
+        if not self.support_user.current_question_id:
             return [
                 TextToSend(await self.msgs.get_no_binded_question_message())
             ]
 
         last_answer = await self.repo.get_question_last_answer(
-            self.support_user.current_question.id
+            self.support_user.current_question_id
         )
 
         if not last_answer:
@@ -702,10 +783,7 @@ class SupportUserManager:
                 )
             ]
 
-        if (
-            not self.support_user.current_question
-            or self.support_user.current_question != last_answer.question
-        ):
+        if self.support_user.current_question_id != last_answer.question_id:
             return [
                 TextToSend(await self.msgs.get_no_binded_question_message())
             ]
@@ -742,7 +820,7 @@ class SupportUserManager:
             ]
 
         question = await self.repo.get_question_by_tg_message_id(
-            question_tg_message_id
+            question_tg_message_id, loader_profile=LoaderProfile.IDENTITY
         )
 
         if not question:
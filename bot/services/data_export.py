@@ -0,0 +1,362 @@
+from __future__ import annotations
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, TypeVar
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+from bot.db.repositories.repository import (
+    Repo,
+    LoaderProfile,
+    Page,
+    PageCursor,
+)
+import csv
+import gzip
+import io
+import json
+
+
+T = TypeVar("T")
+
+EXPORT_PAGE_SIZE = 500
+
+# Roughly how much encoded text is buffered before it's compressed
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+
+class ExportFormat(Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
+class ExportDataset(Enum):
+    ROLES = "roles"
+    REGULAR_USERS = "regular_users"
+    SUPPORT_USERS = "support_users"
+    QUESTIONS = "questions"
+    ANSWERS = "answers"
+    QUESTIONS_ATTACHMENTS = "questions_attachments"
+    ANSWERS_ATTACHMENTS = "answers_attachments"
+
+
+EXPORT_FIELDS: dict[ExportDataset, list[str]] = {
+    ExportDataset.ROLES: [
+        "id",
+        "name",
+        "description",
+        "can_answer_questions",
+        "can_manage_support_users",
+        "created_date",
+    ],
+    ExportDataset.REGULAR_USERS: ["id", "tg_bot_user_id", "join_date"],
+    ExportDataset.SUPPORT_USERS: [
+        "id",
+        "tg_bot_user_id",
+        "descriptive_name",
+        "role_id",
+        "current_question_id",
+        "is_owner",
+        "is_active",
+        "join_date",
+    ],
+    ExportDataset.QUESTIONS: [
+        "id",
+        "regular_user_id",
+        "message",
+        "tg_message_id",
+        "date",
+    ],
+    ExportDataset.ANSWERS: [
+        "id",
+        "question_id",
+        "support_user_id",
+        "message",
+        "tg_message_id",
+        "is_useful",
+        "date",
+    ],
+    ExportDataset.QUESTIONS_ATTACHMENTS: [
+        "id",
+        "question_id",
+        "tg_file_id",
+        "attachment_type",
+        "caption",
+        "date",
+    ],
+    ExportDataset.ANSWERS_ATTACHMENTS: [
+        "id",
+        "answer_id",
+        "tg_file_id",
+        "attachment_type",
+        "caption",
+        "date",
+    ],
+}
+
+
+def get_export_file_name(
+    dataset: ExportDataset, export_format: ExportFormat
+) -> str:
+    return f"{dataset.value}.{export_format.value}.gz"
+
+
+async def iter_pages(
+    get_page: Callable[[PageCursor | None], Awaitable[Page[T]]]
+) -> AsyncIterator[T]:
+    """Yields the items of all the pages one by one
+
+    Every page is fetched in its own short read, so the export
+    never keeps a transaction (and SQLite locks) open while the
+    rows are encoded and compressed.
+
+    Args:
+        get_page (Callable[[PageCursor | None], Awaitable[Page[T]]]):
+        fetches the page that goes after the cursor passed
+
+    Yields:
+        T: the items of the pages
+    """
+    cursor = None
+
+    while True:
+        page = await get_page(cursor)
+
+        for item in page.items:
+            yield item
+
+        if page.next_cursor is None:
+            return
+
+        cursor = page.next_cursor
+
+
+async def iter_dataset_rows(
+    repo: Repo, dataset: ExportDataset, page_size: int = EXPORT_PAGE_SIZE
+) -> AsyncIterator[dict[str, Any]]:
+    """Yields the rows of the dataset as plain dicts
+
+    Args:
+        repo (Repo): repository to read the rows from
+        dataset (ExportDataset): dataset to export
+        page_size (int, optional): how many rows are read at once.
+        Defaults to EXPORT_PAGE_SIZE.
+
+    Yields:
+        dict[str, Any]: the rows of the dataset with the keys
+        from EXPORT_FIELDS
+    """
+    match dataset:
+        case ExportDataset.ROLES:
+            # There are few roles, so they aren't paginated
+            for role in await repo.get_all_roles(
+                loader_profile=LoaderProfile.IDENTITY
+            ):
+                yield {
+                    "id": role.id,
+                    "name": role.name,
+                    "description": role.description,
+                    "can_answer_questions": (
+                        role.permissions.can_answer_questions
+                    ),
+                    "can_manage_support_users": (
+                        role.permissions.can_manage_support_users
+                    ),
+                    "created_date": role.created_date,
+                }
+
+        case ExportDataset.REGULAR_USERS:
+            async for regular_user in iter_pages(
+                lambda cursor: repo.get_regular_users_page(
+                    cursor, page_size, loader_profile=LoaderProfile.IDENTITY
+                )
+            ):
+                yield {
+                    "id": regular_user.id,
+                    "tg_bot_user_id": regular_user.tg_bot_user_id,
+                    "join_date": regular_user.join_date,
+                }
+
+        case ExportDataset.SUPPORT_USERS:
+            async for support_user in iter_pages(
+                lambda cursor: repo.get_support_users_page(
+                    cursor, page_size, loader_profile=LoaderProfile.IDENTITY
+                )
+            ):
+                yield {
+                    "id": support_user.id,
+                    "tg_bot_user_id": support_user.tg_bot_user_id,
+                    "descriptive_name": support_user.descriptive_name,
+                    "role_id": support_user.role_id,
+                    "current_question_id": support_user.current_question_id,
+                    "is_owner": support_user.is_owner,
+                    "is_active": support_user.is_active,
+                    "join_date": support_user.join_date,
+                }
+
+        case ExportDataset.QUESTIONS:
+            async for question in iter_pages(
+                lambda cursor: repo.get_questions_page(
+                    cursor, page_size, loader_profile=LoaderProfile.IDENTITY
+                )
+            ):
+                yield {
+                    "id": question.id,
+                    "regular_user_id": question.regular_user_id,
+                    "message": question.message,
+                    "tg_message_id": question.tg_message_id,
+                    "date": question.date,
+                }
+
+        case ExportDataset.ANSWERS:
+            async for answer in iter_pages(
+                lambda cursor: repo.get_answers_page(
+                    cursor, page_size, loader_profile=LoaderProfile.IDENTITY
+                )
+            ):
+                yield {
+                    "id": answer.id,
+                    "question_id": answer.question_id,
+                    "support_user_id": answer.support_user_id,
+                    "message": answer.message,
+                    "tg_message_id": answer.tg_message_id,
+                    "is_useful": answer.is_useful,
+                    "date": answer.date,
+                }
+
+        case ExportDataset.QUESTIONS_ATTACHMENTS:
+            async for question_attachment in iter_pages(
+                lambda cursor: repo.get_questions_attachments_page(
+                    cursor, page_size
+                )
+            ):
+                yield {
+                    "id": question_attachment.id,
+                    "question_id": question_attachment.question_id,
+                    "tg_file_id": question_attachment.tg_file_id,
+                    "attachment_type": question_attachment.attachment_type,
+                    "caption": question_attachment.caption,
+                    "date": question_attachment.date,
+                }
+
+        case ExportDataset.ANSWERS_ATTACHMENTS:
+            async for answer_attachment in iter_pages(
+                lambda cursor: repo.get_answers_attachments_page(
+                    cursor, page_size
+                )
+            ):
+                yield {
+                    "id": answer_attachment.id,
+                    "answer_id": answer_attachment.answer_id,
+                    "tg_file_id": answer_attachment.tg_file_id,
+                    "attachment_type": answer_attachment.attachment_type,
+                    "caption": answer_attachment.caption,
+                    "date": answer_attachment.date,
+                }
+
+
+def _serialize_value(value: Any) -> Any:
+    match value:
+        case UUID():
+            return str(value)
+
+        case datetime():
+            return value.isoformat()
+
+        case Enum():
+            return value.value
+
+        case _:
+            return value
+
+
+async def encode_jsonl(
+    rows: AsyncIterator[dict[str, Any]]
+) -> AsyncIterator[str]:
+    async for row in rows:
+        yield json.dumps(
+            {key: _serialize_value(value) for key, value in row.items()},
+            ensure_ascii=False,
+        ) + "\n"
+
+
+async def encode_csv(
+    rows: AsyncIterator[dict[str, Any]], fields: list[str]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+
+    writer.writeheader()
+
+    async for row in rows:
+        writer.writerow(
+            {key: _serialize_value(value) for key, value in row.items()}
+        )
+
+        yield buffer.getvalue()
+
+        buffer.seek(0)
+        buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+async def write_export(
+    repo: Repo,
+    dataset: ExportDataset,
+    export_format: ExportFormat,
+    file: BinaryIO,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> int:
+    """Streams the dataset into the file as gzip compressed JSONL or CSV
+
+    Only a page of rows and a small write buffer are held in memory
+    at a time, whatever the size of the dataset.
+
+    Args:
+        repo (Repo): repository to read the rows from
+        dataset (ExportDataset): dataset to export
+        export_format (ExportFormat): format of the rows
+        file (BinaryIO): binary file to write the compressed data to
+        page_size (int, optional): how many rows are read at once.
+        Defaults to EXPORT_PAGE_SIZE.
+
+    Returns:
+        int: number of the rows exported
+    """
+    exported_rows = 0
+
+    async def count_rows(
+        rows: AsyncIterator[dict[str, Any]]
+    ) -> AsyncIterator[dict[str, Any]]:
+        nonlocal exported_rows
+
+        async for row in rows:
+            exported_rows += 1
+
+            yield row
+
+    rows = count_rows(iter_dataset_rows(repo, dataset, page_size))
+
+    match export_format:
+        case ExportFormat.JSONL:
+            chunks = encode_jsonl(rows)
+
+        case ExportFormat.CSV:
+            chunks = encode_csv(rows, EXPORT_FIELDS[dataset])
+
+    with gzip.GzipFile(fileobj=file, mode="wb") as compressed_file:
+        buffer: list[str] = []
+        buffered = 0
+
+        async for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+
+            if buffered >= _WRITE_BUFFER_SIZE:
+                compressed_file.write("".join(buffer).encode())
+
+                buffer.clear()
+                buffered = 0
+
+        compressed_file.write("".join(buffer).encode())
+
+    return exported_rows
@@ -0,0 +1,252 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Iterable, Iterator, TextIO
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from uuid import UUID
+from bot.db.repositories.repository import Repo, BULK_INSERT_BATCH_SIZE
+from bot.services.data_export import (
+    ExportDataset,
+    ExportFormat,
+    get_export_file_name,
+)
+from bot.utils import AttachmentType
+import gzip
+import json
+
+
+# How many rows are inserted in a single transaction
+IMPORT_TRANSACTION_SIZE = 100_000
+
+# The datasets are imported in this order, so the rows
+# they reference are always imported before them
+IMPORT_ORDER = [
+    ExportDataset.ROLES,
+    ExportDataset.REGULAR_USERS,
+    ExportDataset.QUESTIONS,
+    ExportDataset.SUPPORT_USERS,
+    ExportDataset.ANSWERS,
+    ExportDataset.QUESTIONS_ATTACHMENTS,
+    ExportDataset.ANSWERS_ATTACHMENTS,
+]
+
+_FIELDS_PARSERS: dict[ExportDataset, dict[str, Callable[[Any], Any]]] = {
+    ExportDataset.ROLES: {
+        "id": int,
+        "name": str,
+        "description": str,
+        "can_answer_questions": bool,
+        "can_manage_support_users": bool,
+        "created_date": datetime.fromisoformat,
+    },
+    ExportDataset.REGULAR_USERS: {
+        "id": UUID,
+        "tg_bot_user_id": int,
+        "join_date": datetime.fromisoformat,
+    },
+    ExportDataset.SUPPORT_USERS: {
+        "id": UUID,
+        "tg_bot_user_id": int,
+        "descriptive_name": str,
+        "role_id": int,
+        "current_question_id": UUID,
+        "is_owner": bool,
+        "is_active": bool,
+        "join_date": datetime.fromisoformat,
+    },
+    ExportDataset.QUESTIONS: {
+        "id": UUID,
+        "regular_user_id": UUID,
+        "message": str,
+        "tg_message_id": int,
+        "date": datetime.fromisoformat,
+    },
+    ExportDataset.ANSWERS: {
+        "id": UUID,
+        "question_id": UUID,
+        "support_user_id": UUID,
+        "message": str,
+        "tg_message_id": int,
+        "is_useful": bool,
+        "date": datetime.fromisoformat,
+    },
+    ExportDataset.QUESTIONS_ATTACHMENTS: {
+        "id": UUID,
+        "question_id": UUID,
+        "tg_file_id": str,
+        "attachment_type": AttachmentType,
+        "caption": str,
+        "date": datetime.fromisoformat,
+    },
+    ExportDataset.ANSWERS_ATTACHMENTS: {
+        "id": UUID,
+        "answer_id": UUID,
+        "tg_file_id": str,
+        "attachment_type": AttachmentType,
+        "caption": str,
+        "date": datetime.fromisoformat,
+    },
+}
+
+# Values of the fields that may be omitted in the imported rows
+_FIELDS_DEFAULTS: dict[ExportDataset, dict[str, Any]] = {
+    ExportDataset.ROLES: {"description": ""},
+    ExportDataset.REGULAR_USERS: {},
+    ExportDataset.SUPPORT_USERS: {
+        "role_id": None,
+        "current_question_id": None,
+        "is_owner": False,
+        "is_active": True,
+    },
+    ExportDataset.QUESTIONS: {},
+    ExportDataset.ANSWERS: {"is_useful": None},
+    ExportDataset.QUESTIONS_ATTACHMENTS: {"caption": None},
+    ExportDataset.ANSWERS_ATTACHMENTS: {"caption": None},
+}
+
+
+def get_bulk_add_method(
+    repo: Repo, dataset: ExportDataset
+) -> Callable[[Iterable[dict[str, Any]], int], Awaitable[int]]:
+    match dataset:
+        case ExportDataset.ROLES:
+            return repo.bulk_add_roles
+
+        case ExportDataset.REGULAR_USERS:
+            return repo.bulk_add_regular_users
+
+        case ExportDataset.SUPPORT_USERS:
+            return repo.bulk_add_support_users
+
+        case ExportDataset.QUESTIONS:
+            return repo.bulk_add_questions
+
+        case ExportDataset.ANSWERS:
+            return repo.bulk_add_answers
+
+        case ExportDataset.QUESTIONS_ATTACHMENTS:
+            return repo.bulk_add_questions_attachments
+
+        case ExportDataset.ANSWERS_ATTACHMENTS:
+            return repo.bulk_add_answers_attachments
+
+
+def find_import_file(input_dir: Path, dataset: ExportDataset) -> Path | None:
+    """Looks for the dataset's file written by the export,
+    either compressed or not
+
+    Args:
+        input_dir (Path): directory to look for the file in
+        dataset (ExportDataset): dataset to look for
+
+    Returns:
+        Path | None: path of the file if it exists
+    """
+    compressed_path = input_dir / get_export_file_name(
+        dataset, ExportFormat.JSONL
+    )
+
+    for path in (compressed_path, compressed_path.with_suffix("")):
+        if path.exists():
+            return path
+
+    return None
+
+
+def open_import_file(path: Path) -> TextIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return open(path, "rt", encoding="utf-8")
+
+
+def parse_row(
+    dataset: ExportDataset, raw_row: dict[str, Any], line_number: int
+) -> dict[str, Any]:
+    """Converts a decoded JSON object into a row of the dataset's table
+
+    Args:
+        dataset (ExportDataset): dataset the row belongs to
+        raw_row (dict[str, Any]): the decoded JSON object
+        line_number (int): number of the row's line, used in the errors
+
+    Raises:
+        ValueError: if a required field is missing or has a wrong value
+
+    Returns:
+        dict[str, Any]: the row with the values of the columns' types
+    """
+    defaults = _FIELDS_DEFAULTS[dataset]
+    row = {}
+
+    for field, parser in _FIELDS_PARSERS[dataset].items():
+        if field not in raw_row and field not in defaults:
+            raise ValueError(
+                f"Line {line_number} of {dataset.value} has no {field}"
+            )
+
+        value = raw_row.get(field, defaults.get(field))
+
+        try:
+            row[field] = None if value is None else parser(value)
+
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"Line {line_number} of {dataset.value} "
+                + f"has an invalid {field}: {value!r}"
+            ) from e
+
+    return row
+
+
+def iter_rows(
+    dataset: ExportDataset, lines: TextIO
+) -> Iterator[dict[str, Any]]:
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+
+        yield parse_row(dataset, json.loads(line), line_number)
+
+
+async def import_rows(
+    repo: Repo,
+    dataset: ExportDataset,
+    lines: TextIO,
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+    transaction_size: int = IMPORT_TRANSACTION_SIZE,
+) -> int:
+    """Imports the JSONL lines into the dataset's table
+
+    The lines are read lazily and inserted with the bulk methods of the
+    repo in transactions of transaction_size rows each, so only a batch
+    of rows is kept in memory whatever the size of the file.
+
+    Args:
+        repo (Repo): repository to import the rows into
+        dataset (ExportDataset): dataset the lines belong to
+        lines (TextIO): JSONL lines in the format of the export
+        batch_size (int, optional): how many rows are inserted by a
+        single statement. Defaults to BULK_INSERT_BATCH_SIZE.
+        transaction_size (int, optional): how many rows are inserted
+        in a single transaction. Defaults to IMPORT_TRANSACTION_SIZE.
+
+    Raises:
+        ValueError: if transaction_size is less than 1
+
+    Returns:
+        int: number of the imported rows
+    """
+    if transaction_size < 1:
+        raise ValueError("The transaction size must be at least 1")
+
+    bulk_add = get_bulk_add_method(repo, dataset)
+    rows = iter_rows(dataset, lines)
+    imported_rows = 0
+
+    while inserted := await bulk_add(
+        islice(rows, transaction_size), batch_size
+    ):
+        imported_rows += inserted
+
+    return imported_rows
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from datetime import datetime
+from enum import Enum
+from bot.db.repositories.repository import (
+    DELETE_BATCH_SIZE,
+    ProgressCallback,
+    Repo,
+)
+
+
+class RetentionAction(Enum):
+    DELETE = "delete"
+    ANONYMIZE = "anonymize"
+
+
+async def apply_retention_policy(
+    repo: Repo,
+    action: RetentionAction,
+    older_than: datetime,
+    batch_size: int = DELETE_BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
+) -> int:
+    """Deletes or anonymizes the questions asked before the date
+    with their answers and attachments
+
+    Every batch is commited on its own, so if the policy is interrupted,
+    it's applied to the rest of the questions when it's run again.
+
+    Returns:
+        int: number of the deleted or anonymized questions
+    """
+    match action:
+        case RetentionAction.DELETE:
+            return await repo.delete_questions_older_than(
+                older_than, batch_size, on_progress
+            )
+
+        case RetentionAction.ANONYMIZE:
+            return await repo.anonymize_questions_older_than(
+                older_than, batch_size, on_progress
+            )
+
+
+async def erase_regular_user(
+    repo: Repo,
+    tg_bot_user_id: int,
+    batch_size: int = DELETE_BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
+) -> int | None:
+    """Erases all the data of the regular user with the telegram id
+
+    Returns:
+        int | None: number of the erased questions
+        or None if there is no such user
+    """
+    regular_user = await repo.get_regular_user_by_tg_bot_user_id(
+        tg_bot_user_id
+    )
+
+    if not regular_user:
+        return None
+
+    return await repo.erase_regular_user(
+        regular_user.id, batch_size, on_progress
+    )
@@ -19,47 +19,7 @@ class GlobalStatistics:
 
     @classmethod
     async def get_statistics(cls, repo: Repo) -> GlobalStatistics:
-        statistics = GlobalStatistics()
-
-        statistics.total_answered_questions = (
-            await repo.count_answered_questions()
-        )
-
-        statistics.total_answers = await repo.count_all_answers()
-
-        statistics.total_answers_attachments = (
-            await repo.count_all_answers_attachments()
-        )
-
-        statistics.total_questions = await repo.count_all_questions()
-
-        statistics.total_questions_attachments = (
-            await repo.count_all_questions_attachments()
-        )
-
-        statistics.total_regular_users = await repo.count_all_regular_users()
-
-        statistics.total_roles = await repo.count_all_roles()
-
-        statistics.total_support_users = await repo.count_all_support_users()
-
-        statistics.total_unanswered_questions = (
-            await repo.count_unanswered_questions()
-        )
-
-        statistics.total_unuseful_answers = (
-            await repo.count_all_unuseful_answers()
-        )
-
-        statistics.total_useful_answers = await repo.count_all_useful_answers()
-
-        statistics.total_unestimated_ansers = (
-            statistics.total_answers
-            - statistics.total_useful_answers
-            - statistics.total_unuseful_answers
-        )
-
-        return statistics
+        return await repo.get_global_statistics()
 
 
 class RoleStatistics:
@@ -67,13 +27,7 @@ class RoleStatistics:
 
     @classmethod
     async def get_statistics(cls, role_id: int, repo: Repo) -> RoleStatistics:
-        statistics = RoleStatistics()
-
-        statistics.total_users = await repo.count_support_users_with_role(
-            role_id
-        )
-
-        return statistics
+        return await repo.get_role_statistics(role_id)
 
 
 class SupportUserStatistics:
@@ -86,27 +40,7 @@ class SupportUserStatistics:
     async def get_statistics(
         cls, support_user_id: UUID, repo: Repo
     ) -> SupportUserStatistics:
-        statistics = SupportUserStatistics()
-
-        statistics.useful_answers = (
-            await repo.count_support_user_useful_answers(support_user_id)
-        )
-
-        statistics.unuseful_answers = (
-            await repo.count_support_user_unuseful_answers(support_user_id)
-        )
-
-        statistics.total_answers = await repo.count_support_user_answers(
-            support_user_id
-        )
-
-        statistics.unestimated_answers = (
-            statistics.total_answers
-            - statistics.unuseful_answers
-            - statistics.useful_answers
-        )
-
-        return statistics
+        return await repo.get_support_user_statistics(support_user_id)
 
 
 class RegularUserStatistics:
@@ -122,43 +56,7 @@ class RegularUserStatistics:
     async def get_statistics(
         cls, regular_user_id: UUID, repo: Repo
     ) -> RegularUserStatistics:
-        statistics = RegularUserStatistics()
-
-        statistics.asked_questions = await repo.count_regular_users_questions(
-            regular_user_id
-        )
-
-        statistics.answered_questions = (
-            await repo.count_regular_user_answered_questions(regular_user_id)
-        )
-
-        statistics.answers_for_questions = (
-            await repo.count_regular_user_questions_answers(regular_user_id)
-        )
-
-        statistics.unanswered_questions = (
-            statistics.asked_questions - statistics.answered_questions
-        )
-
-        statistics.useful_answers = (
-            await repo.count_regular_user_questions_useful_answers(
-                regular_user_id
-            )
-        )
-
-        statistics.unuseful_answers = (
-            await repo.count_regular_user_questions_unuseful_answers(
-                regular_user_id
-            )
-        )
-
-        statistics.unestimated_answers = (
-            await repo.count_regular_user_questions_unestimated_answers(
-                regular_user_id
-            )
-        )
-
-        return statistics
+        return await repo.get_regular_user_statistics(regular_user_id)
 
 
 class QuestionStatistics:
@@ -169,17 +67,7 @@ class QuestionStatistics:
     async def get_statistics(
         cls, question_id: UUID, repo: Repo
     ) -> QuestionStatistics:
-        statistics = QuestionStatistics()
-
-        statistics.total_answers = await repo.count_question_answers(
-            question_id
-        )
-
-        statistics.total_attachments = await repo.count_question_attachments(
-            question_id
-        )
-
-        return statistics
+        return await repo.get_question_statistics(question_id)
 
 
 class AnswerStatistics:
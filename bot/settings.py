@@ -24,8 +24,10 @@ load_dotenv(dotenv_path=DOTENV_PATH)
 
 
 # Repository that will be used for getting access to the DB
-# Defaults to 'sa', which is implemented using SQLAlchemy
-REPO_TYPE: str = "sa"
+# Defaults to 'sa', which is implemented using SQLAlchemy,
+# 'caching_sa' also keeps the hottest lookups in memory,
+# 'memory' keeps all the data in memory, for tests and benchmarks
+REPO_TYPE: str = os.getenv("REPO_TYPE") or "sa"
 
 # Language code that satisfies IETF standard
 # (https://en.wikipedia.org/wiki/IETF_language_tag)
@@ -0,0 +1,3 @@
+from bot.db.repositories.repository import Repo
+
+__all__ = ["Repo"]
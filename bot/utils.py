@@ -4,7 +4,15 @@ from telegram import (
 )
 from uuid import UUID
 from enum import Enum
-from typing import Any, TYPE_CHECKING
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    TYPE_CHECKING,
+    TypeVar,
+    overload,
+)
 from datetime import datetime, timezone
 
 
@@ -12,6 +20,9 @@ if TYPE_CHECKING:
     from bot.entities.attachment import Attachment
 
 
+T = TypeVar("T")
+
+
 def get_file_type_and_file_id(
     update: Update,
 ) -> tuple[AttachmentType | None, str | None]:
@@ -62,12 +73,112 @@ class AttachmentType(Enum):
 
 
 class IdComparable:
+    __slots__ = ()
+
     id: Any
 
     def __eq__(self, __o: object) -> bool:
         return isinstance(__o, self.__class__) and self.id == __o.id
 
 
+class RelationshipNotLoadedError(Exception):
+    """Raised when a related entity is accessed before it's loaded"""
+
+
+class RelatedEntityNotFoundError(Exception):
+    """Raised when a related entity is resolved by its id,
+    but there is no entity with the id anymore
+    """
+
+
+class Relationship(Generic[T]):
+    """Related entity of an entity, which may be loaded later
+
+    The id of the related entity is always kept in the slot named
+    <name>_id and the entity itself in the slot named _<name>, which is
+    left unset until the entity is loaded. Accessing an entity that
+    isn't loaded raises RelationshipNotLoadedError, so it must be
+    resolved with the entity's get_<name> method first.
+    """
+
+    name: str
+    id_name: str
+    entity_name: str
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.id_name = f"{name}_id"
+        self.entity_name = f"_{name}"
+
+    @overload
+    def __get__(self, instance: None, owner: type) -> Relationship[T]:
+        ...
+
+    @overload
+    def __get__(self, instance: object, owner: type) -> T:
+        ...
+
+    def __get__(
+        self, instance: object | None, owner: type | None = None
+    ) -> Relationship[T] | T:
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.entity_name)
+
+        except AttributeError:
+            raise RelationshipNotLoadedError(
+                f"{type(instance).__name__}.{self.name} isn't loaded"
+            ) from None
+
+    def __set__(self, instance: object, entity: T) -> None:
+        self._set(instance, entity)
+
+    def init(self, instance: object, entity: T | None, id: Any = None) -> None:
+        """Sets the related entity, or only its id if the entity is None
+        and the id isn't, so the entity is loaded when it's resolved
+        """
+        if entity is None and id is not None:
+            setattr(instance, self.id_name, id)
+
+            return
+
+        self._set(instance, entity)
+
+    def is_loaded(self, instance: object) -> bool:
+        return hasattr(instance, self.entity_name)
+
+    async def resolve(
+        self,
+        instance: object,
+        load: Callable[[Any], Awaitable[T | None]],
+    ) -> T:
+        """Returns the related entity, loading it by its id if it isn't
+        loaded yet. The loaded entity is kept by the instance.
+
+        Raises:
+            RelatedEntityNotFoundError: there is no entity with the id
+        """
+        if not self.is_loaded(instance):
+            id = getattr(instance, self.id_name)
+            entity = await load(id)
+
+            if entity is None:
+                raise RelatedEntityNotFoundError(
+                    f"{type(instance).__name__}.{self.name} "
+                    + f"with id {id} doesn't exist"
+                )
+
+            self._set(instance, entity)
+
+        return getattr(instance, self.entity_name)
+
+    def _set(self, instance: object, entity: T | None) -> None:
+        setattr(instance, self.entity_name, entity)
+        setattr(instance, self.id_name, entity and entity.id)  # type: ignore
+
+
 def get_eu_formated_datetime(dt: datetime, tz: timezone) -> str:
     return (
         dt.replace(tzinfo=timezone.utc)
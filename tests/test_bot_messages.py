@@ -0,0 +1,55 @@
+from telegram import Update
+from bot.bot_messages import MessageToSend, Outbox
+import pytest
+
+
+class RecordedMessage(MessageToSend):
+    def __init__(self, text: str, sent: list[str], fails: bool = False):
+        self.text = text
+        self.sent = sent
+        self.fails = fails
+
+    async def send_now(self, update: Update) -> None:
+        if self.fails:
+            raise RuntimeError(self.text)
+
+        self.sent.append(self.text)
+
+
+@pytest.mark.asyncio
+async def test_outbox_sends_after_the_block():
+    sent: list[str] = []
+    update = Update(1)
+
+    outbox = Outbox()
+
+    with outbox.collect():
+        await RecordedMessage("first", sent).send(update)
+        await RecordedMessage("second", sent).send(update)
+
+        # Nothing is sent until the unit of work is commited
+        assert sent == []
+
+    # Outside of the block the messages are sent right away
+    await RecordedMessage("third", sent).send(update)
+
+    await outbox.send()
+
+    assert sent == ["third", "first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_failed_message_doesnt_stop_the_rest():
+    sent: list[str] = []
+    update = Update(1)
+
+    outbox = Outbox()
+
+    with outbox.collect():
+        await RecordedMessage("failed", sent, fails=True).send(update)
+        await RecordedMessage("sent", sent).send(update)
+
+    with pytest.raises(RuntimeError, match="failed"):
+        await outbox.send()
+
+    assert sent == ["sent"]
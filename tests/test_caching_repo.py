@@ -0,0 +1,185 @@
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+from bot.db.models.sa_models import ModelBase
+from bot.db.repositories.caching_repository import CachingRepo
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.entities.regular_user import RegularUser
+from bot.entities.support_user import SupportUser
+import pytest
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture()
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=StaticPool
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def repo(engine: AsyncEngine) -> CachingRepo:
+    return CachingRepo(
+        SARepo(
+            SARepoConfig(
+                connection_povider=async_sessionmaker(
+                    engine, expire_on_commit=False, class_=AsyncSession
+                )
+            )
+        )
+    )
+
+
+def count_statements(engine: AsyncEngine) -> list[str]:
+    statements: list[str] = []
+
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_cached(engine: AsyncEngine, repo: CachingRepo):
+    await SupportUser.add_support_user(1, "Jake", repo)
+
+    statements = count_statements(engine)
+
+    support_user = await repo.get_support_user_by_tg_bot_user_id(1)
+
+    assert support_user and len(statements) == 1
+
+    # The returned entities are copies, so changing them
+    # doesn't change the cached ones
+    support_user.descriptive_name = "John"
+
+    support_user = await repo.get_support_user_by_tg_bot_user_id(1)
+
+    assert support_user and support_user.descriptive_name == "Jake"
+    assert len(statements) == 1
+
+    metrics = repo.get_cache_metrics()["support_users"]
+
+    assert (metrics.hits, metrics.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_caches(repo: CachingRepo):
+    support_user = await SupportUser.add_support_user(1, "Jake", repo)
+    regular_user = await RegularUser.add_regular_user(2, repo)
+    question = await regular_user.ask_question("Question", 10, repo)
+
+    assert await repo.get_question_by_tg_message_id(10)
+    assert await repo.get_support_user_by_tg_bot_user_id(1)
+
+    await support_user.bind_question(question, repo)
+
+    cached_support_user = await repo.get_support_user_by_tg_bot_user_id(1)
+
+    assert cached_support_user and cached_support_user.current_question
+
+    await repo.delete_question_with_id(question.id)
+
+    assert await repo.get_question_by_tg_message_id(10) is None
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_changes_are_not_cached(repo: CachingRepo):
+    regular_user = await RegularUser.add_regular_user(2, repo)
+
+    with pytest.raises(RuntimeError):
+        async with repo.unit_of_work() as unit_of_work_repo:
+            await regular_user.ask_question("Question", 10, unit_of_work_repo)
+
+            assert await unit_of_work_repo.get_question_by_tg_message_id(10)
+
+            raise RuntimeError()
+
+    assert await repo.get_question_by_tg_message_id(10) is None
+
+
+@pytest.mark.asyncio
+async def test_identities_are_cached(engine: AsyncEngine, repo: CachingRepo):
+    support_user = await SupportUser.add_support_user(1, "Jake", repo)
+
+    statements = count_statements(engine)
+
+    identity = await repo.resolve_identity(1)
+
+    assert identity.support_user and not identity.regular_user
+
+    identity = await repo.resolve_identity(1)
+
+    assert identity.support_user and len(statements) == 1
+
+    # The user wasn't a regular user when the identity was cached
+    await RegularUser.add_regular_user(1, repo)
+
+    identity = await repo.resolve_identity(1)
+
+    assert identity.support_user and identity.regular_user
+
+    await support_user.deactivate(repo)
+
+    identity = await repo.resolve_identity(1)
+
+    assert identity.support_user and not identity.support_user.is_active
+
+    metrics = repo.get_cache_metrics()
+
+    assert (metrics["identities"].hits, metrics["identities"].misses) == (1, 3)
+    assert "regular_users_identities" in metrics
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_drop_stale_identities(
+    engine: AsyncEngine, repo: CachingRepo
+):
+    # As the bot does, so the writes with the deleted users fail
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+    await RegularUser.add_regular_user(1, repo)
+
+    regular_user = (await repo.resolve_identity(1)).regular_user
+
+    assert regular_user
+
+    # Another process has its own caches, which aren't dropped
+    # by the changes made here and the other way round
+    other_process_repo = SARepo(
+        SARepoConfig(
+            connection_povider=async_sessionmaker(
+                engine, expire_on_commit=False, class_=AsyncSession
+            )
+        )
+    )
+
+    await other_process_repo.erase_regular_user(regular_user.id)
+
+    # The user is still cached, until a write with it fails
+    assert (await repo.resolve_identity(1)).regular_user
+
+    with pytest.raises(IntegrityError):
+        await regular_user.ask_question("Question", 10, repo)
+
+    assert (await repo.resolve_identity(1)).regular_user is None
+
+    # The identities cached by the wrapped repo are dropped too
+    assert (await repo.repo.resolve_identity(1)).regular_user is None
@@ -0,0 +1,168 @@
+from pathlib import Path
+from uuid import uuid4
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from bot.db.models.sa_models import ModelBase
+from bot.db.repositories.group_commit import GroupCommitter
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.entities.question import Question
+from bot.entities.regular_user import RegularUser
+import asyncio
+import pytest
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture()
+async def engine(tmp_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db'}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+def make_repo_config(
+    engine: AsyncEngine, max_delay: float = 0.05, max_batch_size: int = 100
+) -> SARepoConfig:
+    session_maker = async_sessionmaker(
+        engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+    return SARepoConfig(
+        connection_povider=session_maker,
+        group_committer=GroupCommitter(
+            session_maker, max_delay, max_batch_size
+        ),
+    )
+
+
+def count_commits(engine: AsyncEngine) -> list[None]:
+    commits: list[None] = []
+
+    event.listen(
+        engine.sync_engine, "commit", lambda conn: commits.append(None)
+    )
+
+    return commits
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_commited_together(engine: AsyncEngine):
+    repo_config = make_repo_config(engine)
+
+    regular_user = await RegularUser.add_regular_user(1, SARepo(repo_config))
+
+    commits = count_commits(engine)
+
+    questions = await asyncio.gather(
+        *(
+            regular_user.ask_question("Question", i, SARepo(repo_config))
+            for i in range(10)
+        )
+    )
+
+    assert len(commits) == 1
+
+    repo = SARepo(repo_config)
+
+    assert len(questions) == await repo.count_all_questions() == 10
+    assert (await repo.get_global_statistics()).total_questions == 10
+
+
+@pytest.mark.asyncio
+async def test_writes_return_once_commited(engine: AsyncEngine):
+    repo_config = make_repo_config(engine)
+
+    regular_user = await RegularUser.add_regular_user(1, SARepo(repo_config))
+
+    events: list[str] = []
+
+    event.listen(
+        engine.sync_engine, "commit", lambda conn: events.append("commit")
+    )
+
+    async def ask_question(tg_message_id: int) -> None:
+        await regular_user.ask_question(
+            "Question", tg_message_id, SARepo(repo_config)
+        )
+
+        events.append("returned")
+
+    await asyncio.gather(*(ask_question(i) for i in range(3)))
+
+    assert events == ["commit"] + ["returned"] * 3
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_bounded(engine: AsyncEngine):
+    repo_config = make_repo_config(engine, max_delay=10, max_batch_size=5)
+
+    regular_user = await RegularUser.add_regular_user(1, SARepo(repo_config))
+
+    commits = count_commits(engine)
+
+    # The delay is too long for the test to pass if it was waited for
+    await asyncio.wait_for(
+        asyncio.gather(
+            *(
+                regular_user.ask_question("Question", i, SARepo(repo_config))
+                for i in range(10)
+            )
+        ),
+        timeout=5,
+    )
+
+    assert len(commits) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_fail_the_batch(engine: AsyncEngine):
+    repo_config = make_repo_config(engine)
+
+    regular_user = await RegularUser.add_regular_user(1, SARepo(repo_config))
+    question = await regular_user.ask_question(
+        "Question", 0, SARepo(repo_config)
+    )
+
+    # The question's id is taken already
+    duplicate = Question(question.id, regular_user, "Question", 1)
+
+    results = await asyncio.gather(
+        SARepo(repo_config).add_question(duplicate),
+        regular_user.ask_question("Question", 2, SARepo(repo_config)),
+        SARepo(repo_config).add_question(
+            Question(uuid4(), regular_user, "Question", 3)
+        ),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], exc.IntegrityError)
+    assert not any(isinstance(result, Exception) for result in results[1:])
+
+    repo = SARepo(repo_config)
+
+    assert await repo.count_all_questions() == 3
+    assert (await repo.get_global_statistics()).total_questions == 3
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_writes_are_not_grouped(engine: AsyncEngine):
+    repo_config = make_repo_config(engine)
+
+    regular_user = await RegularUser.add_regular_user(1, SARepo(repo_config))
+
+    with pytest.raises(RuntimeError):
+        async with SARepo(repo_config).unit_of_work() as repo:
+            await regular_user.ask_question("Question", 0, repo)
+
+            raise RuntimeError()
+
+    assert await SARepo(repo_config).count_all_questions() == 0
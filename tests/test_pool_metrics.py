@@ -0,0 +1,39 @@
+from pathlib import Path
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from bot.db.pool_metrics import MeteredAsyncAdaptedQueuePool, get_pool_status
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_checkouts_are_metered(tmp_path: Path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'data.db'}",
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+        status = get_pool_status(engine)
+
+        assert status and (status.checked_out, status.idle) == (1, 0)
+
+        # The only connection is checked out, so the checkout times out
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect() as other_conn:
+                await other_conn.execute(text("SELECT 1"))
+
+    await engine.dispose()
+
+    # The metrics are kept when the pool is recreated
+    status = get_pool_status(engine)
+
+    assert status and (status.checked_out, status.idle) == (0, 0)
+    assert status.metrics.checkouts == 1
+    assert status.metrics.timeouts == 1
+    assert status.metrics.max_checked_out == 1
+    assert sum(status.metrics.wait_time_histogram) == 1
@@ -0,0 +1,63 @@
+from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from bot.db.query_metrics import QueryMetrics, instrument_engine, normalize_sql
+import asyncio
+import logging
+import pytest
+
+
+def test_statements_are_normalized():
+    assert normalize_sql(
+        "SELECT questions.id FROM questions\n"
+        + "WHERE questions.id IN (?, ?, ?) AND questions.message = 'a''b'"
+        + " LIMIT 10"
+    ) == (
+        "SELECT questions.id FROM questions "
+        + "WHERE questions.id IN (...) AND questions.message = ? LIMIT ?"
+    )
+    assert (
+        normalize_sql(
+            "INSERT INTO roles (id, name) VALUES ($1, $2), ($3, $4), ($5, $6)"
+        )
+        == "INSERT INTO roles (id, name) VALUES (...), ..."
+    )
+
+
+@pytest.mark.asyncio
+async def test_queries_are_metered(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'data.db'}")
+
+    # Every query is slow, so every query is logged
+    metrics = QueryMetrics(0)
+
+    instrument_engine(engine, metrics)
+
+    async def handle(handler: str, queries: int) -> None:
+        with metrics.account_queries(handler):
+            async with engine.connect() as conn:
+                for i in range(queries):
+                    await conn.execute(text(f"SELECT {i}"))
+
+                    await asyncio.sleep(0)
+
+    with caplog.at_level(logging.WARNING):
+        # The handlers run concurrently, as they do in the bot
+        await asyncio.gather(
+            handle("handle_message", 2), handle("handle_start", 1)
+        )
+
+    await engine.dispose()
+
+    assert metrics.statements["SELECT ?"].executions == 3
+    assert sum(metrics.statements["SELECT ?"].time_histogram) == 3
+
+    assert metrics.handlers["handle_message"].calls == 1
+    assert metrics.handlers["handle_message"].queries == 2
+    assert metrics.handlers["handle_start"].max_queries == 1
+
+    assert (
+        len([r for r in caplog.records if "handle_message" in r.message]) == 2
+    )
@@ -0,0 +1,314 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+from bot.db.models.sa_models import ModelBase
+from bot.db.repositories.repository import LoaderProfile
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.entities.regular_user import RegularUser
+from bot.entities.support_user import SupportUser
+from bot.utils import AttachmentType
+import re
+import pytest
+import pytest_asyncio
+
+# Tables that grow with the bot's usage,
+# hot queries must never scan them fully
+HOT_TABLES = {
+    "questions",
+    "answers",
+    "questions_attachments",
+    "answers_attachments",
+    "questions_archive",
+    "answers_archive",
+    "questions_attachments_archive",
+    "answers_attachments_archive",
+}
+
+SCAN_RE = re.compile(r"^SCAN (\w+)")
+
+
+class SeededData:
+    regular_user: RegularUser
+    support_user: SupportUser
+    question_id: Any
+    answer_id: Any
+    role_id: int
+
+
+@pytest_asyncio.fixture()
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=StaticPool
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def repo(engine: AsyncEngine) -> SARepo:
+    return SARepo(
+        SARepoConfig(
+            connection_povider=async_sessionmaker(
+                engine, expire_on_commit=False, class_=AsyncSession
+            )
+        )
+    )
+
+
+@pytest_asyncio.fixture()
+async def data(repo: SARepo) -> SeededData:
+    data = SeededData()
+
+    data.support_user = await SupportUser.add_support_user(1, "Jake", repo)
+
+    for i in range(10):
+        regular_user = await RegularUser.add_regular_user(100 + i, repo)
+
+        for j in range(3):
+            question = await regular_user.ask_question(
+                f"Question {j}", 1000 + i * 10 + j, repo
+            )
+
+            await question.add_attachment(
+                f"file-{i}-{j}", AttachmentType.IMAGE, datetime.now(), repo
+            )
+
+            await data.support_user.bind_question(question, repo)
+
+            answer = await data.support_user.answer_current_question(
+                f"Answer {j}", 2000 + i * 10 + j, repo
+            )
+
+            await answer.add_attachment(
+                f"file-{i}-{j}", AttachmentType.IMAGE, datetime.now(), repo
+            )
+
+            await data.support_user.unbind_question(repo)
+
+    data.regular_user = regular_user
+    data.question_id = question.id
+    data.answer_id = answer.id
+
+    return data
+
+
+async def explain_queries(
+    engine: AsyncEngine, call: Callable[[], Awaitable[Any]]
+) -> list[tuple[str, list[str]]]:
+    """Runs the call and returns every SELECT it has executed
+    together with the details of its query plan
+    """
+    statements: list[tuple[str, Any]] = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", collect)
+
+    try:
+        await call()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", collect)
+
+    plans = []
+
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = await conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            )
+
+            plans.append((statement, [row.detail for row in rows]))
+
+    return plans
+
+
+HOT_QUERIES: dict[str, Callable[[SARepo, SeededData], Awaitable[Any]]] = {
+    "get_support_user_by_tg_bot_user_id": lambda repo, data: (
+        repo.get_support_user_by_tg_bot_user_id(
+            data.support_user.tg_bot_user_id,
+            loader_profile=LoaderProfile.IDENTITY,
+        )
+    ),
+    "get_regular_user_by_tg_bot_user_id": lambda repo, data: (
+        repo.get_regular_user_by_tg_bot_user_id(
+            data.regular_user.tg_bot_user_id,
+            loader_profile=LoaderProfile.IDENTITY,
+        )
+    ),
+    "get_regular_user_last_asked_question": lambda repo, data: (
+        repo.get_regular_user_last_asked_question(data.regular_user.id)
+    ),
+    "resolve_identity_of_regular_user": lambda repo, data: (
+        repo.resolve_identity(data.regular_user.tg_bot_user_id)
+    ),
+    "resolve_identity_of_support_user": lambda repo, data: (
+        repo.resolve_identity(data.support_user.tg_bot_user_id)
+    ),
+    "get_questions_with_regular_user_id": lambda repo, data: (
+        repo.get_questions_with_regular_user_id(data.regular_user.id)
+    ),
+    "get_question_by_id": lambda repo, data: (
+        repo.get_question_by_id(data.question_id)
+    ),
+    "get_question_last_answer": lambda repo, data: (
+        repo.get_question_last_answer(data.question_id)
+    ),
+    "get_answers_with_question_id": lambda repo, data: (
+        repo.get_answers_with_question_id(data.question_id)
+    ),
+    "get_answer_by_id": lambda repo, data: (
+        repo.get_answer_by_id(data.answer_id)
+    ),
+    "get_question_attachments": lambda repo, data: (
+        repo.get_question_attachments(data.question_id)
+    ),
+    "get_answer_attachments": lambda repo, data: (
+        repo.get_answer_attachments(data.answer_id)
+    ),
+    "count_regular_users_questions": lambda repo, data: (
+        repo.count_regular_users_questions(data.regular_user.id)
+    ),
+    "count_regular_user_answered_questions": lambda repo, data: (
+        repo.count_regular_user_answered_questions(data.regular_user.id)
+    ),
+    "count_question_answers": lambda repo, data: (
+        repo.count_question_answers(data.question_id)
+    ),
+    "count_support_user_answers": lambda repo, data: (
+        repo.count_support_user_answers(data.support_user.id)
+    ),
+    "count_support_user_useful_answers": lambda repo, data: (
+        repo.count_support_user_useful_answers(data.support_user.id)
+    ),
+    "count_support_user_unuseful_answers": lambda repo, data: (
+        repo.count_support_user_unuseful_answers(data.support_user.id)
+    ),
+    "count_regular_user_questions_answers": lambda repo, data: (
+        repo.count_regular_user_questions_answers(data.regular_user.id)
+    ),
+    "count_regular_user_questions_useful_answers": lambda repo, data: (
+        repo.count_regular_user_questions_useful_answers(data.regular_user.id)
+    ),
+    "count_regular_user_questions_unuseful_answers": lambda repo, data: (
+        repo.count_regular_user_questions_unuseful_answers(
+            data.regular_user.id
+        )
+    ),
+    "count_regular_user_questions_unestimated_answers": lambda repo, data: (
+        repo.count_regular_user_questions_unestimated_answers(
+            data.regular_user.id
+        )
+    ),
+    "count_question_attachments": lambda repo, data: (
+        repo.count_question_attachments(data.question_id)
+    ),
+    "count_answer_attachments": lambda repo, data: (
+        repo.count_answer_attachments(data.answer_id)
+    ),
+    "count_all_useful_answers": lambda repo, data: (
+        repo.count_all_useful_answers()
+    ),
+    "count_all_unuseful_answers": lambda repo, data: (
+        repo.count_all_unuseful_answers()
+    ),
+    "get_regular_user_statistics": lambda repo, data: (
+        repo.get_regular_user_statistics(data.regular_user.id)
+    ),
+    "get_support_user_statistics": lambda repo, data: (
+        repo.get_support_user_statistics(data.support_user.id)
+    ),
+    "get_questions_page": lambda repo, data: (
+        repo.get_questions_page(
+            (datetime.now(), data.question_id),
+            desc_order=True,
+            loader_profile=LoaderProfile.IDENTITY,
+        )
+    ),
+    "get_answers_page": lambda repo, data: (
+        repo.get_answers_page((datetime.now(), data.answer_id))
+    ),
+    "get_answers_page_identity": lambda repo, data: (
+        repo.get_answers_page(
+            (datetime.now(), data.answer_id),
+            desc_order=True,
+            loader_profile=LoaderProfile.IDENTITY,
+        )
+    ),
+    "get_questions_attachments_page": lambda repo, data: (
+        repo.get_questions_attachments_page((datetime.now(), data.question_id))
+    ),
+    "get_answers_attachments_page": lambda repo, data: (
+        repo.get_answers_attachments_page(
+            (datetime.now(), data.answer_id), desc_order=True
+        )
+    ),
+    "get_support_users_page": lambda repo, data: (
+        repo.get_support_users_page(
+            (datetime.now(), data.support_user.id),
+            desc_order=True,
+            loader_profile=LoaderProfile.IDENTITY,
+        )
+    ),
+    "get_question_statistics": lambda repo, data: (
+        repo.get_question_statistics(data.question_id)
+    ),
+    "get_unanswered_questions": lambda repo, data: (
+        repo.get_unanswered_questions(loader_profile=LoaderProfile.IDENTITY)
+    ),
+    "count_unanswered_questions": lambda repo, data: (
+        repo.count_unanswered_questions()
+    ),
+    "count_answered_questions": lambda repo, data: (
+        repo.count_answered_questions()
+    ),
+    # The lookups of the rows that aren't in the hot tables
+    # fall back to the archive tables
+    "get_archived_question_by_tg_message_id": lambda repo, data: (
+        repo.get_question_by_tg_message_id(
+            -1, loader_profile=LoaderProfile.IDENTITY
+        )
+    ),
+    "get_archived_answers_with_question_id": lambda repo, data: (
+        repo.get_answers_with_question_id(uuid4())
+    ),
+    "get_archived_question_statistics": lambda repo, data: (
+        repo.get_question_statistics(uuid4())
+    ),
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query_name", HOT_QUERIES)
+async def test_hot_query_uses_indexes(
+    engine: AsyncEngine, repo: SARepo, data: SeededData, query_name: str
+):
+    plans = await explain_queries(
+        engine, lambda: HOT_QUERIES[query_name](repo, data)
+    )
+
+    assert plans, f"{query_name} has executed no queries"
+
+    for statement, details in plans:
+        for detail in details:
+            match = SCAN_RE.match(detail)
+
+            assert not (match and match.group(1) in HOT_TABLES), (
+                f"{query_name} scans {match and match.group(1)} fully:\n"
+                + f"{statement}\n"
+                + "\n".join(details)
+            )
@@ -0,0 +1,166 @@
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from bot.db.models.sa_models import ModelBase
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.entities.regular_user import RegularUser
+import pytest
+import pytest_asyncio
+
+
+async def create_engine(path: Path) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    return engine
+
+
+@pytest_asyncio.fixture()
+async def repo_config(tmp_path: Path):
+    # The replica is never synced with the primary,
+    # so the rows found show which database was read
+    primary_engine = await create_engine(tmp_path / "primary.db")
+    replica_engine = await create_engine(tmp_path / "replica.db")
+
+    yield SARepoConfig(
+        connection_povider=async_sessionmaker(
+            primary_engine, expire_on_commit=False, class_=AsyncSession
+        ),
+        read_connection_providers=[
+            async_sessionmaker(
+                replica_engine, expire_on_commit=False, class_=AsyncSession
+            )
+        ],
+    )
+
+    await primary_engine.dispose()
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_are_routed_to_replicas(repo_config: SARepoConfig):
+    await RegularUser.add_regular_user(1, SARepo(repo_config))
+
+    repo = SARepo(repo_config)
+
+    assert await repo.get_regular_user_by_tg_bot_user_id(1) is None
+    assert await repo.count_all_regular_users() == 0
+
+
+@pytest.mark.asyncio
+async def test_repo_reads_its_own_writes(repo_config: SARepoConfig):
+    async with SARepo(repo_config).unit_of_work() as repo:
+        assert await repo.get_regular_user_by_tg_bot_user_id(1) is None
+
+        regular_user = await RegularUser.add_regular_user(1, repo)
+
+        assert await repo.get_regular_user_by_id(regular_user.id)
+
+    repo = SARepo(repo_config)
+
+    await RegularUser.add_regular_user(2, repo)
+
+    assert await repo.count_all_regular_users() == 2
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_reads_from_primary(repo_config: SARepoConfig):
+    await RegularUser.add_regular_user(1, SARepo(repo_config))
+
+    async with SARepo(repo_config).unit_of_work() as repo:
+        assert await repo.get_regular_user_by_tg_bot_user_id(1)
+        assert await repo.count_all_regular_users() == 1
+
+
+@pytest.mark.asyncio
+async def test_identities_from_replicas_are_not_cached(
+    repo_config: SARepoConfig,
+):
+    await SARepo(repo_config).resolve_identity(1)
+
+    assert len(repo_config.identity_cache) == 0
+
+    async with SARepo(repo_config).unit_of_work() as repo:
+        await repo.resolve_identity(1)
+
+    assert len(repo_config.identity_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_identity_invalidated_while_read_is_not_cached(
+    repo_config: SARepoConfig,
+):
+    primary_engine: AsyncEngine = repo_config.connection_provider.kw["bind"]
+
+    # The user becomes a support user right after the identity is read
+    def invalidate_identity(*args):
+        repo_config.identity_cache.invalidate(1)
+
+    event.listen(
+        primary_engine.sync_engine,
+        "after_cursor_execute",
+        invalidate_identity,
+    )
+
+    async with SARepo(repo_config).unit_of_work() as repo:
+        await repo.resolve_identity(1)
+
+    assert len(repo_config.identity_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_writer_is_taken_only_for_writes(tmp_path: Path):
+    # All the writes share a single connection,
+    # the reads have their own connections to the same file
+    writer_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'data.db'}",
+        pool_size=1,
+        max_overflow=0,
+    )
+    read_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'data.db'}"
+    )
+
+    async with writer_engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    repo_config = SARepoConfig(
+        connection_povider=async_sessionmaker(
+            writer_engine, expire_on_commit=False, class_=AsyncSession
+        ),
+        primary_read_connection_provider=async_sessionmaker(
+            read_engine, expire_on_commit=False, class_=AsyncSession
+        ),
+    )
+
+    await RegularUser.add_regular_user(1, SARepo(repo_config))
+
+    def get_checked_out_writers() -> int:
+        return writer_engine.sync_engine.pool.checkedout()  # type: ignore
+
+    async with SARepo(repo_config).unit_of_work() as repo:
+        identity = await repo.resolve_identity(1)
+
+        assert identity.regular_user
+        assert get_checked_out_writers() == 0
+
+        await identity.regular_user.ask_question("Question", 1, repo)
+
+        assert get_checked_out_writers() == 1
+
+        # The unit of work reads its own writes
+        assert await repo.get_regular_user_last_asked_question(
+            identity.regular_user.id
+        )
+
+    assert get_checked_out_writers() == 0
+
+    await writer_engine.dispose()
+    await read_engine.dispose()
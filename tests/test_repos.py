@@ -0,0 +1,911 @@
+from datetime import datetime, timedelta
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+from bot.db.models.sa_models import ModelBase
+from bot.db.repositories.memory_repository import MemoryRepo
+from bot.db.repositories.repository import (
+    ANONYMIZED_MESSAGE,
+    LoaderProfile,
+    Page,
+    Repo,
+)
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.entities.answer import Answer
+from bot.entities.regular_user import RegularUser
+from bot.entities.role import Role, RolePermissions
+from bot.entities.support_user import SupportUser
+from bot.services.data_export import (
+    ExportDataset,
+    ExportFormat,
+    iter_pages,
+    write_export,
+)
+from bot.utils import AttachmentType
+import io
+import pytest
+import pytest_asyncio
+
+
+# Every test runs against all the repos, so they behave the same
+@pytest_asyncio.fixture(params=["sa", "memory"])
+async def repo(request: pytest.FixtureRequest) -> AsyncIterator[Repo]:
+    if request.param == "memory":
+        yield MemoryRepo()
+
+        return
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=StaticPool
+    )
+
+    event.listen(
+        engine.sync_engine,
+        "connect",
+        lambda dbapi_connection, connection_record: dbapi_connection.execute(
+            "PRAGMA foreign_keys=ON"
+        ),
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    yield SARepo(
+        SARepoConfig(
+            connection_povider=async_sessionmaker(
+                engine, expire_on_commit=False, class_=AsyncSession
+            )
+        )
+    )
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def create_models(repo: Repo) -> Repo:
+    """Adds a role, three regular users with two questions each
+    and two support users, who answer the questions of the first user
+    """
+    date = datetime(2023, 1, 1)
+
+    role = await Role.add_role(
+        "Support specialist", RolePermissions(True, False), repo
+    )
+
+    support_users = [
+        await SupportUser.add_support_user(
+            100 + i, f"Support {i}", repo, role, addition_time=date
+        )
+        for i in range(2)
+    ]
+
+    for i in range(3):
+        regular_user = await RegularUser.add_regular_user(i, repo)
+
+        for j in range(2):
+            await regular_user.ask_question(
+                f"Question {j}",
+                i * 10 + j,
+                repo,
+                date + timedelta(minutes=i * 10 + j),
+            )
+
+    questions = await repo.get_questions_with_regular_user_id(
+        (await repo.get_regular_user_by_tg_bot_user_id(0)).id
+    )
+
+    for i, (support_user, question) in enumerate(
+        zip(support_users, questions)
+    ):
+        await support_user.bind_question(question, repo)
+        await support_user.answer_current_question(
+            "Answer", 1000 + i, repo, date + timedelta(hours=1, minutes=i)
+        )
+        await support_user.unbind_question(repo)
+
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_getting_answers(create_models: Repo):
+    repo = create_models
+
+    question = (await repo.get_all_answers())[0].question
+
+    all_answers = await repo.get_all_answers()
+
+    answers_with_question_id = await repo.get_answers_with_question_id(
+        question.id
+    )
+
+    answer = await repo.get_answer_by_id(all_answers[0].id)
+
+    assert len(all_answers) == 2
+    assert len(answers_with_question_id) == 1
+    assert type(answer) is Answer
+    assert answer.question == question
+    assert await repo.get_answer_by_tg_message_id(1000) in all_answers
+
+
+@pytest.mark.asyncio
+async def test_deleting_questions(create_models: Repo):
+    repo = create_models
+
+    await repo.delete_all_questions()
+
+    assert await repo.get_all_questions() == []
+    assert await repo.get_all_answers() == []
+    assert await repo.count_all_support_users() == 2
+
+
+@pytest.mark.asyncio
+async def test_deleting_regular_users(create_models: Repo):
+    repo = create_models
+
+    regular_user = await repo.get_regular_user_by_tg_bot_user_id(0)
+
+    await repo.delete_regular_user_with_id(regular_user.id)
+
+    all_questions = await repo.get_all_questions()
+    all_regular_users = await repo.get_all_regular_users()
+    all_answers = await repo.get_all_answers()
+    all_support_users = await repo.get_all_support_users()
+
+    assert len(all_regular_users) == 2
+    assert len(all_questions) == 4
+    assert len(all_support_users) == 2
+    assert all_answers == []
+
+    assert await repo.get_regular_user_by_id(regular_user.id) is None
+    assert await repo.get_questions_with_regular_user_id(regular_user.id) == []
+
+
+@pytest.mark.asyncio
+async def test_deleting_questions_with_regular_user_id(create_models: Repo):
+    repo = create_models
+
+    regular_user = await repo.get_regular_user_by_tg_bot_user_id(1)
+
+    await repo.delete_questions_with_regular_user_id(regular_user.id)
+
+    assert await repo.get_questions_with_regular_user_id(regular_user.id) == []
+    assert await repo.count_all_questions() == 4
+    assert await repo.get_regular_user_by_id(regular_user.id) == regular_user
+
+
+@pytest.mark.asyncio
+async def test_deleting_all_support_users(create_models: Repo):
+    repo = create_models
+
+    await repo.delete_all_support_users()
+
+    all_questions = await repo.get_all_questions()
+    all_regular_users = await repo.get_all_regular_users()
+    all_answers = await repo.get_all_answers()
+    all_support_users = await repo.get_all_support_users()
+
+    assert all_support_users == []
+    assert all_regular_users != []
+    assert all_questions != []
+    assert all_answers == []
+
+
+@pytest.mark.asyncio
+async def test_deleting_support_users_by_id(create_models: Repo):
+    repo = create_models
+
+    support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+
+    await repo.delete_support_user_with_id(support_user.id)
+
+    assert await repo.count_all_support_users() == 1
+    assert await repo.count_all_answers() == 1
+    assert await repo.count_all_questions() == 6
+
+    assert await repo.get_support_user_by_id(support_user.id) is None
+    assert await repo.get_support_user_answers_with_id(support_user.id) == []
+
+
+@pytest.mark.asyncio
+async def test_adding_support_user(create_models: Repo):
+    repo = create_models
+
+    roles = await repo.get_all_roles()
+
+    new_support_user = await SupportUser.add_support_user(
+        2352135235, "Joe", repo, role=roles[0]
+    )
+
+    support_user = await repo.get_support_user_by_id(new_support_user.id)
+
+    assert new_support_user == support_user
+    assert support_user.role == roles[0]
+    assert new_support_user in await repo.get_all_support_users()
+    assert await repo.count_support_users_with_role(roles[0].id) == 3
+
+
+@pytest.mark.asyncio
+async def test_adding_questions(create_models: Repo):
+    repo = create_models
+
+    regular_user = await repo.get_regular_user_by_tg_bot_user_id(2)
+
+    question = await regular_user.ask_question(
+        "Hello there!", 12423561345, repo, datetime(2024, 1, 1)
+    )
+
+    assert await repo.get_question_by_id(question.id) == question
+    assert question in await repo.get_all_questions()
+    assert (
+        await repo.get_regular_user_last_asked_question(regular_user.id)
+        == question
+    )
+
+
+@pytest.mark.asyncio
+async def test_adding_answers(create_models: Repo):
+    repo = create_models
+
+    support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+
+    question = (await repo.get_unanswered_questions())[0]
+
+    await support_user.bind_question(question, repo)
+
+    assert question not in await repo.get_unbinded_questions()
+
+    answer = await support_user.answer_current_question(
+        "Hello there! Now you question is answered!", 12345678, repo
+    )
+
+    assert answer == await repo.get_answer_by_id(answer.id)
+    assert answer in await repo.get_all_answers()
+    assert question not in await repo.get_unanswered_questions()
+
+    await repo.estimate_answer_as_useful(answer.id)
+
+    assert (await repo.get_answer_by_id(answer.id)).is_useful is True
+
+
+@pytest.mark.asyncio
+async def test_adding_regular_users(create_models: Repo):
+    repo = create_models
+
+    regular_user = await RegularUser.add_regular_user(1234124, repo)
+
+    assert regular_user == await repo.get_regular_user_by_id(regular_user.id)
+    assert regular_user in await repo.get_all_regular_users()
+
+
+@pytest.mark.asyncio
+async def test_adding_roles(create_models: Repo):
+    repo = create_models
+
+    role = await Role.add_role(
+        "Senior support specialist",
+        RolePermissions(True, True),
+        repo,
+        "Answers VIP-clients questions and can assign roles",
+    )
+
+    assert role.id
+    assert role == await repo.get_role_by_id(role.id)
+    assert role == await repo.get_role_by_name("Senior support specialist")
+    assert role in await repo.get_all_roles()
+
+
+@pytest.mark.asyncio
+async def test_deleting_roles(create_models: Repo):
+    repo = create_models
+
+    await repo.delete_all_roles()
+
+    all_sup_users = await repo.get_all_support_users()
+
+    assert all_sup_users != []
+
+    for sup_user in all_sup_users:
+        assert sup_user.role is None
+
+
+@pytest.mark.asyncio
+async def test_attachments(create_models: Repo):
+    repo = create_models
+
+    question = (await repo.get_all_questions())[0]
+    answer = (await repo.get_all_answers())[0]
+
+    for i in range(2):
+        await question.add_attachment(
+            f"question file {i}", AttachmentType.IMAGE, datetime.now(), repo
+        )
+        await answer.add_attachment(
+            f"answer file {i}", AttachmentType.DOCUMENT, datetime.now(), repo
+        )
+
+    assert len(await question.get_attachments(repo)) == 2
+    assert len(await repo.get_all_questions_attachments()) == 2
+    assert len(await answer.get_attachments(repo)) == 2
+    assert len(await repo.get_all_answers_attachments()) == 2
+
+    await repo.delete_answer_with_id(answer.id)
+
+    assert await repo.count_all_answers_attachments() == 0
+    assert await repo.count_all_questions_attachments() == 2
+
+
+@pytest.mark.asyncio
+async def test_claiming_questions(create_models: Repo):
+    repo = create_models
+
+    first_support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+    second_support_user = await repo.get_support_user_by_tg_bot_user_id(101)
+
+    # The first user's questions are answered, so the oldest
+    # unanswered and unbinded questions are the second user's ones
+    first_question = await first_support_user.claim_question(repo)
+    second_question = await second_support_user.claim_question(repo)
+
+    assert first_question and first_question.tg_message_id == 10
+    assert second_question and second_question.tg_message_id == 11
+
+    support_user = await repo.get_support_user_by_id(first_support_user.id)
+
+    assert support_user.current_question == first_question
+    assert len(await repo.get_unbinded_questions()) == 4
+
+
+@pytest.mark.asyncio
+async def test_pages(create_models: Repo):
+    repo = create_models
+
+    questions = await repo.get_questions_page(limit=4)
+    last_questions = await repo.get_questions_page(questions.next_cursor, 4)
+
+    assert [question.tg_message_id for question in questions.items] == [
+        0,
+        1,
+        10,
+        11,
+    ]
+    assert [question.tg_message_id for question in last_questions.items] == [
+        20,
+        21,
+    ]
+    assert last_questions.next_cursor is None
+
+    desc_questions = [
+        question.tg_message_id
+        async for question in repo.iter_questions(desc_order=True)
+    ]
+
+    assert desc_questions == [21, 20, 11, 10, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_identity_pages(create_models: Repo):
+    """The pages loaded with LoaderProfile.IDENTITY
+    have the same entities as the fully loaded ones, except that
+    the related entities they don't load are resolved on demand
+    """
+    repo = create_models
+
+    support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+    question = await repo.get_question_by_tg_message_id(20)
+
+    await support_user.bind_question(question, repo)
+
+    def describe(entity) -> dict:
+        # Related entities are compared by their ids, the slots
+        # of the related entities themselves may be left unset
+        attributes = {}
+
+        for cls in type(entity).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name.startswith("_"):
+                    continue
+
+                value = getattr(entity, name)
+
+                attributes[name] = (
+                    describe(value)
+                    if type(value).__module__.startswith("bot.entities")
+                    else value
+                )
+
+        return attributes
+
+    for get_page in (
+        repo.get_regular_users_page,
+        repo.get_support_users_page,
+        repo.get_questions_page,
+        repo.get_answers_page,
+    ):
+        identity_page = await get_page(
+            limit=3, loader_profile=LoaderProfile.IDENTITY
+        )
+        full_page = await get_page(limit=3)
+
+        assert identity_page.next_cursor == full_page.next_cursor
+        assert [describe(elem) for elem in identity_page.items] == [
+            describe(elem) for elem in full_page.items
+        ]
+
+    identity_support_user = next(
+        elem
+        for elem in (
+            await repo.get_support_users_page(
+                loader_profile=LoaderProfile.IDENTITY
+            )
+        ).items
+        if elem == support_user
+    )
+
+    assert await identity_support_user.get_current_question(repo) == question
+
+    answers = [
+        answer
+        async for answer in repo.iter_answers(
+            desc_order=True, loader_profile=LoaderProfile.IDENTITY
+        )
+    ]
+
+    assert [answer.tg_message_id for answer in answers] == [1001, 1000]
+
+    question_answers = await repo.get_question_answers_page(
+        answers[0].question.id, loader_profile=LoaderProfile.IDENTITY
+    )
+
+    assert [describe(answer) for answer in question_answers.items] == [
+        describe(answers[0])
+    ]
+
+
+@pytest.mark.asyncio
+async def test_questions_statuses(create_models: Repo):
+    repo = create_models
+
+    assert await repo.count_answered_questions() == 2
+    assert await repo.count_unanswered_questions() == 4
+
+    support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+    question = await repo.get_question_by_tg_message_id(20)
+
+    await support_user.bind_question(question, repo)
+
+    # The bound question leaves the queue, but stays unanswered
+    assert question not in await repo.get_unanswered_questions()
+    assert await repo.count_unanswered_questions() == 4
+
+    # Claiming another question releases the bound one
+    claimed_question = await support_user.claim_question(repo)
+
+    assert claimed_question and claimed_question.tg_message_id == 10
+    assert question in await repo.get_unanswered_questions()
+
+    await support_user.answer_current_question("Answer", 1002, repo)
+
+    assert await repo.count_answered_questions() == 3
+
+    statistics = await repo.get_question_statistics(claimed_question.id)
+
+    assert statistics.total_answers == 1
+
+    # The claimed question is still bound after losing its answer
+    await repo.delete_support_user_answers_with_id(support_user.id)
+
+    assert await repo.count_answered_questions() == 1
+    assert await repo.count_unanswered_questions() == 5
+    assert claimed_question not in await repo.get_unanswered_questions()
+
+    await support_user.unbind_question(repo)
+
+    assert claimed_question in await repo.get_unanswered_questions()
+    assert (await repo.get_global_statistics()).total_answered_questions == 1
+
+
+@pytest.mark.asyncio
+async def test_statistics(create_models: Repo):
+    repo = create_models
+
+    statistics = await repo.get_global_statistics()
+
+    assert statistics.total_roles == 1
+    assert statistics.total_regular_users == 3
+    assert statistics.total_support_users == 2
+    assert statistics.total_questions == 6
+    assert statistics.total_answered_questions == 2
+    assert statistics.total_unanswered_questions == 4
+    assert statistics.total_answers == 2
+
+    regular_user = await repo.get_regular_user_by_tg_bot_user_id(0)
+
+    regular_user_statistics = await repo.get_regular_user_statistics(
+        regular_user.id
+    )
+
+    assert regular_user_statistics.asked_questions == 2
+    assert regular_user_statistics.answered_questions == 2
+    assert regular_user_statistics.unestimated_answers == 2
+
+
+@pytest.mark.asyncio
+async def test_reestimating_answers(create_models: Repo):
+    repo = create_models
+
+    answer = (await repo.get_all_answers())[0]
+
+    # The counters are counted before the answer is estimated,
+    # so they are updated by the estimations
+    await repo.get_global_statistics()
+    await repo.get_support_user_statistics(answer.support_user_id)
+
+    await repo.estimate_answer_as_useful(answer.id)
+    await repo.estimate_answer_as_unuseful(answer.id)
+
+    statistics = await repo.get_global_statistics()
+
+    assert statistics.total_useful_answers == 0
+    assert statistics.total_unuseful_answers == 1
+
+    support_user_statistics = await repo.get_support_user_statistics(
+        answer.support_user_id
+    )
+
+    assert support_user_statistics.useful_answers == 0
+    assert support_user_statistics.unuseful_answers == 1
+    assert support_user_statistics.unestimated_answers == 0
+
+
+@pytest.mark.asyncio
+async def test_resolving_related_entities(create_models: Repo):
+    repo = create_models
+
+    question = await repo.get_question_by_tg_message_id(20)
+    support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+
+    await support_user.bind_question(question, repo)
+
+    async with repo.unit_of_work() as unit_of_work_repo:
+        support_user = await unit_of_work_repo.get_support_user_by_id(
+            support_user.id, loader_profile=LoaderProfile.IDENTITY
+        )
+
+        assert support_user.current_question_id == question.id
+
+        current_question = await support_user.get_current_question(
+            unit_of_work_repo
+        )
+
+        assert current_question == question
+        assert support_user.current_question is current_question
+
+        regular_user = await current_question.get_regular_user(
+            unit_of_work_repo
+        )
+
+        assert regular_user.tg_bot_user_id == 2
+
+        if isinstance(repo, SARepo):
+            # The entities looked up by ids are loaded once per unit of work
+            assert (
+                await unit_of_work_repo.get_question_by_id(
+                    question.id, loader_profile=LoaderProfile.IDENTITY
+                )
+                is current_question
+            )
+
+            await support_user.unbind_question(unit_of_work_repo)
+
+            # Until something is written
+            assert (
+                await unit_of_work_repo.get_support_user_by_id(
+                    support_user.id, loader_profile=LoaderProfile.IDENTITY
+                )
+                is not support_user
+            )
+
+
+@pytest.mark.asyncio
+async def test_archiving_questions(create_models: Repo):
+    repo = create_models
+
+    answer = await repo.get_answer_by_tg_message_id(1000)
+
+    await answer.estimate_as_useful(repo)
+
+    question = await repo.get_question_by_id(answer.question_id)
+
+    await question.add_attachment(
+        "question file", AttachmentType.IMAGE, datetime.now(), repo
+    )
+    await answer.add_attachment(
+        "answer file", AttachmentType.DOCUMENT, datetime.now(), repo
+    )
+
+    statistics = await repo.get_global_statistics()
+    regular_user_statistics = await repo.get_regular_user_statistics(
+        question.regular_user.id
+    )
+
+    archived = await repo.archive_questions(datetime.now())
+
+    if isinstance(repo, SARepo):
+        # Only the closed question is archived
+        assert archived == 1
+
+    # The archived rows are still found and counted
+    assert await repo.get_question_by_id(question.id) == question
+    assert (
+        await repo.get_question_by_tg_message_id(question.tg_message_id)
+        == question
+    )
+    assert await repo.get_answers_with_question_id(question.id) == [answer]
+    assert (await repo.get_answer_by_tg_message_id(1000)).is_useful
+    assert len(await question.get_attachments(repo)) == 1
+    assert len(await answer.get_attachments(repo)) == 1
+    assert (
+        await repo.get_question_statistics(question.id)
+    ).total_attachments == 1
+
+    await repo.rebuild_statistics()
+
+    assert vars(await repo.get_global_statistics()) == vars(statistics)
+    assert vars(
+        await repo.get_regular_user_statistics(question.regular_user.id)
+    ) == vars(regular_user_statistics)
+
+    # Binding brings the question back
+    support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+
+    await support_user.bind_question(question, repo)
+
+    assert (
+        await repo.get_support_user_by_id(support_user.id)
+    ).current_question_id == question.id
+    assert len(await question.get_attachments(repo)) == 1
+    assert await repo.archive_questions(datetime.now()) == 0
+    assert vars(await repo.get_global_statistics()) == vars(statistics)
+
+
+async def get_all_pages(get_page: Callable[..., Awaitable[Page]]) -> list:
+    items = []
+
+    async for item in iter_pages(lambda cursor: get_page(cursor, 2)):
+        items.append(item)
+
+    return items
+
+
+@pytest.mark.asyncio
+async def test_archived_rows_are_listed(create_models: Repo):
+    repo = create_models
+
+    answer = await repo.get_answer_by_tg_message_id(1000)
+
+    await answer.estimate_as_useful(repo)
+
+    question = await repo.get_question_by_id(answer.question_id)
+
+    await question.add_attachment(
+        "question file", AttachmentType.IMAGE, datetime.now(), repo
+    )
+    await answer.add_attachment(
+        "answer file", AttachmentType.DOCUMENT, datetime.now(), repo
+    )
+
+    listings = (
+        repo.get_questions_page,
+        repo.get_answers_page,
+        repo.get_questions_attachments_page,
+        repo.get_answers_attachments_page,
+        partial(repo.get_question_answers_page, question.id),
+    )
+
+    pages = [await get_all_pages(get_page) for get_page in listings]
+    regular_user_questions = await repo.get_questions_with_regular_user_id(
+        question.regular_user_id
+    )
+    support_user_answers = await repo.get_support_user_answers_with_id(
+        answer.support_user_id
+    )
+
+    exports = {}
+
+    for dataset in ExportDataset:
+        exports[dataset] = await write_export(
+            repo, dataset, ExportFormat.JSONL, io.BytesIO(), page_size=2
+        )
+
+    await repo.archive_questions(datetime.now())
+
+    # The archived rows are listed in the same order
+    for get_page, items in zip(listings, pages):
+        assert [elem.id for elem in await get_all_pages(get_page)] == [
+            elem.id for elem in items
+        ]
+
+    assert {
+        elem.id
+        for elem in await repo.get_questions_with_regular_user_id(
+            question.regular_user_id
+        )
+    } == {elem.id for elem in regular_user_questions}
+    assert {
+        elem.id
+        for elem in await repo.get_support_user_answers_with_id(
+            answer.support_user_id
+        )
+    } == {elem.id for elem in support_user_answers}
+
+    for dataset in ExportDataset:
+        assert (
+            await write_export(
+                repo, dataset, ExportFormat.JSONL, io.BytesIO(), page_size=2
+            )
+            == exports[dataset]
+        )
+
+
+@pytest.mark.asyncio
+async def test_retention_policy(create_models: Repo):
+    repo = create_models
+
+    date = datetime(2023, 1, 1)
+
+    answer = await repo.get_answer_by_tg_message_id(1000)
+
+    await answer.add_attachment(
+        "answer file", AttachmentType.DOCUMENT, datetime.now(), repo
+    )
+    await answer.estimate_as_useful(repo)
+
+    question = await repo.get_question_by_tg_message_id(1)
+
+    await question.add_attachment(
+        "question file", AttachmentType.IMAGE, datetime.now(), repo
+    )
+
+    # The archived questions are processed too
+    await repo.archive_questions(datetime.now())
+
+    bound_question = await repo.get_question_by_tg_message_id(20)
+
+    await (await repo.get_support_user_by_tg_bot_user_id(100)).bind_question(
+        bound_question, repo
+    )
+
+    progress: list[int] = []
+
+    assert (
+        await repo.anonymize_questions_older_than(
+            date + timedelta(minutes=15), 2, progress.append
+        )
+        == 4
+    )
+    # The archived questions are reported after the hot ones
+    assert progress[0] == 2 and progress[-1] == 4
+
+    for tg_message_id in (0, 1, 10, 11):
+        assert (
+            await repo.get_question_by_tg_message_id(tg_message_id)
+        ).message == ANONYMIZED_MESSAGE
+
+    assert (
+        await repo.get_question_by_tg_message_id(20)
+    ).message == "Question 0"
+    assert (
+        await repo.get_answer_by_tg_message_id(1000)
+    ).message == ANONYMIZED_MESSAGE
+
+    statistics = await repo.get_global_statistics()
+
+    assert statistics.total_questions == 6
+    assert statistics.total_questions_attachments == 0
+    assert statistics.total_answers_attachments == 0
+
+    # The anonymized questions are skipped when it's run again
+    assert (
+        await repo.anonymize_questions_older_than(date + timedelta(minutes=15))
+        == 0
+    )
+
+    assert (
+        await repo.delete_questions_older_than(date + timedelta(days=1), 2)
+        == 5
+    )
+    assert await repo.get_all_questions() == [bound_question]
+    assert await repo.get_all_answers() == []
+    assert (await repo.get_global_statistics()).total_questions == 1
+
+
+@pytest.mark.asyncio
+async def test_erasing_regular_user(create_models: Repo):
+    repo = create_models
+
+    regular_user = await repo.get_regular_user_by_tg_bot_user_id(0)
+
+    question = await repo.get_question_by_tg_message_id(0)
+    support_user = await repo.get_support_user_by_tg_bot_user_id(100)
+
+    await support_user.bind_question(question, repo)
+
+    progress: list[int] = []
+
+    assert (
+        await repo.erase_regular_user(regular_user.id, 1, progress.append) == 2
+    )
+    assert progress == [1, 2]
+
+    assert await repo.get_regular_user_by_id(regular_user.id) is None
+    assert await repo.count_all_questions() == 4
+    assert await repo.get_all_answers() == []
+    assert (
+        await repo.get_support_user_by_id(support_user.id)
+    ).current_question_id is None
+    assert (await repo.get_global_statistics()).total_regular_users == 2
+
+
+class BatchFailure(Exception):
+    pass
+
+
+def fail_after_first_batch(processed: int) -> None:
+    raise BatchFailure()
+
+
+@pytest.mark.asyncio
+async def test_retention_continues_after_failures(create_models: Repo):
+    repo = create_models
+
+    date = datetime(2023, 1, 1)
+    regular_user = await repo.get_regular_user_by_tg_bot_user_id(0)
+
+    # The first batch is commited before the job fails,
+    # the second run processes only the rest of the rows
+    with pytest.raises(BatchFailure):
+        await repo.anonymize_questions_older_than(
+            date + timedelta(days=1), 2, fail_after_first_batch
+        )
+
+    assert (
+        await repo.anonymize_questions_older_than(date + timedelta(days=1), 2)
+        == 4
+    )
+    assert all(
+        question.message == ANONYMIZED_MESSAGE
+        for question in await repo.get_all_questions()
+    )
+
+    with pytest.raises(BatchFailure):
+        await repo.erase_regular_user(
+            regular_user.id, 1, fail_after_first_batch
+        )
+
+    assert await repo.get_regular_user_by_id(regular_user.id)
+    assert await repo.erase_regular_user(regular_user.id, 1) == 1
+    assert await repo.get_regular_user_by_id(regular_user.id) is None
+
+    with pytest.raises(BatchFailure):
+        await repo.delete_questions_older_than(
+            date + timedelta(days=1), 2, fail_after_first_batch
+        )
+
+    assert (
+        await repo.delete_questions_older_than(date + timedelta(days=1), 2)
+        == 2
+    )
+    assert await repo.get_all_questions() == []
+    assert await repo.get_all_answers() == []
+
+    statistics = await repo.get_global_statistics()
+
+    assert statistics.total_regular_users == 2
+    assert statistics.total_questions == 0
+    assert statistics.total_answers == 0
@@ -0,0 +1,110 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+from bot.db.repositories.memory_repository import MemoryRepo
+from bot.db.repositories.sa_row_mappers import ANSWERS_ROWS, SUPPORT_USERS_ROWS
+from bot.entities.support_user import SupportUser
+from bot.utils import RelatedEntityNotFoundError, RelationshipNotLoadedError
+import pytest
+
+
+DATE = datetime(2023, 1, 1)
+
+
+def make_support_user_values(
+    role: bool = True, current_question_id: UUID | None = None
+) -> tuple:
+    return (uuid4(), "Support", 1, DATE, False, True, current_question_id) + (
+        (1, "Role", "", True, False, DATE) if role else (None,) * 6
+    )
+
+
+def make_question_values() -> tuple:
+    return (uuid4(), "Question", 1, DATE, uuid4(), 2, DATE)
+
+
+def test_related_entities_are_shared():
+    support_user = make_support_user_values()
+    question = make_question_values()
+
+    as_entity = ANSWERS_ROWS.make_as_entity()
+
+    first, second = (
+        as_entity((uuid4(), "Answer", i, None, DATE) + support_user + question)
+        for i in range(2)
+    )
+
+    assert first is not second
+    assert first.support_user.role is second.support_user.role
+    assert first.question is second.question
+    assert first.question.regular_user is second.question.regular_user
+
+    # Entities built with another function are built again
+    other = ANSWERS_ROWS.make_as_entity()(
+        (uuid4(), "Answer", 3, None, DATE) + support_user + question
+    )
+
+    assert other.question is not first.question
+
+
+@pytest.mark.asyncio
+async def test_changed_entities_are_not_shared():
+    repo = MemoryRepo()
+
+    added_support_user = await SupportUser.add_support_user(1, "Support", repo)
+
+    support_user = (added_support_user.id,) + make_support_user_values()[1:]
+    question = make_question_values()
+
+    as_entity = ANSWERS_ROWS.make_as_entity()
+
+    first, second = (
+        as_entity((uuid4(), "Answer", i, None, DATE) + support_user + question)
+        for i in range(2)
+    )
+
+    # Support users are changed by their methods,
+    # so every answer has its own one
+    assert first.support_user is not second.support_user
+    assert first.support_user == second.support_user
+
+    await first.support_user.deactivate(repo)
+
+    assert not first.support_user.is_active
+    assert second.support_user.is_active
+
+
+def test_missing_related_entities_are_none():
+    as_entity = SUPPORT_USERS_ROWS.make_as_entity()
+
+    support_user = as_entity(make_support_user_values(role=False))
+
+    assert support_user.role is None
+    assert support_user.current_question is None
+
+    current_question_id = uuid4()
+
+    support_user = as_entity(
+        make_support_user_values(current_question_id=current_question_id)
+    )
+
+    assert support_user.role and support_user.role.id == 1
+
+    # The bound question is left to be resolved
+    assert support_user.current_question_id == current_question_id
+
+    with pytest.raises(RelationshipNotLoadedError):
+        support_user.current_question
+
+
+@pytest.mark.asyncio
+async def test_missing_related_entities_are_not_resolved():
+    support_user = SUPPORT_USERS_ROWS.make_as_entity()(
+        make_support_user_values(current_question_id=uuid4())
+    )
+
+    # The bound question doesn't exist in the repo
+    with pytest.raises(RelatedEntityNotFoundError):
+        await support_user.get_current_question(MemoryRepo())
+
+    with pytest.raises(RelationshipNotLoadedError):
+        support_user.current_question
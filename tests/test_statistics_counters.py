@@ -0,0 +1,127 @@
+from pathlib import Path
+from typing import Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from bot.db.models.sa_models import (
+    ModelBase,
+    StatisticsCountersModel,
+    StatisticsScope,
+)
+from bot.db.repositories.sa_repository import SARepo, SARepoConfig
+from bot.entities.regular_user import RegularUser
+import asyncio
+import pytest
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture()
+async def repo_config(tmp_path: Path):
+    # A file, so the concurrent transactions use their own connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'data.db'}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(ModelBase.metadata.create_all)
+
+    yield SARepoConfig(
+        connection_povider=async_sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+    )
+
+    await engine.dispose()
+
+
+async def get_counted_scope_ids(repo: SARepo) -> set[str]:
+    async with repo._session() as session:
+        q = select(StatisticsCountersModel.scope_id).where(
+            StatisticsCountersModel.is_counted == True  # noqa: E712
+        )
+
+        return set((await session.execute(q)).scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_updates_while_counting_are_not_lost(repo_config: SARepoConfig):
+    repo = SARepo(repo_config)
+
+    regular_user = await RegularUser.add_regular_user(1, repo)
+
+    await regular_user.ask_question("Question 1", 1, repo)
+
+    count_statistics = repo._count_statistics
+    writes: list[asyncio.Task] = []
+
+    async def count_statistics_and_write(*args: Any) -> Any:
+        statistics = await count_statistics(*args)
+
+        # The question is asked after the statistics are counted,
+        # but before the counters are stored
+        writes.append(
+            asyncio.create_task(
+                regular_user.ask_question("Question 2", 2, SARepo(repo_config))
+            )
+        )
+
+        await asyncio.sleep(0.1)
+
+        return statistics
+
+    repo._count_statistics = count_statistics_and_write  # type: ignore
+
+    statistics = await repo.get_regular_user_statistics(regular_user.id)
+
+    await asyncio.gather(*writes)
+
+    assert statistics.asked_questions == 1
+
+    statistics = await SARepo(repo_config).get_regular_user_statistics(
+        regular_user.id
+    )
+
+    assert statistics.asked_questions == 2
+
+
+@pytest.mark.asyncio
+async def test_deletions_invalidate_only_their_scopes(
+    repo_config: SARepoConfig,
+):
+    repo = SARepo(repo_config)
+
+    regular_users = [
+        await RegularUser.add_regular_user(i, repo) for i in range(2)
+    ]
+
+    questions = [
+        await regular_user.ask_question("Question", i, repo)
+        for i, regular_user in enumerate(regular_users)
+    ]
+
+    await repo.get_global_statistics()
+    await repo.get_regular_users_statistics(
+        [regular_user.id for regular_user in regular_users]
+    )
+
+    await repo.delete_question_with_id(questions[0].id)
+
+    assert await get_counted_scope_ids(repo) == {str(regular_users[1].id)}
+
+    assert (await repo.get_global_statistics()).total_questions == 1
+    assert (
+        await repo.get_regular_user_statistics(regular_users[0].id)
+    ).asked_questions == 0
+
+    await repo.delete_regular_user_with_id(regular_users[0].id)
+
+    # The counters of the deleted user are deleted with the user
+    async with repo._session() as session:
+        q = select(StatisticsCountersModel.scope_id).where(
+            StatisticsCountersModel.scope == StatisticsScope.REGULAR_USER
+        )
+
+        assert (await session.execute(q)).scalars().all() == [
+            str(regular_users[1].id)
+        ]
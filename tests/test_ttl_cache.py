@@ -0,0 +1,79 @@
+from bot.db.repositories.ttl_cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire():
+    timer = FakeTimer()
+    cache = TTLCache(10, 5, timer=timer)
+
+    cache.set("key", "value")
+
+    timer.now = 4.9
+
+    assert cache.get("key") == "value"
+
+    timer.now = 5
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(2, 60)
+
+    cache.set(1, "first")
+    cache.set(2, "second")
+
+    # Makes the second entry the least recently used one
+    cache.get(1)
+
+    cache.set(3, "third")
+
+    assert cache.get(1) == "first"
+    assert cache.get(2) is None
+    assert cache.get(3) == "third"
+
+
+def test_invalidation():
+    cache = TTLCache(10, 60)
+
+    cache.set(1, "first")
+    cache.set(2, "second")
+
+    cache.invalidate(1)
+    cache.invalidate(3)
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "second"
+
+    cache.clear()
+
+    assert len(cache) == 0
+
+
+def test_metrics():
+    timer = FakeTimer()
+    cache = TTLCache(1, 5, timer=timer)
+
+    cache.set(1, "first")
+    cache.get(1)
+    cache.get(2)
+
+    cache.set(2, "second")
+
+    timer.now = 5
+
+    cache.get(2)
+
+    assert cache.metrics.hits == 1
+    assert cache.metrics.misses == 2
+    assert cache.metrics.evictions == 1
+    assert cache.metrics.expirations == 1
+    assert cache.metrics.hit_rate == 1 / 3